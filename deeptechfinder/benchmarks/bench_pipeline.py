@@ -0,0 +1,21 @@
+"""
+End-to-end ETL pipeline benchmarks.
+
+    python -m pytest benchmarks/bench_pipeline.py --benchmark-autosave
+    python -m pytest benchmarks/bench_pipeline.py --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Each benchmark stores per-phase timings, peak RSS, the tracemalloc peak and
+retained allocator blocks in extra_info, so they are part of the saved JSON.
+"""
+
+from benchmarks.harness import benchmark_config, profile_pipeline, run_pipeline
+
+def test_analyze_university(benchmark, dataset_factory, portfolio_size):
+    dataset = dataset_factory(portfolio_size)
+
+    with benchmark_config(dataset):
+        rounds = 1 if portfolio_size >= 10000 else 3
+        result = benchmark.pedantic(run_pipeline, args=(dataset,), rounds=rounds, iterations=1, warmup_rounds=0)
+        benchmark.extra_info.update(profile_pipeline(dataset))
+
+    assert result.portfolio.patents_retrieved == portfolio_size
@@ -0,0 +1,33 @@
+"""
+Benchmark configuration.
+
+Portfolio sizes default to 10/100/1000/10000 patents and can be narrowed with
+--bench-sizes (e.g. --bench-sizes 10,100 for a quick run).
+"""
+
+import pytest
+
+from benchmarks.synthetic import build_dataset
+
+DEFAULT_SIZES = '10,100,1000,10000'
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-sizes', default=DEFAULT_SIZES,
+                     help=f'Comma-separated portfolio sizes (default: {DEFAULT_SIZES})')
+
+def pytest_generate_tests(metafunc):
+    if 'portfolio_size' in metafunc.fixturenames:
+        sizes = [int(s) for s in metafunc.config.getoption('bench_sizes').split(',') if s]
+        metafunc.parametrize('portfolio_size', sizes, ids=[f'{s}_patents' for s in sizes])
+
+@pytest.fixture(scope='session')
+def dataset_factory(tmp_path_factory):
+    """Build (and cache per session) synthetic datasets by size."""
+    cache = {}
+
+    def factory(size: int):
+        if size not in cache:
+            cache[size] = build_dataset(size, tmp_path_factory.mktemp(f'portfolio_{size}'))
+        return cache[size]
+
+    return factory
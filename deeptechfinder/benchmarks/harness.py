@@ -0,0 +1,86 @@
+"""
+Helpers for running the ETL pipeline under benchmark conditions.
+"""
+
+import gc
+import resource
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from src.core.config import config
+from src.core.university_engine import UniversityEngine
+from src.etl.load.data_models import AnalysisResult
+from src.utils.logging_setup import setup_logging
+
+from benchmarks.synthetic import SyntheticDataset
+
+@contextmanager
+def benchmark_config(dataset: SyntheticDataset):
+    """
+    Point the pipeline at a synthetic dataset (CSV, archive, store, summary index,
+    number resolution table) with quiet logging, so nothing is written to output/.
+    """
+    saved = (config.data.input_file, config.data.summary_index, config.archive.path, config.store.path,
+             config.store.enabled, config.epo_ops.resolution_cache)
+    config.data.input_file = str(dataset.data_file)
+    config.data.summary_index = str(dataset.summary_index_path)
+    config.archive.path = str(dataset.archive_path)
+    config.store.path = str(dataset.store_path)
+    config.store.enabled = True
+    config.epo_ops.resolution_cache = str(dataset.resolution_cache_path)
+    setup_logging(quiet=True, log_file='')
+    try:
+        yield
+    finally:
+        (config.data.input_file, config.data.summary_index, config.archive.path, config.store.path,
+         config.store.enabled, config.epo_ops.resolution_cache) = saved
+
+def run_pipeline(dataset: SyntheticDataset) -> AnalysisResult:
+    """Run extract → transform → analyze → load for the whole synthetic portfolio (replay mode)."""
+    engine = UniversityEngine()
+    return engine.analyze_university(dataset.university, dataset.size, replay=True)
+
+def peak_rss_mb() -> float:
+    """Process peak resident set size in MB (high-water mark since process start)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def profile_pipeline(dataset: SyntheticDataset) -> Dict[str, Any]:
+    """
+    Run the pipeline once and collect phase timings and memory figures.
+
+    Phase timings come from an untraced run; allocation figures from a second
+    run under tracemalloc (which slows execution down considerably).
+
+    retained_blocks counts the allocator blocks still alive after the run, i.e.
+    the objects held by the AnalysisResult and any caches.
+
+    Returns:
+        Report with phases, patents, peak RSS, tracemalloc peak and retained blocks
+    """
+    result = run_pipeline(dataset)
+    phases = result.metrics['phases']
+    patents = result.portfolio.patents_retrieved
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        traced = run_pipeline(dataset)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        retained_blocks = sys.getallocatedblocks() - blocks_before
+    finally:
+        tracemalloc.stop()
+    del traced
+
+    return {
+        'size': dataset.size,
+        'patents_retrieved': patents,
+        'phases': phases,
+        'total_seconds': result.metrics['total_seconds'],
+        'peak_rss_mb': peak_rss_mb(),
+        'tracemalloc_peak_mb': round(traced_peak / (1024 * 1024), 2),
+        'retained_blocks': retained_blocks,
+    }
@@ -0,0 +1,123 @@
+"""
+Standalone benchmark runner with saved results and regression checks.
+
+Each portfolio size runs in a fresh interpreter so peak RSS is measured per
+size. Results are written to benchmarks/results/<timestamp>.json.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 10,100,1000 --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+def run_worker(size: int, seed: int) -> Dict[str, Any]:
+    """Build a dataset and profile the pipeline for one size (runs inside the child process)."""
+    from benchmarks.harness import benchmark_config, profile_pipeline
+    from benchmarks.synthetic import build_dataset
+
+    with tempfile.TemporaryDirectory() as directory:
+        dataset = build_dataset(size, Path(directory), seed)
+        with benchmark_config(dataset):
+            return profile_pipeline(dataset)
+
+def run_size(size: int, seed: int) -> Dict[str, Any]:
+    """Profile one size in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.run', '--worker', str(size), '--seed', str(seed)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float,
+            min_seconds: float = 0.05) -> List[str]:
+    """
+    Compare phase timings and memory against a baseline run.
+    Phases faster than min_seconds in the baseline are skipped as timer noise.
+
+    Returns:
+        Human-readable regression descriptions (empty if none exceed the threshold)
+    """
+    regressions = []
+    baseline_by_size = {entry['size']: entry for entry in baseline}
+
+    for entry in current:
+        previous = baseline_by_size.get(entry['size'])
+        if not previous:
+            continue
+
+        metrics = {f"phase {name}": seconds for name, seconds in entry['phases'].items()}
+        metrics.update({'peak_rss_mb': entry['peak_rss_mb'], 'tracemalloc_peak_mb': entry['tracemalloc_peak_mb']})
+        previous_metrics = {f"phase {name}": seconds for name, seconds in previous['phases'].items()}
+        previous_metrics.update({'peak_rss_mb': previous['peak_rss_mb'],
+                                 'tracemalloc_peak_mb': previous['tracemalloc_peak_mb']})
+
+        for name, value in metrics.items():
+            old = previous_metrics.get(name)
+            if name.startswith('phase ') and (old or 0) < min_seconds:
+                continue
+            if old and value > old * (1 + threshold):
+                regressions.append(f"{entry['size']} patents, {name}: {old} → {value} (+{(value / old - 1) * 100:.0f}%)")
+
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='DeepTechFinder ETL pipeline benchmarks')
+    parser.add_argument('--sizes', default='10,100,1000,10000', help='Comma-separated portfolio sizes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help='Result file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', type=Path, help='Baseline result file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed slowdown/growth (default: 0.10)')
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help='Ignore phases faster than this in the baseline (default: 0.05)')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker, args.seed)))
+        return 0
+
+    results = []
+    print(f"{'patents':>8} {'extract':>9} {'transform':>10} {'analyze':>9} {'load':>8} {'RSS MB':>8} {'traced MB':>10}")
+    for size in [int(s) for s in args.sizes.split(',') if s]:
+        entry = run_size(size, args.seed)
+        results.append(entry)
+        phases = entry['phases']
+        print(f"{size:>8} {phases.get('extract', 0):>8.3f}s {phases.get('transform', 0):>9.3f}s "
+              f"{phases.get('analyze', 0):>8.3f}s {phases.get('load', 0):>7.3f}s "
+              f"{entry['peak_rss_mb']:>8} {entry['tracemalloc_peak_mb']:>10}")
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'created_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'seed': args.seed,
+        'results': results,
+    }, indent=2))
+    print(f"💾 Results: {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())['results']
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print("❌ Regressions:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"✅ No regressions above {args.threshold:.0%}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
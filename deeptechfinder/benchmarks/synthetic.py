@@ -0,0 +1,204 @@
+"""
+Synthetic DeepTechFinder portfolios and OPS biblio payloads for benchmarks.
+
+Payloads follow the structure of real OPS JSON responses (see
+legacy/output/sample_ops_response.json) with realistic entity reuse:
+inventors and industry partners recur across patents, priorities are
+mostly German, and IPC/CPC codes come from a small pool.
+"""
+
+import csv
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+from src.etl.load.data_models import EPOOPSResponse
+from src.etl.load.raw_payload_archive import RawPayloadArchive
+
+UNIVERSITY = "Synthetic University of Benchmarking"
+UNIVERSITY_APPLICANT = ("UNIV SYNTH BENCH [DE]", "Synthetic University of Benchmarking")
+
+INDUSTRY_PARTNERS = [
+    ("SIEMENS AG [DE]", "Siemens Aktiengesellschaft"),
+    ("BOSCH GMBH ROBERT [DE]", "Robert Bosch GmbH"),
+    ("BASF SE [DE]", "BASF SE"),
+    ("FRAUNHOFER GES FORSCHUNG [DE]", "Fraunhofer-Gesellschaft zur Förderung der angewandten Forschung e.V."),
+    ("INFINEON TECHNOLOGIES AG [DE]", "Infineon Technologies AG"),
+    ("ZEISS CARL SMT GMBH [DE]", "Carl Zeiss SMT GmbH"),
+    ("BAYER AG [DE]", "Bayer Aktiengesellschaft"),
+    ("THYSSENKRUPP AG [DE]", "thyssenkrupp AG"),
+]
+
+IPC_CODES = ["E04B 2/86", "E04C 5/20", "G06N 3/08", "H01L 21/02", "A61K 9/00",
+             "B33Y 10/00", "C12N 15/10", "G01N 33/53", "H04L 9/32", "B01J 23/00"]
+
+FIRST_NAMES = ["JULIANE", "MANFRED", "KLAUS", "ANNA", "STEFAN", "MARIA", "THOMAS", "LENA", "JAN", "SOPHIE"]
+LAST_NAMES = ["WAGNER", "CURBACH", "HOLSCHEMACHER", "MUELLER", "SCHMIDT", "SCHNEIDER", "FISCHER",
+              "WEBER", "MEYER", "BECKER", "HOFFMANN", "SCHULZ", "KOCH", "RICHTER", "KLEIN"]
+
+@dataclass
+class SyntheticDataset:
+    """Files backing one benchmark portfolio."""
+    size: int
+    university: str
+    data_file: Path
+    archive_path: Path
+    store_path: Path
+    summary_index_path: Path
+    resolution_cache_path: Path
+
+def _value(text: str) -> Dict[str, str]:
+    return {'$': text}
+
+def _ipc_entry(sequence: int, code: str) -> Dict[str, Any]:
+    subclass, group = code.split(' ')
+    main_group, subgroup = group.split('/')
+    return {'@sequence': str(sequence), 'text': _value(f"{subclass}   {main_group:>2}/{subgroup:>6}            A I")}
+
+def _cpc_entry(sequence: int, code: str) -> Dict[str, Any]:
+    subclass, group = code.split(' ')
+    main_group, subgroup = group.split('/')
+    return {
+        '@sequence': str(sequence),
+        'classification-scheme': {'@office': 'EP', '@scheme': 'CPCI'},
+        'section': _value(subclass[0]),
+        'class': _value(subclass[1:3]),
+        'subclass': _value(subclass[3]),
+        'main-group': _value(main_group),
+        'subgroup': _value(subgroup + '17'),
+    }
+
+def synthetic_biblio(index: int, rng: random.Random, inventor_pool: int) -> Dict[str, Any]:
+    """
+    Build one OPS biblio JSON payload.
+
+    Args:
+        index: Patent index (determines application/publication numbers)
+        rng: Seeded random generator
+        inventor_pool: Number of distinct inventors to draw from
+
+    Returns:
+        Payload shaped like an OPS published-data/application/epodoc/.../biblio response
+    """
+    application = f"{19000000 + index}"
+    publication = f"{3000000 + index}"
+    year = 2000 + index % 24
+
+    applicants = [UNIVERSITY_APPLICANT] + rng.sample(INDUSTRY_PARTNERS, rng.choice([0, 0, 1, 2]))
+    applicant_entries = []
+    for sequence, (epodoc, original) in enumerate(applicants, 1):
+        applicant_entries.append({'@sequence': str(sequence), '@data-format': 'epodoc',
+                                  'applicant-name': {'name': _value(epodoc)}})
+        applicant_entries.append({'@sequence': str(sequence), '@data-format': 'original',
+                                  'applicant-name': {'name': _value(original)}})
+
+    inventor_entries = []
+    for sequence in range(1, rng.randint(1, 5) + 1):
+        person = rng.randrange(inventor_pool)
+        last = LAST_NAMES[person % len(LAST_NAMES)]
+        first = FIRST_NAMES[(person // len(LAST_NAMES)) % len(FIRST_NAMES)]
+        suffix = f" {person // (len(LAST_NAMES) * len(FIRST_NAMES))}" if person >= len(LAST_NAMES) * len(FIRST_NAMES) else ""
+        inventor_entries.append({'@sequence': str(sequence), '@data-format': 'epodoc',
+                                 'inventor-name': {'name': _value(f"{last} {first}{suffix} [DE]")}})
+        inventor_entries.append({'@sequence': str(sequence), '@data-format': 'original',
+                                 'inventor-name': {'name': _value(f"{last}, {first.title()}{suffix},")}})
+
+    priority_country = 'DE' if rng.random() < 0.8 else rng.choice(['US', 'EP', 'JP'])
+    priority_number = f"{priority_country}{year}{10000000 + index:08d}"
+    codes = rng.sample(IPC_CODES, rng.randint(1, 3))
+
+    return {'ops:world-patent-data': {
+        '@xmlns': {'ops': 'http://ops.epo.org', '$': 'http://www.epo.org/exchange'},
+        'exchange-documents': {'exchange-document': {
+            '@system': 'ops.epo.org',
+            '@family-id': str(60000000 + index),
+            '@country': 'EP',
+            '@doc-number': publication,
+            '@kind': 'A1',
+            'bibliographic-data': {
+                'publication-reference': {'document-id': [
+                    {'@document-id-type': 'docdb', 'country': _value('EP'), 'doc-number': _value(publication),
+                     'kind': _value('A1'), 'date': _value(f"{year + 1}0318")},
+                    {'@document-id-type': 'epodoc', 'doc-number': _value(f"EP{publication}"),
+                     'date': _value(f"{year + 1}0318")},
+                ]},
+                'classifications-ipcr': {'classification-ipcr': [
+                    _ipc_entry(sequence, code) for sequence, code in enumerate(codes, 1)
+                ]},
+                'patent-classifications': {'patent-classification': [
+                    _cpc_entry(sequence, code) for sequence, code in enumerate(codes, 1)
+                ]},
+                'application-reference': {'@doc-id': str(500000000 + index), 'document-id': [
+                    {'@document-id-type': 'docdb', 'country': _value('EP'), 'doc-number': _value(application),
+                     'kind': _value('A')},
+                    {'@document-id-type': 'epodoc', 'doc-number': _value(f"EP{year}0{application[2:]}"),
+                     'date': _value(f"{year}0911")},
+                ]},
+                'priority-claims': {'priority-claim': {
+                    '@sequence': '1', '@kind': 'national', 'document-id': [
+                        {'@document-id-type': 'epodoc', 'doc-number': _value(priority_number),
+                         'date': _value(f"{year}0912")},
+                        {'@document-id-type': 'original', 'doc-number': _value(priority_number[2:])},
+                    ]}},
+                'parties': {
+                    'applicants': {'applicant': applicant_entries},
+                    'inventors': {'inventor': inventor_entries},
+                },
+                'invention-title': [
+                    {'$': f"VORRICHTUNG {index}", '@lang': 'de'},
+                    {'$': f"Device and method number {index}", '@lang': 'en'},
+                ],
+            },
+        }},
+    }}
+
+def build_dataset(size: int, directory: Path, seed: int = 0) -> SyntheticDataset:
+    """
+    Write a synthetic DeepTechFinder CSV and a raw payload archive holding its OPS payloads.
+
+    Args:
+        size: Number of patents
+        directory: Target directory
+        seed: Random seed (same seed → identical dataset)
+
+    Returns:
+        SyntheticDataset with the written paths
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    dataset = SyntheticDataset(
+        size=size,
+        university=UNIVERSITY,
+        data_file=directory / f"deeptechfinder_{size}.csv",
+        archive_path=directory / f"ops_archive_{size}.db",
+        store_path=directory / f"analytics_{size}.db",
+        summary_index_path=directory / f"university_index_{size}.db",
+        resolution_cache_path=directory / f"ops_number_resolution_{size}.json",
+    )
+
+    columns = ['University', 'Total_number_of_Spin_outs', 'Spin_outs_List', 'Total_students',
+               'Total_number_of_applications', 'Application_title', 'Espacenet_link', 'Filing_year',
+               'Patent_status', 'Technical_field']
+    with open(dataset.data_file, 'w', newline='', encoding='latin-1') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for index in range(size):
+            writer.writerow([
+                UNIVERSITY, 2, "Bench GmbH, Synth AG", 25000, size, f"Device And Method Number {index}.",
+                f"https://worldwide.espacenet.com/patent/search?q=EP{19000000 + index}A",
+                f"9/11/{(index % 24):02d}", rng.choice(['EP granted', 'EP application']),
+                rng.choice(['Other', 'Materials', 'Digital', 'Energy']),
+            ])
+
+    inventor_pool = max(10, size // 2)
+    with RawPayloadArchive(dataset.archive_path) as archive:
+        for index in range(size):
+            archive.put(EPOOPSResponse(
+                ep_number=f"EP{19000000 + index}A",
+                status_code=200,
+                response_data=synthetic_biblio(index, rng, inventor_pool),
+            ))
+
+    return dataset
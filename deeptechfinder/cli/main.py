@@ -3,6 +3,7 @@ Command-line interface for DeepTechFinder Patent Analytics.
 """
 
 import argparse
+import json
 import sys
 from pathlib import Path
 
@@ -12,6 +13,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from src.core.university_engine import UniversityEngine
 from src.core.config import config
 from src.core.exceptions import *
+from src.etl.load.university_index import UniversitySummaryIndex, SORT_KEYS
+from src.utils.logging_setup import setup_logging
 
 def cmd_test_system(args):
     """Test system components."""
@@ -28,16 +31,27 @@ def cmd_test_system(args):
         return 1
 
 def cmd_list_universities(args):
-    """List available universities."""
+    """List available universities from the summary index."""
     try:
-        engine = UniversityEngine()
-        universities = engine.get_available_universities()
+        with UniversitySummaryIndex() as index:
+            index.refresh()
+            universities = index.list(args.sort, args.top)
+            total = len(index.names())
         
-        print(f"📚 Available Universities ({len(universities)}):")
+        title = f"Top {len(universities)} by {args.sort}" if args.top else f"Available Universities ({total})"
+        print(f"📚 {title}:")
         print("=" * 50)
         
         for i, uni in enumerate(universities, 1):
-            print(f"{i:3d}. {uni}")
+            if not args.details:
+                print(f"{i:3d}. {uni['name']}")
+                continue
+            analyzed = ""
+            if uni['last_analysis']:
+                analyzed = f" | analyzed {uni['last_analysis'][:10]} ({uni['success_rate']:.1f}% retrieved)"
+            print(f"{i:3d}. {uni['name'][:50]:<50} | Students: {uni['total_students']:>6,} | "
+                  f"Apps: {uni['total_applications']:>4} | Granted: {uni['granted_patents']:>4} "
+                  f"({uni['grant_rate']:>5.1f}%) | Spin-outs: {uni['spin_outs']:>3}{analyzed}")
         
         return 0
         
@@ -45,6 +59,34 @@ def cmd_list_universities(args):
         print(f"❌ Error: {e}")
         return 1
 
+def cmd_search_universities(args):
+    """Ranked fuzzy search over university names and aliases."""
+    from src.etl.load.name_search import repair_encoding
+    
+    try:
+        with UniversitySummaryIndex() as index:
+            index.refresh_dataset()
+            resolved = index.resolve(args.query)
+            matches = index.search(args.query, args.limit)
+        
+        if not matches:
+            print(f"📭 No universities match '{args.query}'")
+            return 1
+        
+        print(f"🔎 Universities matching '{args.query}':")
+        print("=" * 50)
+        for i, match in enumerate(matches, 1):
+            via = f"  (via '{match['matched']}')" if match['kind'] == 'alias' else ""
+            marker = " ✅" if match['name'] == resolved else ""
+            print(f"{i:3d}. {match['score']:.2f}  {repair_encoding(match['name'])}{via}{marker}")
+        if resolved:
+            print(f"\n💡 'analyze \"{args.query}\"' analyzes {repair_encoding(resolved)}")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Search failed: {e}")
+        return 1
+
 def cmd_analyze_university(args):
     """Analyze a specific university."""
     try:
@@ -60,7 +102,10 @@ def cmd_analyze_university(args):
             print(f"⚠️  Adjusting limit to maximum: {limit}")
         
         # Run analysis
-        result = engine.analyze_university(args.university, limit)
+        result = engine.analyze_university(args.university, limit, replay=args.replay,
+                                           concurrent=args.concurrent, deadline_seconds=args.deadline,
+                                           max_fetches=args.max_fetches, resume=args.resume,
+                                           streaming=True if args.approximate else None)
         
         # Display summary
         portfolio = result.portfolio
@@ -70,6 +115,8 @@ def cmd_analyze_university(args):
         print(f"👥 Students: {portfolio.total_students:,}")
         print(f"📄 Patents analyzed: {portfolio.patents_retrieved}/{portfolio.patents_requested}")
         print(f"📈 Success rate: {portfolio.success_rate:.1f}%")
+        if portfolio.deferred_patents:
+            print(f"⏱️  Deferred: {len(portfolio.deferred_patents)} patents (continue with --resume)")
         
         # Collaboration insights
         collab = result.collaboration_insights
@@ -91,21 +138,122 @@ def cmd_analyze_university(args):
         inventors = result.inventor_network
         if inventors:
             print(f"\n🔬 INVENTORS:")
-            print(f"   Unique inventors: {inventors.get('unique_inventors', 0)}")
+            approx = "~" if inventors.get('approximate') else ""
+            print(f"   Unique inventors: {approx}{inventors.get('unique_inventors', 0)}")
             print(f"   Avg per patent: {inventors.get('avg_inventors_per_patent', 0)}")
             print(f"   Core researchers (3+ patents): {inventors.get('core_researchers', 0)}")
         
+        # Columnar export
+        if args.parquet or config.export.parquet_export:
+            from src.export.parquet_exporter import ParquetExporter
+            
+            written = ParquetExporter().export(result)
+            print(f"\n💾 PARQUET EXPORT:")
+            for table, path in written.items():
+                print(f"   {table}: {path}")
+        
+        # Run metrics
+        metrics = result.metrics
+        if metrics:
+            print(f"\n⏱️  TIMINGS:")
+            for phase, seconds in metrics.get('phases', {}).items():
+                print(f"   {phase}: {seconds:.2f}s")
+            requests_made = metrics.get('counters', {}).get('ops_requests', 0)
+            if requests_made:
+                print(f"   OPS requests: {requests_made:.0f} ({metrics['throughput']['ops_requests_per_second']}/s)")
+        
+        if args.metrics_json:
+            Path(args.metrics_json).write_text(json.dumps(metrics, indent=2))
+            print(f"📊 Metrics report: {args.metrics_json}")
+        
+        if args.metrics_prom:
+            Path(args.metrics_prom).write_text(
+                engine.metrics.to_prometheus(labels={'university': result.portfolio.university_name})
+            )
+            print(f"📊 Prometheus metrics: {args.metrics_prom}")
+        
         print(f"\n✅ Analysis completed successfully!")
         return 0
         
     except UniversityNotFoundError as e:
         print(f"❌ University not found: {e}")
-        print("💡 Use 'list' command to see available universities")
+        print("💡 Use 'search' or 'list' command to find the university")
         return 1
     except Exception as e:
         print(f"❌ Analysis failed: {e}")
         return 1
 
+def cmd_query(args):
+    """Run a cross-university query against the analytics store."""
+    try:
+        from src.etl.load.analytics_store import AnalyticsStore
+        
+        store_path = config.get_store_path()
+        if not store_path.exists():
+            print(f"❌ No analytics store at {store_path}")
+            print("💡 Run 'analyze' first to load university results")
+            return 1
+        
+        with AnalyticsStore(store_path) as store:
+            if args.sql:
+                df = store.query(args.sql)
+            else:
+                df = store.run_named_query(args.name, args.limit)
+        
+        if df.empty:
+            print("📭 No results")
+        else:
+            print(df.to_string(index=False))
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Query failed: {e}")
+        return 1
+
+def cmd_shard(args):
+    """Sharded execution: enqueue, run workers, merge results, show status."""
+    try:
+        from src.core.sharding import WorkQueue, run_sharded, run_worker, merge_results
+        
+        queue_path = Path(args.queue) if args.queue else None
+        streaming = True if getattr(args, 'approximate', False) else None
+        
+        if args.action in ('run', 'enqueue'):
+            engine = UniversityEngine()
+            universities = (engine.get_available_universities() if args.all
+                            else [engine.resolve_university_name(name) for name in args.universities])
+            if not universities:
+                print("❌ Name universities or use --all")
+                return 1
+        
+        if args.action == 'run':
+            results = run_sharded(universities, args.limit, workers=args.workers, shards_per_university=args.split,
+                                  credentials=args.credentials, queue_path=queue_path, replay=args.replay,
+                                  concurrent=args.concurrent, streaming=streaming)
+            print(f"\n✅ Merged {len(results)} universities into {config.get_store_path()}")
+        elif args.action == 'enqueue':
+            with WorkQueue(queue_path) as queue:
+                added = queue.enqueue(universities, args.limit, args.split)
+                print(f"📋 Queued {added} tasks ({queue.db_path})")
+        elif args.action == 'worker':
+            completed = run_worker(args.id, queue_path, args.credentials[0] if args.credentials else None,
+                                   replay=args.replay, concurrent=args.concurrent, streaming=streaming)
+            print(f"✅ Worker finished: {completed} tasks")
+        elif args.action == 'merge':
+            results = merge_results(queue_path)
+            print(f"✅ Merged {len(results)} universities into {config.get_store_path()}")
+        else:
+            with WorkQueue(queue_path) as queue:
+                for status, count in sorted(queue.status().items()):
+                    print(f"   {status}: {count}")
+                for task in queue.tasks('failed'):
+                    print(f"❌ {task['university']} [{task['shard_index'] + 1}/{task['shard_count']}]: {task['error']}")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Sharded execution failed: {e}")
+        return 1
+
 def cmd_test_api(args):
     """Test EPO OPS API with a specific patent."""
     try:
@@ -146,9 +294,19 @@ Examples:
   python -m cli.main list               # List available universities  
   python -m cli.main analyze "TU Dresden" --limit 10
   python -m cli.main test-api EP19196837A
+  python -m cli.main query industry-partners --limit 20
+  python -m cli.main -q analyze "TU Dresden" --limit 50
+  python -m cli.main analyze "TU Dresden" --limit 50 --deadline 30
+  python -m cli.main shard run --all --workers 4 --credentials ../ipc-ops/.env --credentials ../ipc-ops/.env.b
         """
     )
     
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-v', '--verbose', action='store_true',
+                           help='Show per-patent debug output')
+    verbosity.add_argument('-q', '--quiet', action='store_true',
+                           help='Only show warnings, errors and command results')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Test command
@@ -157,15 +315,79 @@ Examples:
     
     # List universities command
     list_parser = subparsers.add_parser('list', help='List available universities')
+    list_parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='name',
+                             help='Sort order (default: name)')
+    list_parser.add_argument('--top', type=int, metavar='N', help='Only show the first N universities')
+    list_parser.add_argument('--details', action='store_true',
+                             help='Show counts, grants, spin-outs and the last analysis')
     list_parser.set_defaults(func=cmd_list_universities)
     
+    # Search universities command
+    search_parser = subparsers.add_parser('search', help='Find universities by (partial) name or abbreviation')
+    search_parser.add_argument('query', help='Name, abbreviation or alias, e.g. "TU Dresden", "KIT"')
+    search_parser.add_argument('--limit', type=int, default=10, help='Maximum suggestions (default: 10)')
+    search_parser.set_defaults(func=cmd_search_universities)
+    
     # Analyze university command
     analyze_parser = subparsers.add_parser('analyze', help='Analyze university portfolio')
-    analyze_parser.add_argument('university', help='University name')
+    analyze_parser.add_argument('university', help='University name or alias (e.g. "TU Dresden", "KIT")')
     analyze_parser.add_argument('--limit', type=int, default=config.analysis.default_patent_limit,
                                help=f'Patent limit (default: {config.analysis.default_patent_limit})')
+    analyze_parser.add_argument('--parquet', action='store_true',
+                               help=f'Export fact tables to partitioned Parquet ({config.export.parquet_dir})')
+    analyze_parser.add_argument('--replay', action='store_true',
+                               help='Use archived OPS payloads instead of the network')
+    analyze_parser.add_argument('--concurrent', action='store_true',
+                               help=f'Overlap OPS requests with the async client '
+                                    f'(up to {config.epo_ops.max_concurrency} in flight, '
+                                    f'{config.epo_ops.requests_per_second or 1 / config.epo_ops.rate_limit_seconds:g} requests/s '
+                                    f'set by epo_ops.requests_per_second)')
+    analyze_parser.add_argument('--approximate', action='store_true',
+                               help='Fixed-memory approximate aggregates (HyperLogLog, Count-Min, Space-Saving); '
+                                    'per-patent biblio data is still kept, so memory grows with the patent count')
+    analyze_parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                               help='Fetch the most relevant patents first and stop after SECONDS')
+    analyze_parser.add_argument('--max-fetches', type=int, metavar='N',
+                               help='Stop after N OPS lookups (quota deadline)')
+    analyze_parser.add_argument('--resume', action='store_true',
+                               help='Continue the patents deferred by an earlier --deadline/--max-fetches run '
+                                    '(same --limit; needs archive.enabled)')
+    analyze_parser.add_argument('--metrics-json', metavar='FILE',
+                               help='Write the run metrics report as JSON')
+    analyze_parser.add_argument('--metrics-prom', metavar='FILE',
+                               help='Write run metrics in Prometheus text format')
     analyze_parser.set_defaults(func=cmd_analyze_university)
     
+    # Query command
+    from src.etl.load.analytics_store import NAMED_QUERIES
+    query_parser = subparsers.add_parser('query', help='Query the cross-university analytics store')
+    query_parser.add_argument('name', nargs='?', default='industry-partners', choices=sorted(NAMED_QUERIES),
+                             help='Named query (default: industry-partners)')
+    query_parser.add_argument('--limit', type=int, default=20, help='Maximum rows (default: 20)')
+    query_parser.add_argument('--sql', help='Run a custom SQL query instead of a named one')
+    query_parser.set_defaults(func=cmd_query)
+    
+    # Sharded execution command
+    shard_parser = subparsers.add_parser('shard', help='Run analyses across worker processes/nodes')
+    shard_parser.add_argument('action', choices=['run', 'enqueue', 'worker', 'merge', 'status'],
+                             help='run = enqueue + local workers + merge; worker = drain a shared queue (other nodes)')
+    shard_parser.add_argument('universities', nargs='*', help='University names (run/enqueue)')
+    shard_parser.add_argument('--all', action='store_true', help='All universities in the dataset')
+    shard_parser.add_argument('--limit', type=int, default=config.analysis.default_patent_limit,
+                             help=f'Patent limit per university (default: {config.analysis.default_patent_limit})')
+    shard_parser.add_argument('--workers', type=int, default=2, help='Local worker processes (default: 2)')
+    shard_parser.add_argument('--split', type=int, default=1,
+                             help='EP-number partitions per university (default: 1)')
+    shard_parser.add_argument('--credentials', action='append', metavar='ENV_FILE',
+                             help='OPS account credentials; repeat once per account (default: sharding.credentials)')
+    shard_parser.add_argument('--queue', help=f'Work queue database (default: {config.sharding.queue_path})')
+    shard_parser.add_argument('--id', help='Worker name (default: host:pid)')
+    shard_parser.add_argument('--replay', action='store_true', help='Use archived OPS payloads')
+    shard_parser.add_argument('--concurrent', action='store_true',
+                             help='Async OPS client in each worker (budget: epo_ops.requests_per_second per worker)')
+    shard_parser.add_argument('--approximate', action='store_true', help='Mergeable fixed-memory aggregates (per-patent biblio data is still kept)')
+    shard_parser.set_defaults(func=cmd_shard)
+    
     # Test API command
     api_parser = subparsers.add_parser('test-api', help='Test EPO OPS API')
     api_parser.add_argument('patent', help='Patent number to test (e.g., EP19196837A)')
@@ -173,6 +395,8 @@ Examples:
     
     args = parser.parse_args()
     
+    setup_logging(level='DEBUG' if args.verbose else None, quiet=args.quiet)
+    
     if not args.command:
         parser.print_help()
         return 1
@@ -7,19 +7,38 @@ for creating interactive widgets, dropdowns, and visualizations.
 """
 
 import json
+import sys
 import pandas as pd
+from pathlib import Path
 from typing import Dict, List, Optional
 
-def load_university_data(json_path: str = "/home/jovyan/mtc-patent-analytics/deeptechfinder/output/university_analysis.json") -> Dict:
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+def load_university_data(json_path: Optional[str] = None) -> Dict:
     """
-    Load the analyzed university data from JSON file.
+    Load the university summary data.
     
     Args:
-        json_path: Path to the university analysis JSON file
+        json_path: Path to a university analysis JSON file (from analyze_universities.py).
+                   By default the maintained summary index (output/university_index.db)
+                   is used; it is refreshed when the dataset or the analytics store changes.
         
     Returns:
         Dictionary containing university data and sorting options
     """
+    if json_path is None:
+        try:
+            if str(PROJECT_ROOT) not in sys.path:
+                sys.path.insert(0, str(PROJECT_ROOT))
+            from src.etl.load.university_index import UniversitySummaryIndex
+            
+            with UniversitySummaryIndex() as index:
+                index.refresh()
+                return index.to_widget_data()
+        except Exception as e:
+            print(f"Error loading summary index: {e}")
+            return {}
+    
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
             return json.load(f)
@@ -132,10 +151,20 @@ def get_top_universities(n: int = 10, sort_by: str = "by_applications") -> List[
     else:
         return data.get('universities', [])[:n]
 
-def search_universities(search_term: str) -> List[str]:
-    """Search for universities containing the search term."""
-    all_names = get_university_names('alphabetical')
-    return [name for name in all_names if search_term.lower() in name.lower()]
+def search_universities(search_term: str, limit: int = 10) -> List[str]:
+    """Search for universities by name or abbreviation (ranked, best match first)."""
+    try:
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+        from src.etl.load.university_index import UniversitySummaryIndex
+        
+        with UniversitySummaryIndex() as index:
+            index.refresh_dataset()
+            return [match['name'] for match in index.search(search_term, limit)]
+    except Exception as e:
+        print(f"Error searching summary index: {e}")
+        all_names = get_university_names('alphabetical')
+        return [name for name in all_names if search_term.lower() in name.lower()]
 
 if __name__ == "__main__":
     # Demo the functions
@@ -4,8 +4,8 @@ Configuration management for DeepTechFinder Patent Analytics.
 
 import os
 import yaml
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 @dataclass
@@ -19,6 +19,9 @@ class DataConfig:
     input_file: str
     encoding: str
     output_dir: str
+    summary_index: str = "output/university_index.db"
+    university_aliases: Dict[str, str] = field(default_factory=dict)  # Alias -> dataset name
+    city_aliases: Dict[str, str] = field(default_factory=dict)  # Local city name -> dataset spelling
 
 @dataclass
 class EPOOPSConfig:
@@ -27,12 +30,36 @@ class EPOOPSConfig:
     rate_limit_seconds: int
     timeout_seconds: int
     credentials_file: str
+    max_concurrency: int = 8
+    requests_per_second: float = 3  # 0 = one request per rate_limit_seconds
+    http2: bool = True
+    max_retries: int = 3
+    memo_size: int = 10000
+    resolution_cache: str = "output/ops_number_resolution.json"
+    negative_ttl_hours: float = 168
+
+@dataclass
+class SchedulerConfig:
+    priority: List[str]
+    resume_dir: str
+
+@dataclass
+class ShardingConfig:
+    queue_path: str
+    results_dir: str
+    credentials: List[str]  # One .env per OPS account; empty = epo_ops.credentials_file
+    lease_seconds: float = 3600
+    max_attempts: int = 3
 
 @dataclass
 class AnalysisConfig:
     default_patent_limit: int
     max_patent_limit: int
     min_patent_limit: int
+    streaming_statistics: bool = False
+    sketch_precision: int = 14
+    top_k_capacity: int = 10000
+    count_min_width: int = 65536
 
 @dataclass
 class ExportConfig:
@@ -40,12 +67,29 @@ class ExportConfig:
     pdf_reports: bool
     json_export: bool
     filename_sanitization: bool
+    parquet_export: bool = False
+    parquet_dir: str = "output/parquet"
+    row_group_size: int = 10000
+
+@dataclass
+class StoreConfig:
+    enabled: bool
+    path: str
+
+@dataclass
+class ArchiveConfig:
+    enabled: bool
+    path: str
+    compression_level: int
 
 @dataclass
 class LoggingConfig:
     level: str
     format: str
     file: str
+    console_format: str = "%(message)s"
+    progress_interval_seconds: float = 5.0
+    file_format: str = "text"
 
 class Config:
     """Main configuration class that loads and manages all settings."""
@@ -61,14 +105,21 @@ class Config:
     def _load_config(self, config_path: Path):
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
+            with open(config_path, 'r', encoding='utf-8') as f:
                 config_data = yaml.safe_load(f)
             
             self.app = AppConfig(**config_data['app'])
             self.data = DataConfig(**config_data['data'])
             self.epo_ops = EPOOPSConfig(**config_data['epo_ops'])
+            # Endpoint overrides, e.g. for the offline OPS stand-in server (tests/ops_standin.py)
+            self.epo_ops.base_url = os.getenv('OPS_BASE_URL', self.epo_ops.base_url)
+            self.epo_ops.auth_url = os.getenv('OPS_AUTH_URL', self.epo_ops.auth_url)
             self.analysis = AnalysisConfig(**config_data['analysis'])
+            self.scheduler = SchedulerConfig(**config_data['scheduler'])
+            self.sharding = ShardingConfig(**config_data['sharding'])
             self.export = ExportConfig(**config_data['export'])
+            self.store = StoreConfig(**config_data['store'])
+            self.archive = ArchiveConfig(**config_data['archive'])
             self.logging = LoggingConfig(**config_data['logging'])
             
         except Exception as e:
@@ -86,6 +137,40 @@ class Config:
         """Get full path to the output directory."""
         return self.get_project_root() / self.data.output_dir
     
+    def get_summary_index_path(self) -> Path:
+        """Get the per-university summary index path."""
+        return self.get_project_root() / self.data.summary_index
+    
+    def get_parquet_dir_path(self) -> Path:
+        """Get full path to the partitioned Parquet dataset root."""
+        return self.get_project_root() / self.export.parquet_dir
+    
+    def get_store_path(self) -> Path:
+        """Get full path to the embedded analytics database."""
+        return self.get_project_root() / self.store.path
+    
+    def get_archive_path(self) -> Path:
+        """Get full path to the raw OPS payload archive."""
+        return self.get_project_root() / self.archive.path
+    
+    def get_resolution_cache_path(self) -> Optional[Path]:
+        """Get full path to the learned number-format table (None disables persistence)."""
+        if not self.epo_ops.resolution_cache:
+            return None
+        return self.get_project_root() / self.epo_ops.resolution_cache
+    
+    def get_resume_dir_path(self) -> Path:
+        """Get full path to the directory of deferred-fetch resume files."""
+        return self.get_project_root() / self.scheduler.resume_dir
+    
+    def get_shard_queue_path(self) -> Path:
+        """Get full path to the sharded-execution work queue."""
+        return self.get_project_root() / self.sharding.queue_path
+    
+    def get_shard_results_path(self) -> Path:
+        """Get full path to the directory of per-task shard results."""
+        return self.get_project_root() / self.sharding.results_dir
+    
     def get_credentials_path(self) -> Path:
         """Get full path to EPO OPS credentials file."""
         return self.get_project_root() / self.epo_ops.credentials_file
@@ -28,7 +28,10 @@ class RateLimitError(EPOOPSError):
 
 class UniversityNotFoundError(DataExtractionError):
     """Raised when specified university is not found in dataset."""
-    pass
+    
+    def __init__(self, message: str, suggestions: list = None):
+        super().__init__(message)
+        self.suggestions = suggestions or []
 
 class ExportError(PatentAnalyticsError):
     """Raised when data export fails."""
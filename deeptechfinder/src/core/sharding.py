@@ -0,0 +1,368 @@
+"""
+Sharded execution of university analyses across worker processes or nodes.
+
+Work is coordinated through a SQLite queue (a shared file for multiple
+nodes). Each worker claims tasks with a lease, runs them with its own OPS
+credentials and rate budget, and writes the AnalysisResult as JSON. The
+coordinator merges finished results into the analytics store in a fixed
+order (university name, then EP number), so the store contents do not
+depend on which worker finished first.
+"""
+
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from dotenv import dotenv_values
+
+from .config import config
+from .exceptions import ConfigurationError, UniversityNotFoundError
+from .university_engine import UniversityEngine
+from ..etl.load.analytics_store import AnalyticsStore
+from ..etl.load.data_models import AnalysisResult
+from ..etl.load.university_index import UniversitySummaryIndex
+from ..utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    university TEXT NOT NULL,
+    patent_limit INTEGER NOT NULL,
+    shard_index INTEGER NOT NULL,
+    shard_count INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_expires REAL,
+    result_path TEXT,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (university, shard_index, shard_count)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, task_id);
+"""
+
+@dataclass
+class ShardTask:
+    """One unit of work: a university, or one EP-number partition of it."""
+    task_id: int
+    university: str
+    patent_limit: int
+    shard_index: int
+    shard_count: int
+    attempts: int
+
+    @property
+    def shard(self) -> Optional[tuple]:
+        return (self.shard_index, self.shard_count) if self.shard_count > 1 else None
+
+class WorkQueue:
+    """
+    SQLite-backed task queue shared by the coordinator and all workers.
+
+    Claims run in an IMMEDIATE transaction, so two workers never get the same
+    task. A claimed task carries a lease; tasks whose worker died are handed
+    out again once the lease expires. Failed tasks are retried up to
+    sharding.max_attempts times.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else config.get_shard_queue_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def enqueue(self, universities: Sequence[str], patent_limit: int, shards_per_university: int = 1) -> int:
+        """
+        Queue a fresh run of each university.
+
+        Earlier tasks of these universities (done, failed or still running)
+        are replaced, so a new run with another patent limit or split never
+        merges stale results; a worker still running a replaced task loses
+        its lease and its result is discarded.
+
+        Args:
+            universities: University names
+            patent_limit: Patent limit per university
+            shards_per_university: EP-number partitions per university
+
+        Returns:
+            Number of queued tasks
+        """
+        universities = list(dict.fromkeys(universities))
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany("DELETE FROM tasks WHERE university = ?", [(u,) for u in universities])
+            self._conn.executemany(
+                "INSERT INTO tasks (university, patent_limit, shard_index, shard_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(university, patent_limit, index, shards_per_university, time.time())
+                 for university in universities for index in range(shards_per_university)]
+            )
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
+        return len(universities) * shards_per_university
+
+    def claim(self, worker_id: str, lease_seconds: Optional[float] = None) -> Optional[ShardTask]:
+        """Claim the next pending (or lease-expired) task, or None if the queue is drained."""
+        lease = lease_seconds or config.sharding.lease_seconds
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                """SELECT task_id, university, patent_limit, shard_index, shard_count, attempts FROM tasks
+                   WHERE status = 'pending' OR (status = 'running' AND lease_expires < ?)
+                   ORDER BY task_id LIMIT 1""", (now,)
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._conn.execute(
+                "UPDATE tasks SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "lease_expires = ?, updated_at = ? WHERE task_id = ?",
+                (worker_id, now + lease, now, row[0])
+            )
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
+        return ShardTask(*row[:5], attempts=row[5] + 1)
+
+    def complete(self, task_id: int, result_path: Optional[str], worker_id: str) -> bool:
+        """
+        Mark a task done, if worker_id still holds its lease.
+
+        Returns:
+            False if the task was reclaimed by another worker or re-queued
+            meanwhile (the result must then be discarded)
+        """
+        cursor = self._conn.execute(
+            "UPDATE tasks SET status = 'done', result_path = ?, error = NULL, updated_at = ? "
+            "WHERE task_id = ? AND worker = ? AND status = 'running'",
+            (result_path, time.time(), task_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: int, error: str, worker_id: str) -> bool:
+        """Record a failure; the task is retried until sharding.max_attempts is reached. Same lease check as complete()."""
+        cursor = self._conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+            "error = ?, updated_at = ? WHERE task_id = ? AND worker = ? AND status = 'running'",
+            (config.sharding.max_attempts, error, time.time(), task_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def status(self) -> Dict[str, int]:
+        """Task counts by status."""
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+    def tasks(self, status: Optional[str] = None) -> List[Dict]:
+        """Tasks (optionally filtered by status), ordered by university and shard."""
+        sql = "SELECT * FROM tasks" + (" WHERE status = ?" if status else "") + \
+              " ORDER BY university, shard_count, shard_index"
+        cursor = self._conn.execute(sql, (status,) if status else ())
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def apply_credentials(credentials_file: Optional[str]):
+    """Switch this process to the OPS account in credentials_file (relative to the project root)."""
+    if not credentials_file:
+        return
+    path = Path(credentials_file)
+    if not path.is_absolute():
+        path = config.get_project_root() / path
+    values = dotenv_values(path)
+    if not values.get('OPS_KEY') or not values.get('OPS_SECRET'):
+        raise ConfigurationError(f"OPS_KEY/OPS_SECRET not found in {path}")
+    os.environ['OPS_KEY'] = values['OPS_KEY']
+    os.environ['OPS_SECRET'] = values['OPS_SECRET']
+    config.epo_ops.credentials_file = str(path)
+
+def _lease_lost(worker_id: str, task: ShardTask, label: str):
+    logger.warning("⚠️  %s: lease on %s lost (reclaimed or re-queued); result discarded", worker_id, label,
+                   extra={'worker': worker_id, 'task_id': task.task_id, 'university': task.university})
+
+def run_worker(worker_id: Optional[str] = None,
+               queue_path: Optional[Path] = None,
+               credentials_file: Optional[str] = None,
+               replay: bool = False,
+               concurrent: bool = False,
+               streaming: Optional[bool] = None) -> int:
+    """
+    Process queue tasks until the queue is drained.
+
+    Args:
+        worker_id: Name recorded on claimed tasks (default: host:pid)
+        queue_path: Work queue database (default: sharding.queue_path)
+        credentials_file: .env file with this worker's OPS_KEY/OPS_SECRET
+        replay, concurrent, streaming: Passed to UniversityEngine.analyze_university
+
+    Returns:
+        Number of tasks completed
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    apply_credentials(credentials_file)
+    config.store.enabled = False  # The coordinator loads merged results
+
+    results_dir = config.get_shard_results_path()
+    results_dir.mkdir(parents=True, exist_ok=True)
+    engine = UniversityEngine()
+    completed = 0
+
+    with WorkQueue(queue_path) as queue:
+        while (task := queue.claim(worker_id)) is not None:
+            label = task.university + (f" [shard {task.shard_index + 1}/{task.shard_count}]" if task.shard else "")
+            logger.info("🔧 %s: %s", worker_id, label, extra={'worker': worker_id, 'task_id': task.task_id,
+                                                           'university': task.university})
+            try:
+                result = engine.analyze_university(task.university, task.patent_limit, replay=replay,
+                                                   concurrent=concurrent, streaming=streaming, shard=task.shard)
+            except UniversityNotFoundError as e:
+                if task.shard is not None and task.university in engine.get_available_universities():
+                    if queue.complete(task.task_id, None, worker_id):  # Empty EP-number partition
+                        completed += 1
+                    else:
+                        _lease_lost(worker_id, task, label)
+                else:
+                    logger.error("❌ %s: %s", worker_id, e, extra={'worker': worker_id, 'task_id': task.task_id,
+                                                                'error': str(e)})
+                    if not queue.fail(task.task_id, str(e), worker_id):
+                        _lease_lost(worker_id, task, label)
+                continue
+            except Exception as e:
+                logger.error("❌ %s: %s failed: %s", worker_id, label, e,
+                         extra={'worker': worker_id, 'task_id': task.task_id, 'error': f"{type(e).__name__}: {e}"})
+                if not queue.fail(task.task_id, f"{type(e).__name__}: {e}", worker_id):
+                    _lease_lost(worker_id, task, label)
+                continue
+
+            result_path = results_dir / f"{task.task_id:06d}.json"
+            result_path.write_text(result.model_dump_json(), encoding='utf-8')
+            if queue.complete(task.task_id, str(result_path), worker_id):
+                completed += 1
+            else:
+                result_path.unlink(missing_ok=True)
+                _lease_lost(worker_id, task, label)
+
+    logger.info("✅ %s: %d tasks completed", worker_id, completed, extra={'worker': worker_id, 'completed': completed})
+    return completed
+
+def merge_results(queue_path: Optional[Path] = None, store_path: Optional[Path] = None) -> List[AnalysisResult]:
+    """
+    Merge finished task results into the analytics store.
+
+    Shards of one university are combined into a single AnalysisResult
+    (UniversityEngine.merge_shard_results); universities are loaded in name
+    order, so repeated merges produce identical store contents.
+
+    Returns:
+        Merged results, one per university
+    """
+    with WorkQueue(queue_path) as queue:
+        pending = {status: count for status, count in queue.status().items() if status != 'done'}
+        if pending:
+            logger.warning("⚠️  Merging with unfinished tasks: %s", pending, extra={'pending': pending})
+        done = queue.tasks('done')
+
+    by_university: Dict[str, List[AnalysisResult]] = {}
+    for task in done:
+        if task['result_path']:
+            result = AnalysisResult.model_validate_json(Path(task['result_path']).read_text(encoding='utf-8'))
+            by_university.setdefault(task['university'], []).append(result)
+
+    engine = UniversityEngine()
+    merged = []
+    with AnalyticsStore(store_path) as store:
+        for university in sorted(by_university):
+            results = by_university[university]
+            result = results[0] if len(results) == 1 else engine.merge_shard_results(results)
+            store.load_result(result)
+            merged.append(result)
+            logger.info("💾 Merged %s: %d patents from %d shard(s)", university, len(result.portfolio.patents), len(results),
+                        extra={'university': university, 'patents': len(result.portfolio.patents),
+                               'shards': len(results)})
+
+    with UniversitySummaryIndex(store_path=store.db_path) as index:
+        index.refresh_analyses()
+
+    return merged
+
+def _worker_process(worker_id: str, queue_path: Path, credentials_file: Optional[str],
+                    replay: bool, concurrent: bool, streaming: Optional[bool]):
+    run_worker(worker_id, queue_path, credentials_file, replay, concurrent, streaming)
+
+def run_sharded(universities: Sequence[str],
+                patent_limit: int,
+                workers: int = 2,
+                shards_per_university: int = 1,
+                credentials: Optional[Sequence[str]] = None,
+                queue_path: Optional[Path] = None,
+                replay: bool = False,
+                concurrent: bool = False,
+                streaming: Optional[bool] = None) -> List[AnalysisResult]:
+    """
+    Enqueue universities, run local worker processes and merge their results.
+
+    Args:
+        universities: University names
+        patent_limit: Patent limit per university
+        workers: Local worker processes
+        shards_per_university: EP-number partitions per university
+        credentials: One .env file per OPS account; worker i uses credentials[i % len]
+        queue_path: Work queue database (default: sharding.queue_path)
+        replay, concurrent, streaming: Passed to UniversityEngine.analyze_university
+
+    Returns:
+        Merged results, one per university
+    """
+    credentials = list(credentials if credentials is not None else config.sharding.credentials)
+    queue_path = Path(queue_path) if queue_path else config.get_shard_queue_path()
+
+    if not replay:
+        accounts = len(set(credentials)) or 1
+        if workers > accounts:
+            logger.warning("⚠️  %d workers share %d OPS account(s); "
+                           "each worker rate-limits itself, so the account quota may be exceeded",
+                           workers, accounts, extra={'workers': workers, 'accounts': accounts})
+
+    with WorkQueue(queue_path) as queue:
+        added = queue.enqueue(universities, patent_limit, shards_per_university)
+    logger.info("📋 Queued %d tasks for %d universities (%d workers)", added, len(universities), workers,
+                extra={'queued': added, 'universities': len(universities), 'workers': workers})
+
+    processes = []
+    for i in range(workers):
+        process = multiprocessing.Process(
+            target=_worker_process,
+            args=(f"worker-{i + 1}", queue_path, credentials[i % len(credentials)] if credentials else None,
+                  replay, concurrent, streaming),
+            name=f"shard-worker-{i + 1}"
+        )
+        process.start()
+        processes.append(process)
+
+    for process in processes:
+        process.join()
+        if process.exitcode != 0:
+            logger.error("❌ %s exited with code %s", process.name, process.exitcode,
+                         extra={'worker': process.name, 'exitcode': process.exitcode})
+
+    return merge_results(queue_path)
@@ -3,20 +3,33 @@ Main University Engine - ETL orchestrator for patent analysis.
 """
 
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
 from .config import config
 from .exceptions import *
+from ..utils.metrics import MetricsRecorder
+from ..utils.single_flight import ResponseMemo
+from ..utils.logging_setup import get_logger, ensure_logging, ProgressReporter
 from ..etl.extract.deeptechfinder_reader import DeepTechFinderReader
 from ..etl.extract.epo_ops_client import EPOOPSClient
+from ..etl.extract.async_ops_client import fetch_biblio_concurrently
+from ..etl.extract.number_resolution import NumberFormatResolver
+from ..etl.extract.fetch_scheduler import FetchScheduler, FetchDeadline, ResumeState
+from ..analysis.sketches import StreamingPortfolioStats
 from ..etl.transform.priority_normalizer import PriorityNormalizer
 from ..etl.transform.applicant_normalizer import ApplicantNormalizer
 from ..etl.transform.inventor_normalizer import InventorNormalizer
+from ..etl.transform.classification_normalizer import ClassificationNormalizer
+from ..etl.load.analytics_store import AnalyticsStore
+from ..etl.load.raw_payload_archive import RawPayloadArchive
+from ..etl.load.university_index import UniversitySummaryIndex
 from ..etl.load.data_models import (
-    UniversityPortfolio, EnrichedPatent, BiblioData, AnalysisResult
+    UniversityPortfolio, EnrichedPatent, BiblioData, AnalysisResult, EPOOPSResponse
 )
 
+logger = get_logger(__name__)
+
 class UniversityEngine:
     """
     Main ETL engine for university patent analysis.
@@ -24,105 +37,234 @@ class UniversityEngine:
     """
     
     def __init__(self):
+        ensure_logging()
+        
         # Initialize ETL components
         self.dtf_reader = DeepTechFinderReader()
-        self.ops_client = EPOOPSClient()
+        self._ops_client = None  # Created on first use so replay runs need no credentials
+        self.metrics = MetricsRecorder()
+        self.response_memo = ResponseMemo(config.epo_ops.memo_size)  # Shared across analyses of this engine
+        self.number_resolver = NumberFormatResolver()  # Learned formats + negative cache, persisted between runs
         self.priority_normalizer = PriorityNormalizer()
         self.applicant_normalizer = ApplicantNormalizer()
         self.inventor_normalizer = InventorNormalizer()
+        self.classification_normalizer = ClassificationNormalizer()
         
-        print(f"🏭 University Engine initialized")
-        print(f"📊 Config: {config.app.name} v{config.app.version}")
+        logger.debug("🏭 University Engine initialized")
+        logger.debug("📊 Config: %s v%s", config.app.name, config.app.version)
+    
+    @property
+    def ops_client(self) -> EPOOPSClient:
+        """EPO OPS client (loads credentials on first access)."""
+        if self._ops_client is None:
+            self._ops_client = EPOOPSClient(metrics=self.metrics, memo=self.response_memo,
+                                            resolver=self.number_resolver)
+        return self._ops_client
     
     def analyze_university(self, 
                           university_name: str, 
-                          patent_limit: Optional[int] = None) -> AnalysisResult:
+                          patent_limit: Optional[int] = None,
+                          replay: bool = False,
+                          concurrent: bool = False,
+                          deadline_seconds: Optional[float] = None,
+                          max_fetches: Optional[int] = None,
+                          resume: bool = False,
+                          streaming: Optional[bool] = None,
+                          shard: Optional[Tuple[int, int]] = None) -> AnalysisResult:
         """
         Complete ETL pipeline for university patent analysis.
         
         Args:
-            university_name: Name of the university to analyze
+            university_name: Name of the university to analyze (aliases like "TU Dresden" are resolved)
             patent_limit: Maximum number of patents to process (None for default)
+            replay: Read OPS payloads from the raw payload archive instead of the network
+            concurrent: Fetch OPS payloads with the async client (overlapping requests)
+            deadline_seconds: Stop fetching after this many seconds and defer the rest
+            max_fetches: Stop fetching after this many OPS lookups and defer the rest
+            resume: Continue the deferred remainder of an earlier deadline-bounded run
+            streaming: Aggregate with fixed-memory sketches (None = analysis.streaming_statistics)
+            shard: (index, count) to analyze only one EP-number partition of the selected patents
             
         Returns:
             AnalysisResult with complete analysis
         """
         if patent_limit is None:
             patent_limit = config.analysis.default_patent_limit
+        if streaming is None:
+            streaming = config.analysis.streaming_statistics
+        
+        self.metrics.reset()
+        university_name = self.resolve_university_name(university_name)
         
-        print(f"\n🚀 STARTING UNIVERSITY ANALYSIS")
-        print("=" * 60)
-        print(f"🏛️  University: {university_name}")
-        print(f"📄 Patent limit: {patent_limit}")
-        print(f"🕐 Started: {datetime.now().strftime('%H:%M:%S')}")
+        logger.info("🚀 STARTING UNIVERSITY ANALYSIS")
+        logger.info("=" * 60)
+        logger.info("🏛️  University: %s", university_name, extra={'university': university_name})
+        logger.info("📄 Patent limit: %s", patent_limit, extra={'university': university_name, 'patent_limit': patent_limit})
+        if replay:
+            logger.info("📼 Replaying from archive: %s", config.get_archive_path(),
+                        extra={'university': university_name, 'path': str(config.get_archive_path())})
+        logger.info("🕐 Started: %s", datetime.now().strftime('%H:%M:%S'))
         
         # EXTRACT Phase
-        print(f"\n📥 EXTRACT PHASE")
-        print("-" * 20)
-        portfolio = self._extract_data(university_name, patent_limit)
+        logger.info("📥 EXTRACT PHASE")
+        logger.info("-" * 20)
+        with self.metrics.phase('extract'):
+            portfolio = self._extract_data(university_name, patent_limit, replay, concurrent,
+                                           deadline_seconds, max_fetches, resume, shard)
         
         # TRANSFORM Phase
-        print(f"\n🔄 TRANSFORM PHASE") 
-        print("-" * 20)
-        self._transform_data(portfolio)
+        logger.info("🔄 TRANSFORM PHASE") 
+        logger.info("-" * 20)
+        with self.metrics.phase('transform'):
+            self._transform_data(portfolio, streaming)
         
         # ANALYZE Phase
-        print(f"\n📊 ANALYZE PHASE")
-        print("-" * 20)
-        analysis_result = self._analyze_data(portfolio)
+        logger.info("📊 ANALYZE PHASE")
+        logger.info("-" * 20)
+        with self.metrics.phase('analyze'):
+            analysis_result = self._analyze_data(portfolio)
         
-        print(f"\n🎯 ANALYSIS COMPLETED")
-        print("=" * 30)
-        print(f"✅ Patents processed: {portfolio.patents_retrieved}/{portfolio.patents_requested}")
-        print(f"📈 Success rate: {portfolio.success_rate:.1f}%")
-        print(f"🕐 Completed: {datetime.now().strftime('%H:%M:%S')}")
+        # LOAD Phase
+        if config.store.enabled:
+            logger.info("💾 LOAD PHASE")
+            logger.info("-" * 20)
+            with self.metrics.phase('load'):
+                self._load_data(analysis_result)
+        
+        analysis_result.metrics = self.metrics.to_dict()
+        
+        logger.info("🎯 ANALYSIS COMPLETED")
+        logger.info("=" * 30)
+        summary = {'university': university_name, 'patents_retrieved': portfolio.patents_retrieved,
+                   'patents_requested': portfolio.patents_requested, 'success_rate': round(portfolio.success_rate, 1),
+                   'total_seconds': analysis_result.metrics['total_seconds']}
+        logger.info("✅ Patents processed: %d/%d", portfolio.patents_retrieved, portfolio.patents_requested, extra=summary)
+        logger.info("📈 Success rate: %.1f%%", portfolio.success_rate)
+        logger.info("🕐 Completed: %s (%.1fs)", datetime.now().strftime('%H:%M:%S'), analysis_result.metrics['total_seconds'])
         
         return analysis_result
     
-    def _extract_data(self, university_name: str, patent_limit: int) -> UniversityPortfolio:
+    def _extract_data(self, university_name: str, patent_limit: int, replay: bool = False,
+                      concurrent: bool = False, deadline_seconds: Optional[float] = None,
+                      max_fetches: Optional[int] = None, resume: bool = False,
+                      shard: Optional[Tuple[int, int]] = None) -> UniversityPortfolio:
         """
         EXTRACT phase: Get raw data from DeepTechFinder CSV and EPO OPS.
+        In replay mode OPS payloads come from the raw payload archive;
+        in concurrent mode they are prefetched with the async client.
+        
+        Patents are selected and fetched in scheduler priority order. When a
+        deadline is reached the unfetched remainder is deferred and saved for
+        resume=True, which serves the already fetched patents from the archive
+        (so resuming needs archive.enabled and the patent limit of the saved run).
         """
+        archive = RawPayloadArchive() if (replay or config.archive.enabled) else None
+        scheduler = FetchScheduler(is_cached=archive.__contains__ if archive is not None and not replay else None)
+        resume_state = ResumeState(university_name if shard is None else f"{university_name} {shard[0]} of {shard[1]}")
+        
+        if resume and not replay and resume_state.path.exists():
+            if archive is None:
+                raise ConfigurationError(f"--resume needs the raw payload archive (archive.enabled), "
+                                         f"which holds the patents already fetched for {university_name}")
+            saved_limit = resume_state.patent_limit()
+            if saved_limit is not None and saved_limit != patent_limit:
+                raise ConfigurationError(f"The deferred patents of {university_name} were saved by a run with "
+                                         f"patent limit {saved_limit}; resume with --limit {saved_limit}")
+        
         # Extract CSV data
-        print(f"📄 Extracting DeepTechFinder data...")
-        patent_applications = self.dtf_reader.get_university_patents(university_name, patent_limit)
+        logger.info("📄 Extracting DeepTechFinder data...")
+        patent_applications = self.dtf_reader.get_university_patents(university_name, patent_limit, scheduler)
+        if shard is not None:
+            patent_applications = [p for p in patent_applications
+                                   if self._shard_of(self.dtf_reader.extract_ep_number(p.espacenet_link), shard[1]) == shard[0]]
         
         if not patent_applications:
             raise UniversityNotFoundError(f"No patents found for {university_name}")
         
-        # Initialize portfolio
-        portfolio = UniversityPortfolio(
-            university_name=university_name,
-            total_students=patent_applications[0].total_students,
-            patents_requested=len(patent_applications),
-            patents_retrieved=0
-        )
-        
-        print(f"📄 Found {len(patent_applications)} patent applications")
+        logger.info("📄 Found %d patent applications", len(patent_applications),
+                    extra={'university': university_name, 'patents': len(patent_applications)})
         
-        # Test EPO OPS connection
-        print(f"🔐 Testing EPO OPS connection...")
-        if not self.ops_client.test_connection():
-            print(f"⚠️  EPO OPS connection test failed, proceeding anyway...")
+        ep_numbers = [self.dtf_reader.extract_ep_number(p.espacenet_link) for p in patent_applications]
+        to_fetch = [n for n in ep_numbers if n]
+        responses: Dict[str, EPOOPSResponse] = {}
+        fetched = set()
+        progress = ProgressReporter(len(patent_applications), "EPO OPS biblio", logger)
+        on_fetched = lambda ep_number, response: progress.update(success=(response.status_code == 200))
         
-        # Authenticate with EPO OPS
-        if not self.ops_client.get_access_token():
-            raise AuthenticationError("Failed to authenticate with EPO OPS")
+        if resume and not replay:
+            pending = resume_state.load()
+            if pending is None:
+                logger.warning("⚠️  Nothing to resume for %s, running a full extraction", university_name,
+                               extra={'university': university_name})
+            else:
+                pending = set(pending)
+                for ep_number in to_fetch:
+                    cached = archive.get(ep_number) if ep_number not in pending else None
+                    if cached is not None:
+                        self.metrics.cache_hit('archive')
+                        responses[ep_number] = cached
+                        on_fetched(ep_number, cached)
+                to_fetch = [n for n in to_fetch if n not in responses]
+                logger.info("⏯️  Resuming: %d patents from archive, %d to fetch", len(responses), len(to_fetch),
+                            extra={'university': university_name, 'archived': len(responses), 'to_fetch': len(to_fetch)})
         
-        # Extract EPO OPS data for each patent
-        print(f"🌐 Extracting EPO OPS bibliographic data...")
+        deadline = FetchDeadline(deadline_seconds, max_fetches) if (deadline_seconds or max_fetches) else None
         
-        for i, patent_app in enumerate(patent_applications, 1):
-            ep_number = self.dtf_reader.extract_ep_number(patent_app.espacenet_link)
+        if replay:
+            logger.info("📼 Reading EPO OPS bibliographic data from archive (%d payloads)...", len(archive))
+            schedule = scheduler.run(to_fetch, lambda ep_number: self._replay_response(archive, ep_number),
+                                     deadline, on_fetched)
+        elif concurrent:
+            logger.info("🌐 Fetching EPO OPS bibliographic data concurrently (%d requests in flight)...",
+                        config.epo_ops.max_concurrency, extra={'max_concurrency': config.epo_ops.max_concurrency})
+            schedule = scheduler.run_concurrent(
+                to_fetch,
+                lambda numbers, timeout: fetch_biblio_concurrently(numbers, self.metrics, self.response_memo,
+                                                                   self.number_resolver, timeout),
+                deadline
+            )
+            for ep_number, ops_response in schedule.responses.items():
+                on_fetched(ep_number, ops_response)
+            fetched = set(schedule.responses)
+        else:
+            # Test EPO OPS connection
+            logger.info("🔐 Testing EPO OPS connection...")
+            if not self.ops_client.test_connection():
+                logger.warning("⚠️  EPO OPS connection test failed, proceeding anyway...")
+            
+            # Authenticate with EPO OPS
+            if not self.ops_client.get_access_token():
+                raise AuthenticationError("Failed to authenticate with EPO OPS")
             
+            # Extract EPO OPS data for each patent, with rate limiting
+            logger.info("🌐 Extracting EPO OPS bibliographic data...")
+            schedule = scheduler.run(to_fetch, self.ops_client.fetch_with_rate_limit, deadline, on_fetched)
+            fetched = set(schedule.responses)
+        
+        responses.update(schedule.responses)
+        deferred = set(schedule.remaining)
+        
+        # Initialize portfolio (deferred patents are not part of this run's results)
+        portfolio = UniversityPortfolio(
+            university_name=university_name,
+            total_students=patent_applications[0].total_students,
+            patents_requested=len(patent_applications) - len(deferred),
+            patents_retrieved=0,
+            deferred_patents=schedule.remaining
+        )
+        
+        for i, (patent_app, ep_number) in enumerate(zip(patent_applications, ep_numbers), 1):
             if not ep_number:
-                print(f"⚠️  {i}/{len(patent_applications)}: Invalid EP number from {patent_app.espacenet_link}")
+                logger.warning("⚠️  %d/%d: Invalid EP number from %s", i, len(patent_applications), patent_app.espacenet_link,
+                               extra={'university': university_name, 'link': patent_app.espacenet_link})
+                progress.update(success=False)
+                continue
+            if ep_number in deferred:
                 continue
             
-            print(f"🔍 {i}/{len(patent_applications)}: Processing {ep_number}")
-            
-            # Get EPO OPS data with rate limiting
-            ops_response = self.ops_client.fetch_with_rate_limit(ep_number)
+            ops_response = responses[ep_number]
+            if archive is not None and ep_number in fetched:
+                archive.put(ops_response)
             
             # Create enriched patent record
             enriched_patent = EnrichedPatent(
@@ -136,36 +278,81 @@ class UniversityEngine:
             )
             
             if ops_response.status_code == 200:
-                print(f"✅ Retrieved data for {ep_number}")
+                logger.debug("✅ Retrieved data for %s", ep_number, extra={'ep_number': ep_number})
                 portfolio.patents_retrieved += 1
                 # Store raw OPS data for transformation phase
                 enriched_patent._ops_response = ops_response
             else:
-                print(f"❌ Failed to retrieve {ep_number}: {ops_response.error_message}")
+                logger.debug("❌ Failed to retrieve %s: %s", ep_number, ops_response.error_message,
+                             extra={'ep_number': ep_number, 'status_code': ops_response.status_code,
+                                    'error': ops_response.error_message})
                 enriched_patent.errors.append(ops_response.error_message or "Unknown error")
             
             portfolio.patents.append(enriched_patent)
         
+        progress.close()
+        
+        if archive is not None:
+            archive.close()
+        if not replay:
+            self.number_resolver.save()
+            if deferred:
+                resume_state.save(schedule.remaining, patent_limit)
+            else:
+                resume_state.clear()
+        
         portfolio.calculate_success_rate()
-        print(f"📊 Extraction complete: {portfolio.patents_retrieved}/{portfolio.patents_requested} patents ({portfolio.success_rate:.1f}% success)")
+        logger.info("📊 Extraction complete: %d/%d patents (%.1f%% success)",
+                    portfolio.patents_retrieved, portfolio.patents_requested, portfolio.success_rate,
+                    extra={'university': university_name, 'patents_retrieved': portfolio.patents_retrieved,
+                           'patents_requested': portfolio.patents_requested,
+                           'success_rate': round(portfolio.success_rate, 1)})
+        if deferred:
+            logger.info("⏱️  %d patents deferred by the fetch deadline", len(deferred),
+                        extra={'university': university_name, 'deferred': len(deferred)})
         
         return portfolio
     
-    def _transform_data(self, portfolio: UniversityPortfolio):
+    @staticmethod
+    def _shard_of(ep_number: Optional[str], shard_count: int) -> int:
+        """EP-number partition (stable across processes and nodes)."""
+        digits = ''.join(c for c in (ep_number or '') if c.isdigit())
+        return int(digits) % shard_count if digits else 0
+    
+    def _replay_response(self, archive: RawPayloadArchive, ep_number: str) -> EPOOPSResponse:
+        """Archived OPS payload for replay runs (404 response if not archived)."""
+        ops_response = archive.get(ep_number)
+        if ops_response is not None:
+            self.metrics.cache_hit('archive')
+            return ops_response
+        self.metrics.cache_miss('archive')
+        return EPOOPSResponse(
+            ep_number=ep_number,
+            status_code=404,
+            error_message="Not in raw payload archive"
+        )
+    
+    def _transform_data(self, portfolio: UniversityPortfolio, streaming: bool = False):
         """
         TRANSFORM phase: Normalize and clean all extracted data.
+        In streaming mode aggregates are folded into fixed-memory sketches
+        patent by patent instead of collecting per-patent lists. Each patent
+        still keeps its BiblioData (the store, exports and shard merging
+        need it), so memory stays linear in the number of patents.
         """
-        print(f"🔄 Transforming bibliographic data...")
+        logger.info("🔄 Transforming bibliographic data...")
         
         successful_patents = [p for p in portfolio.patents if p.ops_success and hasattr(p, '_ops_response')]
         
         if not successful_patents:
-            print(f"⚠️  No successful EPO OPS responses to transform")
+            logger.warning("⚠️  No successful EPO OPS responses to transform")
             return
         
         all_priorities = []
         all_applicants = []
         all_inventors = []
+        all_classifications = []
+        stats = StreamingPortfolioStats() if streaming else None
         
         for patent in successful_patents:
             ops_response = patent._ops_response
@@ -179,6 +366,9 @@ class UniversityEngine:
             # Transform inventors
             inventors = self.inventor_normalizer.extract_inventors(ops_response)
             
+            # Transform classifications
+            classifications = self.classification_normalizer.extract_classifications(ops_response)
+            
             # Extract title (simple for now)
             title = self._extract_title(ops_response)
             
@@ -188,26 +378,49 @@ class UniversityEngine:
                 title=title or patent.original_title,
                 applicants=applicants,
                 inventors=inventors,
-                priority_claims=priorities
+                priority_claims=priorities,
+                classifications=classifications
             )
             
             # Collect for aggregation
-            all_priorities.append(priorities)
-            all_applicants.append(applicants)
-            all_inventors.append(inventors)
+            if stats is not None:
+                stats.add_patent(applicants, inventors, priorities, classifications)
+            else:
+                all_priorities.append(priorities)
+                all_applicants.append(applicants)
+                all_inventors.append(inventors)
+                all_classifications.append(classifications)
             
             # Clean up temporary data
             delattr(patent, '_ops_response')
         
+        if stats is not None:
+            portfolio._streaming_stats = stats
+            portfolio.priority_statistics = stats.priority_analysis()
+            portfolio.classification_statistics = stats.classification_statistics()
+            
+            counts = {'university': portfolio.university_name, 'unique_applicants': stats.applicants.count(),
+                      'unique_inventors': stats.inventors.count(),
+                      'priority_claims': portfolio.priority_statistics.get('total_priority_claims', 0)}
+            logger.info("✅ Transformation complete (streaming):", extra=counts)
+            logger.info("   👥 Unique applicants: ~%d", counts['unique_applicants'])
+            logger.info("   🔬 Unique inventors: ~%d", counts['unique_inventors'])
+            logger.info("   🏁 Priority claims: %s", counts['priority_claims'])
+            return
+        
         # Aggregate unique entities
         portfolio.unique_applicants = self._aggregate_unique_applicants(all_applicants)
         portfolio.unique_inventors = self._aggregate_unique_inventors(all_inventors)
         portfolio.priority_statistics = self.priority_normalizer.analyze_priority_patterns(all_priorities)
+        portfolio.classification_statistics = self.classification_normalizer.analyze_classification_patterns(all_classifications)
         
-        print(f"✅ Transformation complete:")
-        print(f"   👥 Unique applicants: {len(portfolio.unique_applicants)}")
-        print(f"   🔬 Unique inventors: {len(portfolio.unique_inventors)}")
-        print(f"   🏁 Priority claims: {portfolio.priority_statistics.get('total_priority_claims', 0)}")
+        counts = {'university': portfolio.university_name, 'unique_applicants': len(portfolio.unique_applicants),
+                  'unique_inventors': len(portfolio.unique_inventors),
+                  'priority_claims': portfolio.priority_statistics.get('total_priority_claims', 0)}
+        logger.info("✅ Transformation complete:", extra=counts)
+        logger.info("   👥 Unique applicants: %d", counts['unique_applicants'])
+        logger.info("   🔬 Unique inventors: %d", counts['unique_inventors'])
+        logger.info("   🏁 Priority claims: %s", counts['priority_claims'])
     
     def _extract_title(self, ops_response) -> Optional[str]:
         """Extract patent title from EPO OPS response."""
@@ -247,6 +460,17 @@ class UniversityEngine:
         """
         ANALYZE phase: Generate insights from transformed data.
         """
+        stats = getattr(portfolio, '_streaming_stats', None)
+        if stats is not None:
+            delattr(portfolio, '_streaming_stats')
+            return self._analysis_result(
+                portfolio,
+                collaboration_insights=stats.collaboration_insights(),
+                priority_analysis=stats.priority_analysis(),
+                inventor_network=stats.inventor_network(),
+                streaming_statistics=stats.to_dict()
+            )
+        
         # Extract data for analysis
         all_applicants = [[a for a in p.biblio.applicants] for p in portfolio.patents if p.biblio]
         all_inventors = [[i for i in p.biblio.inventors] for p in portfolio.patents if p.biblio]
@@ -257,37 +481,109 @@ class UniversityEngine:
         priority_analysis = self.priority_normalizer.analyze_priority_patterns(all_priorities)
         inventor_network = self.inventor_normalizer.analyze_inventor_network(all_inventors)
         
-        print(f"📊 Analysis insights generated:")
-        print(f"   🤝 Collaboration rate: {collaboration_insights.get('collaboration_rate', 0)}%")
-        print(f"   🇩🇪 German priority rate: {priority_analysis.get('german_priority_rate', 0)}%")
-        print(f"   🔬 Inventor network: {inventor_network.get('unique_inventors', 0)} researchers")
-        
-        return AnalysisResult(
-            portfolio=portfolio,
+        return self._analysis_result(
+            portfolio,
             collaboration_insights=collaboration_insights,
             priority_analysis=priority_analysis,
             inventor_network=inventor_network
         )
     
+    def _analysis_result(self, portfolio: UniversityPortfolio, **insights) -> AnalysisResult:
+        """Log the headline insights and wrap them into an AnalysisResult."""
+        headline = {'university': portfolio.university_name,
+                    'collaboration_rate': insights['collaboration_insights'].get('collaboration_rate', 0),
+                    'german_priority_rate': insights['priority_analysis'].get('german_priority_rate', 0),
+                    'researchers': insights['inventor_network'].get('unique_inventors', 0)}
+        logger.info("📊 Analysis insights generated:", extra=headline)
+        logger.info("   🤝 Collaboration rate: %s%%", headline['collaboration_rate'])
+        logger.info("   🇩🇪 German priority rate: %s%%", headline['german_priority_rate'])
+        logger.info("   🔬 Inventor network: %s researchers", headline['researchers'])
+        
+        return AnalysisResult(portfolio=portfolio, **insights)
+    
+    def merge_shard_results(self, results: List[AnalysisResult]) -> AnalysisResult:
+        """
+        Combine the EP-number shards of one university into one AnalysisResult.
+        Patents are ordered by EP number so the merge does not depend on shard order.
+        
+        Args:
+            results: Shard results of the same university
+        
+        Returns:
+            AnalysisResult with aggregates and insights recomputed over all shards
+        """
+        first = results[0].portfolio
+        patents = sorted((p for r in results for p in r.portfolio.patents), key=lambda p: p.ep_number)
+        portfolio = UniversityPortfolio(
+            university_name=first.university_name,
+            total_students=first.total_students,
+            patents=patents,
+            analysis_date=max(r.portfolio.analysis_date for r in results),
+            patents_requested=sum(r.portfolio.patents_requested for r in results),
+            patents_retrieved=sum(r.portfolio.patents_retrieved for r in results),
+            deferred_patents=sorted(n for r in results for n in r.portfolio.deferred_patents)
+        )
+        portfolio.calculate_success_rate()
+        
+        if all(r.streaming_statistics for r in results):
+            stats = StreamingPortfolioStats.from_dict(results[0].streaming_statistics)
+            for r in results[1:]:
+                stats.merge(StreamingPortfolioStats.from_dict(r.streaming_statistics))
+            portfolio._streaming_stats = stats
+            portfolio.priority_statistics = stats.priority_analysis()
+            portfolio.classification_statistics = stats.classification_statistics()
+        else:
+            biblios = [p.biblio for p in patents if p.biblio]
+            portfolio.unique_applicants = self._aggregate_unique_applicants([b.applicants for b in biblios])
+            portfolio.unique_inventors = self._aggregate_unique_inventors([b.inventors for b in biblios])
+            portfolio.priority_statistics = self.priority_normalizer.analyze_priority_patterns(
+                [b.priority_claims for b in biblios])
+            portfolio.classification_statistics = self.classification_normalizer.analyze_classification_patterns(
+                [b.classifications for b in biblios])
+        
+        result = self._analyze_data(portfolio)
+        result.metrics = {'shards': [r.metrics for r in results]}
+        return result
+    
+    def _load_data(self, analysis_result: AnalysisResult):
+        """
+        LOAD phase: Upsert the analysis into the embedded analytics store.
+        """
+        with AnalyticsStore() as store:
+            loaded = store.load_result(analysis_result)
+        
+        analysis_result.export_paths['analytics_store'] = str(store.db_path)
+        logger.info("💾 Loaded %d patents into %s", loaded, store.db_path,
+                    extra={'university': analysis_result.portfolio.university_name, 'patents': loaded,
+                           'path': str(store.db_path)})
+        
+        with UniversitySummaryIndex(store_path=store.db_path) as index:
+            index.refresh_analyses()
+    
     def get_available_universities(self) -> List[str]:
         """Get list of available universities."""
         return self.dtf_reader.get_available_universities()
     
+    def resolve_university_name(self, university_name: str) -> str:
+        """Resolve a university name or alias to its dataset name."""
+        return self.dtf_reader.resolve_university_name(university_name)
+    
     def test_system(self) -> bool:
         """Test all system components."""
         try:
-            print("🔧 Testing system components...")
+            logger.info("🔧 Testing system components...")
             
             # Test data loading
             universities = self.dtf_reader.get_available_universities()
-            print(f"✅ Data loading: {len(universities)} universities available")
+            logger.info("✅ Data loading: %d universities available", len(universities))
             
             # Test EPO OPS connection
             ops_works = self.ops_client.test_connection()
-            print(f"{'✅' if ops_works else '❌'} EPO OPS connection: {'Working' if ops_works else 'Failed'}")
+            logger.info("%s EPO OPS connection: %s", '✅' if ops_works else '❌', 'Working' if ops_works else 'Failed',
+                        extra={'ops_connection': ops_works})
             
             return len(universities) > 0 and ops_works
             
         except Exception as e:
-            print(f"❌ System test failed: {e}")
+            logger.error("❌ System test failed: %s", e, extra={'error': str(e)})
             return False
\ No newline at end of file
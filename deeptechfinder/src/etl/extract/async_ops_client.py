@@ -0,0 +1,412 @@
+"""
+Asynchronous EPO OPS API client.
+Overlaps many OPS lookups on one event loop under a shared concurrency and rate budget.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from ...core.config import config
+from ...core.exceptions import AuthenticationError, EPOOPSError
+from ...utils.metrics import MetricsRecorder
+from ...utils.rate_limit import TokenBucket
+from ...utils.single_flight import AsyncSingleFlight, ResponseMemo
+from ...utils.logging_setup import get_logger
+from ..load.data_models import EPOOPSResponse
+from .epo_ops_client import load_credentials
+from .number_resolution import NumberFormatResolver, format_patent_number
+
+logger = get_logger(__name__)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class AsyncEPOOPSClient:
+    """
+    Native asyncio client for EPO OPS (auth, biblio, family, search, images).
+
+    All requests share one semaphore (max_concurrency in-flight requests) and
+    one token bucket (requests_per_second, or one per rate_limit_seconds).
+    429/5xx responses are retried after Retry-After; the bucket is drained so
+    every concurrent task backs off together. HTTP/2 is used when the h2
+    package is installed.
+
+    Usage:
+        async with AsyncEPOOPSClient() as client:
+            responses = await client.fetch_biblio_many(["EP19196837A", "EP18826058A"])
+    """
+
+    def __init__(self,
+                 metrics: Optional[MetricsRecorder] = None,
+                 max_concurrency: Optional[int] = None,
+                 requests_per_second: Optional[float] = None,
+                 http2: Optional[bool] = None,
+                 memo: Optional[ResponseMemo] = None,
+                 resolver: Optional[NumberFormatResolver] = None):
+        if httpx is None:
+            raise EPOOPSError("The async OPS client requires httpx (pip install httpx)")
+
+        self.base_url = config.epo_ops.base_url
+        self.auth_url = config.epo_ops.auth_url
+        self.timeout = config.epo_ops.timeout_seconds
+        self.max_retries = config.epo_ops.max_retries
+        self.metrics = metrics or MetricsRecorder()
+        self.memo = memo if memo is not None else ResponseMemo(config.epo_ops.memo_size)
+        self.resolver = resolver if resolver is not None else NumberFormatResolver()
+        self._single_flight = AsyncSingleFlight()
+
+        self.max_concurrency = max_concurrency or config.epo_ops.max_concurrency
+        rate = requests_per_second if requests_per_second is not None else config.epo_ops.requests_per_second
+        if rate and rate > 0:
+            self.bucket = TokenBucket(rate, capacity=max(1.0, rate), metrics=self.metrics)
+        else:
+            self.bucket = TokenBucket.from_interval(config.epo_ops.rate_limit_seconds, metrics=self.metrics)
+            if self.max_concurrency > 1 and config.epo_ops.rate_limit_seconds > 0:
+                logger.warning("⚠️  No epo_ops.requests_per_second set: one request per %ss, "
+                               "so concurrent requests are no faster than sequential ones",
+                               config.epo_ops.rate_limit_seconds,
+                               extra={'rate_limit_seconds': config.epo_ops.rate_limit_seconds})
+
+        wants_http2 = config.epo_ops.http2 if http2 is None else http2
+        self.http2 = bool(wants_http2 and HTTP2_AVAILABLE)
+
+        self.consumer_key, self.consumer_secret = load_credentials()
+        self.access_token: Optional[str] = None
+        self._client: Optional['httpx.AsyncClient'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> 'AsyncEPOOPSClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the connection pool (bound to the running event loop)."""
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency,
+                                  max_keepalive_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(http2=self.http2, timeout=self.timeout, limits=limits)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._auth_lock = asyncio.Lock()
+
+    async def close(self):
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def authenticate(self, force: bool = False) -> str:
+        """
+        Get an access token; concurrent callers share one token request.
+
+        Args:
+            force: Request a new token even if one is cached (e.g. after a 401)
+
+        Returns:
+            Bearer access token
+        """
+        await self.open()
+        stale_token = self.access_token
+        async with self._auth_lock:
+            # Another task refreshed the token while we waited
+            if self.access_token and (not force or self.access_token != stale_token):
+                return self.access_token
+
+            try:
+                response = await self._send(
+                    'POST', self.auth_url,
+                    data={'grant_type': 'client_credentials'},
+                    auth=(self.consumer_key, self.consumer_secret),
+                    headers={'Content-Type': 'application/x-www-form-urlencoded'}
+                )
+            except httpx.HTTPError as e:
+                raise AuthenticationError(f"Authentication error: {e}")
+
+            if response.status_code != 200:
+                raise AuthenticationError(f"Authentication failed with status {response.status_code}")
+
+            token_data = response.json()
+            self.access_token = token_data['access_token']
+            logger.info("✅ EPO OPS authenticated (expires in %ss)", token_data.get('expires_in', 'unknown'),
+                        extra={'expires_in': token_data.get('expires_in')})
+            return self.access_token
+
+    async def _send(self, method: str, url: str, **kwargs) -> 'httpx.Response':
+        """Send one request under the shared semaphore and token bucket, recording metrics."""
+        async with self._semaphore:
+            await self.bucket.acquire_async()
+            start = time.perf_counter()
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.HTTPError:
+                self.metrics.increment('ops_request_failures')
+                raise
+            finally:
+                self.metrics.observe('ops_request_seconds', time.perf_counter() - start)
+                self.metrics.increment('ops_requests')
+
+        self.metrics.increment('ops_bytes_received', len(response.content))
+        return response
+
+    async def request(self, path: str, accept: str = 'application/json',
+                      params: Optional[Dict[str, Any]] = None) -> 'httpx.Response':
+        """
+        Authenticated GET below the REST base URL with retry handling.
+
+        Retries 429/5xx responses up to max_retries (honouring Retry-After)
+        and refreshes the token once on 401.
+
+        Args:
+            path: REST path, e.g. "published-data/search"
+            accept: Accept header
+            params: Query parameters
+
+        Returns:
+            Final httpx response (any status)
+        """
+        token = self.access_token or await self.authenticate()
+        url = f"{self.base_url}/{path}"
+        refreshed = False
+        attempt = 0
+
+        while True:
+            response = await self._send('GET', url, params=params,
+                                        headers={'Authorization': f'Bearer {token}', 'Accept': accept})
+
+            if response.status_code == 401 and not refreshed:
+                token = await self.authenticate(force=True)
+                refreshed = True
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                attempt += 1
+                self.metrics.increment('ops_retries')
+                # Drain the shared bucket: this and all other tasks wait out the delay
+                self.bucket.penalize(self._retry_after(response, attempt))
+                continue
+
+            return response
+
+    def _retry_after(self, response: 'httpx.Response', attempt: int) -> float:
+        """Delay before retrying: Retry-After header or exponential backoff."""
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', '')))
+        except ValueError:
+            return min(2.0 ** attempt, 30.0)
+
+    def _to_response(self, identifier: str, response: 'httpx.Response') -> EPOOPSResponse:
+        if response.status_code == 200:
+            try:
+                return EPOOPSResponse(ep_number=identifier, status_code=200, response_data=response.json())
+            except ValueError as e:
+                return EPOOPSResponse(ep_number=identifier, status_code=200, error_message=f"Invalid JSON: {e}")
+        return EPOOPSResponse(ep_number=identifier, status_code=response.status_code,
+                              error_message=f"API error {response.status_code}")
+
+    async def get_application_biblio(self, patent_number: str) -> EPOOPSResponse:
+        """
+        Get bibliographic data for a patent application.
+        Memoized and coalesced like EPOOPSClient.get_application_biblio.
+        """
+        key = ('biblio', format_patent_number(patent_number))
+
+        cached = self.memo.get(key)
+        if cached is not None:
+            self.metrics.cache_hit('ops_memo')
+            return cached.model_copy(update={'ep_number': patent_number})
+        self.metrics.cache_miss('ops_memo')
+
+        response, shared = await self._single_flight.do(key, lambda: self._fetch_application_biblio(patent_number))
+        if shared:
+            self.metrics.increment('ops_coalesced')
+            return response.model_copy(update={'ep_number': patent_number})
+
+        if response.status_code == 200:
+            self.memo.put(key, response)
+        return response
+
+    async def _fetch_application_biblio(self, patent_number: str) -> EPOOPSResponse:
+        """Fetch bibliographic data with the same format resolution as EPOOPSClient."""
+        if self.resolver.is_known_missing(patent_number):
+            self.metrics.cache_hit('ops_negative')
+            return EPOOPSResponse(
+                ep_number=patent_number,
+                status_code=404,
+                error_message="Patent not found with any format (cached)"
+            )
+        self.metrics.cache_miss('ops_negative')
+
+        for attempt, (format_name, epodoc_number) in enumerate(self.resolver.candidates(patent_number)):
+            if attempt > 0:
+                self.metrics.increment('ops_retries')
+
+            try:
+                response = await self.request(f"published-data/application/epodoc/{epodoc_number}/biblio")
+            except httpx.HTTPError as e:
+                return EPOOPSResponse(ep_number=patent_number, status_code=0, error_message=f"Request failed: {e}")
+
+            if response.status_code == 404:
+                continue
+            if response.status_code == 200:
+                self.resolver.record_success(patent_number, format_name)
+            return self._to_response(patent_number, response)
+
+        self.resolver.record_missing(patent_number)
+        return EPOOPSResponse(
+            ep_number=patent_number,
+            status_code=404,
+            error_message="Patent not found with any format"
+        )
+
+    async def fetch_biblio_many(self, patent_numbers: Iterable[str],
+                                timeout: Optional[float] = None) -> List[EPOOPSResponse]:
+        """
+        Fetch biblio data for many patents concurrently.
+
+        Args:
+            patent_numbers: EP numbers (e.g., "EP19196837A"); requests start in this order
+            timeout: Seconds after which unfinished lookups are cancelled (None = wait for all)
+
+        Returns:
+            Responses in input order (only completed lookups when the timeout hits)
+        """
+        await self.open()
+        if not self.access_token:
+            await self.authenticate()
+        if timeout is None:
+            return list(await asyncio.gather(*(self.get_application_biblio(n) for n in patent_numbers)))
+
+        tasks = [asyncio.ensure_future(self.get_application_biblio(n)) for n in patent_numbers]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return [task.result() for task in tasks if task in done]
+
+    async def family(self, number: str, reference_type: str = 'publication', input_format: str = 'epodoc',
+                     constituents: Optional[List[str]] = None) -> EPOOPSResponse:
+        """
+        Get the INPADOC family of a document.
+
+        Args:
+            number: Document number in the given input format (e.g., "EP3623538")
+            reference_type: publication, application or priority
+            input_format: epodoc or docdb
+            constituents: Optional constituents, e.g. ["biblio", "legal"]
+        """
+        path = f"family/{reference_type}/{input_format}/{number}"
+        if constituents:
+            path += "/" + ",".join(constituents)
+        return await self._get_json(number, path)
+
+    async def search(self, cql: str, range_begin: int = 1, range_end: int = 25) -> EPOOPSResponse:
+        """
+        Run a published-data search (e.g., "ic=A61K").
+
+        The response model's ep_number field holds the query.
+        """
+        return await self._get_json(cql, 'published-data/search',
+                                    {'q': cql, 'Range': f"{range_begin}-{range_end}"})
+
+    async def images(self, number: str, reference_type: str = 'publication',
+                     input_format: str = 'epodoc') -> EPOOPSResponse:
+        """Get the image inquiry (available document instances and their links)."""
+        return await self._get_json(number, f"published-data/{reference_type}/{input_format}/{number}/images")
+
+    async def image(self, link: str, page: int = 1, document_format: str = 'application/tiff') -> bytes:
+        """
+        Download one image page.
+
+        Args:
+            link: Link from the images inquiry (e.g., "published-data/images/EP/3623538/A1/fullimage")
+            page: Page number
+            document_format: Requested media type
+
+        Returns:
+            Image bytes
+        """
+        try:
+            response = await self.request(link, accept=document_format, params={'Range': page})
+        except httpx.HTTPError as e:
+            raise EPOOPSError(f"Image request failed for {link}: {e}")
+        if response.status_code != 200:
+            raise EPOOPSError(f"Image request failed for {link}: API error {response.status_code}")
+        return response.content
+
+    async def _get_json(self, identifier: str, path: str, params: Optional[Dict[str, Any]] = None) -> EPOOPSResponse:
+        try:
+            response = await self.request(path, params=params)
+        except httpx.HTTPError as e:
+            return EPOOPSResponse(ep_number=identifier, status_code=0, error_message=f"Request failed: {e}")
+        return self._to_response(identifier, response)
+
+async def fetch_biblio_concurrently_async(patent_numbers: List[str],
+                                         metrics: Optional[MetricsRecorder] = None,
+                                         memo: Optional[ResponseMemo] = None,
+                                         resolver: Optional[NumberFormatResolver] = None,
+                                         timeout: Optional[float] = None) -> Dict[str, EPOOPSResponse]:
+    """
+    Awaitable entry point: fetch biblio data for many patents on the caller's event loop
+    (e.g. ``await`` it in a Jupyter cell).
+
+    Args:
+        patent_numbers: EP numbers
+        metrics: Recorder shared with the caller
+        memo: Response memo shared with the caller (e.g. across universities)
+        resolver: Number-format resolution table shared with the caller
+        timeout: Seconds after which unfinished lookups are cancelled (None = wait for all)
+
+    Returns:
+        Mapping of EP number to response
+    """
+    async with AsyncEPOOPSClient(metrics=metrics, memo=memo, resolver=resolver) as client:
+        responses = await client.fetch_biblio_many(patent_numbers, timeout)
+    return {response.ep_number: response for response in responses}
+
+def fetch_biblio_concurrently(patent_numbers: List[str],
+                              metrics: Optional[MetricsRecorder] = None,
+                              memo: Optional[ResponseMemo] = None,
+                              resolver: Optional[NumberFormatResolver] = None,
+                              timeout: Optional[float] = None) -> Dict[str, EPOOPSResponse]:
+    """
+    Synchronous entry point: fetch biblio data for many patents on a private event loop.
+
+    When called from a thread that already runs an event loop (Jupyter), the private
+    loop runs in a worker thread and this call blocks until it finishes.
+
+    Args:
+        patent_numbers: EP numbers
+        metrics: Recorder shared with the caller
+        memo: Response memo shared with the caller (e.g. across universities)
+        resolver: Number-format resolution table shared with the caller
+        timeout: Seconds after which unfinished lookups are cancelled (None = wait for all)
+
+    Returns:
+        Mapping of EP number to response
+    """
+    def run() -> Dict[str, EPOOPSResponse]:
+        return asyncio.run(fetch_biblio_concurrently_async(patent_numbers, metrics, memo, resolver, timeout))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='ops-async') as executor:
+        return executor.submit(run).result()
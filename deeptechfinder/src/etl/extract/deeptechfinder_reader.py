@@ -8,7 +8,12 @@ from pathlib import Path
 
 from ...core.config import config
 from ...core.exceptions import DataExtractionError, UniversityNotFoundError
-from ..load.data_models import PatentApplication
+from ...utils.logging_setup import get_logger
+from ..load.data_models import PatentApplication, is_granted
+from ..load.university_index import UniversitySummaryIndex
+from .fetch_scheduler import FetchScheduler
+
+logger = get_logger(__name__)
 
 class DeepTechFinderReader:
     """
@@ -28,7 +33,7 @@ class DeepTechFinderReader:
             return self._df
         
         try:
-            print(f"📊 Loading DeepTechFinder data from {self.data_file}")
+            logger.info("📊 Loading DeepTechFinder data from %s", self.data_file, extra={'path': str(self.data_file)})
             
             # Try specified encoding first, then fallback options
             encodings = [self.encoding, 'utf-8', 'iso-8859-1', 'cp1252']
@@ -36,7 +41,9 @@ class DeepTechFinderReader:
             for encoding in encodings:
                 try:
                     self._df = pd.read_csv(self.data_file, encoding=encoding)
-                    print(f"✅ Successfully loaded with {encoding} encoding: {len(self._df)} rows and {len(self._df.columns)} columns")
+                    logger.info("✅ Successfully loaded with %s encoding: %d rows and %d columns",
+                                encoding, len(self._df), len(self._df.columns),
+                                extra={'encoding': encoding, 'rows': len(self._df), 'columns': len(self._df.columns)})
                     break
                 except UnicodeDecodeError:
                     continue
@@ -44,7 +51,7 @@ class DeepTechFinderReader:
             if self._df is None:
                 raise DataExtractionError(f"Could not read {self.data_file} with any encoding")
             
-            print(f"📋 Columns: {list(self._df.columns)}")
+            logger.debug("📋 Columns: %s", list(self._df.columns))
             return self._df
             
         except Exception as e:
@@ -56,37 +63,66 @@ class DeepTechFinderReader:
         """
         df = self.load_data()
         universities = sorted(df['University'].unique())
-        print(f"📚 Found {len(universities)} universities in dataset")
+        logger.debug("📚 Found %d universities in dataset", len(universities), extra={'universities': len(universities)})
         return universities
     
-    def get_university_patents(self, university_name: str, limit: Optional[int] = None) -> List[PatentApplication]:
+    def resolve_university_name(self, university_name: str) -> str:
+        """
+        Resolve a university name, abbreviation or alias to its dataset name.
+        
+        Args:
+            university_name: Exact name, or e.g. "TU Dresden", "KIT", "technical university of munich"
+        
+        Returns:
+            Name as it appears in the dataset
+        
+        Raises:
+            UniversityNotFoundError: Unknown or ambiguous name (with ranked suggestions)
+        """
+        df = self.load_data()
+        if (df['University'] == university_name).any():
+            return university_name
+        
+        with UniversitySummaryIndex(data_file=self.data_file) as index:
+            index.refresh_dataset(df)
+            resolved = index.resolve(university_name)
+            suggestions = [] if resolved else [s['name'] for s in index.search(university_name, limit=5)]
+        
+        if resolved:
+            logger.info("🔎 Resolved '%s' to '%s'", university_name, resolved,
+                        extra={'query': university_name, 'university': resolved})
+            return resolved
+        
+        hint = f" Did you mean: {'; '.join(suggestions)}?" if suggestions else ""
+        raise UniversityNotFoundError(f"University '{university_name}' not found.{hint}", suggestions=suggestions)
+    
+    def get_university_patents(self, university_name: str, limit: Optional[int] = None,
+                               scheduler: Optional[FetchScheduler] = None) -> List[PatentApplication]:
         """
         Get patent applications for a specific university.
         
         Args:
-            university_name: Name of the university (must match exactly)
+            university_name: Name of the university (or an alias, see resolve_university_name)
             limit: Maximum number of patents to return (None for all)
+            scheduler: Orders patents by priority before the limit is applied (None keeps file order)
         
         Returns:
             List of PatentApplication objects
         """
         df = self.load_data()
+        university_name = self.resolve_university_name(university_name)
         
         # Filter by university
         university_data = df[df['University'] == university_name]
         
-        if len(university_data) == 0:
-            available = self.get_available_universities()
-            raise UniversityNotFoundError(
-                f"University '{university_name}' not found. "
-                f"Available universities: {available[:10]}..." if len(available) > 10 else f"Available: {available}"
-            )
-        
-        # Apply limit if specified
+        # Most relevant patents first, then apply limit if specified
+        if scheduler is not None:
+            university_data = scheduler.sort_frame(university_data)
         if limit:
             university_data = university_data.head(limit)
         
-        print(f"📄 Found {len(university_data)} patents for {university_name}")
+        logger.info("📄 Found %d patents for %s", len(university_data), university_name,
+                    extra={'university': university_name, 'patents': len(university_data)})
         
         # Convert to PatentApplication objects
         patents = []
@@ -136,7 +172,7 @@ class DeepTechFinderReader:
                 'university': university,
                 'total_students': uni_data['Total_students'].iloc[0] if len(uni_data) > 0 else 0,
                 'total_applications': len(uni_data),
-                'granted_patents': len(uni_data[uni_data['Patent_status'] == 'EP granted']),
+                'granted_patents': int(is_granted(uni_data['Patent_status']).sum()),
             }
             stat['grant_rate'] = (stat['granted_patents'] / stat['total_applications'] * 100) if stat['total_applications'] > 0 else 0
             stats.append(stat)
@@ -5,13 +5,44 @@ Based on proven working patterns from legacy analysis scripts.
 
 import requests
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
 import os
 
 from ...core.config import config
 from ...core.exceptions import EPOOPSError, AuthenticationError, RateLimitError
+from ...utils.metrics import MetricsRecorder
+from ...utils.single_flight import SingleFlight, ResponseMemo
+from ...utils.logging_setup import get_logger
 from ..load.data_models import EPOOPSResponse
+from .number_resolution import NumberFormatResolver, format_patent_number
+
+logger = get_logger(__name__)
+
+def load_credentials() -> Tuple[str, str]:
+    """
+    Load EPO OPS credentials (OPS_KEY, OPS_SECRET) from the environment file.
+    
+    Returns:
+        (consumer_key, consumer_secret)
+    """
+    try:
+        credentials_path = config.get_credentials_path()
+        load_dotenv(credentials_path)
+        
+        consumer_key = os.getenv('OPS_KEY')
+        consumer_secret = os.getenv('OPS_SECRET')
+        
+        if not consumer_key or not consumer_secret:
+            raise AuthenticationError(
+                f"EPO OPS credentials not found in {credentials_path}. "
+                "Please ensure OPS_KEY and OPS_SECRET are set."
+            )
+        
+        return consumer_key, consumer_secret
+        
+    except Exception as e:
+        raise AuthenticationError(f"Failed to load EPO OPS credentials: {e}")
 
 class EPOOPSClient:
     """
@@ -19,33 +50,24 @@ class EPOOPSClient:
     Implements proven patterns from legacy tu_dresden_analysis.py.
     """
     
-    def __init__(self):
+    def __init__(self, metrics: Optional[MetricsRecorder] = None, memo: Optional[ResponseMemo] = None,
+                 resolver: Optional[NumberFormatResolver] = None):
         self.base_url = config.epo_ops.base_url
         self.auth_url = config.epo_ops.auth_url
         self.timeout = config.epo_ops.timeout_seconds
         self.rate_limit = config.epo_ops.rate_limit_seconds
         self.access_token = None
+        self.metrics = metrics or MetricsRecorder()
+        self.memo = memo if memo is not None else ResponseMemo(config.epo_ops.memo_size)
+        self.resolver = resolver if resolver is not None else NumberFormatResolver()
+        self._single_flight = SingleFlight()
         
         # Load credentials
         self._load_credentials()
     
     def _load_credentials(self):
         """Load EPO OPS credentials from environment file."""
-        try:
-            credentials_path = config.get_credentials_path()
-            load_dotenv(credentials_path)
-            
-            self.consumer_key = os.getenv('OPS_KEY')
-            self.consumer_secret = os.getenv('OPS_SECRET')
-            
-            if not self.consumer_key or not self.consumer_secret:
-                raise AuthenticationError(
-                    f"EPO OPS credentials not found in {credentials_path}. "
-                    "Please ensure OPS_KEY and OPS_SECRET are set."
-                )
-                
-        except Exception as e:
-            raise AuthenticationError(f"Failed to load EPO OPS credentials: {e}")
+        self.consumer_key, self.consumer_secret = load_credentials()
     
     def get_access_token(self) -> bool:
         """
@@ -53,18 +75,19 @@ class EPOOPSClient:
         Returns True if successful, False otherwise.
         """
         try:
-            response = requests.post(
+            response = self._request(
+                'POST',
                 self.auth_url,
                 data={'grant_type': 'client_credentials'},
                 auth=(self.consumer_key, self.consumer_secret),
-                headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                timeout=self.timeout
+                headers={'Content-Type': 'application/x-www-form-urlencoded'}
             )
             
             if response.status_code == 200:
                 token_data = response.json()
                 self.access_token = token_data['access_token']
-                print(f"✅ EPO OPS authenticated (expires in {token_data.get('expires_in', 'unknown')}s)")
+                logger.info("✅ EPO OPS authenticated (expires in %ss)", token_data.get('expires_in', 'unknown'),
+                            extra={'expires_in': token_data.get('expires_in')})
                 return True
             else:
                 raise AuthenticationError(f"Authentication failed with status {response.status_code}")
@@ -72,26 +95,73 @@ class EPOOPSClient:
         except Exception as e:
             raise AuthenticationError(f"Authentication error: {e}")
     
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Perform an HTTP request, recording latency and bytes transferred.
+        """
+        start = time.perf_counter()
+        try:
+            response = requests.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException:
+            self.metrics.increment('ops_request_failures')
+            raise
+        finally:
+            self.metrics.observe('ops_request_seconds', time.perf_counter() - start)
+            self.metrics.increment('ops_requests')
+        
+        self.metrics.increment('ops_bytes_received', len(response.content))
+        return response
+    
     def format_patent_number(self, patent_number: str) -> str:
         """
         Format patent number for EPO OPS API calls.
         Implements proven logic from legacy scripts.
         """
-        clean_number = patent_number.replace('EP', '').replace('A', '').replace('B', '')
-        
-        # Leading zero handling for different patent eras (critical for 2000s patents)
-        if clean_number.startswith('0') and len(clean_number) == 8:
-            return clean_number  # Keep leading zero for 2000s patents
-        elif clean_number.startswith('00'):
-            return clean_number.lstrip('0')
-        else:
-            return clean_number.lstrip('0') if clean_number.lstrip('0') else clean_number
+        return format_patent_number(patent_number)
+    
+    def is_memoized(self, patent_number: str) -> bool:
+        """Whether biblio data for this patent is already in the in-process memo."""
+        return ('biblio', self.format_patent_number(patent_number)) in self.memo
     
     def get_application_biblio(self, patent_number: str) -> EPOOPSResponse:
         """
         Get bibliographic data for a patent application.
+        
+        Successful responses are memoized for the run, and concurrent requests
+        for the same application share one in-flight OPS call.
+        """
+        key = ('biblio', self.format_patent_number(patent_number))
+        
+        cached = self.memo.get(key)
+        if cached is not None:
+            self.metrics.cache_hit('ops_memo')
+            return cached.model_copy(update={'ep_number': patent_number})
+        self.metrics.cache_miss('ops_memo')
+        
+        response, shared = self._single_flight.do(key, lambda: self._fetch_application_biblio(patent_number))
+        if shared:
+            self.metrics.increment('ops_coalesced')
+            return response.model_copy(update={'ep_number': patent_number})
+        
+        if response.status_code == 200:
+            self.memo.put(key, response)
+        return response
+    
+    def _fetch_application_biblio(self, patent_number: str) -> EPOOPSResponse:
+        """
+        Fetch bibliographic data from OPS.
         Uses proven endpoint and header configuration.
         """
+        # Cached "not found in any format" results skip the round-trips
+        if self.resolver.is_known_missing(patent_number):
+            self.metrics.cache_hit('ops_negative')
+            return EPOOPSResponse(
+                ep_number=patent_number,
+                status_code=404,
+                error_message="Patent not found with any format (cached)"
+            )
+        self.metrics.cache_miss('ops_negative')
+        
         if not self.access_token:
             if not self.get_access_token():
                 return EPOOPSResponse(
@@ -100,26 +170,23 @@ class EPOOPSClient:
                     error_message="Authentication failed"
                 )
         
-        clean_number = self.format_patent_number(patent_number)
-        
-        # Try multiple formats (proven fallback strategy)
-        formats_to_try = [
-            f"published-data/application/epodoc/EP{clean_number}/biblio",
-            f"published-data/application/epodoc/EP{clean_number.lstrip('0')}/biblio"
-        ]
-        
         headers = {
             'Authorization': f'Bearer {self.access_token}',
             'Accept': 'application/json'  # CRITICAL: Required for proper JSON response
         }
         
-        for endpoint in formats_to_try:
-            url = f"{self.base_url}/{endpoint}"
+        # Try multiple formats (proven fallback strategy), learned best format first
+        for attempt, (format_name, epodoc_number) in enumerate(self.resolver.candidates(patent_number)):
+            url = f"{self.base_url}/published-data/application/epodoc/{epodoc_number}/biblio"
+            
+            if attempt > 0:
+                self.metrics.increment('ops_retries')
             
             try:
-                response = requests.get(url, headers=headers, timeout=self.timeout)
+                response = self._request('GET', url, headers=headers)
                 
                 if response.status_code == 200:
+                    self.resolver.record_success(patent_number, format_name)
                     return EPOOPSResponse(
                         ep_number=patent_number,
                         status_code=200,
@@ -144,6 +211,7 @@ class EPOOPSClient:
                 )
         
         # All formats failed
+        self.resolver.record_missing(patent_number)
         return EPOOPSResponse(
             ep_number=patent_number,
             status_code=404,
@@ -153,12 +221,16 @@ class EPOOPSClient:
     def fetch_with_rate_limit(self, patent_number: str) -> EPOOPSResponse:
         """
         Fetch patent data with automatic rate limiting.
-        Implements EPO OPS compliant delays.
+        Implements EPO OPS compliant delays (skipped for memoized and known-missing patents).
         """
+        if self.is_memoized(patent_number) or self.resolver.is_known_missing(patent_number):
+            return self.get_application_biblio(patent_number)
+        
         response = self.get_application_biblio(patent_number)
         
         # Apply rate limiting after each request
         time.sleep(self.rate_limit)
+        self.metrics.increment('rate_limit_sleep_seconds', self.rate_limit)
         
         return response
     
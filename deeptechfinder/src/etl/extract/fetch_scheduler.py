@@ -0,0 +1,217 @@
+"""
+Priority-ordered OPS fetch scheduling with time and quota deadlines.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from ...core.config import config
+from ...utils.logging_setup import get_logger
+from ..load.data_models import EPOOPSResponse
+
+logger = get_logger(__name__)
+
+PRIORITY_KEYS = ('recent', 'granted', 'uncached')
+
+def filing_years(values: pd.Series) -> pd.Series:
+    """Filing year from DeepTechFinder dates (e.g. "1/22/80"), -1 where unparseable."""
+    dates = pd.to_datetime(values.astype(str), format='%m/%d/%y', errors='coerce')
+    return dates.dt.year.fillna(-1).astype(int)
+
+@dataclass
+class FetchDeadline:
+    """
+    Time and/or quota budget for one extraction.
+
+    Args:
+        seconds: Wall-clock budget for OPS fetches (None = unlimited)
+        max_fetches: Maximum OPS lookups (None = unlimited)
+    """
+    seconds: Optional[float] = None
+    max_fetches: Optional[int] = None
+    started: float = field(default_factory=time.monotonic)
+    fetches: int = 0
+
+    def time_left(self) -> Optional[float]:
+        if self.seconds is None:
+            return None
+        return max(0.0, self.seconds - (time.monotonic() - self.started))
+
+    def reached(self) -> bool:
+        if self.max_fetches is not None and self.fetches >= self.max_fetches:
+            return True
+        return self.seconds is not None and self.time_left() <= 0
+
+@dataclass
+class ScheduleResult:
+    """Outcome of a scheduled extraction."""
+    responses: Dict[str, EPOOPSResponse]
+    remaining: List[str]  # EP numbers not fetched, in priority order
+    deadline_reached: bool = False
+
+class FetchScheduler:
+    """
+    Orders OPS work by configurable priority and stops at a deadline.
+
+    Priority keys (scheduler.priority, applied in order):
+        recent:   most recent filing year first
+        granted:  granted patents before applications/withdrawn ones
+        uncached: patents without an archived payload first, so a tight budget
+                  is spent on new data rather than on refreshing old payloads
+
+    Selection (which patents fall within --limit) uses the relevance keys only,
+    so the cache state never changes which patents a run analyzes.
+    """
+
+    def __init__(self, priority: Optional[Sequence[str]] = None,
+                 is_cached: Optional[Callable[[str], bool]] = None):
+        self.priority = list(priority if priority is not None else config.scheduler.priority)
+        unknown = set(self.priority) - set(PRIORITY_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown scheduler priority keys: {sorted(unknown)} (available: {PRIORITY_KEYS})")
+        self.is_cached = is_cached or (lambda ep_number: False)
+
+    def sort_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Order DeepTechFinder rows by the relevance keys (stable, file order breaks ties).
+
+        Args:
+            df: Rows of one university
+
+        Returns:
+            Reordered DataFrame
+        """
+        keys = pd.DataFrame(index=df.index)
+        columns, ascending = [], []
+        for name in self.priority:
+            if name == 'recent':
+                keys['recent'] = filing_years(df['Filing_year'])
+                columns.append('recent')
+                ascending.append(False)
+            elif name == 'granted':
+                keys['granted'] = df['Patent_status'].astype(str).str.contains('granted', case=False)
+                columns.append('granted')
+                ascending.append(False)
+
+        if not columns:
+            return df
+        order = keys.sort_values(columns, ascending=ascending, kind='stable').index
+        return df.loc[order]
+
+    def order(self, ep_numbers: Sequence[str]) -> List[str]:
+        """
+        Fetch order for an already selected (relevance-ordered) list.
+        Only the uncached key reorders here; the sort is stable.
+        """
+        if 'uncached' not in self.priority:
+            return list(ep_numbers)
+        return sorted(ep_numbers, key=lambda n: self.is_cached(n))
+
+    def run(self, ep_numbers: Sequence[str], fetch: Callable[[str], EPOOPSResponse],
+            deadline: Optional[FetchDeadline] = None,
+            on_fetched: Optional[Callable[[str, EPOOPSResponse], None]] = None) -> ScheduleResult:
+        """
+        Fetch in priority order until done or the deadline is reached.
+
+        Args:
+            ep_numbers: EP numbers to fetch
+            fetch: Fetch function (e.g. EPOOPSClient.fetch_with_rate_limit)
+            deadline: Time/quota budget (None = fetch everything)
+            on_fetched: Callback per completed fetch (e.g. progress reporting)
+
+        Returns:
+            ScheduleResult with responses and the unfetched remainder
+        """
+        ordered = self.order(ep_numbers)
+        responses: Dict[str, EPOOPSResponse] = {}
+
+        for i, ep_number in enumerate(ordered):
+            if deadline is not None and deadline.reached():
+                logger.warning("⏱️  Fetch deadline reached after %d patents, %d deferred", len(responses), len(ordered) - i,
+                               extra={'fetched': len(responses), 'deferred': len(ordered) - i})
+                return ScheduleResult(responses, ordered[i:], deadline_reached=True)
+
+            responses[ep_number] = fetch(ep_number)
+            if deadline is not None:
+                deadline.fetches += 1
+            if on_fetched is not None:
+                on_fetched(ep_number, responses[ep_number])
+
+        return ScheduleResult(responses, [])
+
+    def run_concurrent(self, ep_numbers: Sequence[str],
+                       fetch_many: Callable[[List[str], Optional[float]], Dict[str, EPOOPSResponse]],
+                       deadline: Optional[FetchDeadline] = None) -> ScheduleResult:
+        """
+        Fetch concurrently in priority order (requests are issued in list order),
+        cancelling whatever is still in flight when the time budget runs out.
+
+        Args:
+            ep_numbers: EP numbers to fetch
+            fetch_many: Batch fetch taking (numbers, timeout) (e.g. fetch_biblio_concurrently)
+            deadline: Time/quota budget (None = fetch everything)
+
+        Returns:
+            ScheduleResult with responses and the unfetched remainder
+        """
+        ordered = self.order(ep_numbers)
+        batch = ordered
+        if deadline is not None and deadline.max_fetches is not None:
+            batch = ordered[:max(0, deadline.max_fetches - deadline.fetches)]
+
+        responses = fetch_many(batch, deadline.time_left() if deadline is not None else None) if batch else {}
+        if deadline is not None:
+            deadline.fetches += len(responses)
+
+        remaining = [n for n in ordered if n not in responses]
+        if remaining:
+            logger.warning("⏱️  Fetch deadline reached after %d patents, %d deferred", len(responses), len(remaining),
+                           extra={'fetched': len(responses), 'deferred': len(remaining)})
+        return ScheduleResult(responses, remaining, deadline_reached=bool(remaining))
+
+class ResumeState:
+    """
+    Remainder of a deadline-bounded extraction, persisted per university
+    under scheduler.resume_dir so `analyze --resume` can continue it.
+    """
+
+    def __init__(self, university_name: str, resume_dir: Optional[Path] = None):
+        self.university_name = university_name
+        directory = Path(resume_dir) if resume_dir else config.get_resume_dir_path()
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', university_name).strip('_').lower()
+        self.path = directory / f"{slug}.json"
+
+    def load(self) -> Optional[List[str]]:
+        """Remaining EP numbers, or None if there is nothing to resume."""
+        if not self.path.exists():
+            return None
+        data = json.loads(self.path.read_text(encoding='utf-8'))
+        return data.get('remaining', [])
+
+    def patent_limit(self) -> Optional[int]:
+        """Patent limit of the run that saved the remainder, or None if there is nothing to resume."""
+        if not self.path.exists():
+            return None
+        return json.loads(self.path.read_text(encoding='utf-8')).get('patent_limit')
+
+    def save(self, remaining: List[str], patent_limit: int):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({
+            'university': self.university_name,
+            'patent_limit': patent_limit,
+            'remaining': remaining,
+            'created_at': datetime.now().isoformat(),
+        }, indent=2), encoding='utf-8')
+        logger.info("💾 %d deferred patents saved for --resume: %s", len(remaining), self.path,
+                    extra={'university': self.university_name, 'deferred': len(remaining), 'path': str(self.path)})
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
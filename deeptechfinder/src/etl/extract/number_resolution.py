@@ -0,0 +1,188 @@
+"""
+Learned EP number-format resolution and negative-result cache for OPS lookups.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ...core.config import config
+from ...utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Candidate epodoc renderings, in default order
+FORMATS = ('formatted', 'stripped')
+
+def format_patent_number(patent_number: str) -> str:
+    """
+    Format patent number for EPO OPS API calls.
+    Implements proven logic from legacy scripts.
+    """
+    clean_number = patent_number.replace('EP', '').replace('A', '').replace('B', '')
+    
+    # Leading zero handling for different patent eras (critical for 2000s patents)
+    if clean_number.startswith('0') and len(clean_number) == 8:
+        return clean_number  # Keep leading zero for 2000s patents
+    elif clean_number.startswith('00'):
+        return clean_number.lstrip('0')
+    else:
+        return clean_number.lstrip('0') if clean_number.lstrip('0') else clean_number
+
+class NumberFormatResolver:
+    """
+    Resolution table of which epodoc number format works per number pattern,
+    plus a TTL cache of numbers OPS does not know in any format.
+
+    Number patterns follow the cases format_patent_number distinguishes:
+    authority, digit count and the two leading digits (the filing year of EP
+    application numbers), e.g. "EP:8:05" for EP05012345. Once a format has
+    resolved a pattern it is tried first, so later lookups of that era need
+    one round-trip. Permanently missing numbers are skipped until their
+    negative entry expires.
+
+    State is persisted as JSON at path (default: epo_ops.resolution_cache;
+    when that setting is empty the table lives for the process only).
+    save() merges with the file on disk, so shard workers sharing it keep
+    each other's counts and negative entries.
+    """
+
+    def __init__(self, path: Optional[Path] = None, negative_ttl_hours: Optional[float] = None):
+        self.path = Path(path) if path else config.get_resolution_cache_path()
+        ttl_hours = config.epo_ops.negative_ttl_hours if negative_ttl_hours is None else negative_ttl_hours
+        self.negative_ttl = ttl_hours * 3600
+        self.formats: Dict[str, Dict[str, int]] = {}
+        self.negatives: Dict[str, float] = {}
+        # Changes since the last load/save, merged into the file by save()
+        self._new_counts: Dict[str, Dict[str, int]] = {}
+        self._new_negatives: Dict[str, float] = {}
+        self._resolved: Dict[str, float] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if self.path is None:
+            return
+        formats, negatives = self._read()
+        self.formats, self.negatives = formats, negatives
+
+    def _read(self) -> Tuple[Dict[str, Dict[str, int]], Dict[str, float]]:
+        """Formats and non-expired negatives stored at path (empty if missing or unreadable)."""
+        if not self.path.exists():
+            return {}, {}
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️  Ignoring unreadable resolution cache %s: %s", self.path, e,
+                           extra={'path': str(self.path), 'error': str(e)})
+            return {}, {}
+        now = time.time()
+        negatives = {n: t for n, t in data.get('negatives', {}).items() if now - t < self.negative_ttl}
+        return data.get('formats', {}), negatives
+
+    def save(self):
+        """
+        Persist the table (only if it changed).
+
+        The file is re-read and this process's new counts and negative entries
+        are merged into it (counts added, the latest negative timestamp kept,
+        numbers resolved here dropped), then atomically replaced.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            formats, negatives = self._read()
+            for pattern, counts in self._new_counts.items():
+                merged = formats.setdefault(pattern, {})
+                for name, count in counts.items():
+                    merged[name] = merged.get(name, 0) + count
+            for number, recorded in self._new_negatives.items():
+                negatives[number] = max(recorded, negatives.get(number, 0))
+            for number, resolved in self._resolved.items():
+                if negatives.get(number, 0) <= resolved:
+                    negatives.pop(number, None)
+            now = time.time()
+            negatives = {n: t for n, t in negatives.items() if now - t < self.negative_ttl}
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps({'formats': formats, 'negatives': negatives}, indent=1, sort_keys=True),
+                                encoding='utf-8')
+            tmp_path.replace(self.path)
+
+            self.formats, self.negatives = formats, negatives
+            self._new_counts, self._new_negatives, self._resolved = {}, {}, {}
+            self._dirty = False
+
+    @staticmethod
+    def number_pattern(patent_number: str) -> str:
+        """Pattern key, e.g. "EP:8:05" for EP05012345A."""
+        match = re.match(r'\s*([A-Z]{2})', patent_number.upper())
+        authority = match.group(1) if match else 'EP'
+        digits = re.sub(r'\D', '', patent_number)
+        return f"{authority}:{len(digits)}:{digits[:2]}"
+
+    def candidates(self, patent_number: str) -> List[Tuple[str, str]]:
+        """
+        Epodoc numbers to try, learned best format first (duplicates removed).
+
+        Returns:
+            List of (format name, epodoc number)
+        """
+        clean_number = format_patent_number(patent_number)
+        rendered = {
+            'formatted': f"EP{clean_number}",
+            'stripped': f"EP{clean_number.lstrip('0') or clean_number}",
+        }
+
+        with self._lock:
+            learned = self.formats.get(self.number_pattern(patent_number), {})
+        order = sorted(FORMATS, key=lambda name: -learned.get(name, 0))
+
+        result, seen = [], set()
+        for name in order:
+            if rendered[name] not in seen:
+                seen.add(rendered[name])
+                result.append((name, rendered[name]))
+        return result
+
+    def record_success(self, patent_number: str, format_name: str):
+        """Remember that format_name resolved this number's pattern."""
+        pattern = self.number_pattern(patent_number)
+        with self._lock:
+            counts = self.formats.setdefault(pattern, {})
+            counts[format_name] = counts.get(format_name, 0) + 1
+            new_counts = self._new_counts.setdefault(pattern, {})
+            new_counts[format_name] = new_counts.get(format_name, 0) + 1
+            number = format_patent_number(patent_number)
+            self.negatives.pop(number, None)
+            self._new_negatives.pop(number, None)
+            self._resolved[number] = time.time()
+            self._dirty = True
+
+    def record_missing(self, patent_number: str):
+        """Remember that OPS returned 404 for every format."""
+        with self._lock:
+            number = format_patent_number(patent_number)
+            self.negatives[number] = self._new_negatives[number] = time.time()
+            self._dirty = True
+
+    def is_known_missing(self, patent_number: str) -> bool:
+        """Whether a non-expired negative result exists for this number."""
+        key = format_patent_number(patent_number)
+        with self._lock:
+            recorded = self.negatives.get(key)
+            if recorded is None:
+                return False
+            if time.time() - recorded >= self.negative_ttl:
+                del self.negatives[key]
+                self._dirty = True
+                return False
+            return True
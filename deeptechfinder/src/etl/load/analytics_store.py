@@ -0,0 +1,287 @@
+"""
+Embedded analytical store for cross-university queries.
+Persists enriched patents and normalized entities in an indexed SQLite database.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import pandas as pd
+
+from ...core.config import config
+from ...core.exceptions import PatentAnalyticsError
+from .data_models import AnalysisResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS universities (
+    name TEXT PRIMARY KEY,
+    total_students INTEGER,
+    patents_requested INTEGER,
+    patents_retrieved INTEGER,
+    success_rate REAL,
+    last_analysis TEXT,
+    load_seq INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS patents (
+    ep_number TEXT PRIMARY KEY,
+    title TEXT,
+    original_title TEXT,
+    filing_year TEXT,
+    patent_status TEXT,
+    technical_field TEXT,
+    ops_success INTEGER,
+    extraction_date TEXT
+);
+
+CREATE TABLE IF NOT EXISTS university_patents (
+    university TEXT NOT NULL,
+    ep_number TEXT NOT NULL,
+    PRIMARY KEY (university, ep_number)
+);
+
+CREATE TABLE IF NOT EXISTS applicants (
+    ep_number TEXT NOT NULL,
+    position INTEGER,
+    name TEXT NOT NULL,
+    category TEXT,
+    country TEXT,
+    PRIMARY KEY (ep_number, name)
+);
+
+CREATE TABLE IF NOT EXISTS inventors (
+    ep_number TEXT NOT NULL,
+    position INTEGER,
+    name TEXT NOT NULL,
+    country TEXT,
+    PRIMARY KEY (ep_number, name)
+);
+
+CREATE TABLE IF NOT EXISTS priorities (
+    ep_number TEXT NOT NULL,
+    country TEXT NOT NULL,
+    number TEXT NOT NULL,
+    date TEXT,
+    formatted TEXT,
+    PRIMARY KEY (ep_number, country, number)
+);
+
+CREATE TABLE IF NOT EXISTS classifications (
+    ep_number TEXT NOT NULL,
+    system TEXT NOT NULL,
+    code TEXT NOT NULL,
+    PRIMARY KEY (ep_number, system, code)
+);
+
+CREATE INDEX IF NOT EXISTS idx_university_patents_ep ON university_patents (ep_number);
+CREATE INDEX IF NOT EXISTS idx_applicants_name ON applicants (name);
+CREATE INDEX IF NOT EXISTS idx_applicants_category ON applicants (category, name);
+CREATE INDEX IF NOT EXISTS idx_inventors_name ON inventors (name);
+CREATE INDEX IF NOT EXISTS idx_priorities_country ON priorities (country);
+CREATE INDEX IF NOT EXISTS idx_classifications_code ON classifications (system, code);
+"""
+
+# Named cross-university queries available from the CLI ('query' command).
+# Each takes a single :limit parameter.
+NAMED_QUERIES = {
+    'industry-partners': """
+        SELECT a.name AS partner,
+               COUNT(DISTINCT up.university) AS universities,
+               COUNT(DISTINCT a.ep_number) AS patents
+        FROM applicants a
+        JOIN university_patents up ON up.ep_number = a.ep_number
+        WHERE a.category = 'Industry/Other'
+        GROUP BY a.name
+        ORDER BY universities DESC, patents DESC, partner
+        LIMIT :limit
+    """,
+    'top-inventors': """
+        SELECT i.name AS inventor,
+               COUNT(DISTINCT i.ep_number) AS patents,
+               COUNT(DISTINCT up.university) AS universities
+        FROM inventors i
+        JOIN university_patents up ON up.ep_number = i.ep_number
+        GROUP BY i.name
+        ORDER BY patents DESC, universities DESC, inventor
+        LIMIT :limit
+    """,
+    'shared-patents': """
+        SELECT up.ep_number,
+               COUNT(*) AS universities,
+               GROUP_CONCAT(up.university, '; ') AS university_names
+        FROM university_patents up
+        GROUP BY up.ep_number
+        HAVING COUNT(*) > 1
+        ORDER BY universities DESC, up.ep_number
+        LIMIT :limit
+    """,
+    'ipc-subclasses': """
+        SELECT SUBSTR(c.code, 1, 4) AS subclass,
+               COUNT(DISTINCT c.ep_number) AS patents,
+               COUNT(DISTINCT up.university) AS universities
+        FROM classifications c
+        JOIN university_patents up ON up.ep_number = c.ep_number
+        WHERE c.system = 'IPC'
+        GROUP BY subclass
+        ORDER BY patents DESC, subclass
+        LIMIT :limit
+    """,
+    'universities': """
+        SELECT name AS university, patents_retrieved, patents_requested,
+               ROUND(success_rate, 1) AS success_rate, last_analysis
+        FROM universities
+        ORDER BY patents_retrieved DESC, name
+        LIMIT :limit
+    """,
+}
+
+class AnalyticsStore:
+    """
+    SQLite-backed store for analysis results.
+    Loading a result upserts the university, its patents and their entities,
+    so repeated analyses refresh data instead of duplicating it.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else config.get_store_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns introduced after a store was created."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(universities)")}
+        if 'load_seq' not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE universities ADD COLUMN load_seq INTEGER")
+                self._conn.execute("UPDATE universities SET load_seq = rowid")
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def load_result(self, result: AnalysisResult) -> int:
+        """
+        Upsert one analysis result into the store.
+
+        Every load gets the next load_seq, so readers can pick up what was
+        loaded since they last looked, whatever the result's analysis date
+        (e.g. shard results merged after a newer analysis).
+
+        Args:
+            result: Completed university analysis
+
+        Returns:
+            Number of patents loaded
+        """
+        portfolio = result.portfolio
+
+        try:
+            with self._conn:
+                self._conn.execute(
+                    """INSERT INTO universities VALUES (?, ?, ?, ?, ?, ?,
+                           (SELECT COALESCE(MAX(load_seq), 0) + 1 FROM universities))
+                       ON CONFLICT(name) DO UPDATE SET
+                           total_students = excluded.total_students,
+                           patents_requested = excluded.patents_requested,
+                           patents_retrieved = excluded.patents_retrieved,
+                           success_rate = excluded.success_rate,
+                           last_analysis = excluded.last_analysis,
+                           load_seq = excluded.load_seq""",
+                    (portfolio.university_name, portfolio.total_students, portfolio.patents_requested,
+                     portfolio.patents_retrieved, portfolio.success_rate, portfolio.analysis_date.isoformat())
+                )
+
+                # The portfolio replaces the university's links from earlier runs
+                self._conn.execute("DELETE FROM university_patents WHERE university = ?", (portfolio.university_name,))
+                for patent in portfolio.patents:
+                    self._upsert_patent(portfolio.university_name, patent)
+
+        except sqlite3.Error as e:
+            raise PatentAnalyticsError(f"Failed to load {portfolio.university_name} into {self.db_path}: {e}")
+
+        return len(portfolio.patents)
+
+    def _upsert_patent(self, university: str, patent):
+        """Upsert a patent, its university link and (if enriched) its entities."""
+        biblio = patent.biblio
+
+        # Keep previously enriched data when a later run failed to retrieve the patent
+        self._conn.execute(
+            """INSERT INTO patents VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(ep_number) DO UPDATE SET
+                   title = COALESCE(excluded.title, patents.title),
+                   original_title = excluded.original_title,
+                   filing_year = excluded.filing_year,
+                   patent_status = excluded.patent_status,
+                   technical_field = excluded.technical_field,
+                   ops_success = MAX(excluded.ops_success, patents.ops_success),
+                   extraction_date = excluded.extraction_date""",
+            (patent.ep_number, biblio.title if biblio else None, patent.original_title, patent.filing_year,
+             patent.patent_status, patent.technical_field, int(patent.ops_success),
+             patent.extraction_date.isoformat())
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO university_patents VALUES (?, ?)",
+            (university, patent.ep_number)
+        )
+
+        if biblio is None:
+            return
+
+        # Replace the entity sets of this patent with the fresh extraction
+        for table in ('applicants', 'inventors', 'priorities', 'classifications'):
+            self._conn.execute(f"DELETE FROM {table} WHERE ep_number = ?", (patent.ep_number,))
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO applicants VALUES (?, ?, ?, ?, ?)",
+            [(patent.ep_number, i, a.name, a.category, a.country) for i, a in enumerate(biblio.applicants)]
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO inventors VALUES (?, ?, ?, ?)",
+            [(patent.ep_number, i, inv.name, inv.country) for i, inv in enumerate(biblio.inventors)]
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO priorities VALUES (?, ?, ?, ?, ?)",
+            [(patent.ep_number, p.country, p.number, p.date, p.formatted) for p in biblio.priority_claims]
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO classifications VALUES (?, ?, ?)",
+            [(patent.ep_number, c.system, c.code) for c in biblio.classifications]
+        )
+
+    def run_named_query(self, name: str, limit: int = 20) -> pd.DataFrame:
+        """
+        Run one of the predefined cross-university queries.
+
+        Args:
+            name: Key of NAMED_QUERIES
+            limit: Maximum number of rows
+
+        Returns:
+            Query result as DataFrame
+        """
+        if name not in NAMED_QUERIES:
+            raise PatentAnalyticsError(f"Unknown query '{name}'. Available: {sorted(NAMED_QUERIES)}")
+        return self.query(NAMED_QUERIES[name], {'limit': limit})
+
+    def query(self, sql: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Run an arbitrary SQL query against the store."""
+        try:
+            return pd.read_sql_query(sql, self._conn, params=params or {})
+        except Exception as e:
+            raise PatentAnalyticsError(f"Query failed: {e}")
+
+    def get_loaded_universities(self) -> List[str]:
+        """Get names of all universities loaded into the store."""
+        return [row[0] for row in self._conn.execute("SELECT name FROM universities ORDER BY name")]
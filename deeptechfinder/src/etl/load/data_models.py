@@ -6,6 +6,14 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+# Patent_status counted as a grant in university statistics (the reader, the summary index
+# and the legacy analyze_universities output); "EP granted & Unitary" is not counted.
+GRANTED_STATUS = 'EP granted'
+
+def is_granted(patent_status: Any) -> Any:
+    """Grant predicate for a Patent_status value or Series (element-wise)."""
+    return patent_status == GRANTED_STATUS
+
 class PatentApplication(BaseModel):
     """Raw patent application data from DeepTechFinder CSV."""
     university: str
@@ -91,11 +99,12 @@ class UniversityPortfolio(BaseModel):
     patents_requested: int
     patents_retrieved: int
     success_rate: float = 0.0
+    deferred_patents: List[str] = Field(default_factory=list)  # Not fetched before the deadline (analyze --resume)
     
     # Aggregated data
     unique_applicants: List[Applicant] = Field(default_factory=list)
     unique_inventors: List[Inventor] = Field(default_factory=list)
-    priority_statistics: Dict[str, int] = Field(default_factory=dict)
+    priority_statistics: Dict[str, Any] = Field(default_factory=dict)
     classification_statistics: Dict[str, int] = Field(default_factory=dict)
     
     def calculate_success_rate(self):
@@ -116,5 +125,11 @@ class AnalysisResult(BaseModel):
     technology_analysis: Dict[str, Any] = Field(default_factory=dict)
     inventor_network: Dict[str, Any] = Field(default_factory=dict)
     
+    # Serialized StreamingPortfolioStats (streaming runs only; mergeable across workers)
+    streaming_statistics: Dict[str, Any] = Field(default_factory=dict)
+    
+    # Run metrics (phase timings, OPS latency histograms, counters)
+    metrics: Dict[str, Any] = Field(default_factory=dict)
+    
     # Export paths
     export_paths: Dict[str, str] = Field(default_factory=dict)
\ No newline at end of file
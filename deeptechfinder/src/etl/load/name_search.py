@@ -0,0 +1,137 @@
+"""
+Name normalization, alias generation and trigram scoring for university search.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Set
+
+STOPWORDS = {'of', 'the', 'and', 'for', 'in', 'von', 'der', 'des', 'und', 'fur'}
+
+# "Technical University of X", "X University of Technology", "Technische Universität X", "TU X University"
+_TECHNICAL = re.compile(
+    r'^(?:technical university(?: of)?|technische universitat|tu) (?P<rest>.+?)(?: university)?$'
+    r'|^(?P<city>\S+) university of technology$'
+)
+_UNIVERSITY = re.compile(r'^university of (?P<a>\S+)$|^(?P<b>\S+) university$')
+_PARENTHESIZED = re.compile(r'\(([A-Za-z]{2,})\)')
+# German transliteration of umlauts ("München" -> "Muenchen")
+_UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue', 'ß': 'ss'})
+
+def repair_encoding(name: str) -> str:
+    """
+    Undo Mac Roman text decoded as latin-1 (C1 control characters where the
+    umlauts should be), as produced by reading the DeepTechFinder CSV with
+    data.encoding; other names are returned unchanged.
+    """
+    if not any('\x80' <= c <= '\x9f' for c in name):
+        return name
+    try:
+        return name.encode('latin-1').decode('mac_roman')
+    except UnicodeError:
+        return name
+
+def normalize_name(name: str) -> str:
+    """Casefolded, accent-free form with punctuation collapsed to single spaces."""
+    decomposed = unicodedata.normalize('NFKD', repair_encoding(name).casefold())
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', stripped).split())
+
+def trigrams(text: str) -> Set[str]:
+    """Word trigrams of a normalized string, padded like PostgreSQL pg_trgm ("  w", " wo", ..., "rd ")."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def generate_aliases(name: str) -> Set[str]:
+    """
+    Common short forms of a university name (normalized).
+
+    - Acronyms of the significant words: "Karlsruhe Institute of Technology" -> "kit"
+    - Acronyms given in parentheses: "... (BTU) Cottbus" -> "btu"
+    - "TU <city>" for technical universities: "Technische Universität Dresden" -> "tu dresden"
+    - "Uni <city>" for "University of <city>" / "<city> University"
+    """
+    normalized = normalize_name(name)
+    aliases = {m.lower() for m in _PARENTHESIZED.findall(name)}
+
+    words = [w for w in normalize_name(_PARENTHESIZED.sub(' ', name)).split() if w not in STOPWORDS]
+    if 3 <= len(words) <= 4:
+        aliases.add(''.join(w[0] for w in words))
+
+    technical = _TECHNICAL.match(normalized)
+    if technical:
+        city = technical.group('city') or technical.group('rest').split()[-1]
+        aliases.add(f"tu {city}")
+
+    university = _UNIVERSITY.match(normalized)
+    if university:
+        city = university.group('a') or university.group('b')
+        aliases.update({f"uni {city}", f"universitat {city}"})
+
+    aliases.discard(normalized)
+    return aliases
+
+def city_variants(city_aliases: Dict[str, str]) -> Dict[str, Set[str]]:
+    """
+    Normalized local spellings per normalized dataset city name, with umlauts
+    both dropped and transliterated: {"München": "Munich"} -> {"munich": {"munchen", "muenchen"}}.
+    """
+    variants: Dict[str, Set[str]] = {}
+    for local, city in city_aliases.items():
+        spellings = {normalize_name(local), normalize_name(local.translate(_UMLAUTS))}
+        variants.setdefault(normalize_name(city), set()).update(spellings - {normalize_name(city)})
+    return variants
+
+def localize(key: str, variants: Dict[str, Set[str]]) -> Set[str]:
+    """Forms of a normalized key with each city replaced by its local spellings ("tu munich" -> "tu munchen", ...)."""
+    forms = {key}
+    for city, spellings in variants.items():
+        if f" {city} " in f" {key} ":
+            forms |= {' '.join(spelling if word == city else word for word in form.split())
+                      for form in forms for spelling in spellings}
+    forms.discard(key)
+    return forms
+
+def score_match(query: str, key: str, shared: int, query_count: int, key_count: int) -> float:
+    """
+    Ranking score in [0, 1] of a normalized key for a normalized query.
+
+    Args:
+        query, key: Normalized strings
+        shared: Trigrams the two have in common
+        query_count, key_count: Trigrams of each
+
+    Exact matches score 1; keys whose words start with every query word
+    ("tu dres", "munich") score at least 0.6; anything else scores its trigram
+    Jaccard similarity (tolerates typos and transliterations like "ue"/"u").
+    """
+    if query == key:
+        return 1.0
+    similarity = shared / (query_count + key_count - shared) if shared else 0.0
+
+    key_words = key.split()
+    if all(any(word.startswith(q) for word in key_words) for q in query.split()):
+        return 0.6 + 0.39 * similarity
+    return similarity
+
+def resolve_alias_targets(aliases: Dict[str, str], names: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Map configured aliases to dataset names, matching targets by normalized name
+    (so settings may spell "Nürnberg" as "Nurnberg").
+
+    Returns:
+        Normalized alias -> dataset names (unknown targets are dropped)
+    """
+    by_normalized: Dict[str, List[str]] = {}
+    for name in names:
+        by_normalized.setdefault(normalize_name(name), []).append(name)
+
+    resolved = {}
+    for alias, target in aliases.items():
+        matches = by_normalized.get(normalize_name(target))
+        if matches:
+            resolved[normalize_name(alias)] = matches
+    return resolved
@@ -0,0 +1,176 @@
+"""
+Compressed archive of raw EPO OPS payloads.
+Keeps every retrieved biblio response so transformations can be replayed offline.
+"""
+
+import json
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from ...core.config import config
+from ...core.exceptions import PatentAnalyticsError
+from .data_models import EPOOPSResponse
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class RawPayloadArchive:
+    """
+    Indexed container of zstd-compressed OPS JSON payloads.
+
+    Payloads are keyed by (EP number, retrieval date); storing the same patent
+    twice on one day replaces the earlier payload. Falls back to zlib when the
+    zstandard package is not installed (the codec is recorded per payload).
+    """
+
+    def __init__(self, archive_path: Optional[Path] = None, compression_level: Optional[int] = None):
+        self.archive_path = Path(archive_path) if archive_path else config.get_archive_path()
+        self.compression_level = compression_level or config.archive.compression_level
+        self.codec = 'zstd' if zstandard is not None else 'zlib'
+
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.archive_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS payloads (
+                   ep_number TEXT NOT NULL,
+                   retrieval_date TEXT NOT NULL,
+                   retrieved_at TEXT NOT NULL,
+                   codec TEXT NOT NULL,
+                   raw_size INTEGER NOT NULL,
+                   payload BLOB NOT NULL,
+                   PRIMARY KEY (ep_number, retrieval_date)
+               )"""
+        )
+
+        if zstandard is not None:
+            self._compressor = zstandard.ZstdCompressor(level=self.compression_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    def close(self):
+        """Close the archive."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+
+    def __contains__(self, ep_number: str) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM payloads WHERE ep_number = ? LIMIT 1", (ep_number,)
+        ).fetchone() is not None
+
+    def put(self, response: EPOOPSResponse) -> bool:
+        """
+        Archive a successful OPS response.
+
+        Args:
+            response: EPO OPS response (only status 200 with data is archived)
+
+        Returns:
+            True if the payload was stored
+        """
+        if response.status_code != 200 or not response.response_data:
+            return False
+
+        raw = json.dumps(response.response_data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO payloads VALUES (?, ?, ?, ?, ?, ?)",
+                    (response.ep_number, response.retrieved_at.date().isoformat(),
+                     response.retrieved_at.isoformat(), self.codec, len(raw), self._compress(raw))
+                )
+        except sqlite3.Error as e:
+            raise PatentAnalyticsError(f"Failed to archive payload for {response.ep_number}: {e}")
+
+        return True
+
+    def get(self, ep_number: str, retrieval_date: Optional[str] = None) -> Optional[EPOOPSResponse]:
+        """
+        Random access to one archived payload.
+
+        Args:
+            ep_number: EP number as used for the OPS request (e.g., "EP19196837A")
+            retrieval_date: ISO date (YYYY-MM-DD); None returns the latest payload
+
+        Returns:
+            Rehydrated EPOOPSResponse or None if not archived
+        """
+        if retrieval_date:
+            row = self._conn.execute(
+                "SELECT ep_number, retrieved_at, codec, payload FROM payloads "
+                "WHERE ep_number = ? AND retrieval_date = ?",
+                (ep_number, retrieval_date)
+            ).fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT ep_number, retrieved_at, codec, payload FROM payloads "
+                "WHERE ep_number = ? ORDER BY retrieval_date DESC LIMIT 1",
+                (ep_number,)
+            ).fetchone()
+
+        return self._to_response(row) if row else None
+
+    def iter_responses(self, latest_only: bool = True) -> Iterator[EPOOPSResponse]:
+        """
+        Stream archived payloads in EP-number order for bulk reprocessing.
+
+        Args:
+            latest_only: Yield only the most recent payload per EP number
+
+        Yields:
+            Rehydrated EPOOPSResponse objects, decompressed one at a time
+        """
+        if latest_only:
+            sql = ("SELECT ep_number, retrieved_at, codec, payload FROM payloads p "
+                   "WHERE retrieval_date = (SELECT MAX(retrieval_date) FROM payloads WHERE ep_number = p.ep_number) "
+                   "ORDER BY ep_number")
+        else:
+            sql = ("SELECT ep_number, retrieved_at, codec, payload FROM payloads "
+                   "ORDER BY ep_number, retrieval_date")
+
+        # Separate cursor so callers may interleave get()/put() while streaming
+        cursor = self._conn.cursor()
+        for row in cursor.execute(sql):
+            yield self._to_response(row)
+
+    def keys(self) -> List[tuple]:
+        """List archived (ep_number, retrieval_date) keys."""
+        return self._conn.execute(
+            "SELECT ep_number, retrieval_date FROM payloads ORDER BY ep_number, retrieval_date"
+        ).fetchall()
+
+    def _to_response(self, row) -> EPOOPSResponse:
+        """Decompress an archive row into an EPOOPSResponse."""
+        ep_number, retrieved_at, codec, payload = row
+        data = json.loads(self._decompress(payload, codec))
+        return EPOOPSResponse(
+            ep_number=ep_number,
+            status_code=200,
+            response_data=data,
+            retrieved_at=datetime.fromisoformat(retrieved_at)
+        )
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return self._compressor.compress(raw)
+        return zlib.compress(raw, min(self.compression_level, 9))
+
+    def _decompress(self, payload: bytes, codec: str) -> bytes:
+        if codec == 'zstd':
+            if zstandard is None:
+                raise PatentAnalyticsError("Archive contains zstd payloads but zstandard is not installed")
+            return self._decompressor.decompress(payload)
+        return zlib.decompress(payload)
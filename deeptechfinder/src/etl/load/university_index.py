@@ -0,0 +1,362 @@
+"""
+Precomputed per-university summary index.
+Answers list/search/top-N queries without loading the DeepTechFinder CSV.
+"""
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ...core.config import config
+from ...core.exceptions import PatentAnalyticsError
+from ...utils.logging_setup import get_logger
+from .data_models import is_granted
+from .name_search import (city_variants, generate_aliases, localize, normalize_name, resolve_alias_targets,
+                          score_match, trigrams)
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    name TEXT PRIMARY KEY,
+    total_students INTEGER NOT NULL,
+    total_applications INTEGER NOT NULL,
+    granted_patents INTEGER NOT NULL,
+    grant_rate REAL NOT NULL,
+    spin_outs INTEGER NOT NULL,
+    patents_retrieved INTEGER,
+    success_rate REAL,
+    last_analysis TEXT
+);
+
+CREATE TABLE IF NOT EXISTS search_keys (
+    key_id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    trigram_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS key_trigrams (
+    trigram TEXT NOT NULL,
+    key_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, key_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_search_keys_key ON search_keys (key);
+"""
+
+# Bumped when summarize_dataset() changes, so existing indexes recompute their dataset part
+SUMMARY_VERSION = 2
+
+DATASET_COLUMNS = ('total_students', 'total_applications', 'granted_patents', 'grant_rate', 'spin_outs')
+
+# Sort keys for list/top queries: column and whether larger values come first
+SORT_KEYS = {
+    'name': ('name', False),
+    'students': ('total_students', True),
+    'applications': ('total_applications', True),
+    'granted': ('granted_patents', True),
+    'grant_rate': ('grant_rate', True),
+    'spin_outs': ('spin_outs', True),
+    'success_rate': ('success_rate', True),
+    'last_analysis': ('last_analysis', True),
+}
+
+def summarize_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-university summary of DeepTechFinder rows.
+
+    Args:
+        df: DeepTechFinder CSV contents
+
+    Returns:
+        DataFrame indexed by university with DATASET_COLUMNS
+    """
+    granted = is_granted(df['Patent_status'])
+    grouped = df.assign(_granted=granted).groupby('University', sort=True)
+
+    summary = pd.DataFrame({
+        'total_students': grouped['Total_students'].first().fillna(0).astype(int),
+        'total_applications': grouped.size(),
+        'granted_patents': grouped['_granted'].sum().astype(int),
+        'spin_outs': grouped['Total_number_of_Spin_outs'].first().fillna(0).astype(int),
+    })
+    summary['grant_rate'] = (summary['granted_patents'] / summary['total_applications'] * 100).round(1)
+    return summary[list(DATASET_COLUMNS)]
+
+class UniversitySummaryIndex:
+    """
+    SQLite index with one summary row per university: dataset counts
+    (applications, grants, students, spin-outs) plus the latest analysis
+    from the analytics store (patents retrieved, success rate, date), and a
+    trigram index over university names and aliases for ranked search.
+
+    refresh() keeps it current incrementally: the dataset part is recomputed
+    only when the CSV's size/mtime changes (and only changed rows are
+    rewritten), the analysis part only picks up store rows loaded since the
+    last refresh (by the store's load sequence, not the analysis date).
+    """
+
+    def __init__(self, db_path: Optional[Path] = None,
+                 data_file: Optional[Path] = None,
+                 store_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else config.get_summary_index_path()
+        self.data_file = Path(data_file) if data_file else config.get_data_file_path()
+        self.store_path = Path(store_path) if store_path else config.get_store_path()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the index."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def _dataset_fingerprint(self) -> str:
+        stat = self.data_file.stat()
+        aliases = json.dumps([config.data.university_aliases, config.data.city_aliases], sort_keys=True).encode('utf-8')
+        return f"{stat.st_size}:{stat.st_mtime_ns}:{hashlib.sha1(aliases).hexdigest()[:12]}:v{SUMMARY_VERSION}"
+
+    def refresh(self, df: Optional[pd.DataFrame] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the dataset and the analytics store.
+
+        Args:
+            df: Already loaded DeepTechFinder rows (read from data_file if needed)
+
+        Returns:
+            Number of rows updated per source ('dataset', 'analyses')
+        """
+        return {'dataset': self.refresh_dataset(df), 'analyses': self.refresh_analyses()}
+
+    def refresh_dataset(self, df: Optional[pd.DataFrame] = None) -> int:
+        """Recompute dataset summaries and the name search index if the CSV (or the aliases) changed."""
+        fingerprint = self._dataset_fingerprint()
+        if fingerprint == self._get_meta('dataset_fingerprint'):
+            return 0
+
+        if df is None:
+            # Imported here: the reader pulls in the extract layer, which index readers do not need
+            from ..extract.deeptechfinder_reader import DeepTechFinderReader
+            df = DeepTechFinderReader().load_data()
+
+        summary = summarize_dataset(df)
+        current = {row[0]: tuple(row[1:]) for row in self._conn.execute(
+            f"SELECT name, {', '.join(DATASET_COLUMNS)} FROM summaries")}
+        rows = zip(summary.index, *(summary[column].tolist() for column in DATASET_COLUMNS))
+        changed = [row for row in rows if current.get(row[0]) != tuple(row[1:])]
+        added = set(summary.index) - current.keys()
+        removed = [(name,) for name in current.keys() - set(summary.index)]
+
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    f"""INSERT INTO summaries (name, {', '.join(DATASET_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(name) DO UPDATE SET
+                            {', '.join(f'{c} = excluded.{c}' for c in DATASET_COLUMNS)}""",
+                    changed
+                )
+                self._conn.executemany("DELETE FROM summaries WHERE name = ?", removed)
+                self._rebuild_search(list(summary.index))
+                self._set_meta('dataset_fingerprint', fingerprint)
+                # Stored analyses of newly added universities are picked up from the start
+                if added:
+                    self._conn.execute("DELETE FROM meta WHERE key = 'analysis_watermark'")
+        except sqlite3.Error as e:
+            raise PatentAnalyticsError(f"Failed to update summary index {self.db_path}: {e}")
+
+        logger.info("📇 Summary index: %d universities updated, %d removed", len(changed), len(removed),
+                    extra={'updated': len(changed), 'removed': len(removed)})
+        return len(changed) + len(removed)
+
+    def _rebuild_search(self, names: List[str]):
+        """
+        Replace the search keys: each name, its generated aliases and the configured aliases,
+        plus their forms with local city names (data.city_aliases).
+        """
+        keys = {(normalize_name(name), name, 'name') for name in names}
+        for name in names:
+            keys.update((alias, name, 'alias') for alias in generate_aliases(name))
+        for alias, targets in resolve_alias_targets(config.data.university_aliases, names).items():
+            keys.update((alias, name, 'alias') for name in targets)
+        variants = city_variants(config.data.city_aliases)
+        keys.update((form, name, 'alias') for key, name, _ in list(keys) for form in localize(key, variants))
+
+        self._conn.execute("DELETE FROM search_keys")
+        self._conn.execute("DELETE FROM key_trigrams")
+        for key_id, (key, name, kind) in enumerate(sorted(keys)):
+            grams = trigrams(key)
+            self._conn.execute("INSERT INTO search_keys VALUES (?, ?, ?, ?, ?)", (key_id, key, name, kind, len(grams)))
+            self._conn.executemany("INSERT INTO key_trigrams VALUES (?, ?)", [(g, key_id) for g in grams])
+
+    def refresh_analyses(self) -> int:
+        """Copy analyses loaded into the analytics store since the last refresh."""
+        if not self.store_path.exists():
+            return 0
+
+        watermark = self._get_meta('analysis_watermark') or ''
+        # Indexes written before the load sequence hold an analysis date: copy everything once
+        watermark = int(watermark) if watermark.isdigit() else 0
+        try:
+            store = sqlite3.connect(f"file:{self.store_path}?mode=ro", uri=True)
+            try:
+                rows = store.execute(
+                    "SELECT name, patents_retrieved, success_rate, last_analysis, load_seq FROM universities "
+                    "WHERE load_seq > ? ORDER BY load_seq", (watermark,)
+                ).fetchall()
+            finally:
+                store.close()
+        except sqlite3.Error as e:
+            logger.debug("Analytics store not readable for summary index: %s", e, extra={'error': str(e)})
+            return 0
+
+        if not rows:
+            return 0
+
+        with self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE summaries SET patents_retrieved = ?, success_rate = ?, last_analysis = ? WHERE name = ?",
+                [(retrieved, rate, analyzed, name) for name, retrieved, rate, analyzed, _ in rows]
+            )
+            self._set_meta('analysis_watermark', str(rows[-1][4]))
+        return cursor.rowcount
+
+    def list(self, sort_by: str = 'name', limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        University summaries in the requested order.
+
+        Args:
+            sort_by: Key of SORT_KEYS
+            limit: Maximum number of rows (None for all)
+
+        Returns:
+            List of summary dictionaries
+        """
+        if sort_by not in SORT_KEYS:
+            raise PatentAnalyticsError(f"Unknown sort key '{sort_by}'. Available: {sorted(SORT_KEYS)}")
+        column, descending = SORT_KEYS[sort_by]
+        order = f"{column} IS NULL, {column} {'DESC' if descending else 'ASC'}, name"
+        return self._select(f"ORDER BY {order} LIMIT ?", (limit if limit else -1,))
+
+    def top(self, n: int = 10, sort_by: str = 'applications') -> List[Dict[str, Any]]:
+        """Top n universities by sort_by."""
+        return self.list(sort_by, n)
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.2) -> List[Dict[str, Any]]:
+        """
+        Ranked fuzzy search over university names and aliases.
+
+        Args:
+            query: Full or partial name, abbreviation ("TU Dresden", "KIT") or misspelling
+            limit: Maximum number of suggestions
+            min_score: Drop matches scoring below this (see name_search.score_match)
+
+        Returns:
+            Suggestions (best first) with name, score, the matched key and its kind
+        """
+        normalized = normalize_name(query)
+        grams = trigrams(normalized)
+        if not grams:
+            return []
+
+        placeholders = ', '.join('?' * len(grams))
+        rows = self._conn.execute(
+            f"""SELECT k.key, k.name, k.kind, k.trigram_count, COUNT(*), s.total_applications
+                FROM key_trigrams t
+                JOIN search_keys k ON k.key_id = t.key_id
+                JOIN summaries s ON s.name = k.name
+                WHERE t.trigram IN ({placeholders})
+                GROUP BY t.key_id""",
+            list(grams)
+        ).fetchall()
+
+        best: Dict[str, Dict[str, Any]] = {}
+        for key, name, kind, key_count, shared, applications in rows:
+            score = score_match(normalized, key, shared, len(grams), key_count)
+            if score >= min_score and score > best.get(name, {}).get('score', -1):
+                best[name] = {'name': name, 'score': round(score, 3), 'matched': key, 'kind': kind,
+                              'total_applications': applications}
+
+        ranked = sorted(best.values(), key=lambda s: (-s['score'], -s['total_applications'], s['name']))
+        return ranked[:limit]
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        Dataset name for an exact name, or for a name/alias that matches exactly
+        one university ignoring case and accents; None if unknown or ambiguous.
+        """
+        if self.get(query) is not None:
+            return query
+        names = {row[0] for row in self._conn.execute(
+            "SELECT DISTINCT name FROM search_keys WHERE key = ?", (normalize_name(query),))}
+        return names.pop() if len(names) == 1 else None
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Summary of one university, or None if it is not in the dataset."""
+        rows = self._select("WHERE name = ?", (name,))
+        return rows[0] if rows else None
+
+    def names(self) -> List[str]:
+        """All university names in alphabetical order."""
+        return [row[0] for row in self._conn.execute("SELECT name FROM summaries ORDER BY name")]
+
+    def totals(self) -> Dict[str, Any]:
+        """Dataset-wide totals (matches the legacy widget 'summary' block)."""
+        universities, students, applications, granted = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_students), 0), COALESCE(SUM(total_applications), 0), "
+            "COALESCE(SUM(granted_patents), 0) FROM summaries"
+        ).fetchone()
+        return {
+            'total_universities': universities,
+            'total_students': students,
+            'total_applications': applications,
+            'total_granted': granted,
+            'overall_grant_rate': round(granted / applications * 100, 1) if applications else 0,
+        }
+
+    def to_widget_data(self) -> Dict[str, Any]:
+        """
+        Index contents in the layout of the legacy university_analysis.json,
+        for the dashboard widgets (legacy/scripts/university_data_loader.py).
+        """
+        return {
+            'universities': self.list('applications'),
+            'summary': self.totals(),
+            'sorting_options': {
+                'alphabetical': self.list('name'),
+                'by_students': self.list('students'),
+                'by_applications': self.list('applications'),
+                'by_granted': self.list('granted'),
+                'by_grant_rate': self.list('grant_rate'),
+            },
+            'generated_at': datetime.now().isoformat(),
+        }
+
+    def _select(self, clause: str, params: tuple) -> List[Dict[str, Any]]:
+        cursor = self._conn.execute(f"SELECT * FROM summaries {clause}", params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -4,6 +4,9 @@ Applicant normalization and categorization.
 
 from typing import List, Dict, Any
 from ..load.data_models import Applicant, EPOOPSResponse
+from ...utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
 
 class ApplicantNormalizer:
     """
@@ -66,7 +69,8 @@ class ApplicantNormalizer:
             return applicants
             
         except Exception as e:
-            print(f"⚠️ Error extracting applicants for {ops_response.ep_number}: {e}")
+            logger.warning("⚠️ Error extracting applicants for %s: %s", ops_response.ep_number, e,
+                           extra={'ep_number': ops_response.ep_number, 'error': str(e)})
             return []
     
     def _categorize_applicant(self, applicant_name: str) -> str:
@@ -0,0 +1,152 @@
+"""
+Classification extraction and normalization.
+"""
+
+import re
+from typing import List, Dict, Any
+from ..load.data_models import Classification, EPOOPSResponse
+from ...utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+class ClassificationNormalizer:
+    """
+    Normalizes IPC and CPC classifications from EPO OPS responses.
+    IPC codes come from classifications-ipcr text entries, CPC codes
+    from the structured patent-classifications section.
+    """
+
+    def extract_classifications(self, ops_response: EPOOPSResponse) -> List[Classification]:
+        """
+        Extract and normalize classifications from EPO OPS response.
+
+        Args:
+            ops_response: EPO OPS API response
+
+        Returns:
+            List of Classification objects (IPC first, then CPC)
+        """
+        if not ops_response.response_data or ops_response.status_code != 200:
+            return []
+
+        try:
+            biblio = self._find_bibliographic_data(ops_response.response_data)
+            if not biblio:
+                return []
+
+            classifications = []
+            seen_codes = set()
+
+            # IPC: "E04B   2/    86            A I" style text entries
+            ipcr_section = biblio.get('classifications-ipcr', {})
+            ipcr_entries = ipcr_section.get('classification-ipcr', []) if isinstance(ipcr_section, dict) else []
+            if not isinstance(ipcr_entries, list):
+                ipcr_entries = [ipcr_entries]
+
+            for entry in ipcr_entries:
+                if isinstance(entry, dict):
+                    code = self._normalize_ipc_text(self._text(entry.get('text')))
+                    if code and ('IPC', code) not in seen_codes:
+                        classifications.append(Classification(system='IPC', code=code))
+                        seen_codes.add(('IPC', code))
+
+            # CPC: structured section/class/subclass/main-group/subgroup entries
+            cpc_section = biblio.get('patent-classifications', {})
+            cpc_entries = cpc_section.get('patent-classification', []) if isinstance(cpc_section, dict) else []
+            if not isinstance(cpc_entries, list):
+                cpc_entries = [cpc_entries]
+
+            for entry in cpc_entries:
+                if isinstance(entry, dict):
+                    code = self._format_cpc_entry(entry)
+                    if code and ('CPC', code) not in seen_codes:
+                        classifications.append(Classification(system='CPC', code=code))
+                        seen_codes.add(('CPC', code))
+
+            return classifications
+
+        except Exception as e:
+            logger.warning("⚠️ Error extracting classifications for %s: %s", ops_response.ep_number, e,
+                           extra={'ep_number': ops_response.ep_number, 'error': str(e)})
+            return []
+
+    def _find_bibliographic_data(self, ops_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Find the bibliographic-data section, with or without the 'ops:' prefix.
+
+        Args:
+            ops_data: Full EPO OPS response data
+
+        Returns:
+            bibliographic-data dictionary or empty dict
+        """
+        world_patent_data = ops_data.get('ops:world-patent-data', ops_data.get('world-patent-data', {}))
+        if not isinstance(world_patent_data, dict):
+            return {}
+
+        exchange_document = world_patent_data.get('exchange-documents', {}).get('exchange-document', {})
+        if isinstance(exchange_document, list):
+            exchange_document = exchange_document[0] if exchange_document else {}
+        if not isinstance(exchange_document, dict):
+            return {}
+
+        biblio = exchange_document.get('bibliographic-data', {})
+        return biblio if isinstance(biblio, dict) else {}
+
+    def _text(self, value: Any) -> str:
+        """Return the text content of an OPS JSON value ({'$': ...} or plain)."""
+        if isinstance(value, dict):
+            return str(value.get('$', value.get('#text', '')))
+        return str(value) if value is not None else ''
+
+    def _normalize_ipc_text(self, text: str) -> str:
+        """
+        Normalize IPCR text to "E04B 2/86" format.
+
+        Args:
+            text: Raw IPCR text (e.g., "E04B   2/    86            A I")
+
+        Returns:
+            Normalized IPC code or empty string
+        """
+        match = re.match(r'\s*([A-H]\d{2}[A-Z])\s*(\d+)\s*/\s*(\d+)', text or '')
+        if not match:
+            return ''
+        return f"{match.group(1)} {match.group(2)}/{match.group(3)}"
+
+    def _format_cpc_entry(self, entry: Dict[str, Any]) -> str:
+        """
+        Format a structured patent-classification entry as "E04B 2/8617".
+
+        Args:
+            entry: patent-classification entry
+
+        Returns:
+            CPC code or empty string
+        """
+        parts = {key: self._text(entry.get(key)).strip()
+                 for key in ['section', 'class', 'subclass', 'main-group', 'subgroup']}
+
+        if not all(parts.values()):
+            return ''
+
+        return f"{parts['section']}{parts['class']}{parts['subclass']} {parts['main-group']}/{parts['subgroup']}"
+
+    def analyze_classification_patterns(self, all_classifications: List[List[Classification]]) -> Dict[str, int]:
+        """
+        Count IPC subclasses (first four characters) across patents.
+
+        Args:
+            all_classifications: List of classification lists for each patent
+
+        Returns:
+            Dictionary mapping IPC subclass to number of patents
+        """
+        subclass_counts = {}
+
+        for patent_classifications in all_classifications:
+            subclasses = {c.code[:4] for c in patent_classifications if c.system == 'IPC'}
+            for subclass in subclasses:
+                subclass_counts[subclass] = subclass_counts.get(subclass, 0) + 1
+
+        return dict(sorted(subclass_counts.items(), key=lambda x: x[1], reverse=True))
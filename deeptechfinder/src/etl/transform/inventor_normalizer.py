@@ -5,6 +5,9 @@ Inventor normalization and standardization.
 import re
 from typing import List, Dict, Any
 from ..load.data_models import Inventor, EPOOPSResponse
+from ...utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
 
 class InventorNormalizer:
     """
@@ -61,7 +64,8 @@ class InventorNormalizer:
             return inventors
             
         except Exception as e:
-            print(f"⚠️ Error extracting inventors for {ops_response.ep_number}: {e}")
+            logger.warning("⚠️ Error extracting inventors for %s: %s", ops_response.ep_number, e,
+                           extra={'ep_number': ops_response.ep_number, 'error': str(e)})
             return []
     
     def _normalize_inventor_name(self, name: str) -> str:
@@ -5,6 +5,9 @@ Implements corrected logic based on working EPO OPS JSON structure.
 
 from typing import List, Dict, Any, Optional
 from ..load.data_models import PriorityClaim, EPOOPSResponse
+from ...utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
 
 class PriorityNormalizer:
     """
@@ -67,7 +70,8 @@ class PriorityNormalizer:
             return priorities
             
         except Exception as e:
-            print(f"⚠️ Error extracting priorities for {ops_response.ep_number}: {e}")
+            logger.warning("⚠️ Error extracting priorities for %s: %s", ops_response.ep_number, e,
+                           extra={'ep_number': ops_response.ep_number, 'error': str(e)})
             return []
     
     def _find_priority_claims_section(self, ops_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -0,0 +1,206 @@
+"""
+Columnar Parquet export of analysis results.
+Writes normalized fact tables into partitioned Parquet datasets.
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Any
+from urllib.parse import quote
+
+import pandas as pd
+
+from ..core.config import config
+from ..core.exceptions import ExportError
+from ..etl.load.data_models import AnalysisResult
+from ..utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+class ParquetExporter:
+    """
+    Exports AnalysisResult objects as normalized fact tables.
+
+    Layout (hive partitioning, readable with pyarrow/pandas/DuckDB/Spark):
+        <root>/<table>/university=<name>/snapshot_date=<YYYY-MM-DD>/part-0.parquet
+
+    Re-exporting the same university and snapshot date replaces that partition.
+    """
+
+    TABLES = ('patents', 'applicants', 'inventors', 'priorities', 'classifications')
+
+    def __init__(self, output_dir: Optional[Path] = None, row_group_size: Optional[int] = None):
+        if pa is None:
+            raise ExportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        self.output_dir = Path(output_dir) if output_dir else config.get_parquet_dir_path()
+        self.row_group_size = row_group_size or config.export.row_group_size
+        self.schemas = {
+            'patents': pa.schema([
+                ('ep_number', pa.string()),
+                ('filing_year', pa.string()),
+                ('patent_status', pa.string()),
+                ('technical_field', pa.string()),
+                ('original_title', pa.string()),
+                ('title', pa.string()),
+                ('filing_date', pa.string()),
+                ('publication_date', pa.string()),
+                ('ops_success', pa.bool_()),
+                ('extraction_date', pa.timestamp('us')),
+                ('errors', pa.list_(pa.string())),
+            ]),
+            'applicants': pa.schema([
+                ('ep_number', pa.string()),
+                ('position', pa.int16()),
+                ('name', pa.string()),
+                ('category', pa.string()),
+                ('country', pa.string()),
+            ]),
+            'inventors': pa.schema([
+                ('ep_number', pa.string()),
+                ('position', pa.int16()),
+                ('name', pa.string()),
+                ('country', pa.string()),
+            ]),
+            'priorities': pa.schema([
+                ('ep_number', pa.string()),
+                ('country', pa.string()),
+                ('number', pa.string()),
+                ('date', pa.string()),
+                ('formatted', pa.string()),
+            ]),
+            'classifications': pa.schema([
+                ('ep_number', pa.string()),
+                ('system', pa.string()),
+                ('code', pa.string()),
+            ]),
+        }
+
+    def export(self, result: AnalysisResult, snapshot_date: Optional[date] = None) -> Dict[str, str]:
+        """
+        Write all fact tables for one analysis result.
+
+        Args:
+            result: Completed university analysis
+            snapshot_date: Partition date (defaults to the portfolio analysis date)
+
+        Returns:
+            Mapping of table name to written file path (also stored in result.export_paths)
+        """
+        portfolio = result.portfolio
+        snapshot_date = snapshot_date or portfolio.analysis_date.date()
+
+        written = {}
+        for table in self.TABLES:
+            path = self._partition_path(table, portfolio.university_name, snapshot_date)
+            rows = self._table_rows(table, result)
+            self._write_rows(path, self.schemas[table], rows)
+            written[table] = str(path)
+            result.export_paths[f'parquet_{table}'] = str(path)
+
+        logger.info("💾 Parquet export: %d tables for %s → %s", len(written), portfolio.university_name, self.output_dir,
+                    extra={'university': portfolio.university_name, 'tables': len(written), 'path': str(self.output_dir)})
+        return written
+
+    def load_table(self, table: str, universities: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read one fact table across all exported partitions.
+
+        Args:
+            table: One of TABLES
+            universities: Optional university filter (pushed down to the partition level)
+
+        Returns:
+            DataFrame including 'university' and 'snapshot_date' partition columns
+        """
+        if table not in self.TABLES:
+            raise ExportError(f"Unknown table '{table}'. Available: {list(self.TABLES)}")
+
+        table_dir = self.output_dir / table
+        if not table_dir.exists():
+            return pd.DataFrame()
+
+        dataset = ds.dataset(
+            table_dir,
+            format='parquet',
+            partitioning=ds.partitioning(
+                pa.schema([('university', pa.string()), ('snapshot_date', pa.string())]),
+                flavor='hive'
+            )
+        )
+        row_filter = ds.field('university').isin(universities) if universities else None
+        return dataset.to_table(filter=row_filter).to_pandas()
+
+    def _partition_path(self, table: str, university: str, snapshot_date: date) -> Path:
+        """Build the hive-style partition file path (university name is URI-encoded)."""
+        return (self.output_dir / table
+                / f"university={quote(university, safe='')}"
+                / f"snapshot_date={snapshot_date.isoformat()}"
+                / "part-0.parquet")
+
+    def _write_rows(self, path: Path, schema: "pa.Schema", rows: Iterator[Dict[str, Any]]):
+        """Stream rows into a Parquet file, one row group per row_group_size rows."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.parquet.tmp')
+
+        try:
+            with pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+                batch = []
+                row_groups = 0
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= self.row_group_size:
+                        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                        row_groups += 1
+                        batch = []
+
+                # Write the tail (or an empty row group so the file is readable)
+                if batch or row_groups == 0:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+            tmp_path.replace(path)
+
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            raise ExportError(f"Failed to write {path}: {e}")
+
+    def _table_rows(self, table: str, result: AnalysisResult) -> Iterator[Dict[str, Any]]:
+        """Yield normalized rows for one fact table."""
+        for patent in result.portfolio.patents:
+            biblio = patent.biblio
+
+            if table == 'patents':
+                yield {
+                    'ep_number': patent.ep_number,
+                    'filing_year': patent.filing_year,
+                    'patent_status': patent.patent_status,
+                    'technical_field': patent.technical_field,
+                    'original_title': patent.original_title,
+                    'title': biblio.title if biblio else None,
+                    'filing_date': biblio.filing_date if biblio else None,
+                    'publication_date': biblio.publication_date if biblio else None,
+                    'ops_success': patent.ops_success,
+                    'extraction_date': patent.extraction_date,
+                    'errors': patent.errors,
+                }
+            elif biblio is None:
+                continue
+            elif table == 'applicants':
+                for position, applicant in enumerate(biblio.applicants):
+                    yield {'ep_number': patent.ep_number, 'position': position, **applicant.model_dump()}
+            elif table == 'inventors':
+                for position, inventor in enumerate(biblio.inventors):
+                    yield {'ep_number': patent.ep_number, 'position': position, **inventor.model_dump()}
+            elif table == 'priorities':
+                for priority in biblio.priority_claims:
+                    yield {'ep_number': patent.ep_number, **priority.model_dump()}
+            elif table == 'classifications':
+                for classification in biblio.classifications:
+                    yield {'ep_number': patent.ep_number, 'system': classification.system, 'code': classification.code}
@@ -0,0 +1,193 @@
+"""
+Logging configuration and rate-limited progress reporting.
+"""
+
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..core.config import config
+
+LOGGER_NAME = 'deeptechfinder'
+CONSOLE_HANDLER = 'deeptechfinder.console'
+
+# Attributes of every LogRecord; anything else on a record came from extra= and is a structured field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+def log_fields(record: logging.LogRecord) -> dict:
+    """Structured fields passed with extra= (e.g. university, ep_number, patents_retrieved)."""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Log file formatter that keeps the structured fields of each record.
+
+    'text' appends them as key=value pairs to the configured format,
+    'json' writes one JSON object per line (time, level, logger, message, fields).
+    """
+
+    def __init__(self, fmt: Optional[str] = None, style: str = 'text'):
+        super().__init__(fmt)
+        self.style = style
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = log_fields(record)
+        if self.style == 'json':
+            entry = {'time': self.formatTime(record), 'level': record.levelname, 'logger': record.name,
+                     'message': record.getMessage(), **fields}
+            if record.exc_info:
+                entry['exception'] = self.formatException(record.exc_info)
+            return json.dumps(entry, ensure_ascii=False, default=str)
+        text = super().format(record)
+        if fields:
+            text += ' | ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+def get_logger(module_name: str) -> logging.Logger:
+    """
+    Get a component logger below the 'deeptechfinder' namespace.
+
+    Args:
+        module_name: Module __name__ (e.g., "src.etl.extract.epo_ops_client")
+
+    Returns:
+        Logger named e.g. "deeptechfinder.etl.extract.epo_ops_client"
+    """
+    if module_name.startswith('src.'):
+        module_name = module_name[len('src.'):]
+    return logging.getLogger(f"{LOGGER_NAME}.{module_name}")
+
+def setup_logging(level: Optional[str] = None, quiet: bool = False, log_file: Optional[str] = None) -> logging.Logger:
+    """
+    Configure console and file logging from the 'logging' section of settings.yaml.
+
+    Console output keeps the plain message (emoji progress style); the log file
+    uses the configured format with timestamps and logger names, plus the
+    structured fields of each record (logging.file_format 'text' or 'json').
+
+    Args:
+        level: Console level override (e.g., "DEBUG"); defaults to config.logging.level
+        quiet: Only show warnings and errors on the console, disable progress output
+        log_file: Log file override; empty string disables file logging
+
+    Returns:
+        The configured 'deeptechfinder' logger
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    console_level = 'WARNING' if quiet else (level or config.logging.level)
+    console = logging.StreamHandler(sys.stdout)
+    console.set_name(CONSOLE_HANDLER)
+    console.setLevel(console_level.upper())
+    console.setFormatter(logging.Formatter(config.logging.console_format))
+    logger.addHandler(console)
+
+    log_file = config.logging.file if log_file is None else log_file
+    if log_file:
+        log_path = Path(log_file)
+        if not log_path.is_absolute():
+            log_path = config.get_project_root() / log_path
+        try:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(log_path, encoding='utf-8')
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(StructuredFormatter(config.logging.format, config.logging.file_format))
+            logger.addHandler(file_handler)
+        except OSError as e:
+            logger.warning("⚠️  Cannot write log file %s: %s", log_path, e, extra={'path': str(log_path)})
+
+    return logger
+
+def ensure_logging():
+    """Apply the default configuration unless logging was already set up (e.g., by the CLI)."""
+    if not logging.getLogger(LOGGER_NAME).handlers:
+        setup_logging()
+
+def is_quiet() -> bool:
+    """Whether the console only shows warnings and errors (quiet mode)."""
+    for handler in logging.getLogger(LOGGER_NAME).handlers:
+        if handler.get_name() == CONSOLE_HANDLER:
+            return handler.level > logging.INFO
+    return False
+
+class ProgressReporter:
+    """
+    Batched progress reporting for per-item loops.
+
+    Uses a tqdm bar on interactive terminals; otherwise (CI logs, pipes,
+    notebooks without a TTY) logs one summary line at most every
+    progress_interval_seconds. Nothing is shown in quiet mode.
+    """
+
+    def __init__(self, total: int, description: str, logger: Optional[logging.Logger] = None,
+                 interval: Optional[float] = None):
+        self.total = total
+        self.description = description
+        self.logger = logger or get_logger('progress')
+        self.interval = config.logging.progress_interval_seconds if interval is None else interval
+        self.done = 0
+        self.succeeded = 0
+        self.failed = 0
+        self._started = time.monotonic()
+        self._last_report = self._started
+        self._bar = None
+
+        if not is_quiet() and sys.stderr.isatty():
+            try:
+                from tqdm import tqdm
+                self._bar = tqdm(total=total, desc=description, unit='item', mininterval=0.5, leave=False)
+            except ImportError:
+                self._bar = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def update(self, success: bool = True, count: int = 1):
+        """Record processed items."""
+        self.done += count
+        if success:
+            self.succeeded += count
+        else:
+            self.failed += count
+
+        if self._bar is not None:
+            self._bar.update(count)
+            self._bar.set_postfix(ok=self.succeeded, failed=self.failed, refresh=False)
+            return
+
+        now = time.monotonic()
+        if now - self._last_report >= self.interval and self.done < self.total:
+            self._last_report = now
+            self._log(logging.INFO, now)
+
+    def close(self):
+        """Finish the bar or log the final status line."""
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
+        if self.total:
+            self._log(logging.DEBUG, time.monotonic())
+
+    def _log(self, level: int, now: float):
+        elapsed = now - self._started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        percent = self.done / self.total * 100 if self.total else 100.0
+        eta = (self.total - self.done) / rate if rate > 0 else 0.0
+        self.logger.log(
+            level, "⏳ %s: %d/%d (%.0f%%) ok=%d failed=%d · %.1f/s · ETA %.0fs",
+            self.description, self.done, self.total, percent, self.succeeded, self.failed, rate, eta,
+            extra={'progress': self.description, 'done': self.done, 'total': self.total,
+                   'succeeded': self.succeeded, 'failed': self.failed, 'rate': round(rate, 2)}
+        )
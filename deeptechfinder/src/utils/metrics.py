@@ -0,0 +1,185 @@
+"""
+Run metrics for the ETL pipeline: phase timings, counters and latency histograms.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional
+
+# Latency buckets in seconds (upper bounds), tuned for OPS round-trips
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-compatible cumulative buckets."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        """Record one observation."""
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+
+    def cumulative_counts(self) -> Dict[str, int]:
+        """Cumulative counts per upper bound, including '+Inf'."""
+        cumulative = {}
+        running = 0
+        for upper, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(upper)] = running
+        cumulative['+Inf'] = self.count
+        return cumulative
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'min': round(self.min, 6) if self.min is not None else None,
+            'max': round(self.max, 6) if self.max is not None else None,
+            'buckets': self.cumulative_counts(),
+        }
+
+class MetricsRecorder:
+    """
+    Thread-safe collector for one pipeline run.
+
+    Records per-phase wall-clock durations, monotonic counters (requests, bytes,
+    retries, rate-limit sleep), latency histograms and cache hit/miss pairs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all metrics (called at the start of each analysis)."""
+        with self._lock:
+            self.started_at = datetime.now()
+            self.phases: Dict[str, float] = {}
+            self.counters: Dict[str, float] = {}
+            self.histograms: Dict[str, Histogram] = {}
+            self.cache: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a pipeline phase (durations of repeated phases are summed)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def increment(self, name: str, value: float = 1):
+        """Increase a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """Record a histogram observation."""
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(buckets)
+            self.histograms[name].observe(value)
+
+    def cache_hit(self, cache: str):
+        """Record a hit for the named cache."""
+        self._cache_event(cache, 'hits')
+
+    def cache_miss(self, cache: str):
+        """Record a miss for the named cache."""
+        self._cache_event(cache, 'misses')
+
+    def _cache_event(self, cache: str, kind: str):
+        with self._lock:
+            stats = self.cache.setdefault(cache, {'hits': 0, 'misses': 0})
+            stats[kind] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable report of the run."""
+        with self._lock:
+            total_seconds = sum(self.phases.values())
+            requests = self.counters.get('ops_requests', 0)
+
+            cache_report = {}
+            for name, stats in self.cache.items():
+                lookups = stats['hits'] + stats['misses']
+                cache_report[name] = {
+                    **stats,
+                    'hit_rate': round(stats['hits'] / lookups * 100, 1) if lookups else 0.0,
+                }
+
+            return {
+                'started_at': self.started_at.isoformat(),
+                'total_seconds': round(total_seconds, 6),
+                'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+                'counters': dict(self.counters),
+                'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+                'cache': cache_report,
+                'throughput': {
+                    'ops_requests_per_second': round(requests / total_seconds, 3) if total_seconds else 0.0,
+                },
+            }
+
+    def to_prometheus(self, prefix: str = 'dtf', labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+            labels: Constant labels added to every sample (e.g., {'university': ...})
+
+        Returns:
+            Exposition text (suitable for a node_exporter textfile collector)
+        """
+        base_labels = dict(labels or {})
+
+        def fmt(extra: Optional[Dict[str, str]] = None) -> str:
+            merged = {**base_labels, **(extra or {})}
+            if not merged:
+                return ''
+            pairs = []
+            for key, value in merged.items():
+                value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                pairs.append(f'{key}="{value}"')
+            return '{' + ','.join(pairs) + '}'
+
+        lines = []
+        with self._lock:
+            lines.append(f'# TYPE {prefix}_phase_seconds gauge')
+            for phase, seconds in self.phases.items():
+                lines.append(f'{prefix}_phase_seconds{fmt({"phase": phase})} {seconds:.6f}')
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                lines.append(f'{prefix}_{name}_total{fmt()} {value}')
+
+            for name, histogram in sorted(self.histograms.items()):
+                lines.append(f'# TYPE {prefix}_{name} histogram')
+                for upper, count in histogram.cumulative_counts().items():
+                    lines.append(f'{prefix}_{name}_bucket{fmt({"le": upper})} {count}')
+                lines.append(f'{prefix}_{name}_sum{fmt()} {histogram.sum:.6f}')
+                lines.append(f'{prefix}_{name}_count{fmt()} {histogram.count}')
+
+            if self.cache:
+                lines.append(f'# TYPE {prefix}_cache_lookups_total counter')
+                for cache, stats in sorted(self.cache.items()):
+                    for result, count in stats.items():
+                        lines.append(f'{prefix}_cache_lookups_total{fmt({"cache": cache, "result": result})} {count}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,81 @@
+"""
+Token bucket rate limiting for OPS request budgets.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from .metrics import MetricsRecorder
+
+class TokenBucket:
+    """
+    Token bucket shared by all callers of one client.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token. The sync acquire() is thread-safe, the async
+    acquire_async() is safe for any number of tasks on one event loop.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 metrics: Optional[MetricsRecorder] = None):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.metrics = metrics
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_interval(cls, interval_seconds: float, burst: float = 1.0,
+                      metrics: Optional[MetricsRecorder] = None) -> 'TokenBucket':
+        """Bucket allowing one request per interval_seconds (e.g. rate_limit_seconds)."""
+        return cls(1.0 / interval_seconds if interval_seconds > 0 else 1e9, burst, metrics)
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens (possibly going negative) and return the wait until they are covered."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= tokens
+            return max(0.0, -self.tokens / self.rate)
+
+    def _record(self, wait: float):
+        if wait > 0 and self.metrics is not None:
+            self.metrics.increment('rate_limit_sleep_seconds', wait)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until tokens are available.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        self._record(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """
+        Wait (without blocking the event loop) until tokens are available.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(wait)
+        return wait
+
+    def penalize(self, seconds: float):
+        """Drain the bucket so the next requests wait at least `seconds` (e.g. after Retry-After)."""
+        with self._lock:
+            self.tokens = min(self.tokens, -seconds * self.rate)
+            self._updated = time.monotonic()
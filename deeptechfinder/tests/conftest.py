@@ -0,0 +1,45 @@
+"""
+Shared pytest fixtures.
+"""
+
+import os
+
+import pytest
+
+from src.core.config import config
+from src.utils.logging_setup import setup_logging
+from tests.ops_standin import OPSStandIn, StandInSettings
+
+@pytest.fixture(scope='session', autouse=True)
+def no_log_file():
+    """Log to the console only, so test runs don't append to the project's logs/ file."""
+    setup_logging(log_file='')
+
+@pytest.fixture(scope='session')
+def ops_standin_settings() -> StandInSettings:
+    """Stand-in behaviour; override in a conftest/module to inject latency or errors."""
+    return StandInSettings(seed=0)
+
+@pytest.fixture(scope='session')
+def ops_standin(ops_standin_settings):
+    """
+    Running OPS stand-in server with the OPS clients pointed at it.
+
+    Sets OPS_BASE_URL/OPS_AUTH_URL and dummy credentials in the environment and
+    patches the loaded config, restoring both afterwards.
+    """
+    with OPSStandIn(settings=ops_standin_settings) as server:
+        saved_env = {name: os.environ.get(name) for name in server.env()}
+        saved_urls = (config.epo_ops.base_url, config.epo_ops.auth_url)
+
+        os.environ.update(server.env())
+        config.epo_ops.base_url, config.epo_ops.auth_url = server.base_url, server.auth_url
+        try:
+            yield server
+        finally:
+            config.epo_ops.base_url, config.epo_ops.auth_url = saved_urls
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
@@ -0,0 +1,641 @@
+"""
+Offline EPO OPS stand-in server.
+
+Serves recorded OPS responses (auth, biblio, family, search, images) over HTTP
+so the OPS clients can be exercised and benchmarked without credentials:
+
+- biblio: legacy/output/*.json, the raw payload archive and recordings
+- search: recordings, or CQL (ic/ipc/cpc/pa/pn terms) evaluated against the biblio fixtures
+- family: recordings
+- images: recordings, or generated placeholder inquiry XML and TIFF pages
+- auth: accepts any client credentials and issues bearer tokens
+
+Latency, OPS throttling headers (X-Throttling-Control, quota headers) and
+429/5xx errors are injected according to StandInSettings. With an upstream
+URL configured, misses are proxied to the real OPS and stored as recordings.
+
+Point the clients at it through the environment:
+
+    OPS_BASE_URL=http://127.0.0.1:8089/3.2/rest-services
+    OPS_AUTH_URL=http://127.0.0.1:8089/3.2/auth/accesstoken
+
+Usage:
+    python -m tests.ops_standin --port 8089 --latency 0.2 --error-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import secrets
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+import requests
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'ops'
+LEGACY_OUTPUT_DIR = PROJECT_ROOT / 'legacy' / 'output'
+
+AUTH_PATH = '/3.2/auth/accesstoken'
+REST_PREFIX = '/3.2/rest-services/'
+
+# Requests per minute per throttling service (OPS defaults for registered users)
+DEFAULT_THROTTLE_LIMITS = {'images': 200, 'inpadoc': 60, 'other': 1000, 'retrieval': 200, 'search': 30}
+
+CONTENT_TYPES = {
+    '.json': 'application/json',
+    '.xml': 'application/xml',
+    '.tiff': 'image/tiff',
+    '.png': 'image/png',
+    '.pdf': 'application/pdf',
+}
+
+@dataclass
+class StandInSettings:
+    """Behaviour of the stand-in server."""
+    latency: float = 0.0                 # Fixed delay per request (seconds)
+    jitter: float = 0.0                  # Additional uniform random delay (seconds)
+    error_rate: float = 0.0              # Probability of an injected error response
+    error_statuses: Tuple[int, ...] = (429, 500, 503)
+    throttle_limits: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_THROTTLE_LIMITS))
+    enforce_throttling: bool = True      # Reject with 429 once a service exceeds its limit
+    system_state: str = 'idle'
+    token_ttl: int = 1200
+    require_auth: bool = True
+    placeholder_images: bool = True
+    seed: Optional[int] = None
+    upstream: Optional[str] = None       # e.g. "https://ops.epo.org/3.2" to record misses
+
+def _text(value: Any) -> str:
+    """Text content of an OPS JSON value ({'$': ...} or plain)."""
+    if isinstance(value, dict):
+        return str(value.get('$', ''))
+    return str(value) if value is not None else ''
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _number_key(number: str) -> str:
+    """Normalize a document number for lookups ("EP019196837", "EP.3732452.A1", "19196837.9")."""
+    number = number.upper()
+    if '.' in number:
+        parts = number.split('.')
+        number = parts[1] if re.fullmatch(r'[A-Z]{2}', parts[0]) else parts[0]
+    number = re.sub(r'^[A-Z]{2}', '', number)
+    number = re.sub(r'(?<=\d)[A-Z]\d?$', '', number)
+    return number.lstrip('0') or number
+
+def placeholder_tiff(width: int = 16, height: int = 16) -> bytes:
+    """Build a small uncompressed grayscale TIFF page."""
+    pixels = bytes((x * 255 // max(width - 1, 1)) for _ in range(height) for x in range(width))
+    entries = [
+        (256, 3, 1, width),           # ImageWidth
+        (257, 3, 1, height),          # ImageLength
+        (258, 3, 1, 8),               # BitsPerSample
+        (259, 3, 1, 1),               # Compression: none
+        (262, 3, 1, 1),               # Photometric: black is zero
+        (273, 4, 1, 0),               # StripOffsets (patched below)
+        (277, 3, 1, 1),               # SamplesPerPixel
+        (278, 3, 1, height),          # RowsPerStrip
+        (279, 4, 1, len(pixels)),     # StripByteCounts
+    ]
+    ifd_offset = 8
+    data_offset = ifd_offset + 2 + len(entries) * 12 + 4
+    ifd = struct.pack('<H', len(entries))
+    for tag, type_, count, value in entries:
+        value = data_offset if tag == 273 else value
+        packed = struct.pack('<H', value) + b'\0\0' if type_ == 3 else struct.pack('<I', value)
+        ifd += struct.pack('<HHI', tag, type_, count) + packed
+    return b'II*\0' + struct.pack('<I', ifd_offset) + ifd + struct.pack('<I', 0) + pixels
+
+class FixtureStore:
+    """
+    Index of recorded OPS responses.
+
+    Biblio payloads are indexed by application and publication number so
+    any reference type/format the clients use resolves to the same document.
+    """
+
+    def __init__(self, fixture_dir: Path = FIXTURE_DIR, biblio_sources: Iterable[Path] = (),
+                 archive_path: Optional[Path] = None):
+        self.fixture_dir = Path(fixture_dir)
+        self.biblio: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.documents: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+        for path in biblio_sources:
+            self.add_biblio(json.loads(Path(path).read_text(encoding='utf-8')))
+
+        for path in sorted((self.fixture_dir / 'biblio').glob('*.json')):
+            self.add_biblio(json.loads(path.read_text(encoding='utf-8')))
+
+        if archive_path and Path(archive_path).exists():
+            from src.etl.load.raw_payload_archive import RawPayloadArchive
+            with RawPayloadArchive(archive_path) as archive:
+                for response in archive.iter_responses():
+                    self.add_biblio(response.response_data)
+
+    @classmethod
+    def default(cls, archive_path: Optional[Path] = None) -> 'FixtureStore':
+        """Fixtures from legacy/output, tests/fixtures/ops and optionally a payload archive."""
+        legacy = [p for p in sorted(LEGACY_OUTPUT_DIR.glob('*.json')) if p.name != 'university_analysis.json']
+        return cls(FIXTURE_DIR, legacy, archive_path)
+
+    def add_biblio(self, payload: Dict[str, Any]):
+        """Index an OPS biblio JSON payload (one or more exchange documents)."""
+        world = payload.get('ops:world-patent-data', payload.get('world-patent-data', {}))
+        documents = _as_list(world.get('exchange-documents', {}).get('exchange-document'))
+        if not documents:
+            return
+
+        with self._lock:
+            for document in documents:
+                biblio = document.get('bibliographic-data', {})
+                self.documents.append(document)
+                for ref_type in ('application', 'publication'):
+                    reference = biblio.get(f'{ref_type}-reference', {})
+                    for doc_id in _as_list(reference.get('document-id')):
+                        if doc_id.get('@document-id-type') == 'docdb':
+                            key = (ref_type, _number_key(_text(doc_id.get('doc-number'))))
+                            self.biblio.setdefault(key, payload)
+
+    def get_biblio(self, ref_type: str, number: str) -> Optional[Dict[str, Any]]:
+        return self.biblio.get((ref_type, _number_key(number)))
+
+    def recording_path(self, service: str, rest_path: str, query: str, suffix: str) -> Path:
+        name = quote(rest_path + (f'?{query}' if query else ''), safe='')
+        return self.fixture_dir / service / f'{name}{suffix}'
+
+    def find_recording(self, service: str, rest_path: str, query: str,
+                       accept: str) -> Optional[Tuple[bytes, str]]:
+        """Look up a recorded response, preferring the requested media type."""
+        suffixes = list(CONTENT_TYPES)
+        if 'json' in accept:
+            suffixes.remove('.json')
+            suffixes.insert(0, '.json')
+        for suffix in suffixes:
+            path = self.recording_path(service, rest_path, query, suffix)
+            if path.exists():
+                return path.read_bytes(), CONTENT_TYPES[suffix]
+        return None
+
+    def save_recording(self, service: str, rest_path: str, query: str, body: bytes, content_type: str):
+        """Store an upstream response as a recording."""
+        suffix = next((s for s, t in CONTENT_TYPES.items() if t in content_type), '.xml')
+        path = self.recording_path(service, rest_path, query, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        if service == 'biblio' and suffix == '.json':
+            self.add_biblio(json.loads(body))
+
+    def search(self, cql: str) -> List[Dict[str, str]]:
+        """
+        Evaluate a simple CQL query ("ic=A61K and pa=dresden") against the biblio fixtures.
+
+        Returns:
+            docdb publication references of matching documents
+        """
+        terms = []
+        for term in re.split(r'\s+and\s+', cql.strip(), flags=re.IGNORECASE):
+            match = re.fullmatch(r'(\w+)\s*(?:=|all|any)\s*"?([^"]*)"?', term.strip(), flags=re.IGNORECASE)
+            if not match or match.group(1).lower() not in ('ic', 'ipc', 'cpc', 'cl', 'pa', 'pn'):
+                raise ValueError(f"Unsupported CQL term: {term}")
+            terms.append((match.group(1).lower(), match.group(2).strip().rstrip('*').upper()))
+
+        results, seen = [], set()
+        with self._lock:
+            documents = list(self.documents)
+        for document in documents:
+            reference = {
+                'country': document.get('@country', ''),
+                'number': document.get('@doc-number', ''),
+                'kind': document.get('@kind', ''),
+            }
+            key = tuple(reference.values())
+            if key not in seen and all(self._matches(document, f, v) for f, v in terms):
+                seen.add(key)
+                results.append(reference)
+        return results
+
+    def _matches(self, document: Dict[str, Any], field_name: str, value: str) -> bool:
+        biblio = document.get('bibliographic-data', {})
+        if field_name in ('ic', 'ipc', 'cl'):
+            codes = [_text(c.get('text')).replace(' ', '') for c in
+                     _as_list(biblio.get('classifications-ipcr', {}).get('classification-ipcr'))]
+            return any(code.startswith(value.replace(' ', '')) for code in codes)
+        if field_name == 'cpc':
+            codes = [''.join(_text(c.get(k)).strip() for k in ('section', 'class', 'subclass', 'main-group'))
+                     for c in _as_list(biblio.get('patent-classifications', {}).get('patent-classification'))]
+            return any(code.startswith(value.split('/')[0].replace(' ', '')) for code in codes)
+        if field_name == 'pa':
+            names = [_text(name.get('name')) for applicant in
+                     _as_list(biblio.get('parties', {}).get('applicants', {}).get('applicant'))
+                     for name in _as_list(applicant.get('applicant-name'))]
+            return any(value in name.upper() for name in names)
+        return f"{document.get('@country', '')}{document.get('@doc-number', '')}" == value.split('.')[0]
+
+class Throttle:
+    """Sliding one-minute request windows per OPS throttling service."""
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self.windows: Dict[str, deque] = {name: deque() for name in limits}
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+
+    def hit(self, service: str) -> Tuple[bool, float]:
+        """
+        Record a request.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        now = time.monotonic()
+        with self._lock:
+            window = self.windows.setdefault(service, deque())
+            while window and now - window[0] >= 60:
+                window.popleft()
+            if len(window) >= self.limits.get(service, DEFAULT_THROTTLE_LIMITS['other']):
+                return False, 60 - (now - window[0])
+            window.append(now)
+            return True, 0.0
+
+    def header(self, system_state: str) -> str:
+        """X-Throttling-Control value, e.g. "idle (images=green:200, ...)"."""
+        now = time.monotonic()
+        parts = []
+        with self._lock:
+            for service in sorted(self.limits):
+                limit = self.limits[service]
+                used = sum(1 for t in self.windows.get(service, ()) if now - t < 60)
+                ratio = used / limit if limit else 1.0
+                color = 'green' if ratio < 0.5 else 'yellow' if ratio < 0.75 else 'red' if ratio < 1.0 else 'black'
+                parts.append(f"{service}={color}:{limit}")
+        return f"{system_state} ({', '.join(parts)})"
+
+class OPSStandIn:
+    """
+    Threaded HTTP server emulating the EPO OPS REST API.
+
+    Usage:
+        with OPSStandIn() as server:
+            os.environ.update(server.env())
+            ...
+    """
+
+    def __init__(self, fixtures: Optional[FixtureStore] = None, settings: Optional[StandInSettings] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.fixtures = fixtures or FixtureStore.default()
+        self.settings = settings or StandInSettings()
+        self.throttle = Throttle(self.settings.throttle_limits)
+        self.tokens: Dict[str, float] = {}
+        self.request_log: List[Dict[str, Any]] = []
+        self._random = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        standin = self
+
+        class Handler(OPSRequestHandler):
+            server_state = standin
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def root_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/3.2"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.root_url}/rest-services"
+
+    @property
+    def auth_url(self) -> str:
+        return f"{self.root_url}/auth/accesstoken"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point the OPS clients at this server."""
+        return {
+            'OPS_BASE_URL': self.base_url,
+            'OPS_AUTH_URL': self.auth_url,
+            'OPS_KEY': 'standin-key',
+            'OPS_SECRET': 'standin-secret',
+        }
+
+    def start(self) -> 'OPSStandIn':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='ops-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counts by service and status."""
+        with self._lock:
+            log = list(self.request_log)
+        by_status: Dict[str, int] = {}
+        by_service: Dict[str, int] = {}
+        for entry in log:
+            by_status[str(entry['status'])] = by_status.get(str(entry['status']), 0) + 1
+            by_service[entry['service']] = by_service.get(entry['service'], 0) + 1
+        return {'requests': len(log), 'by_status': by_status, 'by_service': by_service}
+
+    def issue_token(self) -> Dict[str, Any]:
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            self.tokens[token] = time.monotonic() + self.settings.token_ttl
+        return {
+            'access_token': token,
+            'token_type': 'BearerToken',
+            'expires_in': str(self.settings.token_ttl),
+            'status': 'approved',
+        }
+
+    def token_valid(self, authorization: str) -> bool:
+        if not self.settings.require_auth:
+            return True
+        token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else ''
+        with self._lock:
+            expires = self.tokens.get(token)
+        return expires is not None and expires > time.monotonic()
+
+    def delay(self):
+        jitter = self._uniform(0, self.settings.jitter) if self.settings.jitter else 0.0
+        if self.settings.latency or jitter:
+            time.sleep(self.settings.latency + jitter)
+
+    def injected_error(self) -> Optional[int]:
+        if self.settings.error_rate and self._uniform(0, 1) < self.settings.error_rate:
+            with self._lock:
+                return self._random.choice(self.settings.error_statuses)
+        return None
+
+    def log(self, method: str, path: str, service: str, status: int):
+        with self._lock:
+            self.request_log.append({'method': method, 'path': path, 'service': service, 'status': status})
+
+    def _uniform(self, low: float, high: float) -> float:
+        with self._lock:
+            return self._random.uniform(low, high)
+
+class OPSRequestHandler(BaseHTTPRequestHandler):
+    """Routes OPS requests to fixtures, synthesized responses or the upstream proxy."""
+
+    server_state: OPSStandIn = None
+    protocol_version = 'HTTP/1.1'
+
+    BIBLIO_PATH = re.compile(r'published-data/(application|publication|priority)/(epodoc|docdb|original)/([^/]+)/biblio$')
+    IMAGES_INQUIRY_PATH = re.compile(r'published-data/publication/(epodoc|docdb)/([^/]+)/images$')
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        state = self.server_state
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        body = self.rfile.read(length) if length else b''
+        path = urlsplit(self.path).path
+
+        if path != AUTH_PATH:
+            return self._fault(405, 'CLIENT.MethodNotAllowed', 'Only GET is supported on this resource', 'other')
+
+        if state.settings.upstream:
+            return self._proxy('POST', 'auth', '', '', body)
+
+        if not self.headers.get('Authorization', '').startswith('Basic '):
+            return self._fault(401, 'CLIENT.InvalidClientCredentials', 'Client credentials are missing', 'other')
+
+        state.delay()
+        self._send(200, json.dumps(state.issue_token()).encode(), 'application/json', 'other')
+
+    def do_GET(self):
+        state = self.server_state
+        parts = urlsplit(self.path)
+        if not parts.path.startswith(REST_PREFIX):
+            return self._fault(404, 'SERVER.EntityNotFound', 'Unknown resource', 'other')
+
+        rest_path = parts.path[len(REST_PREFIX):]
+        query = urlencode(sorted(parse_qsl(parts.query)))
+        service, fixture_group = self._classify(rest_path)
+
+        if not state.settings.upstream and not state.token_valid(self.headers.get('Authorization', '')):
+            return self._fault(401, 'CLIENT.InvalidAccessToken', 'Invalid or expired access token', service)
+
+        allowed, retry_after = state.throttle.hit(service)
+        if not allowed and state.settings.enforce_throttling:
+            return self._fault(429, 'SERVER.LimitedServerResources', 'Please request again later',
+                               service, {'Retry-After': str(max(int(retry_after), 1))})
+
+        state.delay()
+
+        status = state.injected_error()
+        if status is not None:
+            extra = {'Retry-After': '1'} if status == 429 else {}
+            return self._fault(status, 'SERVER.Injected', 'Injected error', service, extra)
+
+        accept = self.headers.get('Accept', '')
+        recorded = state.fixtures.find_recording(fixture_group, rest_path, query, accept)
+        if recorded:
+            return self._send(200, recorded[0], recorded[1], service)
+
+        response = self._synthesize(rest_path, dict(parse_qsl(parts.query)), accept)
+        if response:
+            return self._send(200, *response, service)
+
+        if state.settings.upstream:
+            return self._proxy('GET', fixture_group, rest_path, query)
+
+        self._fault(404, 'SERVER.EntityNotFound', 'No results found', service)
+
+    def _classify(self, rest_path: str) -> Tuple[str, str]:
+        """Map a REST path to its (throttling service, fixture group)."""
+        if rest_path.startswith('published-data/search'):
+            return 'search', 'search'
+        if rest_path.startswith('published-data/images') or rest_path.endswith('/images'):
+            return 'images', 'images'
+        if rest_path.startswith('family'):
+            return 'inpadoc', 'family'
+        if rest_path.startswith('published-data'):
+            return 'retrieval', 'biblio' if rest_path.endswith('/biblio') else 'published-data'
+        return 'other', 'other'
+
+    def _synthesize(self, rest_path: str, params: Dict[str, str], accept: str) -> Optional[Tuple[bytes, str]]:
+        """Build a response from the fixture index when no recording exists."""
+        fixtures = self.server_state.fixtures
+        settings = self.server_state.settings
+
+        match = self.BIBLIO_PATH.match(rest_path)
+        if match and 'xml' not in accept:
+            ref_type = 'application' if match.group(1) == 'application' else 'publication'
+            payload = fixtures.get_biblio(ref_type, match.group(3))
+            return (json.dumps(payload).encode(), 'application/json') if payload else None
+
+        if rest_path.startswith('published-data/search') and 'q' in params:
+            try:
+                results = fixtures.search(params['q'])
+            except ValueError:
+                return None
+            return json.dumps(self._search_payload(params, results)).encode(), 'application/json'
+
+        if settings.placeholder_images:
+            match = self.IMAGES_INQUIRY_PATH.match(rest_path)
+            if match:
+                number = match.group(2).replace('.', '/')
+                if match.group(1) == 'epodoc':
+                    number = f"{number[:2]}/{number[2:]}"
+                if 'json' in accept:
+                    return json.dumps(self._images_inquiry_json(number)).encode(), 'application/json'
+                return self._images_inquiry(number).encode(), 'application/xml'
+            if rest_path.startswith('published-data/images/'):
+                return placeholder_tiff(), 'image/tiff'
+
+        return None
+
+    def _search_payload(self, params: Dict[str, str], results: List[Dict[str, str]]) -> Dict[str, Any]:
+        begin, end = 1, 25
+        range_match = re.fullmatch(r'(\d+)-(\d+)', params.get('Range', self.headers.get('X-OPS-Range', '1-25')))
+        if range_match:
+            begin, end = int(range_match.group(1)), int(range_match.group(2))
+        page = results[begin - 1:end]
+        return {'ops:world-patent-data': {'ops:biblio-search': {
+            '@total-result-count': str(len(results)),
+            'ops:query': {'$': params['q'], '@syntax': 'CQL'},
+            'ops:range': {'@begin': str(begin), '@end': str(begin + len(page) - 1)},
+            'ops:search-result': {'ops:publication-reference': [
+                {'@system': 'ops.epo.org', 'document-id': {
+                    '@document-id-type': 'docdb',
+                    'country': {'$': ref['country']},
+                    'doc-number': {'$': ref['number']},
+                    'kind': {'$': ref['kind']},
+                }} for ref in page
+            ]},
+        }}}
+
+    def _images_inquiry_json(self, number_path: str) -> Dict[str, Any]:
+        return {'ops:world-patent-data': {'ops:document-inquiry': {'ops:inquiry-result': {
+            'ops:document-instance': {
+                '@system': 'ops.epo.org',
+                '@number-of-pages': '1',
+                '@desc': 'FirstPageClipping',
+                '@link': f"published-data/images/{number_path}/firstpage",
+                'ops:document-format-options': {'ops:document-format': {'$': 'application/tiff'}},
+            }
+        }}}}
+
+    def _images_inquiry(self, number_path: str) -> str:
+        link = f"published-data/images/{number_path}/firstpage"
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ops:world-patent-data xmlns="http://www.epo.org/exchange" xmlns:ops="http://ops.epo.org">'
+            '<ops:document-inquiry><ops:inquiry-result>'
+            f'<ops:document-instance system="ops.epo.org" number-of-pages="1" desc="FirstPageClipping" link="{link}">'
+            '<ops:document-format-options><ops:document-format>application/tiff</ops:document-format>'
+            '</ops:document-format-options></ops:document-instance>'
+            '</ops:inquiry-result></ops:document-inquiry></ops:world-patent-data>'
+        )
+
+    def _proxy(self, method: str, fixture_group: str, rest_path: str, query: str, body: bytes = b''):
+        """Forward a miss to the upstream OPS and record successful GET responses."""
+        state = self.server_state
+        upstream = state.settings.upstream.rstrip('/')
+        url = f"{upstream}/auth/accesstoken" if method == 'POST' else f"{upstream}/rest-services/{rest_path}"
+        headers = {k: v for k, v in self.headers.items()
+                   if k.lower() in ('authorization', 'accept', 'content-type', 'x-ops-range')}
+        try:
+            response = requests.request(method, url, headers=headers, data=body or None,
+                                        params=query or None, timeout=60)
+        except requests.RequestException as e:
+            return self._fault(502, 'SERVER.UpstreamUnavailable', str(e), 'other')
+
+        content_type = response.headers.get('Content-Type', 'application/xml')
+        if method == 'GET' and response.status_code == 200:
+            state.fixtures.save_recording(fixture_group, rest_path, query, response.content, content_type)
+        extra = {k: v for k, v in response.headers.items() if k.lower().startswith('x-')}
+        self._send(response.status_code, response.content, content_type, fixture_group, extra)
+
+    def _fault(self, status: int, code: str, message: str, service: str, headers: Optional[Dict[str, str]] = None):
+        body = (f'<?xml version="1.0" encoding="UTF-8"?><fault xmlns="http://ops.epo.org">'
+                f'<code>{code}</code><message>{message}</message></fault>').encode()
+        self._send(status, body, 'application/xml', service, headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, service: str,
+              headers: Optional[Dict[str, str]] = None):
+        state = self.server_state
+        with state._lock:
+            state.throttle.bytes_served += len(body)
+            used = state.throttle.bytes_served
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Throttling-Control', state.throttle.header(state.settings.system_state))
+        self.send_header('X-IndividualQuotaPerHour-Used', str(used))
+        self.send_header('X-RegisteredQuotaPerWeek-Used', str(used))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        state.log(self.command, self.path, service, status)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline EPO OPS stand-in server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.0, help='Fixed delay per request (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra delay (seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of an injected error')
+    parser.add_argument('--error-statuses', default='429,500,503', help='Comma-separated injected statuses')
+    parser.add_argument('--no-throttling', action='store_true', help='Never reject over-limit requests')
+    parser.add_argument('--archive', type=Path, help='Also serve biblio payloads from a raw payload archive')
+    parser.add_argument('--record', metavar='UPSTREAM',
+                        help='Proxy misses to the real OPS (e.g. https://ops.epo.org/3.2) and record them')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    settings = StandInSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(',') if s),
+        enforce_throttling=not args.no_throttling,
+        seed=args.seed,
+        upstream=args.record,
+    )
+    server = OPSStandIn(FixtureStore.default(args.archive), settings, args.host, args.port)
+    print(f"🧪 OPS stand-in serving {len(server.fixtures.documents)} biblio documents")
+    for name, value in server.env().items():
+        print(f"   {name}={value}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped")
+    finally:
+        server.httpd.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Tests for the streaming sketches: error bounds, merging and serialization.
+"""
+
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from src.analysis.sketches import CountMinSketch, HyperLogLog, SpaceSaving
+
+def frequencies(keys: int = 2000) -> Counter:
+    """Skewed (Zipf-like) counts, as applicant and IPC frequencies are."""
+    return Counter({f"applicant-{i}": max(1, 5000 // (i + 1)) for i in range(keys)})
+
+@pytest.mark.parametrize('distinct', [100, 5_000, 100_000])
+def test_hyperloglog_within_error_bound(distinct):
+    sketch = HyperLogLog(precision=14)
+    for i in range(distinct):
+        sketch.add(f"EP{i:08d}")
+        sketch.add(f"EP{i:08d}")  # Duplicates don't count
+
+    standard_error = 1.04 / math.sqrt(sketch.m)
+    assert abs(sketch.count() - distinct) <= 3 * standard_error * distinct
+
+def test_hyperloglog_merge_is_union():
+    left, right, both = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    for i in range(30_000):
+        (left if i % 2 else right).add(str(i))
+        both.add(str(i))
+    for i in range(10_000):  # Overlap
+        left.add(str(i))
+
+    left.merge(right)
+
+    assert left.registers == both.registers
+    assert HyperLogLog.from_dict(left.to_dict()).count() == both.count()
+
+def test_hyperloglog_rejects_other_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(14))
+
+def test_count_min_never_undercounts_and_stays_within_bound():
+    counts = frequencies()
+    sketch = CountMinSketch(width=2048, depth=4)
+    for key, count in counts.items():
+        sketch.add(key, count)
+
+    total = sum(counts.values())
+    bound = math.e / sketch.width * total
+    overcounts = [sketch.estimate(key) - count for key, count in counts.items()]
+
+    assert min(overcounts) >= 0
+    # Holds per key with probability 1 - exp(-depth)
+    assert sum(overcount > bound for overcount in overcounts) <= math.exp(-sketch.depth) * len(counts)
+
+def test_count_min_merge_matches_single_sketch():
+    counts = frequencies()
+    whole, first, second = CountMinSketch(), CountMinSketch(), CountMinSketch()
+    for i, (key, count) in enumerate(counts.items()):
+        whole.add(key, count)
+        (first if i % 3 else second).add(key, count)
+
+    first.merge(second)
+
+    assert [row.tolist() for row in first.table] == [row.tolist() for row in whole.table]
+    restored = CountMinSketch.from_dict(first.to_dict())
+    assert all(restored.estimate(key) == whole.estimate(key) for key in counts)
+
+def test_space_saving_keeps_heavy_hitters():
+    counts = frequencies()
+    stream = [key for key, count in counts.items() for _ in range(count)]
+    random.Random(0).shuffle(stream)
+    sketch = SpaceSaving(capacity=100)
+    for key in stream:
+        sketch.add(key)
+
+    # Every key above total/capacity is kept, with its true count within [count - error, count]
+    reported = {key: (count, error) for key, count, error in sketch.top(sketch.capacity)}
+    for key, true_count in counts.items():
+        if true_count > len(stream) / sketch.capacity:
+            count, error = reported[key]
+            assert count - error <= true_count <= count, key
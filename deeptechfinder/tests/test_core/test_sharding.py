@@ -0,0 +1,98 @@
+"""
+Tests for the sharded-execution work queue: claims, leases and retries.
+"""
+
+import time
+
+import pytest
+
+from src.core.config import config
+from src.core.sharding import WorkQueue
+
+@pytest.fixture
+def queue(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db') as queue:
+        yield queue
+
+def test_enqueue_replaces_earlier_tasks_of_a_university(queue):
+    assert queue.enqueue(['Uni A', 'Uni B'], 10, shards_per_university=2) == 4
+    assert queue.enqueue(['Uni A', 'Uni C'], 10, shards_per_university=2) == 4
+    assert queue.status() == {'pending': 6}
+
+def test_new_run_requeues_done_tasks_with_its_own_limit(queue):
+    queue.enqueue(['Uni A'], 10, shards_per_university=2)
+    while (task := queue.claim('worker-1')) is not None:
+        queue.complete(task.task_id, f'{task.task_id}.json', 'worker-1')
+
+    assert queue.enqueue(['Uni A'], 50) == 1
+
+    tasks = queue.tasks()
+    assert [(t['status'], t['patent_limit'], t['shard_count']) for t in tasks] == [('pending', 50, 1)]
+    assert queue.tasks('done') == []
+
+def test_claims_hand_out_each_task_once(queue, tmp_path):
+    queue.enqueue(['Uni A', 'Uni B'], 10)
+
+    with WorkQueue(tmp_path / 'queue.db') as other:
+        first = queue.claim('worker-1', lease_seconds=60)
+        second = other.claim('worker-2', lease_seconds=60)
+        third = other.claim('worker-2', lease_seconds=60)
+
+    assert {first.university, second.university} == {'Uni A', 'Uni B'}
+    assert third is None
+    assert queue.status() == {'running': 2}
+
+def test_expired_lease_is_claimed_again(queue):
+    queue.enqueue(['Uni A'], 10)
+    task = queue.claim('crashed-worker', lease_seconds=0.05)
+    assert queue.claim('worker-2', lease_seconds=60) is None
+
+    time.sleep(0.1)
+    reclaimed = queue.claim('worker-2', lease_seconds=60)
+
+    assert reclaimed.task_id == task.task_id
+    assert reclaimed.attempts == 2
+    assert queue.tasks()[0]['worker'] == 'worker-2'
+
+def test_failed_task_is_retried_until_max_attempts(queue, monkeypatch):
+    monkeypatch.setattr(config.sharding, 'max_attempts', 2)
+    queue.enqueue(['Uni A'], 10)
+
+    queue.fail(queue.claim('worker-1').task_id, "OPS timeout", 'worker-1')
+    assert queue.status() == {'pending': 1}
+
+    queue.fail(queue.claim('worker-1').task_id, "OPS timeout", 'worker-1')
+    assert queue.status() == {'failed': 1}
+    assert queue.claim('worker-1') is None
+    assert queue.tasks('failed')[0]['error'] == "OPS timeout"
+
+def test_completed_task_is_not_claimed_again(queue):
+    queue.enqueue(['Uni A'], 10)
+    task = queue.claim('worker-1', lease_seconds=0.01)
+
+    assert queue.complete(task.task_id, 'result.json', 'worker-1')
+    time.sleep(0.05)
+
+    assert queue.claim('worker-2') is None
+    assert queue.tasks('done')[0]['result_path'] == 'result.json'
+
+def test_worker_that_lost_its_lease_cannot_complete(queue):
+    queue.enqueue(['Uni A'], 10)
+    task = queue.claim('slow-worker', lease_seconds=0.05)
+    time.sleep(0.1)
+    reclaimed = queue.claim('worker-2', lease_seconds=60)
+
+    assert not queue.complete(task.task_id, 'stale.json', 'slow-worker')
+    assert not queue.fail(task.task_id, "late error", 'slow-worker')
+    assert queue.tasks()[0]['status'] == 'running'
+
+    assert queue.complete(reclaimed.task_id, 'fresh.json', 'worker-2')
+    assert queue.tasks('done')[0]['result_path'] == 'fresh.json'
+
+def test_requeued_task_cannot_be_completed_by_the_old_worker(queue):
+    queue.enqueue(['Uni A'], 10)
+    task = queue.claim('worker-1', lease_seconds=60)
+    queue.enqueue(['Uni A'], 20)
+
+    assert not queue.complete(task.task_id, 'old-limit.json', 'worker-1')
+    assert queue.status() == {'pending': 1}
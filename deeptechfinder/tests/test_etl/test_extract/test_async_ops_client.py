@@ -0,0 +1,56 @@
+"""
+Tests for the asyncio OPS client entry points (against the OPS stand-in).
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.config import Config, config
+from src.etl.extract.async_ops_client import AsyncEPOOPSClient, fetch_biblio_concurrently, fetch_biblio_concurrently_async
+from src.etl.extract.number_resolution import NumberFormatResolver
+
+KNOWN = 'EP18826058A'
+MISSING = 'EP99999999A'
+
+@pytest.fixture(autouse=True)
+def fast_rate(monkeypatch):
+    """The stand-in has no fair-use limit; don't wait rate_limit_seconds between requests."""
+    monkeypatch.setattr(config.epo_ops, 'requests_per_second', 100)
+
+def test_fetch_biblio_concurrently_without_event_loop(ops_standin, tmp_path):
+    resolver = NumberFormatResolver(path=tmp_path / 'resolution.json')
+
+    responses = fetch_biblio_concurrently([KNOWN, MISSING], resolver=resolver)
+
+    assert responses[KNOWN].status_code == 200
+    assert responses[MISSING].status_code == 404
+
+def test_fetch_biblio_concurrently_inside_running_loop(ops_standin, tmp_path):
+    """Jupyter runs cells inside an event loop; the sync entry point must still work there."""
+    resolver = NumberFormatResolver(path=tmp_path / 'resolution.json')
+
+    async def notebook_cell():
+        return fetch_biblio_concurrently([KNOWN], resolver=resolver)
+
+    responses = asyncio.run(notebook_cell())
+
+    assert responses[KNOWN].status_code == 200
+    assert responses[KNOWN].response_data
+
+def test_fetch_biblio_concurrently_async_is_awaitable(ops_standin, tmp_path):
+    resolver = NumberFormatResolver(path=tmp_path / 'resolution.json')
+
+    responses = asyncio.run(fetch_biblio_concurrently_async([KNOWN, KNOWN], resolver=resolver))
+
+    assert list(responses) == [KNOWN]
+    assert responses[KNOWN].status_code == 200
+
+def test_default_budget_is_faster_than_sequential(ops_standin, monkeypatch):
+    settings = Config().epo_ops
+    monkeypatch.setattr(config.epo_ops, 'requests_per_second', settings.requests_per_second)
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', settings.rate_limit_seconds)
+
+    client = AsyncEPOOPSClient(resolver=NumberFormatResolver(path=None))
+
+    assert client.bucket.rate > 1 / settings.rate_limit_seconds
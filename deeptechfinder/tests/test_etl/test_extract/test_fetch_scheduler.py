@@ -0,0 +1,86 @@
+"""
+Tests for priority-ordered fetch scheduling with deadlines (against the OPS stand-in).
+"""
+
+import pandas as pd
+import pytest
+
+from src.core.config import config
+from src.etl.extract.async_ops_client import fetch_biblio_concurrently
+from src.etl.extract.epo_ops_client import EPOOPSClient
+from src.etl.extract.fetch_scheduler import FetchDeadline, FetchScheduler
+from src.etl.extract.number_resolution import NumberFormatResolver
+
+NUMBERS = ['EP18826058A', 'EP19196837A', 'EP99999999A']
+
+@pytest.fixture(autouse=True)
+def fast_rate(monkeypatch):
+    """The stand-in has no fair-use limit; don't wait rate_limit_seconds between requests."""
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', 0)
+    monkeypatch.setattr(config.epo_ops, 'requests_per_second', 100)
+
+@pytest.fixture
+def resolver(tmp_path) -> NumberFormatResolver:
+    return NumberFormatResolver(path=tmp_path / 'resolution.json')
+
+def test_sort_frame_orders_recent_then_granted():
+    df = pd.DataFrame({
+        'Filing_year': ['1/22/80', '3/1/19', '3/1/19', 'unknown'],
+        'Patent_status': ['EP granted', 'Pending', 'EP granted', 'EP granted'],
+    }, index=['old', 'pending', 'granted', 'undated'])
+
+    ordered = FetchScheduler(priority=['recent', 'granted']).sort_frame(df)
+
+    assert ordered.index.tolist() == ['granted', 'pending', 'old', 'undated']
+
+def test_uncached_first_keeps_relative_order():
+    scheduler = FetchScheduler(priority=['uncached'], is_cached=lambda n: n in {'EP1A', 'EP3A'})
+
+    assert scheduler.order(['EP1A', 'EP2A', 'EP3A', 'EP4A']) == ['EP2A', 'EP4A', 'EP1A', 'EP3A']
+
+def test_unknown_priority_key_is_rejected():
+    with pytest.raises(ValueError):
+        FetchScheduler(priority=['oldest'])
+
+def test_run_fetches_everything_without_deadline(ops_standin, resolver):
+    client = EPOOPSClient(resolver=resolver)
+    fetched = []
+
+    result = FetchScheduler(priority=[]).run(NUMBERS, client.fetch_with_rate_limit,
+                                              on_fetched=lambda n, response: fetched.append(n))
+
+    assert fetched == NUMBERS
+    assert result.remaining == [] and not result.deadline_reached
+    assert [result.responses[n].status_code for n in NUMBERS] == [200, 200, 404]
+
+def test_run_defers_the_rest_at_the_quota(ops_standin, resolver):
+    client = EPOOPSClient(resolver=resolver)
+    deadline = FetchDeadline(max_fetches=2)
+
+    result = FetchScheduler(priority=[]).run(NUMBERS, client.fetch_with_rate_limit, deadline)
+
+    assert list(result.responses) == NUMBERS[:2]
+    assert result.remaining == NUMBERS[2:]
+    assert result.deadline_reached
+    assert deadline.fetches == 2
+
+def test_run_concurrent_respects_the_quota(ops_standin, resolver):
+    deadline = FetchDeadline(max_fetches=2)
+
+    result = FetchScheduler(priority=[]).run_concurrent(
+        NUMBERS, lambda numbers, timeout: fetch_biblio_concurrently(numbers, resolver=resolver, timeout=timeout),
+        deadline
+    )
+
+    assert sorted(result.responses) == sorted(NUMBERS[:2])
+    assert all(response.status_code == 200 for response in result.responses.values())
+    assert result.remaining == NUMBERS[2:]
+    assert result.deadline_reached
+
+def test_run_stops_at_the_time_budget(ops_standin, resolver):
+    client = EPOOPSClient(resolver=resolver)
+
+    result = FetchScheduler(priority=[]).run(NUMBERS, client.fetch_with_rate_limit, FetchDeadline(seconds=0))
+
+    assert result.responses == {}
+    assert result.remaining == NUMBERS
@@ -0,0 +1,135 @@
+"""
+Tests for learned number-format resolution and the negative-result cache (against the OPS stand-in).
+"""
+
+import time
+
+import pytest
+
+from src.core.config import config
+from src.etl.extract.epo_ops_client import EPOOPSClient
+from src.etl.extract.number_resolution import NumberFormatResolver, format_patent_number
+
+@pytest.fixture(autouse=True)
+def fast_rate(monkeypatch):
+    """The stand-in has no fair-use limit; don't wait rate_limit_seconds between requests."""
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', 0)
+
+def biblio_requests(server) -> int:
+    return sum(1 for entry in server.request_log if entry['path'].endswith('/biblio'))
+
+@pytest.mark.parametrize('patent_number, expected', [
+    ('EP05012345A', '05012345'),
+    ('EP0012345A', '12345'),
+    ('EP18826058A', '18826058'),
+])
+def test_format_patent_number(patent_number, expected):
+    assert format_patent_number(patent_number) == expected
+
+def test_number_pattern():
+    assert NumberFormatResolver.number_pattern('EP05012345A') == 'EP:8:05'
+
+def test_learned_format_is_tried_first(tmp_path):
+    resolver = NumberFormatResolver(path=tmp_path / 'resolution.json')
+    assert [name for name, _ in resolver.candidates('EP05012345A')] == ['formatted', 'stripped']
+
+    resolver.record_success('EP05099999A', 'stripped')
+
+    assert resolver.candidates('EP05012345A') == [('stripped', 'EP5012345'), ('formatted', 'EP05012345')]
+    assert [name for name, _ in resolver.candidates('EP18826058A')] == ['formatted']
+
+def test_resolution_persists_between_runs(tmp_path):
+    path = tmp_path / 'resolution.json'
+    resolver = NumberFormatResolver(path=path)
+    resolver.record_success('EP05099999A', 'stripped')
+    resolver.record_missing('EP99999999A')
+    resolver.save()
+
+    reloaded = NumberFormatResolver(path=path)
+
+    assert reloaded.candidates('EP05012345A')[0][0] == 'stripped'
+    assert reloaded.is_known_missing('EP99999999A')
+
+def test_negative_entries_expire(tmp_path, monkeypatch):
+    resolver = NumberFormatResolver(path=tmp_path / 'resolution.json', negative_ttl_hours=1)
+    resolver.record_missing('EP99999999A')
+
+    later = time.time() + 3601
+    monkeypatch.setattr(time, 'time', lambda: later)
+
+    assert not resolver.is_known_missing('EP99999999A')
+
+def test_known_missing_numbers_skip_ops(ops_standin, tmp_path):
+    client = EPOOPSClient(resolver=NumberFormatResolver(path=tmp_path / 'resolution.json'))
+
+    before = biblio_requests(ops_standin)
+    first = client.fetch_with_rate_limit('EP99999999A')
+    after_first = biblio_requests(ops_standin)
+    second = client.fetch_with_rate_limit('EP99999999A')
+
+    assert first.status_code == second.status_code == 404
+    assert after_first > before
+    assert biblio_requests(ops_standin) == after_first
+    assert client.resolver.is_known_missing('EP99999999A')
+
+def test_found_number_records_its_format(ops_standin, tmp_path):
+    client = EPOOPSClient(resolver=NumberFormatResolver(path=tmp_path / 'resolution.json'))
+
+    response = client.fetch_with_rate_limit('EP18826058A')
+
+    assert response.status_code == 200
+    assert client.resolver.formats[NumberFormatResolver.number_pattern('EP18826058A')] == {'formatted': 1}
+
+def test_concurrent_workers_keep_each_others_entries(tmp_path):
+    path = tmp_path / 'resolution.json'
+    first = NumberFormatResolver(path=path)
+    second = NumberFormatResolver(path=path)
+
+    first.record_success('EP05099999A', 'stripped')
+    first.record_missing('EP99999999A')
+    second.record_success('EP05088888A', 'stripped')
+    second.record_success('EP18826058A', 'formatted')
+    second.record_missing('EP99999998A')
+    first.save()
+    second.save()
+
+    merged = NumberFormatResolver(path=path)
+    assert merged.formats == {'EP:8:05': {'stripped': 2}, 'EP:8:18': {'formatted': 1}}
+    assert merged.is_known_missing('EP99999999A')
+    assert merged.is_known_missing('EP99999998A')
+
+def test_save_adds_only_new_counts(tmp_path):
+    path = tmp_path / 'resolution.json'
+    resolver = NumberFormatResolver(path=path)
+    resolver.record_success('EP05099999A', 'stripped')
+    resolver.save()
+    resolver.record_success('EP05088888A', 'stripped')
+    resolver.save()
+
+    assert NumberFormatResolver(path=path).formats == {'EP:8:05': {'stripped': 2}}
+
+def test_number_resolved_by_one_worker_drops_the_shared_negative(tmp_path):
+    path = tmp_path / 'resolution.json'
+    first = NumberFormatResolver(path=path)
+    first.record_missing('EP18826058A')
+    first.save()
+
+    second = NumberFormatResolver(path=path)
+    second.record_success('EP18826058A', 'formatted')
+    second.save()
+
+    assert not NumberFormatResolver(path=path).is_known_missing('EP18826058A')
+
+def test_later_save_does_not_restore_a_resolved_negative(tmp_path):
+    path = tmp_path / 'resolution.json'
+    first = NumberFormatResolver(path=path)
+    first.record_missing('EP18826058A')
+    first.save()
+    second = NumberFormatResolver(path=path)
+    second.record_success('EP18826058A', 'formatted')
+    second.save()
+
+    first.record_success('EP05099999A', 'stripped')
+    first.save()
+
+    assert not NumberFormatResolver(path=path).is_known_missing('EP18826058A')
@@ -0,0 +1,35 @@
+"""
+Tests for the embedded analytics store.
+"""
+
+from src.etl.load.analytics_store import AnalyticsStore
+from src.etl.load.data_models import AnalysisResult, EnrichedPatent, UniversityPortfolio
+
+def make_result(university: str, ep_numbers) -> AnalysisResult:
+    patents = [
+        EnrichedPatent(ep_number=ep_number, university=university, filing_year='9/11/20',
+                       patent_status='EP granted', technical_field='Other', original_title=f"Title {ep_number}")
+        for ep_number in ep_numbers
+    ]
+    portfolio = UniversityPortfolio(university_name=university, total_students=1000, patents=patents,
+                                    patents_requested=len(patents), patents_retrieved=len(patents))
+    return AnalysisResult(portfolio=portfolio)
+
+def linked_patents(store: AnalyticsStore, university: str):
+    rows = store.query("SELECT ep_number FROM university_patents WHERE university = :u ORDER BY ep_number",
+                       {'u': university})
+    return rows['ep_number'].tolist()
+
+def test_reanalysis_replaces_university_links(tmp_path):
+    first = [f"EP{19000000 + i}A" for i in range(200)]
+    second = first[:10] + [f"EP{20000000 + i}A" for i in range(10)]
+
+    with AnalyticsStore(tmp_path / 'analytics.db') as store:
+        store.load_result(make_result('Uni A', first))
+        store.load_result(make_result('Uni B', first[:5]))
+        store.load_result(make_result('Uni A', second))
+
+        assert linked_patents(store, 'Uni A') == sorted(second)
+        assert linked_patents(store, 'Uni B') == first[:5]
+        # Patent rows themselves are kept (other universities or later runs may link them)
+        assert store.query("SELECT COUNT(*) AS n FROM patents")['n'][0] == 210
@@ -0,0 +1,90 @@
+"""
+Tests for the raw OPS payload archive: storage, random access, streaming and replay.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.core.config import config
+from src.core.university_engine import UniversityEngine
+from src.etl.load import raw_payload_archive
+from src.etl.load.data_models import EPOOPSResponse
+from src.etl.load.raw_payload_archive import RawPayloadArchive
+
+def payload(title: str) -> dict:
+    return {'ops:world-patent-data': {'exchange-documents': {'exchange-document': {
+        'bibliographic-data': {'invention-title': {'$': title, '@lang': 'de'}}}}}}
+
+def response(ep_number: str, title: str, retrieved_at: datetime) -> EPOOPSResponse:
+    return EPOOPSResponse(ep_number=ep_number, status_code=200, response_data=payload(title), retrieved_at=retrieved_at)
+
+@pytest.fixture
+def archive(tmp_path):
+    with RawPayloadArchive(tmp_path / 'archive.db') as archive:
+        yield archive
+
+def test_put_get_round_trip(archive):
+    retrieved_at = datetime(2026, 3, 1, 9, 30)
+    assert archive.put(response('EP18826058A', 'Dehnungsmessstreifen – Ü', retrieved_at))
+
+    restored = archive.get('EP18826058A')
+
+    assert restored.response_data == payload('Dehnungsmessstreifen – Ü')
+    assert restored.retrieved_at == retrieved_at
+    assert 'EP18826058A' in archive and 'EP99999999A' not in archive
+    assert archive.get('EP99999999A') is None
+
+def test_failed_responses_are_not_archived(archive):
+    assert not archive.put(EPOOPSResponse(ep_number='EP1A', status_code=404, error_message='Not found'))
+    assert not archive.put(EPOOPSResponse(ep_number='EP1A', status_code=200, response_data={}))
+    assert len(archive) == 0
+
+def test_one_payload_per_patent_and_day(archive):
+    archive.put(response('EP1A', 'first', datetime(2026, 3, 1, 9)))
+    archive.put(response('EP1A', 'same day', datetime(2026, 3, 1, 17)))
+    archive.put(response('EP1A', 'next day', datetime(2026, 3, 2, 9)))
+
+    assert archive.keys() == [('EP1A', '2026-03-01'), ('EP1A', '2026-03-02')]
+    assert archive.get('EP1A').response_data == payload('next day')
+    assert archive.get('EP1A', '2026-03-01').response_data == payload('same day')
+
+def test_iter_responses_streams_latest_payloads_in_order(archive):
+    archive.put(response('EP2A', 'two', datetime(2026, 3, 1)))
+    archive.put(response('EP1A', 'one (old)', datetime(2026, 3, 1)))
+    archive.put(response('EP1A', 'one', datetime(2026, 3, 2)))
+
+    assert [(r.ep_number, r.response_data) for r in archive.iter_responses()] == [
+        ('EP1A', payload('one')), ('EP2A', payload('two'))]
+    assert len(list(archive.iter_responses(latest_only=False))) == 3
+
+def test_zlib_payloads_stay_readable(tmp_path, monkeypatch):
+    """Archives written without zstandard are read back by installs that have it (codec stored per payload)."""
+    with monkeypatch.context() as patched:
+        patched.setattr(raw_payload_archive, 'zstandard', None)
+        with RawPayloadArchive(tmp_path / 'archive.db') as archive:
+            assert archive.codec == 'zlib'
+            archive.put(response('EP1A', 'zlib', datetime(2026, 3, 1)))
+
+    with RawPayloadArchive(tmp_path / 'archive.db') as archive:
+        archive.put(response('EP2A', archive.codec, datetime(2026, 3, 1)))
+        assert archive.get('EP1A').response_data == payload('zlib')
+        assert archive.get('EP2A').response_data == payload(archive.codec)
+
+def test_replay_reproduces_the_analysis_without_ops(ops_standin, tmp_path, monkeypatch):
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', 0)
+    monkeypatch.setattr(config.epo_ops, 'resolution_cache', str(tmp_path / 'resolution.json'))
+    monkeypatch.setattr(config.archive, 'enabled', True)
+    monkeypatch.setattr(config.archive, 'path', str(tmp_path / 'archive.db'))
+    monkeypatch.setattr(config.store, 'enabled', False)
+    monkeypatch.setattr(config.data, 'summary_index', str(tmp_path / 'university_index.db'))
+    university = next(name for name in UniversityEngine().get_available_universities() if 'Saarbr' in name)
+
+    live = UniversityEngine().analyze_university(university, 20)
+    requests_before = len(ops_standin.request_log)
+    replayed = UniversityEngine().analyze_university(university, 20, replay=True)
+
+    assert len(ops_standin.request_log) == requests_before
+    assert replayed.portfolio.patents_retrieved == live.portfolio.patents_retrieved >= 1
+    assert [p.biblio.model_dump() for p in replayed.portfolio.patents if p.biblio] == \
+           [p.biblio.model_dump() for p in live.portfolio.patents if p.biblio]
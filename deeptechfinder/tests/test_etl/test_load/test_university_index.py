@@ -0,0 +1,133 @@
+"""
+Tests for the per-university summary index.
+"""
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.core.config import config
+from src.core.university_engine import UniversityEngine
+from src.etl.extract.deeptechfinder_reader import DeepTechFinderReader
+from src.etl.load.analytics_store import AnalyticsStore
+from src.etl.load.data_models import AnalysisResult, UniversityPortfolio
+from src.etl.load.university_index import UniversitySummaryIndex, summarize_dataset
+
+@pytest.fixture(scope='module')
+def dataset() -> pd.DataFrame:
+    return DeepTechFinderReader().load_data()
+
+@pytest.fixture
+def index(tmp_path, dataset):
+    with UniversitySummaryIndex(db_path=tmp_path / 'index.db', store_path=tmp_path / 'no_store.db') as index:
+        index.refresh(dataset)
+        yield index
+
+def test_grants_match_reader_statistics(index):
+    reader_stats = DeepTechFinderReader().get_university_statistics().set_index('university')
+
+    for summary in index.list():
+        expected = reader_stats.loc[summary['name']]
+        assert summary['granted_patents'] == expected['granted_patents'], summary['name']
+        assert summary['grant_rate'] == round(expected['grant_rate'], 1), summary['name']
+
+def test_unitary_grants_are_not_counted():
+    df = pd.DataFrame({
+        'University': ['A', 'A', 'A', 'A'],
+        'Patent_status': ['EP granted', 'EP granted & Unitary', 'Pending', 'Refused / Withdrawn'],
+        'Total_students': [100] * 4,
+        'Total_number_of_Spin_outs': [1] * 4,
+    })
+
+    summary = summarize_dataset(df).loc['A']
+
+    assert summary['granted_patents'] == 1
+    assert summary['grant_rate'] == 25.0
+
+def test_refresh_skips_unchanged_dataset(index, dataset):
+    assert index.refresh(dataset) == {'dataset': 0, 'analyses': 0}
+
+def stored_result(university: str, analysis_date: datetime) -> AnalysisResult:
+    portfolio = UniversityPortfolio(university_name=university, total_students=1000, patents=[],
+                                    patents_requested=10, patents_retrieved=7, analysis_date=analysis_date)
+    return AnalysisResult(portfolio=portfolio)
+
+def test_results_loaded_later_are_picked_up_whatever_their_date(tmp_path, dataset):
+    """E.g. shard results produced before, but merged after, another analysis."""
+    aalen, ulm = (next(name for name in dataset['University'].unique() if key in name) for key in ('Aalen', 'Ulm'))
+    now = datetime.now()
+
+    with UniversitySummaryIndex(db_path=tmp_path / 'index.db', store_path=tmp_path / 'analytics.db') as index, \
+            AnalyticsStore(tmp_path / 'analytics.db') as store:
+        index.refresh(dataset)
+        store.load_result(stored_result(aalen, now))
+        assert index.refresh_analyses() == 1
+
+        store.load_result(stored_result(ulm, now - timedelta(days=1)))
+        assert index.refresh_analyses() == 1
+        assert index.refresh_analyses() == 0
+        assert index.get(ulm)['last_analysis'] == (now - timedelta(days=1)).isoformat()
+
+        store.load_result(stored_result(aalen, now - timedelta(days=2)))  # Reloaded: the older result wins
+        assert index.refresh_analyses() == 1
+        assert index.get(aalen)['last_analysis'] == (now - timedelta(days=2)).isoformat()
+
+@pytest.mark.parametrize('query, expected', [
+    ('TU Dresden', 'Technische Universit\x8at Dresden'),  # Generated alias (name as read with data.encoding)
+    ('KIT', 'Karlsruhe Institute of Technology'),  # Acronym
+    ('Karlsruhe Institut of Technologie', 'Karlsruhe Institute of Technology'),  # Misspelled
+    ('tech univ munich', 'Technical University of Munich'),  # Partial words
+])
+def test_search_ranks_the_intended_university_first(index, query, expected):
+    assert index.search(query)[0]['name'] == expected
+
+def test_search_results_are_ranked_and_limited(index):
+    results = index.search('Munich', limit=3)
+
+    assert len(results) == 3
+    assert all('Munich' in result['name'] for result in results)
+    assert [result['score'] for result in results] == sorted((result['score'] for result in results), reverse=True)
+
+def test_search_without_match(index):
+    assert index.search('xyzzy') == []
+    assert index.search('') == []
+
+def test_resolve_needs_a_unique_match(index):
+    assert index.resolve('Karlsruhe Institute of Technology') == 'Karlsruhe Institute of Technology'
+    assert index.resolve('kit') == 'Karlsruhe Institute of Technology'
+    assert index.resolve('Berlin') is None  # Ambiguous
+
+@pytest.mark.parametrize('query, expected', [
+    ('TU München', 'Technical University of Munich'),
+    ('TU Muenchen', 'Technical University of Munich'),
+    ('munich', 'Technical University of Munich'),  # Configured city alias
+    ('LMU München', 'Ludwig Maximilian University of Munich'),
+    ('Uni Köln', 'University of Cologne'),
+    ('Universität Koeln', 'University of Cologne'),
+])
+def test_resolve_local_city_names(index, query, expected):
+    assert index.resolve(query) == expected
+
+def test_analysis_is_picked_up_from_the_store(ops_standin, dataset, tmp_path, monkeypatch):
+    """An analysis loaded by the engine (against the OPS stand-in) shows up in the index."""
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', 0)
+    monkeypatch.setattr(config.epo_ops, 'resolution_cache', str(tmp_path / 'resolution.json'))
+    monkeypatch.setattr(config.archive, 'enabled', False)
+    monkeypatch.setattr(config.store, 'enabled', True)
+    monkeypatch.setattr(config.store, 'path', str(tmp_path / 'analytics.db'))
+    monkeypatch.setattr(config.data, 'summary_index', str(tmp_path / 'index.db'))
+    monkeypatch.setattr(config.scheduler, 'resume_dir', str(tmp_path / 'resume'))
+    engine = UniversityEngine()
+    university = next(name for name in engine.get_available_universities() if 'Saarbr' in name)
+
+    with UniversitySummaryIndex() as index:
+        index.refresh(dataset)
+
+    result = engine.analyze_university(university, 20)
+
+    with UniversitySummaryIndex() as index:
+        summary = index.get(university)
+        assert summary['patents_retrieved'] == result.portfolio.patents_retrieved >= 1
+        assert summary['last_analysis'] is not None
+        assert index.refresh() == {'dataset': 0, 'analyses': 0}  # Already refreshed by the engine
@@ -0,0 +1,72 @@
+"""
+Tests for IPC/CPC extraction from OPS biblio responses.
+"""
+
+from src.core.config import config
+from src.etl.extract.epo_ops_client import EPOOPSClient
+from src.etl.extract.number_resolution import NumberFormatResolver
+from src.etl.load.data_models import Classification, EPOOPSResponse
+from src.etl.transform.classification_normalizer import ClassificationNormalizer
+
+def cpc(section, cls, subclass, main_group, subgroup):
+    return {'section': {'$': section}, 'class': {'$': cls}, 'subclass': {'$': subclass},
+            'main-group': {'$': main_group}, 'subgroup': {'$': subgroup}}
+
+def response(biblio, prefix='ops:') -> EPOOPSResponse:
+    return EPOOPSResponse(ep_number='EP18826058', status_code=200, response_data={
+        f'{prefix}world-patent-data': {'exchange-documents': {'exchange-document': {'bibliographic-data': biblio}}}})
+
+def codes(classifications):
+    return [(c.system, c.code) for c in classifications]
+
+def test_ipc_text_and_cpc_entries_are_normalized():
+    biblio = {
+        'classifications-ipcr': {'classification-ipcr': [
+            {'text': {'$': 'G01L   1/    22            A I'}},
+            {'text': {'$': 'G01B   7/    16            A I'}},
+            {'text': {'$': 'G01L   1/22            A N'}},  # Duplicate code
+            {'text': {'$': 'not a code'}},
+        ]},
+        'patent-classifications': {'patent-classification': [
+            cpc('G', '01', 'L', '1', '2268'),
+            cpc('G', '01', 'L', '1', ''),  # Incomplete
+        ]},
+    }
+
+    assert codes(ClassificationNormalizer().extract_classifications(response(biblio))) == [
+        ('IPC', 'G01L 1/22'), ('IPC', 'G01B 7/16'), ('CPC', 'G01L 1/2268')]
+
+def test_single_entries_and_unprefixed_root():
+    biblio = {
+        'classifications-ipcr': {'classification-ipcr': {'text': 'E04B   2/    86            A I'}},
+        'patent-classifications': {'patent-classification': cpc('E', '04', 'B', '2', '8617')},
+    }
+
+    assert codes(ClassificationNormalizer().extract_classifications(response(biblio, prefix=''))) == [
+        ('IPC', 'E04B 2/86'), ('CPC', 'E04B 2/8617')]
+
+def test_failed_or_empty_responses_have_no_classifications():
+    normalizer = ClassificationNormalizer()
+
+    assert normalizer.extract_classifications(EPOOPSResponse(ep_number='EP1', status_code=404)) == []
+    assert normalizer.extract_classifications(response({})) == []
+    assert normalizer.extract_classifications(EPOOPSResponse(ep_number='EP1', status_code=200,
+                                                             response_data={'unexpected': []})) == []
+
+def test_subclass_counts_once_per_patent():
+    patents = [
+        [Classification(system='IPC', code='G01L 1/22'), Classification(system='IPC', code='G01L 5/00'),
+         Classification(system='CPC', code='H01L 1/2268')],
+        [Classification(system='IPC', code='G01L 1/22'), Classification(system='IPC', code='G01B 7/16')],
+    ]
+
+    assert ClassificationNormalizer().analyze_classification_patterns(patents) == {'G01L': 2, 'G01B': 1}
+
+def test_stand_in_biblio_response(ops_standin, tmp_path, monkeypatch):
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', 0)
+    client = EPOOPSClient(resolver=NumberFormatResolver(path=tmp_path / 'resolution.json'))
+
+    classifications = ClassificationNormalizer().extract_classifications(client.fetch_with_rate_limit('EP18826058A'))
+
+    assert ('IPC', 'G01L 1/22') in codes(classifications)
+    assert ('CPC', 'G01L 1/2268') in codes(classifications)
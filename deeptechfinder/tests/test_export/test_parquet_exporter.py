@@ -0,0 +1,85 @@
+"""
+Tests for the partitioned Parquet export: written partitions read back with pyarrow.
+"""
+
+from datetime import date, datetime
+from urllib.parse import quote
+
+import pytest
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+from src.etl.load.data_models import (AnalysisResult, Applicant, BiblioData, Classification, EnrichedPatent,
+                                      Inventor, PriorityClaim, UniversityPortfolio)
+from src.export.parquet_exporter import ParquetExporter
+
+UNIVERSITY = 'Universität des Saarlandes / Saarbrücken'
+SNAPSHOT = date(2026, 3, 1)
+
+def patent(ep_number: str, biblio: bool = True) -> EnrichedPatent:
+    return EnrichedPatent(
+        ep_number=ep_number, university=UNIVERSITY, filing_year='2018', patent_status='EP granted',
+        technical_field='Measurement', original_title=f"Title {ep_number}", ops_success=biblio,
+        extraction_date=datetime(2026, 3, 1, 12, 0),
+        errors=[] if biblio else ['Not found'],
+        biblio=BiblioData(
+            ep_number=ep_number, title=f"OPS title {ep_number}",
+            applicants=[Applicant(name='UNIV DES SAARLANDES', category='University', country='DE'),
+                        Applicant(name='ACME GMBH', category='Industry/Other', country='DE')],
+            inventors=[Inventor(name='MUSTERMANN, ERIKA', country='DE')],
+            priority_claims=[PriorityClaim(country='DE', number='102017000001', date='20171221',
+                                           formatted='DE102017000001·2017-12-21')],
+            classifications=[Classification(system='IPC', code='G01L 1/22'),
+                             Classification(system='CPC', code='G01L 1/2268')],
+        ) if biblio else None,
+    )
+
+@pytest.fixture
+def result() -> AnalysisResult:
+    portfolio = UniversityPortfolio(university_name=UNIVERSITY, total_students=17000,
+                                    patents=[patent('EP18826058'), patent('EP19000001', biblio=False)],
+                                    patents_requested=2, patents_retrieved=1)
+    return AnalysisResult(portfolio=portfolio)
+
+def test_export_round_trip(tmp_path, result):
+    exporter = ParquetExporter(tmp_path, row_group_size=1)
+    written = exporter.export(result, SNAPSHOT)
+
+    assert set(written) == set(ParquetExporter.TABLES)
+    patents = exporter.load_table('patents')
+    assert patents['ep_number'].tolist() == ['EP18826058', 'EP19000001']
+    assert patents['title'][0] == 'OPS title EP18826058' and patents['title'].isna()[1]
+    assert patents['errors'].map(list).tolist() == [[], ['Not found']]
+    assert set(patents['university']) == {UNIVERSITY}
+    assert set(patents['snapshot_date']) == {SNAPSHOT.isoformat()}
+
+    applicants = exporter.load_table('applicants')
+    assert applicants[['position', 'name', 'category']].values.tolist() == [
+        [0, 'UNIV DES SAARLANDES', 'University'], [1, 'ACME GMBH', 'Industry/Other']]
+    assert exporter.load_table('classifications')[['system', 'code']].values.tolist() == [
+        ['IPC', 'G01L 1/22'], ['CPC', 'G01L 1/2268']]
+    assert exporter.load_table('priorities')['formatted'].tolist() == ['DE102017000001·2017-12-21']
+
+def test_university_partition_is_uri_encoded(tmp_path, result):
+    written = ParquetExporter(tmp_path).export(result, SNAPSHOT)
+
+    partition = tmp_path / 'patents' / f"university={quote(UNIVERSITY, safe='')}" / 'snapshot_date=2026-03-01'
+    assert written['patents'] == str(partition / 'part-0.parquet')
+    assert '/' not in partition.parent.name.split('=', 1)[1]
+    assert pq.read_table(written['patents']).num_rows == 2
+
+def test_university_filter_and_reexport(tmp_path, result):
+    exporter = ParquetExporter(tmp_path)
+    exporter.export(result, SNAPSHOT)
+    result.portfolio.patents = result.portfolio.patents[:1]
+    exporter.export(result, SNAPSHOT)  # Replaces the partition
+
+    assert len(exporter.load_table('patents', universities=[UNIVERSITY])) == 1
+    assert exporter.load_table('patents', universities=['Other University']).empty
+
+def test_empty_portfolio_writes_readable_tables(tmp_path):
+    empty = AnalysisResult(portfolio=UniversityPortfolio(university_name='Empty University', total_students=0,
+                                                         patents_requested=0, patents_retrieved=0))
+    written = ParquetExporter(tmp_path).export(empty, SNAPSHOT)
+
+    assert all(pq.read_table(path).num_rows == 0 for path in written.values())
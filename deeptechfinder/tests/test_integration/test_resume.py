@@ -0,0 +1,50 @@
+"""
+Resuming a deadline-bounded analysis against the OPS stand-in: the archive and the saved patent limit.
+"""
+
+import pytest
+
+from src.core.config import config
+from src.core.exceptions import ConfigurationError
+from src.core.university_engine import UniversityEngine
+from src.etl.extract.fetch_scheduler import ResumeState
+
+@pytest.fixture
+def isolated_output(tmp_path, monkeypatch):
+    """Point every output of a run at tmp_path, with the raw payload archive enabled."""
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', 0)
+    monkeypatch.setattr(config.epo_ops, 'resolution_cache', str(tmp_path / 'resolution.json'))
+    monkeypatch.setattr(config.archive, 'enabled', True)
+    monkeypatch.setattr(config.archive, 'path', str(tmp_path / 'archive'))
+    monkeypatch.setattr(config.store, 'enabled', False)
+    monkeypatch.setattr(config.data, 'summary_index', str(tmp_path / 'university_index.db'))
+    monkeypatch.setattr(config.scheduler, 'resume_dir', str(tmp_path / 'resume'))
+    return tmp_path
+
+@pytest.fixture
+def university() -> str:
+    return next(name for name in UniversityEngine().get_available_universities() if 'Saarbr' in name)
+
+@pytest.fixture
+def deferred(university, isolated_output) -> ResumeState:
+    state = ResumeState(university)
+    state.save(['EP18826058'], 20)
+    return state
+
+def test_resume_continues_the_saved_run(ops_standin, university, deferred):
+    result = UniversityEngine().analyze_university(university, 20, resume=True)
+
+    assert result.portfolio.deferred_patents == []
+    assert not deferred.path.exists()
+
+def test_resume_without_archive_fails(ops_standin, university, deferred, monkeypatch):
+    monkeypatch.setattr(config.archive, 'enabled', False)
+
+    with pytest.raises(ConfigurationError, match='archive'):
+        UniversityEngine().analyze_university(university, 20, resume=True)
+    assert deferred.load() == ['EP18826058']
+
+def test_resume_with_another_limit_fails(ops_standin, university, deferred):
+    with pytest.raises(ConfigurationError, match='--limit 20'):
+        UniversityEngine().analyze_university(university, 10, resume=True)
+    assert deferred.load() == ['EP18826058']
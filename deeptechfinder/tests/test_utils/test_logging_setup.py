@@ -0,0 +1,43 @@
+"""
+Tests for logging setup: quiet mode and structured log file fields.
+"""
+
+import json
+import logging
+
+import pytest
+
+from src.utils.logging_setup import StructuredFormatter, is_quiet, setup_logging
+
+@pytest.fixture
+def record() -> logging.LogRecord:
+    logger = logging.getLogger('deeptechfinder.test')
+    return logger.makeRecord(logger.name, logging.INFO, __file__, 1, "📊 Extraction complete: %d/%d", (48, 50), None,
+                             extra={'university': 'TU Dresden', 'patents_retrieved': 48})
+
+@pytest.fixture
+def restore_logging():
+    yield
+    setup_logging(log_file='')
+
+def test_quiet_mode_raises_console_level(restore_logging):
+    logger = setup_logging(quiet=True, log_file='')
+
+    assert is_quiet()
+    assert not hasattr(logger, 'quiet')
+
+    setup_logging(log_file='')
+    assert not is_quiet()
+
+def test_text_format_appends_fields(record):
+    line = StructuredFormatter('%(levelname)s %(message)s').format(record)
+
+    assert line == "INFO 📊 Extraction complete: 48/50 | university=TU Dresden patents_retrieved=48"
+
+def test_json_format_has_one_object_per_record(record):
+    entry = json.loads(StructuredFormatter(style='json').format(record))
+
+    assert entry['message'] == "📊 Extraction complete: 48/50"
+    assert entry['level'] == 'INFO'
+    assert entry['university'] == 'TU Dresden'
+    assert entry['patents_retrieved'] == 48
@@ -0,0 +1,96 @@
+"""
+Tests for the run metrics: JSON report and Prometheus text exposition.
+"""
+
+import json
+import re
+
+from src.core.config import config
+from src.core.university_engine import UniversityEngine
+from src.utils.metrics import Histogram, MetricsRecorder
+
+# One exposition sample: name, optional {labels}, value
+SAMPLE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})? (?P<value>\S+)$')
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+def parse_prometheus(text: str) -> dict:
+    """{(name, frozenset(labels)): value}; fails on lines that are neither comments nor valid samples."""
+    samples, typed = {}, set()
+    for line in text.splitlines():
+        if line.startswith('# TYPE '):
+            typed.add(line.split()[2])
+            continue
+        match = SAMPLE.match(line)
+        assert match, f"Invalid exposition line: {line!r}"
+        name = match['name']
+        assert any(name == family or name.startswith(family + '_') for family in typed), f"Untyped sample {name}"
+        labels = frozenset(LABEL.findall(match['labels'] or ''))
+        samples[(name, labels)] = float(match['value'])
+    return samples
+
+def recorder() -> MetricsRecorder:
+    metrics = MetricsRecorder()
+    with metrics.phase('extract'):
+        pass
+    metrics.increment('ops_requests', 3)
+    metrics.increment('ops_bytes_received', 2048)
+    for seconds in (0.04, 0.3, 0.3, 12.0):
+        metrics.observe('ops_request_seconds', seconds)
+    metrics.cache_hit('archive')
+    metrics.cache_miss('archive')
+    metrics.cache_miss('archive')
+    return metrics
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == {'0.1': 1, '1.0': 3, '+Inf': 4}
+    assert histogram.to_dict()['min'] == 0.05 and histogram.to_dict()['max'] == 3.0
+
+def test_json_report_round_trip():
+    report = json.loads(json.dumps(recorder().to_dict()))
+
+    assert set(report['phases']) == {'extract'}
+    assert report['counters'] == {'ops_requests': 3, 'ops_bytes_received': 2048}
+    assert report['histograms']['ops_request_seconds']['count'] == 4
+    assert report['histograms']['ops_request_seconds']['buckets']['0.5'] == 3
+    assert report['cache']['archive'] == {'hits': 1, 'misses': 2, 'hit_rate': 33.3}
+
+def test_prometheus_exposition():
+    labels = {'university': 'Universität "Saar"\\Saarbrücken'}
+    samples = parse_prometheus(recorder().to_prometheus(labels=labels))
+    university = ('university', 'Universität \\"Saar\\"\\\\Saarbrücken')
+
+    assert samples[('dtf_ops_requests_total', frozenset({university}))] == 3
+    assert samples[('dtf_ops_request_seconds_bucket', frozenset({university, ('le', '+Inf')}))] == 4
+    assert samples[('dtf_ops_request_seconds_bucket', frozenset({university, ('le', '0.5')}))] == 3
+    assert samples[('dtf_ops_request_seconds_count', frozenset({university}))] == 4
+    assert samples[('dtf_cache_lookups_total',
+                    frozenset({university, ('cache', 'archive'), ('result', 'misses')}))] == 2
+    assert ('dtf_phase_seconds', frozenset({university, ('phase', 'extract')})) in samples
+
+def test_reset_clears_the_previous_run():
+    metrics = recorder()
+    metrics.reset()
+
+    assert metrics.to_dict()['counters'] == {}
+    assert metrics.to_prometheus() == '# TYPE dtf_phase_seconds gauge\n'
+
+def test_analysis_reports_ops_metrics(ops_standin, tmp_path, monkeypatch):
+    monkeypatch.setattr(config.epo_ops, 'rate_limit_seconds', 0)
+    monkeypatch.setattr(config.epo_ops, 'resolution_cache', str(tmp_path / 'resolution.json'))
+    monkeypatch.setattr(config.archive, 'enabled', False)
+    monkeypatch.setattr(config.store, 'enabled', False)
+    monkeypatch.setattr(config.data, 'summary_index', str(tmp_path / 'university_index.db'))
+    engine = UniversityEngine()
+    university = next(name for name in engine.get_available_universities() if 'Saarbr' in name)
+
+    result = engine.analyze_university(university, 20)
+
+    assert set(result.metrics['phases']) >= {'extract', 'transform', 'analyze'}
+    assert result.metrics['counters']['ops_requests'] >= 1
+    samples = parse_prometheus(engine.metrics.to_prometheus(labels={'university': university}))
+    assert samples[('dtf_ops_requests_total', frozenset({('university', university)}))] == \
+           result.metrics['counters']['ops_requests']
@@ -0,0 +1,95 @@
+"""
+Tests for request coalescing (single-flight).
+"""
+
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import AsyncSingleFlight
+
+class SlowCall:
+    """Coroutine factory counting calls; each call waits until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return f"result {self.calls}"
+
+def test_concurrent_calls_share_one_flight():
+    async def scenario():
+        flight, call = AsyncSingleFlight(), SlowCall()
+        tasks = [asyncio.create_task(flight.do('key', call)) for _ in range(5)]
+        await asyncio.sleep(0)
+        call.release.set()
+        return call.calls, await asyncio.gather(*tasks)
+
+    calls, results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert results[0] == ('result 1', False)
+    assert results[1:] == [('result 1', True)] * 4
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    async def scenario():
+        flight, call = AsyncSingleFlight(), SlowCall()
+        leader = asyncio.create_task(flight.do('key', call))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do('key', call)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        for _ in range(100):  # Until a waiter takes over the call
+            if call.calls == 2:
+                break
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        call.release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        results = await asyncio.gather(*waiters)
+        return call.calls, results
+
+    calls, results = asyncio.run(scenario())
+
+    # One waiter became the new leader, the others shared its call
+    assert calls == 2
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert {result for result, _ in results} == {'result 2'}
+
+def test_cancelled_waiter_does_not_cancel_leader():
+    async def scenario():
+        flight, call = AsyncSingleFlight(), SlowCall()
+        leader = asyncio.create_task(flight.do('key', call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do('key', call))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        call.release.set()
+        return call.calls, await leader
+
+    calls, result = asyncio.run(scenario())
+
+    assert calls == 1
+    assert result == ('result 1', False)
+
+def test_errors_are_shared_with_waiters():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError('OPS down')
+
+    async def scenario():
+        flight = AsyncSingleFlight()
+        return await asyncio.gather(*(flight.do('key', failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in results)
@@ -0,0 +1,334 @@
+"""
+Headless batch builder of family trees for portfolios of seed documents.
+
+Usage (from the familytree directory):
+    python -m patent_analysis.batch_builder EP2101496B1 EP1234567A1 --output trees
+    python -m patent_analysis.batch_builder --seeds-file portfolio.txt --reference-type application --countries US JP
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+
+import pandas as pd
+
+from patent_analysis.family_index import INDEX_FILE, FamilyIndex
+from patent_analysis.family_record import FamilyRecord
+from patent_analysis.tree_creation import TreeCreation
+from patent_analysis.view_engine import ViewEngine
+
+# "EP2101496B1", "EP 09164213 A", "EP.2101496.B1", optionally prefixed with "application:" / "publication:"
+SEED_PATTERN = re.compile(
+    r'^(?:(?P<reference_type>application|publication)\s*:\s*)?'
+    r'(?P<country>[A-Z]{2})[\s.]*(?P<doc_number>\d+)[\s.]*(?P<kind>[A-Z]\d?)?$',
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class Seed:
+    """A seed document of a batch: the family of this publication or application is built."""
+    reference_type: str
+    country: str
+    doc_number: str
+    kind: Optional[str] = None
+
+    @classmethod
+    def parse(cls, text: str, reference_type: str = 'publication') -> 'Seed':
+        """
+        Parse a seed such as 'EP2101496B1' or 'application:EP09164213A'.
+
+        Args:
+        - text (str): The seed.
+        - reference_type (str): Reference type of seeds without prefix ('publication' or 'application').
+
+        Returns:
+        - Seed: The parsed seed.
+
+        Raises:
+        - ValueError: If the seed is not a country code followed by a number and an optional kind code.
+        """
+        match = SEED_PATTERN.match(text.strip())
+        if not match:
+            raise ValueError(f"Invalid seed document: {text!r}")
+        return cls(
+            reference_type=(match.group('reference_type') or reference_type).lower(),
+            country=match.group('country').upper(),
+            doc_number=match.group('doc_number'),
+            kind=match.group('kind').upper() if match.group('kind') else None,
+        )
+
+    @property
+    def label(self) -> str:
+        return f"{self.country}{self.doc_number}{self.kind or ''}"
+
+    def member_keys(self) -> Set[str]:
+        """Numbers under which this document appears in a family table (see family_member_keys)."""
+        number = f"{self.country}{self.doc_number}"
+        keys = {number}
+        if self.reference_type == 'application' and self.country == 'EP' and len(self.doc_number) >= 2:
+            # Same normalization as FamilyRecord._parse_application_data
+            year_prefix = '19' if int(number[2:4]) > 50 else '20'
+            keys.add(f"EP{year_prefix}{number[2:11]}")
+        return keys
+
+
+def family_member_keys(df: pd.DataFrame) -> Set[str]:
+    """Application, accession and publication numbers (with country, without kind) of a family table."""
+    keys = set()
+    for column in ('app_number', 'accession_number', 'pub_number'):
+        if column in df.columns:
+            keys.update(value for value in df[column].tolist() if isinstance(value, str) and value)
+    return keys
+
+
+@dataclass
+class FamilyTreeResult:
+    """
+    Outcome of one seed: 'built', 'duplicate' (family already built from another seed of the
+    batch), 'empty' (no family members after filtering) or 'error'.
+    """
+    seed: Seed
+    status: str
+    family_id: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    tree: Optional[str] = None
+    table: Optional[pd.DataFrame] = field(default=None, repr=False)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'seed': self.seed.label,
+            'reference_type': self.seed.reference_type,
+            'status': self.status,
+            'family_id': self.family_id,
+            'duplicate_of': self.duplicate_of,
+            'members': None if self.table is None else int(len(self.table)),
+            'error': self.error,
+            'seconds': round(self.seconds, 3),
+        }
+
+
+class FamilyTreeStore:
+    """
+    Directory store of batch results:
+    - trees/<family>.txt: the rendered family tree
+    - tables/<family>.json: the derived family table (one record per member)
+    - seeds.jsonl: one line per seed with its status, family and duplicate seed
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, 'seeds.jsonl')
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(output_dir, 'trees'), exist_ok=True)
+        os.makedirs(os.path.join(output_dir, 'tables'), exist_ok=True)
+
+    @staticmethod
+    def family_name(result: FamilyTreeResult) -> str:
+        return f"family_{result.family_id}" if result.family_id else result.seed.label
+
+    def tree_path(self, result: FamilyTreeResult) -> str:
+        return os.path.join(self.output_dir, 'trees', self.family_name(result) + '.txt')
+
+    def table_path(self, result: FamilyTreeResult) -> str:
+        return os.path.join(self.output_dir, 'tables', self.family_name(result) + '.json')
+
+    def write(self, result: FamilyTreeResult):
+        """Write the tree and table of a built family, and record the seed in the manifest."""
+        with self._lock:
+            if result.status == 'built':
+                with open(self.tree_path(result), 'w') as f:
+                    f.write(result.tree or '')
+                result.table.to_json(self.table_path(result), orient='records', indent=1, default_handler=str)
+            with open(self.manifest_path, 'a') as f:
+                f.write(json.dumps(result.summary()) + '\n')
+
+
+class BatchTreeBuilder:
+    """
+    Builds the family trees of many seed documents concurrently.
+
+    Families are fetched first, then one tree is built per family, from the first seed of the
+    family in input order; the other seeds of the family are reported as its duplicates.
+    A seed found among the members of a family fetched for an earlier seed is not fetched at all,
+    and seeds fetched in parallel are matched by their INPADOC family ID.
+    """
+
+    def __init__(self, countries: Optional[List[str]] = None, views: Union[str, List[str], None] = None,
+                 constituents: Optional[List[str]] = None, max_workers: int = 4, store: Optional[FamilyTreeStore] = None,
+                 on_result: Optional[Callable[[FamilyTreeResult], None]] = None, index: Optional[FamilyIndex] = None,
+                 workdir: Optional[str] = None):
+        """
+        Initialize the BatchTreeBuilder.
+
+        Args:
+        - countries (Optional[List[str]]): Additional countries of the trees (as the country checkboxes).
+        - views (Union[str, List[str], None]): View flag(s) rendered in the trees, e.g. ['Show_priorities'].
+        - constituents (Optional[List[str]]): Family constituents (default: legal and biblio).
+        - max_workers (int): Families fetched and built concurrently.
+        - store (Optional[FamilyTreeStore]): Where results are written (None: only returned).
+        - on_result (Optional[Callable]): Called with each result as soon as it is available.
+        - index (Optional[FamilyIndex]): Persistent family index, so seeds of families indexed by earlier runs
+          are resolved without an OPS family call (default: family_index.sqlite in the store's output directory,
+          or the notebook's shared index without a store).
+        - workdir (Optional[str]): Directory of the image cache of the Show_images view (default: the store's
+          output directory, or the notebook directory without a store).
+        """
+        self.countries = countries or None
+        self.views = views
+        self.constituents = constituents
+        self.max_workers = max_workers
+        self.store = store
+        self.on_result = on_result
+        if index is None and store is not None:
+            index = FamilyIndex(os.path.join(store.output_dir, INDEX_FILE))
+        self.index = index
+        self.workdir = workdir or (store.output_dir if store is not None else None)
+        self._lock = threading.Lock()
+        self._member_families: Dict[str, str] = {}  # Member number -> family key
+        self._family_owners: Dict[str, int] = {}  # Family key -> index of its first fetched seed
+
+    def build(self, seeds: Iterable[Union[Seed, str]]) -> List[FamilyTreeResult]:
+        """
+        Build the family trees of all seeds.
+
+        Args:
+        - seeds (Iterable[Union[Seed, str]]): Seeds, as Seed objects or strings (see Seed.parse).
+
+        Returns:
+        - List[FamilyTreeResult]: One result per distinct seed, in input order.
+        """
+        seeds = list(dict.fromkeys(seed if isinstance(seed, Seed) else Seed.parse(seed) for seed in seeds))
+        self._member_families.clear()
+        self._family_owners.clear()
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            fetched = list(executor.map(self._fetch_family, range(len(seeds)), seeds))
+            return list(executor.map(lambda index: self._finish(seeds, fetched, index), range(len(seeds))))
+
+    def _fetch_family(self, index: int, seed: Seed):
+        """Fetch the family of a seed, unless it is a member of a family fetched for an earlier seed."""
+        start = time.perf_counter()
+        with self._lock:
+            for key in seed.member_keys():
+                family_key = self._member_families.get(key)
+                if family_key is not None and self._family_owners[family_key] < index:
+                    return family_key, None, time.perf_counter() - start
+        try:
+            record = FamilyRecord(seed.reference_type, seed.doc_number, seed.country, seed.kind,
+                                  self.constituents, countrySelection=self.countries, index=self.index)
+        except Exception as e:
+            return None, FamilyTreeResult(seed, 'error', error=f"{type(e).__name__}: {e}"), time.perf_counter() - start
+        if record.df is None or record.df.empty:
+            return None, FamilyTreeResult(seed, 'empty', error="No family data found"), time.perf_counter() - start
+
+        family_key = record.family_id or seed.label
+        with self._lock:
+            self._family_owners[family_key] = min(index, self._family_owners.get(family_key, index))
+            for key in family_member_keys(record.df):
+                self._member_families.setdefault(key, family_key)
+        return family_key, record, time.perf_counter() - start
+
+    def _finish(self, seeds: List[Seed], fetched: List, index: int) -> FamilyTreeResult:
+        seed = seeds[index]
+        family_key, outcome, seconds = fetched[index]
+        start = time.perf_counter()
+        if isinstance(outcome, FamilyTreeResult):
+            result = outcome
+        elif self._family_owners[family_key] != index:
+            owner = seeds[self._family_owners[family_key]]
+            family_id = family_key if family_key != owner.label else None
+            result = FamilyTreeResult(seed, 'duplicate', family_id=family_id, duplicate_of=owner.label)
+        else:
+            try:
+                result = self._build_tree(seed, outcome)
+            except Exception as e:
+                result = FamilyTreeResult(seed, 'error', family_id=outcome.family_id, error=f"{type(e).__name__}: {e}")
+        result.seconds = seconds + time.perf_counter() - start
+
+        if self.store is not None:
+            self.store.write(result)
+        if self.on_result is not None:
+            self.on_result(result)
+        return result
+
+    def _build_tree(self, seed: Seed, record: FamilyRecord) -> FamilyTreeResult:
+        processed = record.process_fami_record(self.countries)
+        if not processed:
+            return FamilyTreeResult(seed, 'empty', family_id=record.family_id, error="No members left after filtering")
+        df = processed[0]
+
+        tree = TreeCreation(db="EPODOC", df=df)
+        root, listAPs, listORAPs, df = tree.create_nested_dict(df)
+        with ViewEngine(tree, root, listAPs, listORAPs, df, workdir=self.workdir) as views:
+            text = views.render(self.views)
+        return FamilyTreeResult(seed, 'built', family_id=record.family_id, tree=text, table=df)
+
+
+def read_seeds(path: str) -> List[str]:
+    """Seeds of a text file: one per line (or comma separated); blank lines and '#' comments are ignored."""
+    seeds = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            seeds.extend(part.strip() for part in line.split(',') if part.strip())
+    return seeds
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the family trees of a portfolio of seed documents.")
+    parser.add_argument('seeds', nargs='*', help="Seed documents, e.g. EP2101496B1 or application:EP09164213A")
+    parser.add_argument('--seeds-file', help="File with one seed per line")
+    parser.add_argument('--reference-type', choices=['publication', 'application'], default='publication',
+                        help="Reference type of seeds without prefix (default: publication)")
+    parser.add_argument('--countries', nargs='*', default=None, help="Additional countries in the trees, e.g. US JP")
+    parser.add_argument('--views', nargs='*', default=None, choices=ViewEngine.VIEWS, help="Views rendered in the trees")
+    parser.add_argument('--output', default='family_trees', help="Output directory (default: family_trees)")
+    parser.add_argument('--workers', type=int, default=4, help="Families built concurrently (default: 4)")
+    parser.add_argument('--index', help=f"Family index shared across runs (default: {INDEX_FILE} in the output directory)")
+    parser.add_argument('--refresh', action='store_true', help="Fetch every family from OPS again (and re-index it)")
+    parser.add_argument('--verbose', action='store_true', help="Show the processing output of every family")
+    args = parser.parse_args(argv)
+
+    texts = list(args.seeds) + (read_seeds(args.seeds_file) if args.seeds_file else [])
+    try:
+        seeds = [Seed.parse(text, args.reference_type) for text in texts]
+    except ValueError as e:
+        parser.error(str(e))
+    if not seeds:
+        parser.error("No seed documents given")
+
+    store = FamilyTreeStore(args.output)
+    done = []
+
+    def report(result: FamilyTreeResult):
+        done.append(result)
+        detail = result.duplicate_of and f"same family as {result.duplicate_of}" or result.error or f"family {result.family_id}"
+        print(f"[{len(done)}/{len(seeds)}] {result.seed.label}: {result.status} ({detail})", file=sys.stderr)
+
+    index = FamilyIndex(args.index or os.path.join(args.output, INDEX_FILE), max_age_days=0 if args.refresh else 7.0)
+    builder = BatchTreeBuilder(countries=args.countries, views=args.views, max_workers=args.workers, store=store,
+                               on_result=report, index=index)
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        results = builder.build(seeds)
+
+    counts = pd.Series([result.status for result in results]).value_counts().to_dict()
+    print(f"Built {counts.get('built', 0)} family trees from {len(results)} seeds in {time.perf_counter() - start:.1f}s "
+          f"({counts.get('duplicate', 0)} duplicates, {counts.get('empty', 0)} empty, {counts.get('error', 0)} errors) -> {args.output}")
+    return 1 if counts.get('error', 0) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional
+
+import requests
+
+from patent_analysis.ops_client import models
+
+logger = logging.getLogger(__name__)
+
+# Returned by BiblioCache.get for publications not in the cache (None is a cached 'not found')
+NOT_CACHED = object()
+
+
+def fetch_biblio(client, pub_number: str):
+    """
+    Retrieve the bibliographic data of a publication as a DataFrame.
+
+    Args:
+    - client (OPSClient or RestOPSClient): The OPS client.
+    - pub_number (str): Publication number with country and kind code (e.g. 'EP2101496A1').
+
+    Returns:
+    - pd.DataFrame: The biblio data returned by the client.
+    """
+    return client.published_data(
+        reference_type="publication",
+        input=models.Docdb(pub_number[2:-2], pub_number[:2], pub_number[-2:], date=None),
+        endpoint="biblio",
+        constituents=[],
+        output_type="Dataframe",
+    )
+
+
+class RateBudget:
+    """
+    Spaces request starts at least 1 / requests_per_second apart, across all threads
+    sharing the budget (OPS fair-use throttling applies per client, not per thread).
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self):
+        with self._lock:
+            start = max(time.monotonic(), self._next_start)
+            self._next_start = start + self.interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class BiblioCache:
+    """
+    In-memory LRU cache of publication biblio data, keyed by publication number.
+    A publication OPS reported as not found is cached as None, so it is not requested again.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pub_number: str, default: Any = NOT_CACHED) -> Any:
+        """The cached biblio data of a publication (None: not found in OPS), or default if it is not cached."""
+        with self._lock:
+            biblio_data = self._entries.get(pub_number, NOT_CACHED)
+            if biblio_data is NOT_CACHED:
+                return default
+            self._entries.move_to_end(pub_number)
+            return biblio_data
+
+    def put(self, pub_number: str, biblio_data: Any) -> Any:
+        with self._lock:
+            self._entries[pub_number] = biblio_data
+            self._entries.move_to_end(pub_number)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return biblio_data
+
+    def invalidate(self, pub_number: Optional[str] = None):
+        """Drop one publication (or all publications when pub_number is None)."""
+        with self._lock:
+            if pub_number is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(pub_number, None)
+
+    def __contains__(self, pub_number: str) -> bool:
+        with self._lock:
+            return pub_number in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def prefetch(self, client, pub_numbers: Iterable[str], max_workers: int = 4, requests_per_second: Optional[float] = 10.0) -> int:
+        """
+        Fetch the biblio data of every publication not cached yet, concurrently under a rate budget.
+
+        Failures other than 'not found' are not cached, so rendering retries them on demand
+        (and reports the error there); the failed publications are logged as a warning.
+
+        Args:
+        - client (OPSClient or RestOPSClient): The OPS client.
+        - pub_numbers (Iterable[str]): Publication numbers with country and kind code.
+        - max_workers (int): Concurrent requests.
+        - requests_per_second (Optional[float]): Rate budget shared by the workers (None: unlimited).
+
+        Returns:
+        - int: Number of publications requested from OPS.
+        """
+        missing = list(dict.fromkeys(pn for pn in pub_numbers if pn and pn not in self))
+        if not missing:
+            return 0
+        budget = RateBudget(requests_per_second)
+        failed = {}
+
+        def fetch(pub_number):
+            budget.acquire()
+            try:
+                self.put(pub_number, fetch_biblio(client, pub_number))
+            except Exception as e:
+                if isinstance(e, requests.exceptions.RequestException) and \
+                        getattr(e, 'response', None) is not None and e.response.status_code == 404:
+                    self.put(pub_number, None)
+                else:
+                    failed[pub_number] = f"{type(e).__name__}: {e}"  # Retried when the node is rendered
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(executor.map(fetch, missing))
+        if failed:
+            logger.warning("Biblio prefetch failed for %d of %d publications (retried on render): %s",
+                           len(failed), len(missing), '; '.join(f"{pn} ({error})" for pn, error in sorted(failed.items())))
+        return len(missing)
+
+
+# Shared by all TreeProcessor instances of the session, so view toggles render from memory
+biblio_cache = BiblioCache()
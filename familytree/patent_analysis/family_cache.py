@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Tuple, List, Set, Any
+import threading
+import xml.etree.ElementTree as ET
+
+
+@dataclass
+class FamilyDocument:
+    """
+    One fetched INPADOC family document and what was derived from it.
+
+    The member records are stored before any country selection is applied, so
+    every FamilyRecord for the same document (other countries, updateFamily(),
+    tree rebuilds) can re-derive its DataFrame without another OPS call or parse.
+    """
+    xml_tree: Any
+    root: Optional[ET.Element] = None
+    members: Optional[Dict[str, Dict]] = None
+    family_id: Optional[str] = None
+    country_codes: Set[str] = field(default_factory=set)
+    ccw_to_wo_mapping: Dict[str, Tuple[str, Optional[str]]] = field(default_factory=dict)
+
+
+class FamilyDocumentCache:
+    """
+    In-memory LRU cache of family documents, keyed by
+    (reference type, country + number, kind, constituents).
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, FamilyDocument]" = OrderedDict()
+        self._lock = threading.Lock()  # Records may be built from several threads (batch builder)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(reference_type: str, doc_number: str, country: Optional[str], kind: Optional[str],
+                 constituents: Optional[List[str]]) -> Tuple:
+        """
+        Build the cache key of a family request.
+
+        Args:
+        - reference_type (str): 'application', 'publication' or 'priority'.
+        - doc_number (str): The document number.
+        - country (Optional[str]): The country code.
+        - kind (Optional[str]): The kind code.
+        - constituents (Optional[List[str]]): Requested constituents (e.g. ['legal', 'biblio']).
+
+        Returns:
+        - Tuple: Hashable key.
+        """
+        if isinstance(constituents, str):
+            constituents = [constituents]
+        return (reference_type, f"{country or ''}{doc_number}", kind or '', tuple(constituents or ()))
+
+    def get(self, key: Tuple) -> Optional[FamilyDocument]:
+        with self._lock:
+            document = self._entries.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def peek(self, key: Tuple) -> Optional[FamilyDocument]:
+        """Look up a document without counting a hit or changing the LRU order."""
+        return self._entries.get(key)
+
+    def put(self, key: Tuple, document: FamilyDocument) -> FamilyDocument:
+        with self._lock:
+            self._entries[key] = document
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return document
+
+    def invalidate(self, key: Optional[Tuple] = None):
+        """Drop one document (or all documents when key is None), e.g. to force a fresh OPS fetch."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._entries
+
+
+# Shared by all FamilyRecord instances of the session
+family_cache = FamilyDocumentCache()
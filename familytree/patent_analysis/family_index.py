@@ -0,0 +1,188 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from patent_analysis.family_cache import FamilyDocument
+
+NOTEBOOK_DIR = '/home/jovyan/tip-data-ops/docs/patent_analysis'
+DEFAULT_INDEX_PATH = f'{NOTEBOOK_DIR}/family_index.sqlite'
+INDEX_FILE = 'family_index.sqlite'  # Name of the index in a batch output directory
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS families (
+    family_id TEXT NOT NULL,
+    constituents TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    document BLOB NOT NULL,
+    PRIMARY KEY (family_id, constituents)
+);
+CREATE TABLE IF NOT EXISTS members (
+    reference_type TEXT NOT NULL,
+    number TEXT NOT NULL,
+    family_id TEXT NOT NULL,
+    PRIMARY KEY (reference_type, number)
+);
+CREATE INDEX IF NOT EXISTS members_family ON members (family_id);
+"""
+
+
+def member_numbers(family_member: Dict[str, List]) -> Set[Tuple[str, str]]:
+    """
+    (reference type, country + number) of the applications and publications of a streamed
+    family member (see family_parser.iter_family_members), without kind code.
+    """
+    numbers = set()
+    for reference_type, references in (('application', family_member['applications']),
+                                       ('publication', family_member['publications'])):
+        for reference in references:
+            if reference.get('doc-number'):
+                numbers.add((reference_type, f"{reference.get('country') or ''}{reference['doc-number']}"))
+    return numbers
+
+
+class FamilyIndex:
+    """
+    Persistent SQLite index of parsed families, shared across sessions and runs.
+
+    Every application and publication number of a family maps to its INPADOC family ID, and
+    each family is stored once (per constituents) with its XML and parsed members. A seed
+    that is a member of an indexed family is resolved locally, without an OPS family call.
+    Families older than max_age_days are fetched again (legal events keep changing).
+
+    The index directory is created when needed, except the notebook directory: outside the
+    notebook, the default index is unavailable and families are fetched from OPS.
+    Families are stored as compressed JSON.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, max_age_days: Optional[float] = 7.0):
+        self.path = path
+        self.max_age_days = max_age_days
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory and os.path.normpath(directory) != NOTEBOOK_DIR:
+                    os.makedirs(directory, exist_ok=True)
+                connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                connection.executescript(SCHEMA)
+                self._connection = connection
+            except (OSError, sqlite3.Error) as e:
+                print(f"Family index {self.path} unavailable, families are fetched from OPS: {e}")
+                self.path = None
+        return self._connection
+
+    @staticmethod
+    def constituents_key(constituents: Optional[Iterable[str]]) -> str:
+        if isinstance(constituents, str):
+            constituents = [constituents]
+        return ','.join(sorted(constituents or ()))
+
+    def lookup(self, reference_type: str, doc_number: str, country: Optional[str],
+               constituents: Optional[List[str]]) -> Optional[FamilyDocument]:
+        """
+        Resolve a family request locally.
+
+        Args:
+        - reference_type (str): 'application' or 'publication'.
+        - doc_number (str): The document number.
+        - country (Optional[str]): The country code.
+        - constituents (Optional[List[str]]): Requested constituents (e.g. ['legal', 'biblio']).
+
+        Returns:
+        - Optional[FamilyDocument]: The parsed family, or None if the document is not a member of
+          a (fresh) indexed family.
+        """
+        number = f"{country or ''}{doc_number}"
+        with self._lock:
+            connection = self._connect() if self.path else None
+            row = None
+            if connection is not None:
+                try:
+                    row = connection.execute(
+                        "SELECT f.family_id, f.fetched_at, f.document FROM members m "
+                        "JOIN families f ON f.family_id = m.family_id AND f.constituents = ? "
+                        "WHERE m.reference_type = ? AND m.number = ?",
+                        (self.constituents_key(constituents), reference_type, number)).fetchone()
+                except sqlite3.Error as e:
+                    print(f"Family index lookup failed: {e}")
+            if row is None or (self.max_age_days is not None and time.time() - row[1] > self.max_age_days * 86400):
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            payload = json.loads(zlib.decompress(row[2]))
+        except (zlib.error, ValueError) as e:
+            print(f"Family {row[0]} in the family index is unreadable, fetching it again: {e}")
+            return None
+        return FamilyDocument(payload['xml_tree'], members=payload['members'], family_id=row[0],
+                              country_codes=set(payload['country_codes']),
+                              ccw_to_wo_mapping={accession: tuple(wo) for accession, wo in payload['ccw_to_wo_mapping'].items()})
+
+    def store(self, document: FamilyDocument, constituents: Optional[List[str]], numbers: Iterable[Tuple[str, str]]):
+        """
+        Index a parsed family under all its member numbers (replacing an older version of the family).
+
+        Args:
+        - document (FamilyDocument): The family, with its members parsed.
+        - constituents (Optional[List[str]]): Constituents the family was fetched with.
+        - numbers (Iterable[Tuple[str, str]]): (reference type, country + number) of the members,
+          and of the seed the family was requested for.
+        """
+        if not document.family_id or document.members is None:
+            return
+        xml_tree = document.xml_tree
+        # Sets (country codes, priority numbers and ORAPs of members) are stored as sorted lists
+        payload = zlib.compress(json.dumps({
+            'xml_tree': xml_tree.decode('utf-8') if isinstance(xml_tree, bytes) else xml_tree,
+            'members': document.members,
+            'country_codes': document.country_codes,
+            'ccw_to_wo_mapping': document.ccw_to_wo_mapping,
+        }, default=sorted).encode('utf-8'))
+        with self._lock:
+            connection = self._connect() if self.path else None
+            if connection is None:
+                return
+            try:
+                with connection:
+                    connection.execute("INSERT OR REPLACE INTO families VALUES (?, ?, ?, ?)",
+                                       (document.family_id, self.constituents_key(constituents), time.time(), payload))
+                    connection.execute("DELETE FROM members WHERE family_id = ?", (document.family_id,))
+                    connection.executemany("INSERT OR REPLACE INTO members VALUES (?, ?, ?)",
+                                           [(reference_type, number, document.family_id) for reference_type, number in set(numbers)])
+            except sqlite3.Error as e:
+                print(f"Family {document.family_id} could not be indexed: {e}")
+
+    def invalidate(self, family_id: Optional[str] = None):
+        """Drop one family (or the whole index when family_id is None), e.g. to force a fresh OPS fetch."""
+        with self._lock:
+            connection = self._connect() if self.path else None
+            if connection is None:
+                return
+            with connection:
+                if family_id is None:
+                    connection.execute("DELETE FROM families")
+                    connection.execute("DELETE FROM members")
+                else:
+                    connection.execute("DELETE FROM families WHERE family_id = ?", (family_id,))
+                    connection.execute("DELETE FROM members WHERE family_id = ?", (family_id,))
+
+    def __len__(self) -> int:
+        """Number of indexed families."""
+        with self._lock:
+            connection = self._connect() if self.path else None
+            if connection is None:
+                return 0
+            return connection.execute("SELECT COUNT(DISTINCT family_id) FROM families").fetchone()[0]
+
+
+# Shared by all FamilyRecord instances; persisted next to the notebook's tree files, so later runs reuse it
+family_index = FamilyIndex()
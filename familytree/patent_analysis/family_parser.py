@@ -0,0 +1,95 @@
+import io
+from typing import Dict, Iterator, List, Optional, Union
+
+try:
+    from lxml import etree as iter_etree  # Faster iterparse when available
+except ImportError:
+    import xml.etree.ElementTree as iter_etree
+
+ParseError = iter_etree.ParseError
+
+OPS_NS = 'http://ops.epo.org'
+EXCHANGE_NS = 'http://www.epo.org/exchange'
+
+# Qualified tags, computed once instead of per element lookup
+FAMILY_MEMBER = f'{{{OPS_NS}}}family-member'
+LEGAL = f'{{{OPS_NS}}}legal'
+PRE = f'{{{OPS_NS}}}pre'
+
+# Reference element -> key of the list it is collected into
+REFERENCE_TAGS = {
+    f'{{{EXCHANGE_NS}}}application-reference': 'applications',
+    f'{{{EXCHANGE_NS}}}priority-claim': 'priority_claims',
+    f'{{{EXCHANGE_NS}}}publication-reference': 'publications',
+}
+FIELD_TAGS = {f'{{{EXCHANGE_NS}}}{name}': name for name in ('doc-number', 'country', 'kind', 'date')}
+
+
+def iter_family_members(xml_tree: Union[str, bytes]) -> Iterator[Dict[str, List]]:
+    """
+    Stream the members of an OPS family document, one compact record per member.
+
+    The document is read with a single iterparse pass; every member element is
+    cleared and detached once its record is emitted, so memory stays bounded by
+    one member regardless of the family size.
+
+    Each record holds the INPADOC 'family_id' of the member and, in document order:
+    - 'applications', 'priority_claims', 'publications': one dict per reference with the text of
+      its first doc-number/country/kind/date descendant (a key is absent if the element is)
+    - 'legal_events': one dict per ops:legal with code, desc, dateMigr, infl and the ops:pre texts
+
+    Args:
+    - xml_tree (Union[str, bytes]): The family XML.
+
+    Returns:
+    - Iterator[Dict[str, List]]: Member records.
+    """
+    source = io.BytesIO(xml_tree.encode('utf-8') if isinstance(xml_tree, str) else xml_tree)
+    ancestors: List = []  # Open elements, to detach finished members from their parent
+    member: Optional[Dict[str, List]] = None
+    reference: Optional[Dict[str, Optional[str]]] = None
+    reference_tag: Optional[str] = None
+    legal: Optional[Dict] = None
+
+    for event, elem in iter_etree.iterparse(source, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            ancestors.append(elem)
+            if tag == FAMILY_MEMBER:
+                member = {'family_id': elem.get('family-id'),
+                          'applications': [], 'priority_claims': [], 'publications': [], 'legal_events': []}
+            elif member is None:
+                continue
+            elif tag in REFERENCE_TAGS and reference is None:
+                reference, reference_tag = {}, tag
+            elif tag == LEGAL:
+                legal = {
+                    'legal_event_code': elem.get('code', ''),
+                    'legal_event_desc': elem.get('desc', ''),
+                    'legal_event_date_migr': elem.get('dateMigr', ''),
+                    'legal_event_infl': elem.get('infl', ''),
+                    'legal_event_texts': [],
+                    'nested_data': None  # Ensures 'nested_data' exists
+                }
+            continue
+
+        ancestors.pop()
+        if member is None:
+            continue
+        if reference is not None and tag in FIELD_TAGS:
+            reference.setdefault(FIELD_TAGS[tag], elem.text)
+        elif tag == reference_tag:
+            member[REFERENCE_TAGS[tag]].append(reference)
+            reference = reference_tag = None
+        elif tag == PRE:
+            if legal is not None and elem.text:
+                legal['legal_event_texts'].append(elem.text.strip())
+        elif tag == LEGAL and legal is not None:
+            member['legal_events'].append(legal)
+            legal = None
+        elif tag == FAMILY_MEMBER:
+            yield member
+            member = None
+            elem.clear()
+            if ancestors:
+                ancestors[-1].remove(elem)
@@ -3,10 +3,17 @@ import os
 from typing import Optional, Dict, Tuple, List, Set
 import xml.etree.ElementTree as ET
 import pandas as pd
-from epo.tipdata.ops import OPSClient, models, exceptions
+import requests
 import re
-from IPython.display import display
-from patent_analysis.helpers import convert_japanese_priority_number, sort_orap
+try:
+    from IPython.display import display
+except ImportError:  # Outside notebooks (batch runs, tests)
+    display = print
+from patent_analysis.helpers import convert_japanese_priority_number, resolve_orap
+from patent_analysis.ops_client import create_ops_client, models, exceptions
+from patent_analysis.family_cache import FamilyDocument, FamilyDocumentCache, family_cache
+from patent_analysis.family_index import FamilyIndex, family_index, member_numbers
+from patent_analysis.family_parser import iter_family_members, ParseError
 from pprint import pprint
 import logging
 # logging.basicConfig(level=logging.DEBUG)
@@ -17,7 +24,7 @@ class FamilyRecord:
     Provides methods to fetch, parse, and process patent family data.
     """
     # Put more fundamental/lower-level methods earlier in the class definition:
-    def __init__(self, reference_type: str, doc_number: str, country: Optional[str] = None, kind: Optional[str] = None, constituents: Optional[str] = None, countrySelection=None, output_type: Optional[str] = None, ):  # xml_tree: Optional[str] = None, 
+    def __init__(self, reference_type: str, doc_number: str, country: Optional[str] = None, kind: Optional[str] = None, constituents: Optional[str] = None, countrySelection=None, output_type: Optional[str] = None, cache: Optional[FamilyDocumentCache] = None, index: Optional[FamilyIndex] = None):  # xml_tree: Optional[str] = None, 
         self.reference_type: str = reference_type        
         """
         Initialize the FamilyRecord object.
@@ -27,8 +34,14 @@ class FamilyRecord:
         - doc_number (str): The document number.
         - country (str): The country code (e.g., 'EP' for Europe).
         - kind (Optional[str]): The kind code (e.g., 'A' for application, 'B' for publication).
+        - cache (Optional[FamilyDocumentCache]): Family documents shared between records (default: the
+          session cache), so other country selections and updateFamily() reuse one OPS family call.
+        - index (Optional[FamilyIndex]): Persistent member -> family index (default: the shared index), so
+          documents of already indexed families are resolved without an OPS family call.
         """        
-        self.client: OPSClient = OPSClient(key=os.getenv("OPS_KEY"), secret=os.getenv("OPS_SECRET"))
+        self.client = create_ops_client()  # OPSClient, or RestOPSClient when OPS_BASE_URL is set
+        self.cache: FamilyDocumentCache = cache if cache is not None else family_cache
+        self.index: FamilyIndex = index if index is not None else family_index
         self.reference_type: str = reference_type
         self.doc_number: str = doc_number        
         self.source_doc_number: Optional[str] = self.compute_source_doc_number(doc_number, country, kind)
@@ -41,6 +54,7 @@ class FamilyRecord:
         self.output_type: str = output_type
         self.ccw_to_wo_mapping = {}
         self.familyRoot = None
+        self.family_id: Optional[str] = None  # INPADOC family ID, from the family document
         self.xml_tree = None
         self.data = {}  # Initialize the data attribute
         self.df, self.DropdownCC = self._initialize_dataframe()
@@ -79,6 +93,19 @@ class FamilyRecord:
         Returns:
         - str: The fetched XML data as a string.
         """        
+        key = FamilyDocumentCache.make_key(reference_type, doc_number, country, kind, constituents)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.xml_tree = cached.xml_tree
+            return self.xml_tree
+
+        # Member of a family indexed in this or an earlier run: parsed family, no OPS call
+        indexed = self.index.lookup(reference_type, doc_number, country, constituents)
+        if indexed is not None:
+            self.cache.put(key, indexed)
+            self.xml_tree = indexed.xml_tree
+            return self.xml_tree
+
         try:
             input_model = models.Docdb(doc_number, country, kind) if kind else models.Epodoc(f"{country}{doc_number}")
             # print("reference_type:", reference_type)
@@ -86,17 +113,38 @@ class FamilyRecord:
             # print("constituents:", constituents)
             # print("output_type:", output_type)
             self.xml_tree = self.client.family(reference_type=reference_type, input=input_model, constituents=constituents, output_type=output_type)
+            if self.xml_tree is not None:
+                self.cache.put(key, FamilyDocument(self.xml_tree))
             return self.xml_tree
-        except exceptions.HTTPError as e:
+        except (exceptions.HTTPError, requests.exceptions.HTTPError) as e:
             print(f"HTTPError: {e}")
             return None
 
     # This is a core data-fetching method. It should come before methods that depend on the XML data.
     def get_family_root(self) -> Optional[ET.Element]:
+        """
+        Full element tree of the family document. The DataFrame is built by the streaming
+        parser, so the tree is only materialized on request (once per cached document).
+        """
+        if self.familyRoot is not None:
+            return self.familyRoot
         if self.xml_tree is None:
             print("Error: self.xml_tree is not initialized.")
             return None
-        return ET.fromstring(self.xml_tree)
+        document = self._cached_document()
+        if document is not None and document.root is not None:
+            self.familyRoot = document.root
+            return self.familyRoot
+        self.familyRoot = self._parse_xml()
+        if document is not None:
+            document.root = self.familyRoot
+        return self.familyRoot
+
+    def _cached_document(self) -> Optional[FamilyDocument]:
+        """The cache entry of this record's family request, if the XML was fetched in this session."""
+        key = FamilyDocumentCache.make_key(self.reference_type, self.doc_number, self.country, self.kind, self.constituents)
+        document = self.cache.peek(key)
+        return document if document is not None and document.xml_tree is self.xml_tree else None
 
     def _parse_xml(self) -> Optional[ET.Element]:
         """Parses XML from self.xml_tree and returns the root element."""
@@ -141,26 +189,17 @@ class FamilyRecord:
     
         return f"{{{namespace_uri}}}{local_name}"
 
-    # Utility for XML parsing. Parses the XML tree and returns a list of family members.
-    def _extract_family_members(self):
-        """Extracts family members from the XML tree."""
-        return self.familyRoot.findall(".//{http://ops.epo.org}family-member")
-
-    def _parse_application_data(self, family_member, nsmap) -> Tuple[str, Dict]:
+    def _parse_application_data(self, family_member: Dict[str, List]) -> Tuple[str, Dict]:
         """Extracts application details such as country, kind, number, and date."""
         app_number_full = None
         app_data = {}
+        app_kind_text = None
 
-        for application_reference in family_member.findall(f".//{self.get_ns_prefix('exchange:application-reference', nsmap)}"):
-            app_doc_number = application_reference.find(f".//{self.get_ns_prefix('exchange:doc-number', nsmap)}")
-            app_country = application_reference.find(f".//{self.get_ns_prefix('exchange:country', nsmap)}")
-            app_kind = application_reference.find(f".//{self.get_ns_prefix('exchange:kind', nsmap)}")
-            app_date = application_reference.find(f".//{self.get_ns_prefix('exchange:date', nsmap)}")
-
-            app_number = app_doc_number.text if app_doc_number is not None else None
-            app_country_text = app_country.text if app_country is not None else 'Unknown'
-            app_kind_text = app_kind.text if app_kind is not None else 'Unknown'
-            app_date_text = app_date.text if app_date is not None else None
+        for application_reference in family_member['applications']:
+            app_number = application_reference.get('doc-number')
+            app_country_text = application_reference.get('country', 'Unknown')
+            app_kind_text = application_reference.get('kind', 'Unknown')
+            app_date_text = application_reference.get('date')
             app_number_full = f"{app_country_text}{app_number}"
 
             if app_number_full.startswith('EP'):
@@ -204,18 +243,13 @@ class FamilyRecord:
         else:
             return (2, item)  # Lowest priority
             
-    def _parse_priority_claims(self, family_member, nsmap, data, app_number_full, app_data, app_kind_text):
-        for priority_claim in family_member.findall(f".//{self.get_ns_prefix('exchange:priority-claim', nsmap)}"):
-            elements = { 
-                key: priority_claim.find(f".//{self.get_ns_prefix(f'exchange:{key}', nsmap)}")
-                for key in ['doc-number', 'country', 'kind', 'date']
-            }
-
-            if elements['doc-number'] is not None:
-                priority_doc_number = elements['doc-number'].text
-                priority_country = elements['country'].text if elements['country'] is not None else 'Unknown'
-                priority_kind = elements['kind'].text if elements['kind'] is not None else ''
-                priority_date = elements['date'].text if elements['date'] is not None else ''
+    def _parse_priority_claims(self, family_member, data, app_number_full, app_data, app_kind_text):
+        for priority_claim in family_member['priority_claims']:
+            if 'doc-number' in priority_claim:
+                priority_doc_number = priority_claim['doc-number']
+                priority_country = priority_claim.get('country', 'Unknown')
+                priority_kind = priority_claim.get('kind', '')
+                priority_date = priority_claim.get('date', '')
 
                 priority_doc_number_full = f"{priority_country}{priority_doc_number}"
                 if priority_doc_number_full.startswith('EP'):
@@ -252,17 +286,15 @@ class FamilyRecord:
                             app_data['priority_numbers'] = sorted(app_data['priority_numbers'], key=self.custom_sort_key)
                             app_data['orap'] = sorted(app_data['orap'], key=self.custom_sort_key)
 
-    def _parse_publication_data(self, family_member, nsmap, data, app_number_full, app_data, country_codes):            
-        for publication_reference in family_member.findall(f".//{self.get_ns_prefix('exchange:publication-reference', nsmap)}"):
-            pub_attrs = {
-                "pub_number": publication_reference.find(f".//{self.get_ns_prefix('exchange:doc-number', nsmap)}"),
-                "pub_country": publication_reference.find(f".//{self.get_ns_prefix('exchange:country', nsmap)}"),
-                "pub_kind": publication_reference.find(f".//{self.get_ns_prefix('exchange:kind', nsmap)}"),
-                "pub_date": publication_reference.find(f".//{self.get_ns_prefix('exchange:date', nsmap)}")
-            }
-        
+    def _parse_publication_data(self, family_member, data, app_number_full, app_data, country_codes):            
+        for publication_reference in family_member['publications']:
             # Extract text values, ensuring defaults where necessary
-            pub_data = {key: (elem.text if elem is not None else None) for key, elem in pub_attrs.items()}
+            pub_data = {
+                "pub_number": publication_reference.get('doc-number'),
+                "pub_country": publication_reference.get('country'),
+                "pub_kind": publication_reference.get('kind'),
+                "pub_date": publication_reference.get('date')
+            }
             pub_data["pub_country"] = pub_data["pub_country"] or "Unknown"
         
             if pub_data["pub_number"]:
@@ -272,23 +304,14 @@ class FamilyRecord:
                 app_data.update({k: v for k, v in pub_data.items() if v})  # Update only non-empty values
                 country_codes.add(pub_data["pub_country"])
     
-    def _parse_legal_events(self, family_member, nsmap, data, app_number_full, app_data): 
-        for legal_event in family_member.findall(f".//{self.get_ns_prefix('ops:legal', nsmap)}"):
-            legal_event_data = {
-                'legal_event_code': legal_event.attrib.get('code', ''),
-                'legal_event_desc': legal_event.attrib.get('desc', ''),
-                'legal_event_date_migr': legal_event.attrib.get('dateMigr', ''),
-                'legal_event_infl': legal_event.attrib.get('infl', ''),
-                'legal_event_texts': [pre.text.strip() for pre in legal_event.findall('.//{http://ops.epo.org}pre') if pre.text],
-                'nested_data': None  # Ensures 'nested_data' exists
-            }
-
+    def _parse_legal_events(self, family_member, data, app_number_full, app_data): 
+        for legal_event_data in family_member['legal_events']:
             if app_number_full in data:
                 app_data['legal_events'].append(legal_event_data)
 
-    def _process_family_member(self, family_member: ET.Element, nsmap: Dict[str, str], data: Dict, country_codes: Set[str]):
-        """Parses and processes data for a single family member."""
-        app_number_full, app_data, app_kind_text = self._extract_application_data(family_member, nsmap)
+    def _process_family_member(self, family_member: Dict[str, List], data: Dict, country_codes: Set[str]):
+        """Processes the streamed record (see family_parser.iter_family_members) of a single family member."""
+        app_number_full, app_data, app_kind_text = self._extract_application_data(family_member)
     
         if not app_number_full:
             return  # Skip processing if no valid application data
@@ -298,9 +321,9 @@ class FamilyRecord:
         data[app_number_full]['priority_numbers'].update(app_data.get('priority_numbers', set()))
         data[app_number_full]['orap'].update(app_data.get('orap', set()))
     
-        self._parse_priority_claims(family_member, nsmap, data, app_number_full, app_data, app_kind_text)
-        self._parse_publication_data(family_member, nsmap, data, app_number_full, app_data, country_codes)
-        self._parse_legal_events(family_member, nsmap, data, app_number_full, app_data)
+        self._parse_priority_claims(family_member, data, app_number_full, app_data, app_kind_text)
+        self._parse_publication_data(family_member, data, app_number_full, app_data, country_codes)
+        self._parse_legal_events(family_member, data, app_number_full, app_data)
 
     def _add_missing_countries(self, data: Dict[str, Dict], country_codes: Set[str]):
         """Ensures all selected countries are represented in the data."""
@@ -324,6 +347,7 @@ class FamilyRecord:
         flattened_data = [
             {
                 **value,
+                'priority_dates': dict(value['priority_dates']),
                 'priority_numbers': sorted(value['priority_numbers'], key=self.custom_sort_key),
                 'orap': sorted(value['orap'], key=self.custom_sort_key),
                 'legal_events': [
@@ -350,12 +374,24 @@ class FamilyRecord:
         return df
 
     def _parse_xml_to_dataframe(self) -> Optional[pd.DataFrame]:
-        """Parses the XML, processes family members, and returns a DataFrame."""
-        self.familyRoot = self._parse_xml()
-        if self.familyRoot is None:
+        """
+        Parses the XML, processes family members, and returns a DataFrame.
+        The parsed members are cached with the family document; later calls for the
+        same document only re-apply the country selection.
+        """
+        document = self._cached_document()
+        if document is not None and document.members is not None:
+            self.familyRoot = document.root
+            self.ccw_to_wo_mapping.update(document.ccw_to_wo_mapping)
+            self.family_id = document.family_id
+            data = dict(document.members)
+            self._add_missing_countries(data, document.country_codes)
+            return self._create_dataframe(data), sorted(document.country_codes)
+
+        if self.xml_tree is None:
+            print("Error: self.xml_tree is None.")
             return None, []
 
-        nsmap = self._get_namespace_map()
         data = defaultdict(lambda: {
             'accession_number': '',
             'app_number': '',
@@ -369,13 +405,31 @@ class FamilyRecord:
             'legal_events': []
         })
         country_codes = set()
+        numbers = {(self.reference_type, f"{self.country or ''}{self.doc_number}")}
     
-        family_members = self._get_family_members()
-        print(f"Extracted {len(family_members)} family members.")
-
-        for family_member in family_members:
-            self._process_family_member(family_member, nsmap, data, country_codes)
-
+        members_count = 0
+        try:
+            # Single streaming pass; each member is processed as soon as it is complete
+            for family_member in iter_family_members(self.xml_tree):
+                self.family_id = self.family_id or family_member['family_id']
+                self._process_family_member(family_member, data, country_codes)
+                numbers.update(member_numbers(family_member))
+                members_count += 1
+        except ParseError as e:
+            print(f"XML parsing failed: {e}")
+            return None, []
+        print(f"Extracted {members_count} family members.")
+
+        if document is not None:
+            document.members = dict(data)
+            document.family_id = self.family_id
+            document.country_codes = set(country_codes)
+            document.ccw_to_wo_mapping = dict(self.ccw_to_wo_mapping)
+            for value in document.members.values():
+                numbers.update(('application', number) for number in (value['app_number'], value['accession_number']) if number)
+            self.index.store(document, self.constituents, numbers)
+
+        data = dict(data)
         self._add_missing_countries(data, country_codes)
         df = self._create_dataframe(data)
     
@@ -410,13 +464,9 @@ class FamilyRecord:
             print(f"Error initializing DataFrame: {e}")
             return pd.DataFrame(), []
             
-    def _get_family_members(self) -> List[ET.Element]:
-        """Extracts and returns a list of family members from the parsed XML."""
-        return list(self._extract_family_members())
-
-    def _extract_application_data(self, family_member: ET.Element, nsmap: Dict[str, str]) -> Tuple[Optional[str], Dict, Optional[str]]:
+    def _extract_application_data(self, family_member: Dict[str, List]) -> Tuple[Optional[str], Dict, Optional[str]]:
         """Extracts application data and returns a tuple (app_number_full, app_data, app_kind_text)."""
-        app_number_full, app_data, app_kind_text = self._parse_application_data(family_member, nsmap)
+        app_number_full, app_data, app_kind_text = self._parse_application_data(family_member)
     
         if not app_number_full:
             print("Skipping family member: No app_number_full")
@@ -452,10 +502,7 @@ class FamilyRecord:
                     if 'orap_history' not in filtered_df.columns:
                         filtered_df['orap_history'] = None
                         
-                    filtered_df = filtered_df.apply(
-                        lambda row: sort_orap(row, self.ccw_to_wo_mapping, self.data), 
-                        axis=1
-                    )
+                    filtered_df = resolve_orap(filtered_df, self.ccw_to_wo_mapping)
                     # display(filtered_df)
                 return filtered_df          
         return None
@@ -482,6 +529,30 @@ class FamilyRecord:
             print("DataFrame is empty. No data to process.")
             return None
 
+    # Hashable form of each container column, as convert_to_hashable() would produce it
+    HASHABLE_COLUMNS = {
+        'priority_numbers': lambda value: tuple(sorted(value)),
+        'orap': lambda value: tuple(sorted(value)),
+        'orap_history': lambda value: tuple(sorted(value)),
+        'priority_dates': lambda value: tuple(sorted(value.items())),
+        'legal_events': lambda value: tuple(sorted(tuple(sorted(event.items())) for event in value)),
+    }
+
+    def _to_hashable_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert the container columns of df to hashable values with one typed converter per
+        column; missing values and columns outside HASHABLE_COLUMNS go through convert_to_hashable.
+        """
+        df = df.copy()
+        for col in df.columns:
+            convert = self.HASHABLE_COLUMNS.get(col)
+            values = df[col].tolist()
+            df[col] = [
+                convert(value) if convert is not None and isinstance(value, (list, set, dict)) else self.convert_to_hashable(value)
+                for value in values
+            ]
+        return df
+
     def convert_to_hashable(self, value):
         """
         Convert the given value to a hashable type.
@@ -519,20 +590,13 @@ class FamilyRecord:
                 self.DropdownCC = dropdown_cc
 
                 # Convert all non-hashable types in the DataFrame to hashable types
-                for col in self.df.columns:
-                    self.df[col] = self.df[col].apply(self.convert_to_hashable)
-
-                # Verify if any unhashable objects still exist in the DataFrame
-                for col in self.df.columns:
-                    unhashable_count = self.df[col].apply(lambda x: isinstance(x, dict) or isinstance(x, (list, set))).sum()
-                    if unhashable_count > 0:
-                        print(f"Warning: Column '{col}' still contains {unhashable_count} unhashable items.")
-                        print("Here are some examples:")
-                        print(self.df[col][self.df[col].apply(lambda x: isinstance(x, dict) or isinstance(x, (list, set)))].head())
-
-                # Attempt to drop duplicates
+                self.df = self._to_hashable_columns(self.df)
+
+                # Members are keyed by application number, so comparing the scalar columns
+                # is enough to find duplicate rows (no hashing of nested tuples)
                 print("Dropping duplicates...")
-                self.df = self.df.drop_duplicates()
+                key_columns = [col for col in self.df.columns if col not in self.HASHABLE_COLUMNS]
+                self.df = self.df.drop_duplicates(subset=key_columns or None)
 
         except Exception as e:
             print(f"Error updating FamilyRecord: {e}")
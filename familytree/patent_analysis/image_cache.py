@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+import xml.etree.ElementTree as ET
+
+from patent_analysis.biblio_cache import RateBudget
+from patent_analysis.ops_client import models
+
+OPS_NAMESPACE = {'ops': 'http://ops.epo.org'}
+
+
+def extract_first_page_link(image_xml) -> Optional[str]:
+    """
+    Extract the link of the first page clipping from an OPS images inquiry.
+
+    Args:
+    - image_xml (Union[str, bytes]): The inquiry XML.
+
+    Returns:
+    - Optional[str]: Image link (e.g. 'EP/2101496/A1/firstpage') or None if the document has no first page clipping.
+    """
+    root = ET.fromstring(image_xml)
+    first_page_clipping = root.find('.//ops:document-instance[@desc="FirstPageClipping"]', OPS_NAMESPACE)
+    return first_page_clipping.get('link') if first_page_clipping is not None else None
+
+
+class ImageStore:
+    """
+    Content-addressed image cache on disk.
+
+    Images are stored once under their SHA-256 (<root>/<2 hex>/<sha256>.tiff), whichever
+    publication they were downloaded for; index.json maps publication numbers to their image
+    link and digest, so cached publications need neither an inquiry nor a download.
+    Index changes are written every flush_every records and on flush(); entries lost in a
+    crash only cost a new inquiry (the image itself is deduplicated by its digest).
+    Thumbnails are only generated when first requested.
+    """
+
+    def __init__(self, root_dir: str, flush_every: int = 50):
+        self.root_dir = root_dir
+        self.index_path = os.path.join(root_dir, 'index.json')
+        self.flush_every = flush_every
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        os.makedirs(root_dir, exist_ok=True)
+        try:
+            with open(self.index_path) as f:
+                self._index: Dict[str, Dict[str, Optional[str]]] = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def path(self, digest: str, suffix: str = '.tiff') -> str:
+        return os.path.join(self.root_dir, digest[:2], digest + suffix)
+
+    def put(self, data: bytes) -> str:
+        """Store image bytes (if not stored yet) and return their digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def lookup(self, pub_number: str) -> Optional[Dict[str, Optional[str]]]:
+        """Index entry {'link', 'digest'} of a publication (digest None: no first page image), or None if unknown."""
+        entry = self._index.get(pub_number)
+        if entry and entry.get('digest') and not os.path.exists(self.path(entry['digest'])):
+            return None  # Image file removed from the cache
+        return entry
+
+    def record(self, pub_number: str, link: Optional[str], digest: Optional[str]):
+        with self._lock:
+            self._index[pub_number] = {'link': link, 'digest': digest}
+            self._unsaved += 1
+            if self._unsaved >= self.flush_every:
+                self._write_index()
+
+    def flush(self):
+        """Write index.json if it has unsaved records."""
+        with self._lock:
+            if self._unsaved:
+                self._write_index()
+
+    def _write_index(self):
+        tmp_path = f"{self.index_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+        self._unsaved = 0
+
+    def thumbnail(self, digest: str, size: Tuple[int, int] = (256, 256)) -> str:
+        """
+        Path of a PNG thumbnail of a stored image, generated on first request.
+
+        Args:
+        - digest (str): Digest returned by put().
+        - size (Tuple[int, int]): Maximum width and height.
+
+        Returns:
+        - str: Path of the thumbnail.
+        """
+        from PIL import Image
+
+        path = self.path(digest, f'_{size[0]}x{size[1]}.png')
+        if not os.path.exists(path):
+            with Image.open(self.path(digest)) as image:
+                image.thumbnail(size)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                image.save(tmp_path, format='PNG')
+            os.replace(tmp_path, path)
+        return path
+
+
+class ImagePipeline:
+    """
+    Retrieves first page images of publications: the images inquiry and the page download run
+    concurrently on a thread pool, under a rate budget shared by all requests (images service
+    throttling), and results go to an ImageStore.
+
+    submit() returns immediately, so a tree can start rendering while images are downloading;
+    result() waits for one publication only, which lets image views load progressively.
+    A retrieval that fails for another reason than 'not found' is not cached, so the next
+    submit() or result() of that publication tries again.
+    """
+
+    def __init__(self, client, store: ImageStore, max_workers: int = 4, requests_per_second: Optional[float] = 5.0):
+        self.client = client
+        self.store = store
+        self.max_workers = max_workers
+        self.budget = RateBudget(requests_per_second)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, pub_numbers: Iterable[str]):
+        """Schedule the retrieval of every publication not cached or scheduled yet (in the given order)."""
+        with self._lock:
+            for pub_number in pub_numbers:
+                if pub_number:
+                    self._schedule(pub_number)
+
+    def result(self, pub_number: str) -> Optional[str]:
+        """
+        Wait for one publication.
+
+        Returns:
+        - Optional[str]: Digest of its first page image in the store, or None if there is none
+          (or if the retrieval failed).
+        """
+        with self._lock:
+            future = self._schedule(pub_number)
+        return future.result()
+
+    def shutdown(self):
+        """Cancel the retrievals not started yet (they are scheduled again on the next submit) and save the index."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._futures = {pub_number: future for pub_number, future in self._futures.items()
+                             if not future.cancelled()}
+        self.store.flush()
+
+    def _schedule(self, pub_number: str) -> Future:
+        """Future of a publication, scheduling its retrieval if needed (call with self._lock held)."""
+        future = self._futures.get(pub_number)
+        if future is not None:
+            return future
+        entry = self.store.lookup(pub_number)
+        if entry is not None:
+            future = Future()
+            future.set_result(entry.get('digest'))
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, self.max_workers))
+            future = self._executor.submit(self._retrieve, pub_number)
+        self._futures[pub_number] = future
+        return future
+
+    def _forget(self, pub_number: str):
+        """Drop a failed retrieval, so the publication is requested again."""
+        with self._lock:
+            self._futures.pop(pub_number, None)
+
+    def _retrieve(self, pub_number: str) -> Optional[str]:
+        try:
+            self.budget.acquire()
+            image_xml = self.client.published_data(
+                reference_type="publication",
+                input=models.Docdb(pub_number[2:-2], pub_number[:2], pub_number[-2:], date=None),
+                endpoint="images",
+                constituents=[],
+                output_type="Raw",
+            )
+            link = extract_first_page_link(image_xml)
+            digest = None
+            if link:
+                self.budget.acquire()
+                digest = self.store.put(self.client.image(path=link, range=1, document_format='application/tiff'))
+            self.store.record(pub_number, link, digest)
+            return digest
+        except requests.exceptions.RequestException as e:
+            if getattr(e, 'response', None) is not None and e.response.status_code == 404:
+                print(f"Publication number {pub_number} not found. Skipping.")
+                self.store.record(pub_number, None, None)
+            else:
+                print(f"HTTP error occurred: {e}")
+                self._forget(pub_number)
+            return None
+        except ET.ParseError as e:
+            print(f"Images inquiry of {pub_number} could not be parsed: {e}")
+            self._forget(pub_number)
+            return None
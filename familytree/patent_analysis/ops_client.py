@@ -0,0 +1,170 @@
+import os
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional, List
+
+import pandas as pd
+import requests
+
+
+@dataclass
+class Docdb:
+    """Docdb input (number, country and kind code), as epo.tipdata.ops.models.Docdb."""
+    number: str
+    country_code: str
+    kind_code: str
+    date: Optional[str] = None
+
+
+@dataclass
+class Epodoc:
+    """Epodoc input (e.g. 'EP09164213'), as epo.tipdata.ops.models.Epodoc."""
+    number: str
+    kind_code: Optional[str] = None
+    date: Optional[str] = None
+
+
+try:
+    from epo.tipdata.ops import models, exceptions
+except ImportError:  # Outside TIP: inputs for RestOPSClient, which raises requests' HTTPError
+    models = SimpleNamespace(Docdb=Docdb, Epodoc=Epodoc)
+    exceptions = requests.exceptions
+
+
+def create_ops_client():
+    """
+    Create the OPS client used by FamilyRecord, TreeProcessor and PatentProcessor.
+
+    When OPS_BASE_URL is set (e.g. to the offline OPS stand-in server of deeptechfinder/tests),
+    a RestOPSClient talking to that endpoint is returned; otherwise the TIP OPSClient.
+
+    Returns:
+    - OPSClient or RestOPSClient: Client exposing family(), published_data() and image().
+    """
+    base_url = os.getenv("OPS_BASE_URL")
+    if base_url:
+        return RestOPSClient(
+            base_url=base_url,
+            auth_url=os.getenv("OPS_AUTH_URL", "https://ops.epo.org/3.2/auth/accesstoken"),
+            key=os.getenv("OPS_KEY"),
+            secret=os.getenv("OPS_SECRET"),
+        )
+
+    from epo.tipdata.ops import OPSClient
+    return OPSClient(key=os.getenv("OPS_KEY"), secret=os.getenv("OPS_SECRET"))
+
+
+class RestOPSClient:
+    """
+    Minimal OPS REST client with the subset of the TIP OPSClient interface used in this package.
+    Errors are raised as requests.exceptions.HTTPError.
+    """
+
+    def __init__(self, base_url: str, auth_url: str, key: Optional[str], secret: Optional[str], timeout: int = 30):
+        self.base_url = base_url.rstrip("/")
+        self.auth_url = auth_url
+        self.key = key
+        self.secret = secret
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.access_token = None
+
+    def family(self, reference_type: str, input, constituents: Optional[List[str]] = None, output_type: Optional[str] = None) -> bytes:
+        """
+        Retrieve the INPADOC family of a document as XML.
+
+        Args:
+        - reference_type (str): 'publication', 'application' or 'priority'.
+        - input: models.Docdb or models.Epodoc input.
+        - constituents (Optional[List[str]]): e.g. ['legal', 'biblio'].
+
+        Returns:
+        - bytes: The family XML document.
+        """
+        path = f"family/{reference_type}/{self._input_path(input)}"
+        if constituents:
+            path += "/" + ",".join([constituents] if isinstance(constituents, str) else constituents)
+        return self._get(path, accept="application/xml").content
+
+    def published_data(self, reference_type: str, input, endpoint: str = "biblio", constituents: Optional[List[str]] = None, output_type: Optional[str] = None):
+        """
+        Retrieve published data (biblio, images inquiry, ...) for a document.
+
+        Args:
+        - reference_type (str): 'publication' or 'application'.
+        - input: models.Docdb or models.Epodoc input.
+        - endpoint (str): OPS published-data endpoint, e.g. 'biblio' or 'images'.
+        - output_type (Optional[str]): 'Dataframe' returns the exchange documents as a DataFrame
+          with '|'-separated column names, anything else the raw XML.
+
+        Returns:
+        - pd.DataFrame or bytes: The retrieved data.
+        """
+        path = f"published-data/{reference_type}/{self._input_path(input)}/{endpoint}"
+        if constituents:
+            path += "," + ",".join(constituents)
+
+        if output_type == "Dataframe":
+            data = self._get(path, accept="application/json").json()
+            world = data.get("ops:world-patent-data", {})
+            documents = world.get("exchange-documents", {}).get("exchange-document", [])
+            documents = documents if isinstance(documents, list) else [documents]
+            return pd.json_normalize(documents, sep="|", max_level=1)
+
+        return self._get(path, accept="application/xml").content
+
+    def image(self, path: str, range: int = 1, document_format: str = "application/tiff") -> bytes:
+        """
+        Download one page of a document image.
+
+        Args:
+        - path (str): Image link from the images inquiry (e.g. 'published-data/images/EP/1234567/A1/firstpage').
+        - range (int): Page number.
+        - document_format (str): Requested media type.
+
+        Returns:
+        - bytes: The image data.
+        """
+        path = path if path.startswith("published-data/") else f"published-data/images/{path}"
+        return self._get(path, accept=document_format, params={"Range": range}).content
+
+    def _input_path(self, input) -> str:
+        """Render a models.Docdb / models.Epodoc input as an OPS path segment."""
+        def first(*names):
+            for name in names:
+                value = getattr(input, name, None)
+                if value:
+                    return str(value)
+            return ""
+
+        number = first("number", "doc_number")
+        if type(input).__name__.lower() == "epodoc":
+            return f"epodoc/{number}"
+        country = first("country_code", "country")
+        kind = first("kind_code", "kind")
+        return "docdb/" + ".".join(part for part in (country, number, kind) if part)
+
+    def _authenticate(self):
+        response = self.session.post(
+            self.auth_url,
+            data={"grant_type": "client_credentials"},
+            auth=(self.key or "", self.secret or ""),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        self.access_token = response.json()["access_token"]
+
+    def _get(self, path: str, accept: str, params: Optional[dict] = None) -> requests.Response:
+        if self.access_token is None:
+            self._authenticate()
+
+        url = f"{self.base_url}/{path}"
+        headers = {"Authorization": f"Bearer {self.access_token}", "Accept": accept}
+        response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+        if response.status_code == 401:  # Token expired: authenticate once more
+            self._authenticate()
+            headers["Authorization"] = f"Bearer {self.access_token}"
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+
+        response.raise_for_status()
+        return response
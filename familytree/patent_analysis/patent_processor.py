@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import xml.etree.ElementTree as ET
 import ipywidgets as widgets
@@ -9,7 +10,9 @@ from epo.tipdata.ops import OPSClient, models, exceptions
 from patent_analysis.family_record import FamilyRecord  # Custom module for handling patent family records
 from patent_analysis.tree_creation import TreeCreation, TreeNode  # Custom module for tree creation logic
 from patent_analysis.tree_processor import TreeProcessor  # Custom module to process tree structure of patents
+from patent_analysis.view_engine import ViewEngine  # Renders tree views from one in-memory family snapshot
 from patent_analysis.install_dependencies import InstallDependencies  # Custom module to process dependencies
+from patent_analysis.ops_client import create_ops_client
 
 class PatentProcessor:
     def __init__(self, OPSClient, models, exceptions):
@@ -18,7 +21,7 @@ class PatentProcessor:
         input widgets, and buttons.
         """
         # Initialize OPSClient with API key and secret, which are loaded from environment variables
-        self.client: OPSClient = OPSClient(key=os.getenv("OPS_KEY"), secret=os.getenv("OPS_SECRET"))
+        self.client: OPSClient = create_ops_client()
 
         # Initialize attributes for tree structure and patent processing logic
         self.tree = None  # To hold the generated tree structure
@@ -27,6 +30,7 @@ class PatentProcessor:
         self.listORAPs = None  # Original Application numbers list
         self.filtered_app_numbers = None  # Filtered list of application numbers
         self.familyRoot = None  # Root of the patent family
+        self.view_engine = None  # Renders the views of the current family tree (see create_and_process_tree)
         self.record1 = None  # Instance of FamilyRecord for patent family processing
         self.initFlag = None  # Flag to track the current action (showing priorities, applications, etc.)
         self.is_button_clicked = False  # To check whether a button was clicked
@@ -164,27 +168,12 @@ class PatentProcessor:
             # Clears the output from previous actions to provide a clean view.
             clear_output(wait=True)
             try:
-                # Initializes the TreeProcessor object with the tree, root node, and relevant application data.
-                tree_processor = TreeProcessor(
-                    tree=self.tree, 
-                    root=self.root, 
-                    initFlag=self.initFlag, 
-                    listAPs=self.listAPs, 
-                    listORAPs=self.listORAPs, 
-                    df=self.filtered_app_numbers,
-                    familyRoot=self.familyRoot
-                )
-                # Checks if a file exists at the given path where the tree file will be saved. If it does, it deletes the file to ensure fresh processing.
-                if os.path.exists(tree_processor.tree_file_path):
-                    os.remove(tree_processor.tree_file_path)
-
-                # Processes the tree file and returns the root node.
-                current_root = tree_processor.process_tree_file()
-
-                # Reads and prints the contents of the processed tree file if it exists.
-                if os.path.exists(tree_processor.tree_file_path):
-                    with open(tree_processor.tree_file_path, 'r') as f:
-                        print(f.read())
+                # Renders the requested view(s) from the family snapshot built in create_and_process_tree(),
+                # streaming straight into the output widget (no tree file, no new OPS requests).
+                if self.view_engine is None:
+                    print("No family tree to display. Submit a document first.")
+                    return
+                self.view_engine.stream(self.initFlag, sys.stdout)
                 
                 if self.tree is not None:
                     self.display_checkboxes()
@@ -196,6 +185,16 @@ class PatentProcessor:
                 print(f"Error processing tree with initFlag {self.initFlag}: {e}")
                 import traceback
                 traceback.print_exc()
+
+    def show_views(self, views):
+        """
+        Display a combination of views in one tree, e.g. ['Show_priorities', 'Show_legal_events'].
+
+        Args:
+        - views (list or str): initFlag value(s) of the action buttons.
+        """
+        self.initFlag = views
+        self.process_with_initFlag()
                 
     def display_checkboxes(self):
         """
@@ -272,23 +271,20 @@ class PatentProcessor:
             # Converts the nested dictionary to a tree structure using TreeNode objects.
             tree_object = TreeNode.dict_to_object(self.tree)
 
-            # Initializes a TreeProcessor object to handle tree processing.
-            tree_processor = TreeProcessor(
+            # Builds the family snapshot every view is rendered from (action buttons only re-render it).
+            if self.view_engine is not None:
+                self.view_engine.close()  # Stops the image downloads of the previous family
+            self.view_engine = ViewEngine(
                 tree=tree_object, 
                 root=self.root, 
-                initFlag=self.initFlag, 
                 listAPs=self.listAPs, 
                 listORAPs=self.listORAPs, 
                 df=self.filtered_app_numbers, 
                 familyRoot=self.familyRoot
             )
             
-            # Processes the tree and creates a tree file that represents the patent family structure.
-            tree_processor.process_tree_file()
-            
-            # Reads and prints the content of the processed tree file.
-            with open(tree_processor.tree_file_path, 'r') as f:
-                print(f.read())
+            # Renders the tree (with the current view, if any) straight into the output.
+            self.view_engine.stream(self.initFlag, sys.stdout)
             
             # If the tree is successfully created, it displays the checkboxes and action buttons for further actions.    
             if self.tree is not None:
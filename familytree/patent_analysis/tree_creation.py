@@ -2,6 +2,10 @@ import pandas as pd
 from typing import Dict, Any
 import re
 
+def first_word(value) -> str:
+    """First space-separated word of a table value ('' for missing values)."""
+    return value.split(' ')[0] if isinstance(value, str) else ''
+
 class TreeCreation:
     """
     The TreeCreation class is designed to manage and organize data related to publications, patents, or applications, 
@@ -116,70 +120,66 @@ class TreeCreation:
         # listORAPs contains all oldest applications with potential redundancies
         # print("listORAPs:", listORAPs) 
 
-        if self.orapNb is not None and int(self.orapNb) > 0:            
-            if self.db in ["EPODOC", "DOCDB"]:                
-                for i in range(len(self.df)):
-                    current_row = df.iloc[i]
-                    # print(f"Row {i}: {current_row}")  # Print the row to check its content
-
-                    # Safely handle 'accession_number'
-                    accession_number = current_row['accession_number'].split(' ')[0] if pd.notna(current_row['accession_number']) else ''
-                    # print("accession_number:", accession_number)
-                    # Safely handle 'app_number'
-                    app_number = current_row['app_number'].split(' ')[0] if pd.notna(current_row['app_number']) else ''
-                    # print("app_number:", app_number)
-                    # Safely handle 'pub_number'
-                    pub_number = str(current_row['pub_number']) + str(current_row['pub_kind']) # current_row['pub_number']
-                    # print("pub_number:", pub_number)                    
-                    # Safely handle 'orap'
-                    orap = current_row['orap'].split(' ')[0] if pd.notna(current_row['orap']) and current_row['orap'] else ''
-                    # print("orap:", orap)
+        if self.orapNb is not None and int(self.orapNb) > 0:
+            accession_numbers = df['accession_number'].tolist()
+            app_numbers = df['app_number'].tolist()
+            oraps = df['orap'].tolist()
+
+            if self.db in ["EPODOC", "DOCDB"]:
+                # First row of each accession number, to back-fill the orap of national phase entries
+                # (EP accession, non-EP application) from their EP counterpart in one lookup
+                first_row_by_accession = {}
+                for j, accession_number in enumerate(accession_numbers):
+                    first_row_by_accession.setdefault(accession_number, j)
+
+                for i in range(len(df)):
+                    accession_number = first_word(accession_numbers[i])
+                    app_number = first_word(app_numbers[i])
+                    orap = first_word(oraps[i]) if pd.notna(oraps[i]) and oraps[i] else ''
                     if (orap == '') and (accession_number != app_number) and ('EP' in accession_number) and ('EP' not in app_number):
-                        for j in range(len(df)):
-                            if df.iloc[j]['accession_number'] == accession_number:
-                                df.iloc[i, df.columns.get_loc('orap')] = df.iloc[j]['orap']
-                                break  # Stop searching after finding the match
-                                
+                        j = first_row_by_accession.get(accession_number)
+                        if j is not None:
+                            oraps[i] = oraps[j]
+                df['orap'] = oraps
+
+            # Roots: valid members whose orap is not an application of this family
+            set_of_aps = set(listAPs)
+            orap_column = df['orap']
+            is_root = (
+                df['accession_number'].notna() & df['app_number'].notna() & (df['app_number'] != "Unknown0000000")
+                & (orap_column.isna() | ~orap_column.map(lambda x: first_word(x) in set_of_aps if isinstance(x, str) else False))
+            )
+            priority_numbers = df['priority_numbers'].tolist()
+            pub_numbers = (df['pub_number'].astype(str) + df['pub_kind'].astype(str)).tolist()
+            legal_events = df['legal_events'].tolist()
+
             # Initialize root dictionary
             root = {'0': 0} # Ensure root['0'] is initialized
-            for i in range(len(df), 0, -1):
-                prior_row = df.iloc[i-1]
-                if i-1 < len(df) and prior_row['app_number'] is not None:                    
-                    # Skip rows where 'accession_number' or 'app_number' is None or invalid
-                    if pd.isna(prior_row['accession_number']) or pd.isna(prior_row['app_number']) or prior_row['app_number'] == "Unknown0000000":
-                        # print(f"Skipping row {i} due to None or invalid values")
-                        continue
-                    
-                    if (pd.notna(prior_row['orap']) and (prior_row['orap'].split(' ')[0] not in listAPs)) or pd.isna(prior_row['orap']) or pd.isnull(prior_row['orap']):                        
-                        r = root['0'] + 1  # Increment root index
-                        root[r] = {
-                            'root_an': prior_row['accession_number'].split(' ')[0] if pd.notna(prior_row['accession_number']) else '',                        
-                            'root_ap': prior_row['app_number'].split(' ')[0] if pd.notna(prior_row['app_number']) else '',
-                            'root_pn': str(prior_row['pub_number']) + str(prior_row['pub_kind']),
-                            'root_pr': prior_row['priority_numbers'],
-                            'root_orap': prior_row['orap'].split(' ')[0] if pd.notna(prior_row['orap']) and prior_row['orap'] else '',
-                            'root_evnt': prior_row['legal_events']  # Include legal events
-                            }
-
-                        # print("i and r:", i-1, r)
-                        # print("prior_row['orap']", prior_row['orap'])
-                        
-                        # Ensure i-1 is within the bounds
-                        if i > 0 and prior_row['orap'] == '':
-                            # Use .at for positional access
-                            if df.at[i-1, 'orap'] == '':
-                                # print()
-                                # print("df.at[i-1, 'orap']:", df.at[i-1, 'orap'])
-                                df.at[i-1, 'orap'] = "noOrap" + str(r)  # Using .at for direct label-based assignment
-                                # print("df.at[i-1, 'orap']:", df.at[i-1, 'orap'])
-                                prior_row['orap'] = df.at[i-1, 'orap']  # Update the prior_orap if needed
-                                # print("prior_orap:", prior_orap)
-                                self.orap = df['orap'].tolist()  # Ensure the tree's orap is updated from the DataFrame
-                                
-                        # Update the dictionary with the latest orap value from DataFrame
-                        root[r]['root_orap'] = df.at[i - 1, 'orap'].split(' ')[0] if df.at[i - 1, 'orap'] else ''
-                        root['0'] = r
-        
+            placeholders = False
+            for row in reversed(is_root.to_numpy().nonzero()[0].tolist()):
+                r = root['0'] + 1  # Increment root index
+                root[r] = {
+                    'root_an': first_word(accession_numbers[row]),
+                    'root_ap': first_word(app_numbers[row]),
+                    'root_pn': pub_numbers[row],
+                    'root_pr': priority_numbers[row],
+                    'root_orap': first_word(oraps[row]) if pd.notna(oraps[row]) and oraps[row] else '',
+                    'root_evnt': legal_events[row]  # Include legal events
+                }
+
+                # Roots without orap get a unique placeholder, so their children can be told apart
+                if isinstance(oraps[row], str) and oraps[row] == '':
+                    oraps[row] = "noOrap" + str(r)
+                    placeholders = True
+
+                # Update the dictionary with the latest orap value from DataFrame
+                root[r]['root_orap'] = first_word(oraps[row]) if isinstance(oraps[row], str) and oraps[row] else ''
+                root['0'] = r
+
+            if placeholders:
+                df['orap'] = oraps
+                self.orap = list(oraps)  # Ensure the tree's orap is updated from the DataFrame
+
         return root, listAPs, listORAPs, df        
 
 class TreeNode:
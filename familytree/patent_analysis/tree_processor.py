@@ -5,14 +5,21 @@ import os
 import re
 import io
 import pandas as pd
-from typing import List, Dict, Any
-from epo.tipdata.ops import OPSClient, models, exceptions
+import time
+from typing import List, Dict, Any, Optional
 import xml.etree.ElementTree as ET
-from IPython.display import Markdown, display
-from PIL import Image
+try:
+    from IPython.display import Markdown, display
+except ImportError:  # Outside notebooks (batch runs, tests)
+    Markdown, display = str, print
 import requests
 from pprint import pprint
 import logging
+from patent_analysis.ops_client import create_ops_client, models, exceptions
+from patent_analysis.biblio_cache import NOT_CACHED, BiblioCache, biblio_cache as session_biblio_cache, fetch_biblio
+from patent_analysis.image_cache import ImagePipeline, ImageStore
+
+DEFAULT_WORKDIR = '/home/jovyan/tip-data-ops/docs/patent_analysis/'  # Notebook directory of tree files and images
 
 class TreeProcessor:
     """
@@ -21,7 +28,10 @@ class TreeProcessor:
     The TreeProcessor class is responsible for writing results to a file, and handling different patent-related entities such as applications, 
     publications, and legal events. It uses the OPSClient to interact with the European Patent Office API.
     """
-    def __init__(self, tree: Dict[str, Any], root: Dict[str, Any], initFlag: str, listAPs: List[str], listORAPs: List[str], df: pd.DataFrame, familyRoot):
+    # Views rendered from publication biblio data, prefetched for the whole tree before rendering
+    BIBLIO_FLAGS = ('Show_citations', 'Show_classifications', 'Show_parties')
+
+    def __init__(self, tree: Dict[str, Any], root: Dict[str, Any], initFlag: str, listAPs: List[str], listORAPs: List[str], df: pd.DataFrame, familyRoot, biblio_cache: Optional[BiblioCache] = None, workdir: Optional[str] = None):
         """
         Initialize a TreeProcessor instance with the necessary data structures and configurations.
         It checks for the correct structure of the tree and initializes several attributes, including setting up the file path for saving the tree output.
@@ -34,6 +44,9 @@ class TreeProcessor:
             listORAPs (list): List of original application identifiers.
             df (pd.DataFrame): DataFrame containing relevant publication data.
             familyRoot: Additional family-related data.
+            biblio_cache (BiblioCache, optional): Biblio data shared between views (default: the session cache).
+            workdir (str, optional): Directory of the tree file and the image cache (default: the notebook directory).
+                It is created when a file is first written to it.
         
         Raises:
             TypeError: If 'tree' is a list instead of a dictionary-like object.
@@ -45,14 +58,16 @@ class TreeProcessor:
         self.listAPs = listAPs  # A list of application identifiers (APs).
         self.listORAPs = listORAPs  # A list of original application identifiers (ORAPs).
         self.df = df  # A pandas DataFrame containing filtered publication numbers.
-        # An instance of OPSClient, initialized with API credentials.
-        self.client: OPSClient = OPSClient(key=os.getenv("OPS_KEY"), secret=os.getenv("OPS_SECRET"))        
+        # An instance of OPSClient (RestOPSClient when OPS_BASE_URL is set), initialized with API credentials.
+        self.client = create_ops_client()        
         self.familyRoot = familyRoot  # Represents the root of the patent family.
+        self.children = None  # Parent application -> positions of its children (see build_child_index).
+        self.biblio_cache = biblio_cache if biblio_cache is not None else session_biblio_cache
         
         self.tree_file_path = self.tree.recInp + '.txt'  # The file path to save the output tree data.
-        self.workdir = '/home/jovyan/tip-data-ops/docs/patent_analysis/'  # The directory where files will be stored.
-        os.makedirs(self.workdir, exist_ok=True)
+        self.workdir = workdir or DEFAULT_WORKDIR  # The directory where files will be stored.
         self.tree_file_path = os.path.join(self.workdir, self.tree_file_path)
+        self.image_pipeline = None  # Created on the first image view (see get_image_pipeline).
     
     def process_tree_file(self):
         """
@@ -64,60 +79,110 @@ class TreeProcessor:
         This method processes the patent tree structure and generates a summary text file detailing divisional applications.
         The method iterates over the root elements, processes the root nodes, and recursively generates tree 
         structures for application nodes.
+        The tree is written by write_tree(); render() produces the same text in memory.
 
         Returns:
             dict: The last processed root node.
         """       
+        current_root = None
         try:
-            # If listORAPs is None, it returns early to avoid errors.
-            if self.listORAPs is None:
-                print("Error: listORAPs is None")
-                return
+            os.makedirs(self.workdir, exist_ok=True)
+            with open(self.tree_file_path, 'w') as tree_file:
+                current_root = self.write_tree(tree_file)
+        except Exception as e:
+            print(f"Error during process_tree_file: {e}")
 
-            if not self.listORAPs:
-                print("Warning: listORAPs is empty")
+        return current_root
 
-            listApCCs = ['WO' if len(word) > 2 and word[2] == 'W' else word[:2] for word in self.listAPs]
+    @property
+    def views(self):
+        """The views to render: initFlag may be one flag ('Show_parties') or a list of flags."""
+        if isinstance(self.initFlag, (list, tuple)):
+            return list(self.initFlag)
+        return [self.initFlag] if self.initFlag else []
 
-            # Count occurrences of each country code        
-            country_code_counts = Counter(listApCCs)
-            
-            # creates a formatted comment for divisional applications, including the number of applications per country code.
-            applicationComment = 'including: ' + ' + '.join(
-                f'{count} {code}{"s" if count > 1 else ""}' for code, count in country_code_counts.items()
-            )
-            tree_comment = f'Divisional Applications ({self.df.shape[0]}) {applicationComment}'
+    def render(self, views=None):
+        """
+        Render the tree into memory instead of tree_file_path.
 
-            # The method writes this information to a tree file for later inspection.
-            with open(self.tree_file_path, 'w') as tree_file:
-                tree_file.write(f'Starting Divitree with {self.tree.recInp}\n')       
-                # tree_file.write(f'{tree_comment}\n')
-
-                processed_apps = set()
-                for r in range(len(self.root) + 1, 0, -1):
-                    current_root = self.root.get(r, {})
-                    # print(f"root[{r}] =", current_root)
-                    # print("root.an[{r}] =", current_root.get('root_an', ''))            
-                    # print("root.ap[{r}] =", current_root.get('root_ap', ''))
-                    # print("root.pn[{r}] =", current_root.get('root_pn', ''))                
-                    # print("root.pr[{r}] =", current_root.get('root_pr', ''))
-                    # print("root.orap[{r}] =", current_root.get('root_orap', ''))               
-                    # print("root.evnt[{r}] =", current_root.get('root_evnt', ''))
-                
-                    if not isinstance(current_root, dict):
-                        print(f"Warning: Expected dict for root at {r}, got {type(current_root)}")
-                        continue
-                    
-                    self.process_root(current_root, tree_file)
-
-                    if self.listORAPs:
-                        my_node = current_root.get('root_ap', '')
-                        # print("my_node:", my_node)
-                        if my_node.strip() and my_node not in processed_apps:
-                            # print(f"Generating tree for: {my_node} at level 1")
-                            self.tree_generation(my_node, 1, tree_file, processed_apps)
+        Args:
+            views (str or list, optional): Flag or combination of flags to render (default: initFlag).
+
+        Returns:
+            str: The rendered tree.
+        """
+        if views is not None:
+            self.initFlag = views
+        buffer = io.StringIO()
+        try:
+            self.write_tree(buffer)
         except Exception as e:
-            print(f"Error during process_tree_file: {e}")
+            print(f"Error during render: {e}")
+        return buffer.getvalue()
+
+    def write_tree(self, tree_file):
+        """
+        Write the tree with the selected views to any text stream (file, StringIO, widget stream).
+
+        Args:
+            tree_file (file): Text stream to write to.
+
+        Returns:
+            dict: The last processed root node.
+        """
+        # If listORAPs is None, it returns early to avoid errors.
+        if self.listORAPs is None:
+            print("Error: listORAPs is None")
+            return
+
+        if not self.listORAPs:
+            print("Warning: listORAPs is empty")
+
+        listApCCs = ['WO' if len(word) > 2 and word[2] == 'W' else word[:2] for word in self.listAPs]
+
+        # Count occurrences of each country code        
+        country_code_counts = Counter(listApCCs)
+        
+        # creates a formatted comment for divisional applications, including the number of applications per country code.
+        applicationComment = 'including: ' + ' + '.join(
+            f'{count} {code}{"s" if count > 1 else ""}' for code, count in country_code_counts.items()
+        )
+        tree_comment = f'Divisional Applications ({self.df.shape[0]}) {applicationComment}'
+
+        tree_file.write(f'Starting Divitree with {self.tree.recInp}\n')       
+        # tree_file.write(f'{tree_comment}\n')
+
+        current_root = None
+        processed_apps = set()
+        if self.children is None:
+            self.children = self.build_child_index()
+        if any(view in self.BIBLIO_FLAGS for view in self.views):
+            self.prefetch_biblio()
+        if 'Show_images' in self.views:
+            # Start all downloads now; each node only waits for its own image while rendering
+            self.get_image_pipeline().submit(self.collect_publication_numbers())
+        for r in range(len(self.root) + 1, 0, -1):
+            current_root = self.root.get(r, {})
+            # print(f"root[{r}] =", current_root)
+            # print("root.an[{r}] =", current_root.get('root_an', ''))            
+            # print("root.ap[{r}] =", current_root.get('root_ap', ''))
+            # print("root.pn[{r}] =", current_root.get('root_pn', ''))                
+            # print("root.pr[{r}] =", current_root.get('root_pr', ''))
+            # print("root.orap[{r}] =", current_root.get('root_orap', ''))               
+            # print("root.evnt[{r}] =", current_root.get('root_evnt', ''))
+        
+            if not isinstance(current_root, dict):
+                print(f"Warning: Expected dict for root at {r}, got {type(current_root)}")
+                continue
+            
+            self.process_root(current_root, tree_file)
+
+            if self.listORAPs:
+                my_node = current_root.get('root_ap', '')
+                # print("my_node:", my_node)
+                if my_node.strip() and my_node not in processed_apps:
+                    # print(f"Generating tree for: {my_node} at level 1")
+                    self.tree_generation(my_node, 1, tree_file, processed_apps)
 
         return current_root
         
@@ -174,9 +239,10 @@ class TreeProcessor:
             }
 
             # The initFlag is used to control the type of information processed (e.g., citations, classifications, parties).            
-            if self.initFlag in process_methods:
-                # print("self.initFlag in process_root:", self.initFlag)
-                process_methods[self.initFlag](current_root, 1, tree_file)
+            for view in self.views:
+                if view in process_methods:
+                    # print("view in process_root:", view)
+                    process_methods[view](current_root, 1, tree_file)
 
     def clean_orap_list(self, orap_list):
         """
@@ -205,6 +271,87 @@ class TreeProcessor:
         # The cleaned entries are returned as a de-duplicated list.
         return cleaned_orap_list
 
+    def parent_applications(self, orap):
+        """
+        Split an ORAP entry into the parent application numbers it names.
+
+        Args:
+            orap (str or list): ORAP of a family member ('EP2009164213', possibly with dates or several entries).
+
+        Returns:
+            list: Parent application numbers, in order and without duplicates.
+        """
+        if isinstance(orap, (list, tuple, set)):
+            entries = [str(entry) for entry in orap]
+        elif isinstance(orap, str):
+            entries = [orap]
+        else:
+            return []
+        parents = []
+        for entry in entries:
+            for part in re.split(r'[\s,;]+', re.sub(r'\(\d{8}\)', ' ', entry)):
+                if part and part not in parents:
+                    parents.append(part)
+        return parents
+
+    def build_child_index(self):
+        """
+        Build the adjacency index used by tree_generation(), in one pass over the family members.
+        Children of each parent keep the order in which tree_generation() visits them (last member first).
+
+        Returns:
+            dict: Parent application number -> list of member positions naming it as ORAP.
+        """
+        children = {}
+        for t in range(int(self.tree.orapNb) - 1, -1, -1):
+            for parent in self.parent_applications(self.tree.orap[t]):
+                children.setdefault(parent, []).append(t)
+        return children
+
+    def collect_publication_numbers(self):
+        """
+        Publication numbers of every node tree_generation() will render: the roots and all
+        members reachable from them in the child index.
+
+        Returns:
+            list: Publication numbers in tree order, without duplicates.
+        """
+        if self.children is None:
+            self.children = self.build_child_index()
+        pub_numbers = []
+        visited = set()
+        stack = []
+        for r in range(len(self.root) + 1, 0, -1):
+            current_root = self.root.get(r, {})
+            if isinstance(current_root, dict) and current_root.get('root_ap', '').strip():
+                pub_numbers.append(current_root.get('root_pn', ''))
+                stack.append(current_root['root_ap'])
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            for t in self.children.get(node, []):
+                if isinstance(self.tree.ap[t], str):
+                    pub_numbers.append(self.tree.pn[t].split()[0])
+                    stack.append(self.tree.ap[t].split()[0])
+        return list(dict.fromkeys(pn for pn in pub_numbers if pn))
+
+    def prefetch_biblio(self, max_workers: int = 4, requests_per_second: float = 10.0):
+        """
+        Fetch the biblio data of all tree nodes into the biblio cache before rendering, concurrently
+        under a rate budget, so citations, classifications and parties views render from memory.
+
+        Args:
+            max_workers (int): Concurrent OPS requests.
+            requests_per_second (float): Request rate budget shared by the workers.
+        """
+        pub_numbers = self.collect_publication_numbers()
+        start = time.perf_counter()
+        requested = self.biblio_cache.prefetch(self.client, pub_numbers, max_workers=max_workers, requests_per_second=requests_per_second)
+        if requested:
+            print(f"Prefetched biblio data of {requested} publications ({len(pub_numbers) - requested} cached) in {time.perf_counter() - start:.1f}s")
+
     def tree_generation(self, my_node, level, tree_file, processed_apps):
         """
         This recursive method generates the tree structure for a given node:
@@ -235,40 +382,40 @@ class TreeProcessor:
         # Dictionary to track sibling nodes at this level, starting with an index '0'.
         sibling = {'0': 0}
 
-        # Loop through the nodes in reverse order.
-        for t in range(int(self.tree.orapNb) - 1, -1, -1):
+        if self.children is None:
+            self.children = self.build_child_index()
+
+        # Children of the current node, looked up in the adjacency index (exact parent match).
+        for t in self.children.get(my_node, []):
             # print(f"t: {t} self.tree.ap[t]: {self.tree.ap[t]}, self.tree.pn[t] {self.tree.pn[t]}, tree.orap[t] {self.tree.orap[t]}, my_node: {my_node}")
-            # Check if the current node is a child in the tree data.
-            if my_node in self.tree.orap[t]:
-                if self.tree.orap[t] != '':
-                    # # Check the type and value of self.tree.pr[t]
-                    # print(f"Type of self.tree.pr[{t}]:", type(self.tree.pr[t]))
-                    # print(f"Value of self.tree.pr[{t}]:", self.tree.pr[t])
-
-                    # if self.tree.pr[t] != []:
-                    #     print("self.tree.ap[t]:", self.tree.ap[t])
-                    #     print("self.tree.pr[t]:", self.tree.pr[t])
-                    
-                    # Collect sibling data (application number, publication number, priorities, etc.)
-                    s = sibling['0'] + 1  # Increment sibling index for each valid sibling node.
-                    sibling[s] = {
-                        'an': '',  # Application number (not directly used here)
-                        'ap': self.tree.ap[t].split()[0] if isinstance(self.tree.ap[t], str) else '',
-                        'pn': self.tree.pn[t].split()[0] if isinstance(self.tree.ap[t], str) else '', 
-                        'pr': list(self.tree.pr[t]) if hasattr(self.tree, 'pr') and isinstance(self.tree.pr[t], (list,tuple)) else '',
-                        'orap': self.tree.orap[t],
-                        's': self.tree.ap[t].split()[0] if isinstance(self.tree.ap[t], str) else '',
-                        'evnt': self.tree.evnt[t] if hasattr(self.tree, 'evnt') and isinstance(self.tree.evnt[t], list) else []
-                    }
-                    # print("sibling[s]:", sibling[s])
-                    # print("t:", t)
-                    # print(f"Found child: {sibling[s]['ap']}")
-                    # print(f"Found publication: {sibling[s]['pn']}")
-                    # print(f"Found prio: {sibling[s]['pr']}")
-                    # print(f"Found parent: {sibling[s]['orap']}")
-                    # print(f"Found evnt: {sibling[s]['evnt']}")
-                    # print()
-                    sibling['0'] = s  # Update sibling count.
+            # # Check the type and value of self.tree.pr[t]
+            # print(f"Type of self.tree.pr[{t}]:", type(self.tree.pr[t]))
+            # print(f"Value of self.tree.pr[{t}]:", self.tree.pr[t])
+
+            # if self.tree.pr[t] != []:
+            #     print("self.tree.ap[t]:", self.tree.ap[t])
+            #     print("self.tree.pr[t]:", self.tree.pr[t])
+            
+            # Collect sibling data (application number, publication number, priorities, etc.)
+            s = sibling['0'] + 1  # Increment sibling index for each valid sibling node.
+            sibling[s] = {
+                'an': '',  # Application number (not directly used here)
+                'ap': self.tree.ap[t].split()[0] if isinstance(self.tree.ap[t], str) else '',
+                'pn': self.tree.pn[t].split()[0] if isinstance(self.tree.ap[t], str) else '', 
+                'pr': list(self.tree.pr[t]) if hasattr(self.tree, 'pr') and isinstance(self.tree.pr[t], (list,tuple)) else '',
+                'orap': self.tree.orap[t],
+                's': self.tree.ap[t].split()[0] if isinstance(self.tree.ap[t], str) else '',
+                'evnt': self.tree.evnt[t] if hasattr(self.tree, 'evnt') and isinstance(self.tree.evnt[t], list) else []
+            }
+            # print("sibling[s]:", sibling[s])
+            # print("t:", t)
+            # print(f"Found child: {sibling[s]['ap']}")
+            # print(f"Found publication: {sibling[s]['pn']}")
+            # print(f"Found prio: {sibling[s]['pr']}")
+            # print(f"Found parent: {sibling[s]['orap']}")
+            # print(f"Found evnt: {sibling[s]['evnt']}")
+            # print()
+            sibling['0'] = s  # Update sibling count.
 
         # If siblings are found, process them.
         if sibling['0'] > 0:
@@ -293,34 +440,35 @@ class TreeProcessor:
                     'Show_images': self.process_images                    
                 }
 
-                # Call specific methods based on the initFlag.
-                if self.initFlag == 'Show_priorities':
-                    self.process_priorities(sibling[s]['pr'], level, tree_file)
-                elif self.initFlag == 'Show_applications':
-                    self.process_applications(sibling[s]['ap'], level, tree_file)
-                elif self.initFlag == 'Show_parents':
-                    self.process_parents(sibling[s]['orap'], level, tree_file)
-                elif self.initFlag == 'Show_legal_events' and sibling[s]['evnt']: # and sibling[s]['evnt'] != []
-                    # tree_file.write(', ' * (level + 1) + "legal_events:\n")  # Add header for legal events
+                # Call specific methods for each requested view (initFlag).
+                for view in self.views:
+                    if view == 'Show_priorities':
+                        self.process_priorities(sibling[s]['pr'], level, tree_file)
+                    elif view == 'Show_applications':
+                        self.process_applications(sibling[s]['ap'], level, tree_file)
+                    elif view == 'Show_parents':
+                        self.process_parents(sibling[s]['orap'], level, tree_file)
+                    elif view == 'Show_legal_events' and sibling[s]['evnt']: # and sibling[s]['evnt'] != []
+                        # tree_file.write(', ' * (level + 1) + "legal_events:\n")  # Add header for legal events
                     
-                    # for event in sibling[s]['evnt']:
-                    #     event_code = event.get('code', 'N/A')
-                    #     event_desc = event.get('desc', 'No Description')
-                    #     event_date = event.get('dateMigr', 'Unknown Date')
-                    #     event_texts = event.get('texts', '').split('|')  # Split multiple texts if needed
-
-                    #    # Write formatted event information
-                    #    tree_file.write(', ' * (level + 2) + f"- {event_code}: {event_desc} ({event_date})\n")
+                        # for event in sibling[s]['evnt']:
+                        #     event_code = event.get('code', 'N/A')
+                        #     event_desc = event.get('desc', 'No Description')
+                        #     event_date = event.get('dateMigr', 'Unknown Date')
+                        #     event_texts = event.get('texts', '').split('|')  # Split multiple texts if needed
+
+                        #    # Write formatted event information
+                        #    tree_file.write(', ' * (level + 2) + f"- {event_code}: {event_desc} ({event_date})\n")
         
-                    #    # Write additional text information if available
-                    #    for text in event_texts:
-                    #        tree_file.write(', ' * (level + 3) + f"{text.strip()}\n")
+                        #    # Write additional text information if available
+                        #    for text in event_texts:
+                        #        tree_file.write(', ' * (level + 3) + f"{text.strip()}\n")
             
-                    self.process_legal_events({'legal_events': sibling[s]['evnt']}, level, tree_file)
+                        self.process_legal_events({'legal_events': sibling[s]['evnt']}, level, tree_file)
                     
-                elif self.initFlag in process_methods:
-                    sibling_dict = {'root_pn': sibling[s]['pn']}
-                    process_methods[self.initFlag](sibling_dict, level, tree_file)                
+                    elif view in process_methods:
+                        sibling_dict = {'root_pn': sibling[s]['pn']}
+                        process_methods[view](sibling_dict, level, tree_file)                
    
                 # Recursive call with depth control           
                 child_node = sibling[s]['ap']
@@ -548,33 +696,34 @@ class TreeProcessor:
         # Extract the publication number from the current_root
         pub_number = current_root.get('root_pn', '')
 
-        # Initialize biblio_data to handle the case where retrieval fails
-        biblio_data = None  # Initialize biblio_data to handle the case where retrieval fails
-        try:
-            # Determine the endpoint and output type based on the data_type
-            endpoint = "biblio"
-            output_type = "Dataframe"
-            if data_type == 'images':
-                endpoint = "images"
-                output_type = "Raw"
-            
-            # Retrieve the bibliographic, image, or legal data for the document
-            biblio_data = self.client.published_data(
-                reference_type="publication",
-                input=models.Docdb(pub_number[2:-2], pub_number[:2], pub_number[-2:], date=None),
-                endpoint=endpoint,
-                constituents=[],
-                output_type=output_type,
-            )
-        except requests.exceptions.RequestException as e:  # Catch any request exception
-            print(f"HTTP error occurred: {e}")
-            if hasattr(e, 'response'):  # Check if the exception has a response attribute (likely in newer versions)
-                if e.response.status_code == 404:
-                    print(f"Publication number {pub_number} not found. Skipping.")
+        # Prefetched or rendered before (None: not found in OPS); a single lookup, so eviction can't race it
+        biblio_data = self.biblio_cache.get(pub_number) if data_type != 'images' else NOT_CACHED
+        if biblio_data is NOT_CACHED:
+            biblio_data = None  # Stays None if retrieval fails
+            try:
+                if data_type == 'images':
+                    # Retrieve the image inquiry data for the document
+                    biblio_data = self.client.published_data(
+                        reference_type="publication",
+                        input=models.Docdb(pub_number[2:-2], pub_number[:2], pub_number[-2:], date=None),
+                        endpoint="images",
+                        constituents=[],
+                        output_type="Raw",
+                    )
                 else:
-                    raise  # Re-raise other errors
-            else:  # For older versions, assume it's a 404 based on the message
-                print(f"Publication number {pub_number} not found. Skipping.")
+                    # Retrieve the bibliographic data for the document, kept for the other views
+                    biblio_data = self.biblio_cache.put(pub_number, fetch_biblio(self.client, pub_number))
+            except requests.exceptions.RequestException as e:  # Catch any request exception
+                print(f"HTTP error occurred: {e}")
+                if hasattr(e, 'response'):  # Check if the exception has a response attribute (likely in newer versions)
+                    if e.response.status_code == 404:
+                        print(f"Publication number {pub_number} not found. Skipping.")
+                        if data_type != 'images':
+                            self.biblio_cache.put(pub_number, None)
+                    else:
+                        raise  # Re-raise other errors
+                else:  # For older versions, assume it's a 404 based on the message
+                    print(f"Publication number {pub_number} not found. Skipping.")
 
         # display(biblio_data)
         
@@ -878,80 +1027,46 @@ class TreeProcessor:
             output_format_func=format_party_output
         )
     
+    def get_image_pipeline(self):
+        """
+        The image pipeline of this tree, storing images in the content-addressed cache under workdir.
+
+        Returns:
+            ImagePipeline: Concurrent, rate-limited first page image retrieval.
+        """
+        if self.image_pipeline is None:
+            store = ImageStore(os.path.join(self.workdir, 'image_cache'))
+            self.image_pipeline = ImagePipeline(self.client, store)
+        return self.image_pipeline
+
     def process_images(self, current_root, level, tree_file):
         """
         Process and write image data from the current root node to the tree file.
+        The first page image comes from the image pipeline (downloaded in the background when the
+        view started, or read from the image cache); a thumbnail is displayed and the tree links
+        to the cached image.
 
         Args:
             current_root (str or dict): Current root node data or application identifier.
             level (int): The level in the tree for formatting output.
             tree_file (file object): File object for writing the processed data.
         """
-        
-        def extract_image_data(image_xml):
-            """
-            Extracts the image path from the XML data.
-
-            Args:
-                image_xml (str): XML data containing image information.
-
-            Returns:
-                str or None: Path to the image if found, otherwise None.
-            """
-            root = ET.fromstring(image_xml)
-            namespace = {'ops': 'http://ops.epo.org'}
-
-            # Extract the path from the 'FirstPageClipping' document instance
-            first_page_clipping = root.find('.//ops:document-instance[@desc="FirstPageClipping"]', namespace)
-            if first_page_clipping is not None:
-                path = first_page_clipping.get('link')
-                # print(f"Extracted image path: {path}")
-                return path
-            # print("No FirstPageClipping found")
-            return None
+        if not isinstance(current_root, dict) or 'root_pn' not in current_root:
+            print(f"Invalid 'current_root': {current_root}")
+            return
 
-        def format_image_output(image_path):
-            """
-            Formats and saves the image, then writes a Markdown link to the image to the tree file.
+        pipeline = self.get_image_pipeline()
+        digest = pipeline.result(current_root.get('root_pn', ''))
+        if digest is None:
+            return
 
-            Args:
-                image_path (str or None): Path to the image.
+        from PIL import Image
 
-            Returns:
-                str: Markdown formatted image link or a message if no image is found.
-            """
-            if image_path:
-                # print(f"Formatting image path: {image_path}")
-                fp_image_data = self.client.image(
-                    path=image_path,
-                    range=1,
-                    document_format='application/tiff',
-                )
-                # print("fp_image_data:", fp_image_data)
-                fp_image = Image.open(io.BytesIO(fp_image_data))
-                # print("fp_image:", fp_image)
-                display(fp_image)
-                
-                image_filename = f"image_level_{level}.tiff"
-                print("image_filename:", image_filename)
-                fp_image.save(image_filename)
-
-                formatted_output = f"![Image at level {level}]({image_filename})"
-                # print(f"Formatted output: {formatted_output}")
-                if formatted_output:
-                    tree_file.write(f"{'. ' * (level + 1)}{formatted_output}\n")          
-                return formatted_output        
-            return "No image found."
-            
-        # Initialize formatted_output to None
-        formatted_output = None
+        # Thumbnails are generated on first display only
+        display(Image.open(pipeline.store.thumbnail(digest)))
 
-        # Retrieve and format image data
-        formatted_output = self.retrieve_biblio_data(
-            current_root, 
-            level, 
-            None, 
-            'images',
-            extraction_func=extract_image_data,
-            output_format_func=format_image_output
-        )
+        formatted_output = f"![Image at level {level}]({pipeline.store.path(digest)})"
+        if tree_file:
+            tree_file.write(f"{'. ' * (level + 1)}{formatted_output}\n")
+            if hasattr(tree_file, 'flush'):
+                tree_file.flush()  # Show the node while the next images are still downloading
@@ -0,0 +1,125 @@
+import io
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from patent_analysis.biblio_cache import BiblioCache
+from patent_analysis.tree_processor import TreeProcessor
+
+
+class ViewEngine:
+    """
+    Renders views of one patent family tree from a single in-memory snapshot.
+
+    The snapshot (tree, roots, child index and the biblio data prefetched for it) is built once
+    per family selection. Any view, or combination of views, is then rendered into memory or
+    straight into a stream (e.g. the output widget), without a tree file on disk and without
+    walking or fetching the family again. Rendered text is kept per view combination, except
+    for views with display side effects (images).
+
+    close() (or leaving a `with ViewEngine(...)` block) stops the image download threads of the
+    Show_images view.
+    """
+    VIEWS = ('Show_priorities', 'Show_applications', 'Show_parents', 'Show_publications', 'Show_citations',
+             'Show_classifications', 'Show_parties', 'Show_legal_events', 'Show_images')
+    UNCACHED_VIEWS = ('Show_images',)
+
+    def __init__(self, tree, root: Dict, listAPs: List[str], listORAPs: List[str], df: pd.DataFrame, familyRoot=None,
+                 biblio_cache: Optional[BiblioCache] = None, workdir: Optional[str] = None):
+        """
+        Initialize the ViewEngine with the tree built by TreeCreation.create_nested_dict().
+
+        Args:
+        - tree (TreeCreation): Tree data of the family.
+        - root (dict): Root nodes of the tree.
+        - listAPs (List[str]): Application numbers of the family.
+        - listORAPs (List[str]): ORAPs of the family.
+        - df (pd.DataFrame): Filtered application numbers.
+        - familyRoot: Family XML root (optional).
+        - biblio_cache (Optional[BiblioCache]): Biblio data shared between views (default: the session cache).
+        - workdir (Optional[str]): Directory of the image cache (default: the notebook directory).
+        """
+        self.processor = TreeProcessor(tree=tree, root=root, initFlag=None, listAPs=listAPs, listORAPs=listORAPs,
+                                       df=df, familyRoot=familyRoot, biblio_cache=biblio_cache,
+                                       workdir=workdir)
+        self._rendered: Dict[Tuple[str, ...], str] = {}
+
+    @staticmethod
+    def view_key(views: Union[str, List[str], None]) -> Tuple[str, ...]:
+        """Normalize a flag, list of flags or None to a tuple of flags in the requested order."""
+        if views is None:
+            return ()
+        return (views,) if isinstance(views, str) else tuple(dict.fromkeys(views))
+
+    def render(self, views: Union[str, List[str], None]) -> str:
+        """
+        Render the tree with the given views.
+
+        Args:
+        - views (Union[str, List[str], None]): A flag (e.g. 'Show_parties'), a combination of flags,
+          or None for the bare tree.
+
+        Returns:
+        - str: The rendered tree. A render that fails (e.g. on an OPS error while fetching biblio data)
+          returns the text up to the failure, which is not kept, so the next render tries again.
+        """
+        buffer = io.StringIO()
+        self.stream(views, buffer)
+        return buffer.getvalue()
+
+    def stream(self, views: Union[str, List[str], None], out) -> None:
+        """
+        Write the tree with the given views to a text stream as it is rendered.
+
+        Args:
+        - views (Union[str, List[str], None]): See render().
+        - out: Text stream, e.g. sys.stdout inside an ipywidgets Output context.
+        """
+        key = self.view_key(views)
+        if key in self._rendered:
+            out.write(self._rendered[key])
+            return
+        self.processor.initFlag = list(key)
+        tee = _TeeWriter(out)
+        try:
+            self.processor.write_tree(tee)
+        except Exception as e:
+            print(f"Error during render: {e}")
+            return
+        if not any(view in self.UNCACHED_VIEWS for view in key):
+            self._rendered[key] = tee.getvalue()
+
+    def clear(self):
+        """Forget rendered views (the snapshot and biblio data are kept)."""
+        self._rendered.clear()
+
+    def close(self):
+        """Shut down the image pipeline of the tree, if an image view started one."""
+        pipeline, self.processor.image_pipeline = self.processor.image_pipeline, None
+        if pipeline is not None:
+            pipeline.shutdown()
+
+    def __enter__(self) -> 'ViewEngine':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _TeeWriter:
+    """Writes through to a stream while keeping a copy of the text."""
+
+    def __init__(self, out):
+        self.out = out
+        self.parts: List[str] = []
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        return self.out.write(text)
+
+    def flush(self):
+        if hasattr(self.out, 'flush'):
+            self.out.flush()
+
+    def getvalue(self) -> str:
+        return ''.join(self.parts)
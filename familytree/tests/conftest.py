@@ -0,0 +1,69 @@
+"""
+Shared pytest fixtures.
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+import pytest
+
+from patent_analysis.family_cache import FamilyDocumentCache
+from patent_analysis.family_index import FamilyIndex
+from patent_analysis.family_record import FamilyRecord
+from patent_analysis.tree_creation import TreeCreation
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'ops'
+# Offline OPS stand-in server of deeptechfinder; it serves the recordings in FIXTURE_DIR
+STANDIN_PATH = Path(__file__).parents[2] / 'deeptechfinder' / 'tests' / 'ops_standin.py'
+# Recorded family request of EP2101496A1 (as sent by FamilyRecord)
+FAMILY_PATH = 'family/publication/docdb/EP.2101496.A1/legal,biblio'
+COUNTRIES = ['US', 'JP']
+
+def load_standin():
+    """Import the stand-in module from its file (both projects have a top-level 'tests' package)."""
+    spec = importlib.util.spec_from_file_location('ops_standin', STANDIN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope='session')
+def family_xml() -> bytes:
+    """
+    Family of EP2101496A1: an EP parent with two generations of divisionals, US and JP
+    national phases, a DE and a CN member, and a WO member without application reference.
+    """
+    return (FIXTURE_DIR / 'family' / f"{quote(FAMILY_PATH, safe='')}.xml").read_bytes()
+
+@pytest.fixture(scope='session')
+def ops_standin():
+    """
+    Running OPS stand-in server serving tests/fixtures/ops, with create_ops_client() pointed at it
+    through OPS_BASE_URL/OPS_AUTH_URL and dummy credentials (restored afterwards).
+    """
+    if not STANDIN_PATH.exists():
+        pytest.skip(f"OPS stand-in not found at {STANDIN_PATH}")
+    standin = load_standin()
+
+    with standin.OPSStandIn(fixtures=standin.FixtureStore(FIXTURE_DIR)) as server:
+        saved_env = {name: os.environ.get(name) for name in server.env()}
+        os.environ.update(server.env())
+        try:
+            yield server
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+@pytest.fixture
+def family_tree(ops_standin, tmp_path):
+    """(tree, root, listAPs, listORAPs, df) of EP2101496A1 with US and JP members, fetched without any cached family."""
+    record = FamilyRecord('publication', '2101496', 'EP', 'A1', countrySelection=COUNTRIES,
+                          cache=FamilyDocumentCache(), index=FamilyIndex(str(tmp_path / 'family_index.sqlite')))
+    df = record.process_fami_record(COUNTRIES)[0]
+    tree = TreeCreation(db="EPODOC", df=df)
+    root, listAPs, listORAPs, df = tree.create_nested_dict(df)
+    return tree, root, listAPs, listORAPs, df
@@ -0,0 +1,57 @@
+"""
+Tests for the batch builder's deduplication of seeds of one family, with families fetched through the OPS stand-in.
+"""
+
+import json
+
+import pytest
+
+from patent_analysis import family_record as family_record_module
+from patent_analysis.batch_builder import BatchTreeBuilder, FamilyTreeStore
+from patent_analysis.family_cache import FamilyDocumentCache
+
+COUNTRIES = ['US', 'JP']
+# The root publication and its two divisionals, all members of INPADOC family 37809311
+SEEDS = ['EP2101496A1', 'EP2200000A1', 'EP2200001A1']
+
+@pytest.fixture
+def session_cache(monkeypatch):
+    """Empty session family cache, so every family the builder needs goes to the stand-in."""
+    monkeypatch.setattr(family_record_module, 'family_cache', FamilyDocumentCache())
+
+def family_requests(server) -> int:
+    return sum(entry['service'] == 'inpadoc' for entry in server.request_log)
+
+def build(tmp_path, seeds, max_workers: int):
+    store = FamilyTreeStore(str(tmp_path / 'out'))
+    builder = BatchTreeBuilder(countries=COUNTRIES, max_workers=max_workers, store=store)
+    return store, builder.build(seeds)
+
+def test_members_of_a_fetched_family_are_not_fetched_again(ops_standin, session_cache, tmp_path):
+    requests_before = family_requests(ops_standin)
+    store, results = build(tmp_path, SEEDS + ['application:EP09164213A'], max_workers=1)
+
+    assert [result.status for result in results] == ['built', 'duplicate', 'duplicate', 'duplicate']
+    assert all(result.duplicate_of == 'EP2101496A1' for result in results[1:])
+    assert all(result.family_id == '37809311' for result in results)
+    assert family_requests(ops_standin) == requests_before + 1
+
+    with open(store.manifest_path) as f:
+        manifest = [json.loads(line) for line in f]
+    assert sorted(entry['status'] for entry in manifest) == ['built', 'duplicate', 'duplicate', 'duplicate']
+    assert len(list((tmp_path / 'out' / 'trees').iterdir())) == 1
+
+def test_concurrent_seeds_of_one_family_build_one_tree(ops_standin, session_cache, tmp_path):
+    requests_before = family_requests(ops_standin)
+    store, results = build(tmp_path, SEEDS, max_workers=len(SEEDS))
+
+    # Seeds fetched before the first family came back are deduplicated by INPADOC family ID
+    assert [result.status for result in results] == ['built', 'duplicate', 'duplicate']
+    assert [result.duplicate_of for result in results] == [None, 'EP2101496A1', 'EP2101496A1']
+    assert family_requests(ops_standin) - requests_before <= len(SEEDS)
+    assert [path.name for path in (tmp_path / 'out' / 'trees').iterdir()] == ['family_37809311.txt']
+
+def test_repeated_seed_is_built_once(ops_standin, session_cache, tmp_path):
+    store, results = build(tmp_path, ['EP2101496A1', 'EP2101496A1'], max_workers=2)
+
+    assert [result.status for result in results] == ['built']
@@ -0,0 +1,79 @@
+"""
+Tests for the biblio cache and its concurrent prefetch, against the OPS stand-in.
+"""
+
+import logging
+import time
+
+import pandas as pd
+import pytest
+
+from patent_analysis.biblio_cache import NOT_CACHED, BiblioCache, RateBudget
+from patent_analysis.ops_client import create_ops_client
+
+# Biblio fixtures of the EP2101496A1 family; the JP member has none (OPS answers 404)
+FOUND = ['EP2101496A1', 'EP2200000A1', 'US2010000001A1']
+NOT_FOUND = 'JP2011500003A'
+
+
+def biblio_requests(server):
+    return [entry for entry in server.request_log if entry['path'].endswith('/biblio')]
+
+
+@pytest.fixture
+def client(ops_standin):
+    return create_ops_client()
+
+
+def test_prefetch_caches_found_and_not_found_publications(ops_standin, client):
+    cache = BiblioCache()
+
+    assert cache.prefetch(client, FOUND + [NOT_FOUND, FOUND[0], None], requests_per_second=None) == 4
+
+    for pub_number in FOUND:
+        assert isinstance(cache.get(pub_number), pd.DataFrame) and not cache.get(pub_number).empty
+    assert cache.get(NOT_FOUND, default='missing') is None  # Cached 'not found'
+
+    before = len(biblio_requests(ops_standin))
+    assert cache.prefetch(client, FOUND + [NOT_FOUND]) == 0
+    assert len(biblio_requests(ops_standin)) == before
+
+
+def test_transient_errors_are_not_cached(ops_standin, client, monkeypatch, caplog):
+    cache = BiblioCache()
+    cache.prefetch(client, [FOUND[0]], requests_per_second=None)  # Authenticates before errors are injected
+
+    monkeypatch.setattr(ops_standin.settings, 'error_rate', 1.0)
+    monkeypatch.setattr(ops_standin.settings, 'error_statuses', (503,))
+    with caplog.at_level(logging.WARNING, logger='patent_analysis.biblio_cache'):
+        assert cache.prefetch(client, [FOUND[1]], requests_per_second=None) == 1
+
+    assert FOUND[1] not in cache
+    assert FOUND[1] in caplog.text and '503' in caplog.text
+
+    monkeypatch.setattr(ops_standin.settings, 'error_rate', 0.0)
+    assert cache.prefetch(client, [FOUND[1]], requests_per_second=None) == 1
+    assert isinstance(cache.get(FOUND[1]), pd.DataFrame)
+
+
+def test_rate_budget_spaces_request_starts():
+    budget = RateBudget(requests_per_second=50)
+    start = time.monotonic()
+    for _ in range(6):
+        budget.acquire()
+
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = BiblioCache(max_entries=2)
+    cache.put('EP1A1', 'one')
+    cache.put('EP2A1', 'two')
+    cache.get('EP1A1')
+    cache.put('EP3A1', 'three')
+
+    assert cache.get('EP2A1') is NOT_CACHED
+    assert (cache.get('EP1A1'), cache.get('EP3A1')) == ('one', 'three')
+
+    cache.invalidate('EP1A1')
+    assert 'EP1A1' not in cache and len(cache) == 1
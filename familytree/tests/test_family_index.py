@@ -0,0 +1,81 @@
+"""
+Tests for the persistent member -> family index, with families fetched through the OPS stand-in.
+"""
+
+import json
+import sqlite3
+import time
+import zlib
+
+from patent_analysis import family_index as family_index_module
+from patent_analysis.batch_builder import BatchTreeBuilder, FamilyTreeStore
+from patent_analysis.family_cache import FamilyDocumentCache
+from patent_analysis.family_index import FamilyIndex
+from patent_analysis.family_record import FamilyRecord
+
+COUNTRIES = ['US', 'JP']
+
+def family_requests(server) -> int:
+    return sum(entry['service'] == 'inpadoc' for entry in server.request_log)
+
+def fetch(index: FamilyIndex, doc_number: str, reference_type: str = 'publication', kind: str = 'A1'):
+    """DataFrame of a family record with an empty in-memory cache, so only the index can spare the OPS call."""
+    record = FamilyRecord(reference_type, doc_number, 'EP', kind, countrySelection=COUNTRIES,
+                          cache=FamilyDocumentCache(), index=index)
+    return record.process_fami_record(COUNTRIES)[0]
+
+def test_other_member_is_resolved_without_family_call(ops_standin, tmp_path):
+    index = FamilyIndex(str(tmp_path / 'family_index.sqlite'))
+    first = fetch(index, '2101496')
+    requests_before = family_requests(ops_standin)
+
+    # A divisional's publication and the parent application, both resolved from the index
+    for doc_number, reference_type, kind in (('2200000', 'publication', 'A1'), ('09164213', 'application', 'A')):
+        df = fetch(index, doc_number, reference_type, kind)
+        assert df['app_number'].tolist() == first['app_number'].tolist()
+        assert df['orap'].tolist() == first['orap'].tolist()
+
+    assert family_requests(ops_standin) == requests_before
+    assert index.hits == 2 and len(index) == 1
+
+def test_expired_family_is_fetched_again(ops_standin, tmp_path, monkeypatch):
+    path = str(tmp_path / 'family_index.sqlite')
+    fetch(FamilyIndex(path), '2101496')
+    requests_before = family_requests(ops_standin)
+
+    later = time.time() + 8 * 86400
+    monkeypatch.setattr(family_index_module.time, 'time', lambda: later)
+    index = FamilyIndex(path, max_age_days=7.0)
+    df = fetch(index, '2101496')
+
+    assert family_requests(ops_standin) == requests_before + 1
+    assert index.misses == 1 and not df.empty
+
+def test_families_are_stored_as_json(ops_standin, tmp_path):
+    path = tmp_path / 'family_index.sqlite'
+    index = FamilyIndex(str(path))
+    fetch(index, '2101496')
+
+    with sqlite3.connect(path) as connection:
+        family_id, blob = connection.execute("SELECT family_id, document FROM families").fetchone()
+    payload = json.loads(zlib.decompress(blob))
+    assert family_id == '37809311'
+    assert payload['xml_tree'].startswith('<?xml')
+    assert payload['members']['EP2009164213']['orap'] == ['EP2008004567', 'EP2009164213']  # A set in memory
+
+    document = index.lookup('publication', '2101496', 'EP', ['legal', 'biblio'])
+    assert 'US' in document.country_codes and isinstance(document.country_codes, set)
+    assert document.ccw_to_wo_mapping['USW09000001'] == ('WO2009US000001', '20090701')
+
+def test_notebook_directory_is_not_created(tmp_path, monkeypatch):
+    notebook_dir = tmp_path / 'tip-data-ops'
+    monkeypatch.setattr(family_index_module, 'NOTEBOOK_DIR', str(notebook_dir))
+    index = FamilyIndex(str(notebook_dir / 'family_index.sqlite'))
+
+    assert index.lookup('publication', '2101496', 'EP', None) is None
+    assert not notebook_dir.exists()
+
+def test_batch_index_is_kept_in_the_output_directory(tmp_path):
+    builder = BatchTreeBuilder(store=FamilyTreeStore(str(tmp_path / 'out')))
+
+    assert builder.index.path == str(tmp_path / 'out' / 'family_index.sqlite')
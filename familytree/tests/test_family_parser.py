@@ -0,0 +1,82 @@
+"""
+Tests for the streaming family parser against the DOM parsing it replaced in FamilyRecord.
+"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from patent_analysis.family_parser import EXCHANGE_NS, OPS_NS, ParseError, iter_family_members
+
+REFERENCES = (('application-reference', 'applications'), ('priority-claim', 'priority_claims'),
+              ('publication-reference', 'publications'))
+FIELDS = ('doc-number', 'country', 'kind', 'date')
+
+def dom_reference(reference: ET.Element) -> dict:
+    fields = {}
+    for name in FIELDS:
+        elem = reference.find(f'.//{{{EXCHANGE_NS}}}{name}')
+        if elem is not None:
+            fields[name] = elem.text
+    return fields
+
+def dom_family_members(xml_tree: bytes) -> list:
+    """Member records as the former FamilyRecord read them: findall/find over the whole document."""
+    members = []
+    for member in ET.fromstring(xml_tree).findall(f'.//{{{OPS_NS}}}family-member'):
+        record = {'family_id': member.get('family-id')}
+        for tag, key in REFERENCES:
+            record[key] = [dom_reference(reference) for reference in member.findall(f'.//{{{EXCHANGE_NS}}}{tag}')]
+        record['legal_events'] = [
+            {
+                'legal_event_code': legal.attrib.get('code', ''),
+                'legal_event_desc': legal.attrib.get('desc', ''),
+                'legal_event_date_migr': legal.attrib.get('dateMigr', ''),
+                'legal_event_infl': legal.attrib.get('infl', ''),
+                'legal_event_texts': [pre.text.strip() for pre in legal.findall(f'.//{{{OPS_NS}}}pre') if pre.text],
+                'nested_data': None,
+            }
+            for legal in member.findall(f'.//{{{OPS_NS}}}legal')
+        ]
+        members.append(record)
+    return members
+
+def repeated_members(xml_tree: bytes, times: int) -> bytes:
+    """The family document with its member elements repeated, for a family of many members."""
+    start = xml_tree.index(b'<ops:family-member')
+    end = xml_tree.rindex(b'</ops:family-member>') + len(b'</ops:family-member>')
+    return xml_tree[:start] + xml_tree[start:end] * times + xml_tree[end:]
+
+def test_members_match_dom_parser(family_xml):
+    members = list(iter_family_members(family_xml))
+
+    assert len(members) == 8
+    assert members == dom_family_members(family_xml)
+
+def test_large_family_matches_dom_parser(family_xml):
+    xml_tree = repeated_members(family_xml, 250)
+
+    assert list(iter_family_members(xml_tree)) == dom_family_members(xml_tree)
+
+def test_text_input_is_parsed_like_bytes(family_xml):
+    assert list(iter_family_members(family_xml.decode('utf-8'))) == list(iter_family_members(family_xml))
+
+def test_member_record_contents(family_xml):
+    members = list(iter_family_members(family_xml))
+    root, german, wo = members[0], members[5], members[7]
+
+    assert root['family_id'] == '37809311'
+    assert root['applications'] == [{'country': 'EP', 'doc-number': '09164213', 'kind': 'A', 'date': '20090630'}]
+    assert [claim['doc-number'] for claim in root['priority_claims']] == ['08004567', '09164213']
+    # Blank ops:pre texts are kept as '' (stripped), missing texts are skipped
+    assert root['legal_events'][0]['legal_event_texts'] == ['Designated contracting states:', 'AT BE CH DE']
+    assert root['legal_events'][1]['legal_event_texts'] == []
+    assert members[6]['legal_events'][1]['legal_event_texts'] == ['Entry into substantive examination', '']
+    # Absent elements are absent keys
+    assert german['publications'] == [{'country': 'DE', 'doc-number': '102009012345', 'date': '20100916'}]
+    assert german['priority_claims'] == [{'country': 'DE', 'doc-number': '102009012345'}]
+    assert wo['applications'] == [] and len(wo['publications']) == 1
+
+def test_truncated_document_raises_parse_error(family_xml):
+    with pytest.raises(ParseError):
+        list(iter_family_members(family_xml[:len(family_xml) // 2]))
@@ -0,0 +1,63 @@
+"""
+Tests for the vectorized ORAP resolution against the per-row sort_orap it replaced.
+"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from patent_analysis.helpers import resolve_orap, sort_orap
+
+PRIORITIES = ['EP2009164213', 'EP2008004567', 'USW2009000001', 'JPW2009000003', 'US12000000', 'DE1000',
+              'EP2010100001', 'WO2009EP004567']
+DATES = ['20090630', '20080301', '20090701', '20100101']
+# Missing, empty and non-YYYYMMDD dates take the pd.to_datetime fallback
+ODD_DATES = ['', 'garbage', '2009-07-01', None]
+JPW_TO_WO = {'USW2009000001': ('WO2009EP004567', '20090701'), 'JPW2009000003': ('WO2009EP004567', '20090702')}
+
+def random_family(rnd: random.Random, size: int, odd_dates: bool) -> pd.DataFrame:
+    rows = []
+    for i in range(size):
+        priority_numbers = rnd.sample(PRIORITIES, rnd.randint(0, 5))
+        dates = {number: rnd.choice(DATES + ODD_DATES if odd_dates else DATES) for number in priority_numbers
+                 if not odd_dates or rnd.random() < 0.9}
+        app_number = priority_numbers[-1] if priority_numbers and rnd.random() < 0.3 else f'EP2011{i:06d}'
+        rows.append({
+            'app_number': app_number,
+            'priority_numbers': priority_numbers,
+            # FamilyRecord hands over dicts or (number, date) tuples
+            'priority_dates': dates if rnd.random() < 0.5 else tuple(sorted(dates.items())),
+            'orap': sorted(priority_numbers),
+            'position': i,
+        })
+    return pd.DataFrame(rows, index=range(100, 100 + size))
+
+def assert_same_orap(resolved: pd.DataFrame, expected: pd.DataFrame):
+    assert resolved.index.tolist() == expected.index.tolist()
+    assert resolved['position'].tolist() == expected['position'].tolist()
+    assert resolved['orap'].tolist() == expected['orap'].tolist()
+    assert [list(history) for history in resolved['orap_history']] == [list(history) for history in expected['orap_history']]
+
+def test_divisional_and_national_phase():
+    df = pd.DataFrame([
+        {'app_number': 'EP2010100000', 'priority_numbers': ['EP2008004567', 'EP2009164213'],
+         'priority_dates': {'EP2008004567': '20080301', 'EP2009164213': '20090630'}},
+        {'app_number': 'WO2009US000001', 'priority_numbers': ['USW2009000001', 'EP2009164213'],
+         'priority_dates': {'EP2009164213': '20090630'}},
+        {'app_number': 'DE102009012345', 'priority_numbers': ['DE102009012345'], 'priority_dates': {}},
+    ])
+    resolved = resolve_orap(df, JPW_TO_WO)
+
+    assert resolved['orap'].tolist() == ['EP2009164213', 'WO2009EP004567', '']
+    assert resolved['orap_history'][1] == [('EP2009164213', '20090630'), ('WO2009EP004567', '20090701')]
+    assert 'orap' not in df  # The input frame is left alone
+
+@pytest.mark.parametrize('odd_dates', [False, True])
+def test_matches_sort_orap(odd_dates):
+    rnd = random.Random(3)
+    for _ in range(100):
+        df = random_family(rnd, rnd.randint(1, 8), odd_dates)
+        expected = df.apply(lambda row: sort_orap(row, JPW_TO_WO, {}), axis=1)
+
+        assert_same_orap(resolve_orap(df, JPW_TO_WO), expected)
@@ -0,0 +1,92 @@
+"""
+Tests for the first page image pipeline and its content-addressed store, against the OPS stand-in
+(placeholder images inquiry and TIFF pages).
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from patent_analysis.image_cache import ImagePipeline, ImageStore
+from patent_analysis.ops_client import create_ops_client
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ImageStore(str(tmp_path / 'image_cache'))
+
+
+def image_requests(server):
+    return [entry for entry in server.request_log if entry['service'] == 'images']
+
+
+def test_images_are_stored_once_under_their_digest(ops_standin, store):
+    pipeline = ImagePipeline(create_ops_client(), store, requests_per_second=None)
+    pipeline.submit(['EP2101496A1', 'EP2200000A1'])
+
+    first, second = pipeline.result('EP2101496A1'), pipeline.result('EP2200000A1')
+    pipeline.shutdown()
+
+    assert first == second  # Same placeholder page
+    assert os.path.exists(store.path(first))
+    with open(store.index_path) as f:
+        assert json.load(f)['EP2101496A1']['link'].endswith('EP/2101496/A1/firstpage')
+
+
+def test_cached_publications_make_no_request(ops_standin, store):
+    pipeline = ImagePipeline(create_ops_client(), store, requests_per_second=None)
+    digest = pipeline.result('EP2101496A1')
+    pipeline.shutdown()
+    before = len(image_requests(ops_standin))
+
+    reloaded = ImagePipeline(create_ops_client(), ImageStore(store.root_dir), requests_per_second=None)
+
+    assert reloaded.result('EP2101496A1') == digest
+    assert len(image_requests(ops_standin)) == before
+
+
+def test_transient_error_is_retried(ops_standin, store, monkeypatch):
+    client = create_ops_client()
+    pipeline = ImagePipeline(client, store, requests_per_second=None)
+    pipeline.result('EP2200000A1')  # Authenticates before errors are injected
+
+    monkeypatch.setattr(ops_standin.settings, 'error_rate', 1.0)
+    monkeypatch.setattr(ops_standin.settings, 'error_statuses', (503,))
+    assert pipeline.result('EP2200001A1') is None
+    assert store.lookup('EP2200001A1') is None
+
+    monkeypatch.setattr(ops_standin.settings, 'error_rate', 0.0)
+    assert pipeline.result('EP2200001A1') is not None
+    pipeline.shutdown()
+
+
+def test_shutdown_cancels_queued_retrievals(ops_standin, store):
+    pipeline = ImagePipeline(create_ops_client(), store, max_workers=1, requests_per_second=2)
+    pub_numbers = [f'EP22000{n:02d}A1' for n in range(6)]
+    pipeline.submit(pub_numbers)
+    pipeline.shutdown()
+
+    time.sleep(1.2)  # Let the retrieval that had started finish
+    started = len(image_requests(ops_standin))
+    time.sleep(1.0)
+
+    assert len(image_requests(ops_standin)) == started  # Nothing else was started
+    assert pipeline.result(pub_numbers[-1]) is not None  # Scheduled again
+    pipeline.shutdown()
+
+
+def test_index_is_written_in_batches(store):
+    store.flush_every = 3
+    store.record('EP1A1', None, None)
+    store.record('EP2A1', None, None)
+    assert not os.path.exists(store.index_path)
+
+    store.record('EP3A1', None, None)
+    store.record('EP4A1', None, None)
+    with open(store.index_path) as f:
+        assert sorted(json.load(f)) == ['EP1A1', 'EP2A1', 'EP3A1']
+
+    store.flush()
+    assert sorted(ImageStore(store.root_dir)._index) == ['EP1A1', 'EP2A1', 'EP3A1', 'EP4A1']
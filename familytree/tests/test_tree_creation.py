@@ -0,0 +1,107 @@
+"""
+Tests for create_nested_dict against the row-by-row loop it replaced.
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from patent_analysis.family_cache import FamilyDocumentCache
+from patent_analysis.family_index import FamilyIndex
+from patent_analysis.family_record import FamilyRecord
+from patent_analysis.tree_creation import TreeCreation
+
+
+def reference_nested_dict(db, df):
+    """The original create_nested_dict loop (ORAP back-fill and root detection with df.iloc), without debug output."""
+    df = df.reset_index(drop=True)
+    listAPs = df['app_number'].tolist()
+    listORAPs = df['orap'].apply(lambda x: x.split()[0] if isinstance(x, str) and x.strip() else None).dropna().tolist()
+    root = {'0': 0}
+    if df.shape[0] > 0:
+        if db in ["EPODOC", "DOCDB"]:
+            for i in range(len(df)):
+                current_row = df.iloc[i]
+                accession_number = current_row['accession_number'].split(' ')[0] if pd.notna(current_row['accession_number']) else ''
+                app_number = current_row['app_number'].split(' ')[0] if pd.notna(current_row['app_number']) else ''
+                orap = current_row['orap'].split(' ')[0] if pd.notna(current_row['orap']) and current_row['orap'] else ''
+                if (orap == '') and (accession_number != app_number) and ('EP' in accession_number) and ('EP' not in app_number):
+                    for j in range(len(df)):
+                        if df.iloc[j]['accession_number'] == accession_number:
+                            df.iloc[i, df.columns.get_loc('orap')] = df.iloc[j]['orap']
+                            break
+
+        for i in range(len(df), 0, -1):
+            prior_row = df.iloc[i - 1]
+            if prior_row['app_number'] is not None:
+                if pd.isna(prior_row['accession_number']) or pd.isna(prior_row['app_number']) or prior_row['app_number'] == "Unknown0000000":
+                    continue
+                if (pd.notna(prior_row['orap']) and (prior_row['orap'].split(' ')[0] not in listAPs)) or pd.isna(prior_row['orap']):
+                    r = root['0'] + 1
+                    root[r] = {
+                        'root_an': prior_row['accession_number'].split(' ')[0],
+                        'root_ap': prior_row['app_number'].split(' ')[0],
+                        'root_pn': str(prior_row['pub_number']) + str(prior_row['pub_kind']),
+                        'root_pr': prior_row['priority_numbers'],
+                        'root_orap': prior_row['orap'].split(' ')[0] if pd.notna(prior_row['orap']) and prior_row['orap'] else '',
+                        'root_evnt': prior_row['legal_events'],
+                    }
+                    if prior_row['orap'] == '' and df.at[i - 1, 'orap'] == '':
+                        df.at[i - 1, 'orap'] = "noOrap" + str(r)
+                    root[r]['root_orap'] = df.at[i - 1, 'orap'].split(' ')[0] if df.at[i - 1, 'orap'] else ''
+                    root['0'] = r
+    return root, listAPs, listORAPs, df
+
+
+def random_family(rnd: random.Random, size: int) -> pd.DataFrame:
+    ep_apps = [f'EP20{9 + i % 3:02d}{100000 + i:06d}' for i in range(size)]
+    rows = []
+    for i in range(size):
+        kind = rnd.random()
+        if kind < 0.5:  # EP application
+            accession, app = ep_apps[i], ep_apps[i] + rnd.choice(['', ' A'])
+        elif kind < 0.8:  # National phase of an EP accession
+            accession, app = rnd.choice(ep_apps[:i + 1]), rnd.choice(['US', 'JP', 'CN']) + f'2010{i:06d}'
+        elif kind < 0.9:
+            accession, app = f'WO2009EP{i:06d}', 'Unknown0000000'
+        else:
+            accession, app = np.nan, f'DE10{i:06d}'
+        rows.append({
+            'accession_number': accession,
+            'app_number': app,
+            'pub_number': f'{app[:2]}{2000000 + i}',
+            'pub_kind': rnd.choice(['A1', 'B1', 'A']),
+            'priority_numbers': ' '.join(rnd.sample(ep_apps, rnd.randint(0, min(2, size)))),
+            'orap': rnd.choice(['', '', rnd.choice(ep_apps) + rnd.choice(['', ' 20090630']),
+                                'US99000000', ep_apps[i]]),
+            'legal_events': [f'event-{i}'] if rnd.random() < 0.5 else [],
+            'source_doc_number': 'EP2101496A1',
+        })
+    return pd.DataFrame(rows)
+
+
+def assert_same_tree(df, db="EPODOC"):
+    expected_root, expected_aps, expected_oraps, expected_df = reference_nested_dict(db, df.copy())
+    tree = TreeCreation(db=db, df=df.copy())
+    root, listAPs, listORAPs, result_df = tree.create_nested_dict(df.copy())
+
+    assert root == expected_root
+    assert listAPs == expected_aps
+    assert listORAPs == expected_oraps
+    assert result_df['orap'].fillna('<nan>').tolist() == expected_df['orap'].fillna('<nan>').tolist()
+
+
+def test_fixture_family_matches_the_loop(ops_standin, tmp_path):
+    record = FamilyRecord('publication', '2101496', 'EP', 'A1', countrySelection=['US', 'JP'],
+                          cache=FamilyDocumentCache(), index=FamilyIndex(str(tmp_path / 'family_index.sqlite')))
+    df = record.process_fami_record(['US', 'JP'])[0]
+
+    assert_same_tree(df)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_random_families_match_the_loop(seed):
+    rnd = random.Random(seed)
+    assert_same_tree(random_family(rnd, rnd.randint(1, 25)), db=rnd.choice(["EPODOC", "DOCDB", "OTHER"]))
@@ -0,0 +1,46 @@
+"""
+Tests for the tree processor on a family fetched through the OPS stand-in.
+"""
+
+import pytest
+
+from patent_analysis.tree_processor import TreeProcessor
+
+VIEWS = [None, 'Show_priorities', ['Show_priorities', 'Show_publications', 'Show_legal_events']]
+
+def make_processor(family_tree, workdir, views=None) -> TreeProcessor:
+    tree, root, listAPs, listORAPs, df = family_tree
+    return TreeProcessor(tree=tree, root=root, initFlag=views, listAPs=listAPs, listORAPs=listORAPs, df=df,
+                         familyRoot=None, workdir=str(workdir))
+
+def test_family_is_fetched_through_the_standin(ops_standin, family_tree):
+    df = family_tree[4]
+
+    assert df['app_number'].tolist() == ['EP2009164213', 'EP2010100000', 'EP2011100001',
+                                         'WO2009US000001', 'WO2009JP000003']
+    assert any(entry['path'].endswith('/family/publication/docdb/EP.2101496.A1/legal,biblio')
+               and entry['status'] == 200 for entry in ops_standin.request_log)
+
+def test_child_index_matches_linear_scan(family_tree, tmp_path):
+    tree = family_tree[0]
+    processor = make_processor(family_tree, tmp_path)
+    children = processor.build_child_index()
+
+    roots = [root['root_ap'] for root in processor.root.values() if isinstance(root, dict)]
+    nodes = set(roots) | {ap.split()[0] for ap in tree.ap if isinstance(ap, str)}
+    assert children['EP2009164213'] and children['EP2010100000']
+    for node in nodes:
+        # tree_generation() before the index: every member whose ORAP names the node, last member first
+        scanned = [t for t in range(int(tree.orapNb) - 1, -1, -1) if node in tree.orap[t] and tree.orap[t] != '']
+        assert children.get(node, []) == scanned, node
+
+@pytest.mark.parametrize('views', VIEWS)
+def test_render_matches_tree_file(family_tree, tmp_path, views):
+    processor = make_processor(family_tree, tmp_path / 'trees', views)
+    processor.process_tree_file()
+    with open(processor.tree_file_path) as tree_file:
+        written = tree_file.read()
+
+    assert written.startswith('Starting Divitree with EP2101496\n')
+    assert 'EP2011100001' in written
+    assert make_processor(family_tree, tmp_path, views).render() == written
@@ -0,0 +1,56 @@
+"""
+Tests for rendering views from one family snapshot.
+"""
+
+import io
+
+import pytest
+
+from patent_analysis.biblio_cache import BiblioCache
+from patent_analysis.tree_processor import TreeProcessor
+from patent_analysis.view_engine import ViewEngine
+
+VIEWS = [None, 'Show_priorities', ['Show_priorities', 'Show_publications', 'Show_legal_events'], 'Show_parties']
+
+def make_engine(family_tree, workdir) -> ViewEngine:
+    tree, root, listAPs, listORAPs, df = family_tree
+    return ViewEngine(tree, root, listAPs, listORAPs, df, biblio_cache=BiblioCache(), workdir=str(workdir))
+
+def processor_render(family_tree, workdir, views) -> str:
+    tree, root, listAPs, listORAPs, df = family_tree
+    processor = TreeProcessor(tree=tree, root=root, initFlag=views, listAPs=listAPs, listORAPs=listORAPs, df=df,
+                              familyRoot=None, biblio_cache=BiblioCache(), workdir=str(workdir))
+    return processor.render()
+
+@pytest.mark.parametrize('views', VIEWS)
+def test_stream_and_render_match_processor(family_tree, tmp_path, views):
+    expected = processor_render(family_tree, tmp_path, views)
+
+    with make_engine(family_tree, tmp_path) as engine:
+        streamed = io.StringIO()
+        engine.stream(views, streamed)
+        assert streamed.getvalue() == expected
+        assert engine.render(views) == expected  # Kept from the stream
+
+    with make_engine(family_tree, tmp_path) as engine:
+        assert engine.render(views) == expected
+
+def test_parties_come_from_the_biblio_fixtures(family_tree, tmp_path):
+    with make_engine(family_tree, tmp_path) as engine:
+        text = engine.render('Show_parties')
+
+    assert 'EXAMPLE GMBH, MUSTER, Max, BEISPIEL, Erika' in text
+    assert 'EXAMPLE CORP' in text
+
+def test_failed_render_is_not_kept(ops_standin, family_tree, tmp_path, monkeypatch):
+    expected = processor_render(family_tree, tmp_path, 'Show_parties')
+
+    with make_engine(family_tree, tmp_path) as engine:
+        with monkeypatch.context() as patch:
+            patch.setattr(ops_standin.settings, 'error_rate', 1.0)
+            patch.setattr(ops_standin.settings, 'error_statuses', (503,))
+            partial = engine.render('Show_parties')
+
+        assert expected.startswith(partial) and len(partial) < len(expected)
+        assert engine.render('Show_parties') == expected  # OPS recovered: rendered again, not the partial text
+        assert engine.render('Show_parties') == expected
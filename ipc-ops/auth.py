@@ -11,7 +11,7 @@ def get_access_token():
     if not key or not secret:
         raise EnvironmentError("Bitte setze OPS_KEY und OPS_SECRET in der .env-Datei.")
 
-    url = "https://ops.epo.org/3.2/auth/accesstoken"
+    url = os.getenv("OPS_AUTH_URL", "https://ops.epo.org/3.2/auth/accesstoken")
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     data = {"grant_type": "client_credentials"}
 
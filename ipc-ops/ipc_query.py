@@ -1,3 +1,4 @@
+import os
 import time
 from typing import Dict, List, Optional, Union, Any
 import requests
@@ -31,7 +32,7 @@ class IPCQueryResult:
 class IPCQuery:
     """Handles IPC (International Patent Classification) queries to EPO OPS API."""
     
-    BASE_URL = "https://ops.epo.org/3.2/rest-services/published-data/search"
+    BASE_URL = os.getenv("OPS_BASE_URL", "https://ops.epo.org/3.2/rest-services").rstrip("/") + "/published-data/search"
     
     def __init__(self):
         self.token = get_access_token()